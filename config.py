@@ -1,9 +1,11 @@
 """
 Configurações centralizadas do projeto
 """
+import math
 import os
 import logging
-from typing import List, Dict, Optional
+import threading
+from typing import Any, List, Dict, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -14,6 +16,10 @@ class DatabaseConfig:
     """Configurações do banco de dados"""
     dynamodb_table_name: str = "djblog-noticias"
     aws_region: str = "us-east-1"
+    feed_state_table_name: str = "djblog-feed-state"
+    dedup_index_table_name: str = "djblog-dedup-index"
+    read_model_table_name: str = "djblog-read-model"
+    summary_cache_table_name: str = "djblog-summary-cache"
 
 
 @dataclass
@@ -43,6 +49,81 @@ class ContentConfig:
     language: str = "pt-BR"
 
 
+@dataclass
+class CollectorConfig:
+    """Configurações do coletor de feeds"""
+    fetch_workers: int = 8
+    max_connections_per_host: int = 2
+    conditional_get: bool = True
+    write_mode: str = "batch"
+    feed_parser: str = "feedparser"
+    content_filter: bool = True
+    content_filter_capacity: int = 50000
+    content_filter_fp_rate: float = 0.001
+    content_filter_rebuild_hours: int = 24
+    content_filter_check_rate: float = 0.05
+    language_detector: str = "langdetect"
+    language_min_samples: int = 5
+    language_dominance: float = 0.8
+
+
+@dataclass
+class SummaryConfig:
+    """Configurações do resumo com IA (summarize_ai.SummaryPipeline)"""
+    enabled: bool = False
+    model: str = "gpt-3.5-turbo"
+    base_url: Optional[str] = None
+    batch_size: int = 8
+    concurrency: int = 4
+    max_batch_tokens: int = 6000
+    tokens_per_minute: int = 60000
+    cache_ttl_days: int = 30
+    cache_memory_size: int = 5000
+    extractive_sentences: int = 3
+    extractive_max_chars: int = 400
+
+
+@dataclass
+class HttpConfig:
+    """Configurações do cliente HTTP compartilhado"""
+    pool_maxsize: int = 16
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 2
+    max_retry_after: float = 5.0
+
+
+@dataclass
+class RateLimitConfig:
+    """Limites de requisições HTTP por host (token bucket)"""
+    default_rps: float = 2.0
+    burst: int = 2
+    wordpress_rps: float = 4.0
+    per_host: Dict[str, float] = None
+
+
+@dataclass
+class CleanupConfig:
+    """Configurações da limpeza de notícias antigas"""
+    retention_days: int = 7
+    mode: str = "index"
+    scan_segments: int = 4
+    retention_by_niche: Dict[str, int] = None
+
+
+@dataclass
+class NewsAPIConfig:
+    """Configurações da API de leitura de notícias"""
+    page_size: int = 20
+    max_page_size: int = 100
+    cache_max_age: int = 60
+    read_model_size: int = 50
+    local_cache_size: int = 256
+    local_cache_ttl: int = 30
+    local_cache_cursor_ttl: int = 300
+    local_cache_stale: int = 300
+
+
 @dataclass
 class WordPressConfig:
     """Configurações do WordPress"""
@@ -50,6 +131,9 @@ class WordPressConfig:
     wp_user: Optional[str] = None
     wp_app_password: Optional[str] = None
     categorias_wp: Dict[str, int] = None
+    publish_mode: str = "async"
+    publish_concurrency: int = 4
+    publish_max_retries: int = 4
 
 
 class Config:
@@ -64,7 +148,11 @@ class Config:
         # Database
         self.database = DatabaseConfig(
             dynamodb_table_name=os.environ.get("DYNAMODB_TABLE_NAME", "djblog-noticias"),
-            aws_region=os.environ.get("AWS_REGION", "us-east-1")
+            aws_region=os.environ.get("AWS_REGION", "us-east-1"),
+            feed_state_table_name=os.environ.get("FEED_STATE_TABLE_NAME", "djblog-feed-state"),
+            dedup_index_table_name=os.environ.get("DEDUP_INDEX_TABLE_NAME", "djblog-dedup-index"),
+            read_model_table_name=os.environ.get("READ_MODEL_TABLE_NAME", "djblog-read-model"),
+            summary_cache_table_name=os.environ.get("SUMMARY_CACHE_TABLE_NAME", "djblog-summary-cache")
         )
 
         # APIs
@@ -96,11 +184,85 @@ class Config:
             language=os.environ.get("LANGUAGE", "pt-BR")
         )
 
+        # Collector
+        self.collector = CollectorConfig(
+            fetch_workers=int(os.environ.get("FETCH_WORKERS", 8)),
+            max_connections_per_host=int(os.environ.get("MAX_CONNECTIONS_PER_HOST", 2)),
+            conditional_get=os.environ.get("CONDITIONAL_GET", "true").lower() == "true",
+            write_mode=os.environ.get("COLLECTOR_WRITE_MODE", "batch").lower(),
+            feed_parser=os.environ.get("FEED_PARSER", "feedparser").lower(),
+            content_filter=os.environ.get("CONTENT_FILTER", "true").lower() == "true",
+            content_filter_capacity=int(os.environ.get("CONTENT_FILTER_CAPACITY", 50000)),
+            content_filter_fp_rate=float(os.environ.get("CONTENT_FILTER_FP_RATE", 0.001)),
+            content_filter_rebuild_hours=int(os.environ.get("CONTENT_FILTER_REBUILD_HOURS", 24)),
+            content_filter_check_rate=float(os.environ.get("CONTENT_FILTER_CHECK_RATE", 0.05)),
+            language_detector=os.environ.get("LANGUAGE_DETECTOR", "langdetect").lower(),
+            language_min_samples=int(os.environ.get("LANGUAGE_MIN_SAMPLES", 5)),
+            language_dominance=float(os.environ.get("LANGUAGE_DOMINANCE", 0.8))
+        )
+
+        # Resumo com IA
+        self.summary = SummaryConfig(
+            enabled=os.environ.get("AI_SUMMARY", "false").lower() == "true",
+            model=os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo"),
+            base_url=os.environ.get("OPENAI_BASE_URL") or None,
+            batch_size=int(os.environ.get("AI_SUMMARY_BATCH_SIZE", 8)),
+            concurrency=int(os.environ.get("AI_SUMMARY_CONCURRENCY", 4)),
+            max_batch_tokens=int(os.environ.get("AI_SUMMARY_MAX_BATCH_TOKENS", 6000)),
+            tokens_per_minute=int(os.environ.get("OPENAI_TPM", 60000)),
+            cache_ttl_days=int(os.environ.get("AI_SUMMARY_CACHE_TTL_DAYS", 30)),
+            cache_memory_size=int(os.environ.get("AI_SUMMARY_CACHE_SIZE", 5000)),
+            extractive_sentences=int(os.environ.get("RESUMO_FRASES", 3)),
+            extractive_max_chars=int(os.environ.get("RESUMO_MAX_CARACTERES", 400))
+        )
+
+        # HTTP
+        self.http = HttpConfig(
+            pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", 16)),
+            connect_timeout=float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05)),
+            read_timeout=float(os.environ.get("HTTP_READ_TIMEOUT", 10.0)),
+            retries=int(os.environ.get("HTTP_RETRIES", 2)),
+            max_retry_after=float(os.environ.get("HTTP_MAX_RETRY_AFTER", 5.0))
+        )
+
+        # Rate limiting
+        self.rate_limit = RateLimitConfig(
+            default_rps=float(os.environ.get("RATE_LIMIT_DEFAULT_RPS", 2.0)),
+            burst=int(os.environ.get("RATE_LIMIT_BURST", 2)),
+            wordpress_rps=float(os.environ.get("RATE_LIMIT_WORDPRESS_RPS", 4.0)),
+            per_host=self._parse_pairs(os.environ.get("RATE_LIMIT_PER_HOST", ""), float)
+        )
+
+        # Cleanup
+        self.cleanup = CleanupConfig(
+            retention_days=int(os.environ.get("RETENTION_DAYS", 7)),
+            mode=os.environ.get("CLEANUP_MODE", "index").lower(),
+            scan_segments=int(os.environ.get("CLEANUP_SCAN_SEGMENTS", 4)),
+            retention_by_niche=self._parse_pairs(
+                os.environ.get("RETENTION_DAYS_BY_NICHE", ""), int
+            )
+        )
+
+        # API de leitura
+        self.news_api = NewsAPIConfig(
+            page_size=int(os.environ.get("API_PAGE_SIZE", 20)),
+            max_page_size=int(os.environ.get("API_MAX_PAGE_SIZE", 100)),
+            cache_max_age=int(os.environ.get("API_CACHE_MAX_AGE", 60)),
+            read_model_size=int(os.environ.get("READ_MODEL_SIZE", 50)),
+            local_cache_size=int(os.environ.get("API_LOCAL_CACHE_SIZE", 256)),
+            local_cache_ttl=int(os.environ.get("API_LOCAL_CACHE_TTL", 30)),
+            local_cache_cursor_ttl=int(os.environ.get("API_LOCAL_CACHE_CURSOR_TTL", 300)),
+            local_cache_stale=int(os.environ.get("API_LOCAL_CACHE_STALE", 300))
+        )
+
         # WordPress
         self.wordpress = WordPressConfig(
             wp_url=os.environ.get("WP_URL"),
             wp_user=os.environ.get("WP_USER"),
             wp_app_password=os.environ.get("WP_APP_PASSWORD"),
+            publish_mode=os.environ.get("WP_PUBLISH_MODE", "async").lower(),
+            publish_concurrency=int(os.environ.get("WP_PUBLISH_CONCURRENCY", 4)),
+            publish_max_retries=int(os.environ.get("WP_PUBLISH_MAX_RETRIES", 4)),
             categorias_wp={
                 "tecnologia": 2,
                 "esportes": 3,
@@ -118,6 +280,17 @@ class Config:
             }
         )
 
+    @staticmethod
+    def _parse_pairs(value: str, cast) -> Dict[str, Any]:
+        """Lê variáveis no formato chave:valor,chave:valor (ex.: saude:14,economia:30)"""
+        pairs = {}
+        for pair in value.split(","):
+            if ":" not in pair:
+                continue
+            key, item = pair.rsplit(":", 1)
+            pairs[key.strip().lower()] = cast(item)
+        return pairs
+
     def _validate_configurations(self):
         """Valida todas as configurações obrigatórias"""
         errors = []
@@ -136,6 +309,108 @@ class Config:
         if self.content.threshold_caracteres <= 0:
             errors.append("THRESHOLD_CARACTERES deve ser maior que 0")
 
+        if self.collector.fetch_workers <= 0:
+            errors.append("FETCH_WORKERS deve ser maior que 0")
+
+        if self.collector.max_connections_per_host <= 0:
+            errors.append("MAX_CONNECTIONS_PER_HOST deve ser maior que 0")
+
+        if self.collector.write_mode not in ("batch", "single"):
+            errors.append("COLLECTOR_WRITE_MODE deve ser 'batch' ou 'single'")
+
+        if self.collector.feed_parser not in ("feedparser", "stream"):
+            errors.append("FEED_PARSER deve ser 'feedparser' ou 'stream'")
+
+        if self.collector.content_filter_capacity <= 0:
+            errors.append("CONTENT_FILTER_CAPACITY deve ser maior que 0")
+
+        if not 0 < self.collector.content_filter_fp_rate < 1:
+            errors.append("CONTENT_FILTER_FP_RATE deve estar entre 0 e 1")
+        elif (-self.collector.content_filter_capacity * math.log(self.collector.content_filter_fp_rate)
+              / math.log(2) ** 2 / 8 > 350 * 1024):
+            # O snapshot do filtro precisa caber num item de 400 KB do DynamoDB
+            errors.append("CONTENT_FILTER_CAPACITY e CONTENT_FILTER_FP_RATE geram um filtro maior que 350 KB")
+
+        if self.collector.content_filter_rebuild_hours <= 0:
+            errors.append("CONTENT_FILTER_REBUILD_HOURS deve ser maior que 0")
+
+        if not 0 <= self.collector.content_filter_check_rate <= 1:
+            errors.append("CONTENT_FILTER_CHECK_RATE deve estar entre 0 e 1")
+
+        if self.collector.language_detector not in ("langdetect", "ngram"):
+            errors.append("LANGUAGE_DETECTOR deve ser 'langdetect' ou 'ngram'")
+
+        if self.collector.language_min_samples <= 0:
+            errors.append("LANGUAGE_MIN_SAMPLES deve ser maior que 0")
+
+        if not 0.5 < self.collector.language_dominance <= 1:
+            errors.append("LANGUAGE_DOMINANCE deve estar entre 0.5 (exclusivo) e 1")
+
+        if self.summary.batch_size <= 0:
+            errors.append("AI_SUMMARY_BATCH_SIZE deve ser maior que 0")
+
+        if self.summary.concurrency <= 0:
+            errors.append("AI_SUMMARY_CONCURRENCY deve ser maior que 0")
+
+        if self.summary.max_batch_tokens <= 0:
+            errors.append("AI_SUMMARY_MAX_BATCH_TOKENS deve ser maior que 0")
+
+        if self.summary.cache_ttl_days <= 0:
+            errors.append("AI_SUMMARY_CACHE_TTL_DAYS deve ser maior que 0")
+
+        if self.summary.cache_memory_size <= 0:
+            errors.append("AI_SUMMARY_CACHE_SIZE deve ser maior que 0")
+
+        if self.summary.extractive_sentences <= 0:
+            errors.append("RESUMO_FRASES deve ser maior que 0")
+
+        if self.summary.extractive_max_chars <= 0:
+            errors.append("RESUMO_MAX_CARACTERES deve ser maior que 0")
+
+        if self.http.pool_maxsize <= 0:
+            errors.append("HTTP_POOL_MAXSIZE deve ser maior que 0")
+
+        if self.http.retries < 0:
+            errors.append("HTTP_RETRIES não pode ser negativo")
+
+        if self.http.max_retry_after < 0:
+            errors.append("HTTP_MAX_RETRY_AFTER não pode ser negativo")
+
+        if self.wordpress.publish_mode not in ("async", "sequential"):
+            errors.append("WP_PUBLISH_MODE deve ser 'async' ou 'sequential'")
+
+        if self.wordpress.publish_concurrency <= 0:
+            errors.append("WP_PUBLISH_CONCURRENCY deve ser maior que 0")
+
+        if self.rate_limit.burst <= 0:
+            errors.append("RATE_LIMIT_BURST deve ser maior que 0")
+
+        if self.cleanup.retention_days <= 0:
+            errors.append("RETENTION_DAYS deve ser maior que 0")
+
+        if any(days <= 0 for days in self.cleanup.retention_by_niche.values()):
+            errors.append("RETENTION_DAYS_BY_NICHE deve ter apenas valores maiores que 0")
+
+        if self.cleanup.mode not in ("index", "scan"):
+            errors.append("CLEANUP_MODE deve ser 'index' ou 'scan'")
+
+        if self.cleanup.scan_segments <= 0:
+            errors.append("CLEANUP_SCAN_SEGMENTS deve ser maior que 0")
+
+        if not 0 < self.news_api.page_size <= self.news_api.max_page_size:
+            errors.append("API_PAGE_SIZE deve estar entre 1 e API_MAX_PAGE_SIZE")
+
+        if self.news_api.cache_max_age < 0:
+            errors.append("API_CACHE_MAX_AGE não pode ser negativo")
+
+        if self.news_api.read_model_size < 0:
+            errors.append("READ_MODEL_SIZE não pode ser negativo")
+
+        if min(self.news_api.local_cache_size, self.news_api.local_cache_ttl,
+               self.news_api.local_cache_cursor_ttl, self.news_api.local_cache_stale) < 0:
+            errors.append("API_LOCAL_CACHE_SIZE, API_LOCAL_CACHE_TTL, API_LOCAL_CACHE_CURSOR_TTL "
+                          "e API_LOCAL_CACHE_STALE não podem ser negativos")
+
         if errors:
             error_msg = (
                 "Erros de configuração:\n" + "\n".join(f"- {error}" for error in errors)
@@ -149,6 +424,10 @@ class Config:
         """Retorna ID da categoria WordPress para um nicho"""
         return self.wordpress.categorias_wp.get(nicho.lower(), 1)  # 1 = Uncategorized
 
+    def get_retention_days(self, nicho: str) -> int:
+        """Retorna por quantos dias as notícias de um nicho são mantidas"""
+        return self.cleanup.retention_by_niche.get(nicho.lower(), self.cleanup.retention_days)
+
     def is_wordpress_configured(self) -> bool:
         """Verifica se o WordPress está configurado"""
         return all([
@@ -170,12 +449,111 @@ class Config:
         return bool(self.monitoring.dd_api_key)
 
     def get_dynamodb_resource(self):
-        """Retorna recurso DynamoDB configurado"""
-        import boto3
-        return boto3.resource('dynamodb', region_name=self.database.aws_region)
+        """Retorna recurso DynamoDB configurado (memoizado pelo registro de clientes)"""
+        return get_aws_registry().resource('dynamodb', self.database.aws_region)
+
+    def get_dynamodb_client(self):
+        """Retorna cliente DynamoDB de baixo nível (thread-safe, compartilhado)"""
+        return get_aws_registry().client('dynamodb', self.database.aws_region)
+
+    def get_dynamodb_table(self, table_name: Optional[str] = None):
+        """
+        Retorna uma tabela DynamoDB (memoizada pelo registro de clientes)
+
+        Args:
+            table_name: Nome da tabela (padrão: tabela de notícias)
+        """
+        return get_aws_registry().table(table_name or self.database.dynamodb_table_name,
+                                        self.database.aws_region)
+
+
+class AWSClientRegistry:
+    """
+    Memoiza a sessão, os clientes, os recursos e as tabelas do boto3
+
+    Criar uma sessão ou um recurso carrega os modelos do serviço e leva
+    dezenas de milissegundos; o registro cria cada objeto uma vez por
+    container e o reaproveita nas invocações seguintes.
+
+    - clientes são thread-safe e compartilhados por todas as threads
+    - recursos e Tables não são thread-safe: cada thread recebe os seus,
+      memoizados por região e nome de tabela
+
+    A Session também não é thread-safe, então toda criação passa pelo lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self._clients: Dict[tuple, Any] = {}
+        self._local = threading.local()
+
+    def _get_session(self):
+        if self._session is None:
+            import boto3
+            self._session = boto3.session.Session()
+        return self._session
+
+    def client(self, service: str, region: str):
+        """Cliente do serviço na região, compartilhado pelo processo"""
+        key = (service, region)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._get_session().client(service, region_name=region)
+                    self._clients[key] = client
+        return client
+
+    def resource(self, service: str, region: str):
+        """Recurso do serviço na região, um por thread"""
+        resources = self._thread_cache("resources")
+        key = (service, region)
+        resource = resources.get(key)
+        if resource is None:
+            with self._lock:
+                resource = self._get_session().resource(service, region_name=region)
+            resources[key] = resource
+        return resource
+
+    def table(self, table_name: str, region: str):
+        """Table do DynamoDB, uma por thread"""
+        tables = self._thread_cache("tables")
+        key = (table_name, region)
+        table = tables.get(key)
+        if table is None:
+            table = self.resource('dynamodb', region).Table(table_name)
+            tables[key] = table
+        return table
+
+    def _thread_cache(self, name: str) -> Dict[tuple, Any]:
+        cache = getattr(self._local, name, None)
+        if cache is None:
+            cache = {}
+            setattr(self._local, name, cache)
+        return cache
+
+    def reset(self) -> None:
+        """Descarta tudo o que foi criado (usado nos testes)"""
+        with self._lock:
+            self._session = None
+            self._clients = {}
+            self._local = threading.local()
 
 
 _config_instance = None
+_aws_registry = AWSClientRegistry()
+
+
+def get_aws_registry() -> AWSClientRegistry:
+    """Retorna o registro de clientes AWS do processo"""
+    return _aws_registry
+
+
+def reset_aws_clients() -> None:
+    """Descarta clientes, recursos e tabelas memoizados (usado nos testes)"""
+    _aws_registry.reset()
 
 
 def get_config():
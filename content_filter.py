@@ -0,0 +1,181 @@
+"""
+Filtro de Bloom dos hashes de conteúdo já coletados
+
+Em regime normal quase todas as entradas de um feed já estão na tabela, e
+o coletor pagava uma leitura no DynamoDB por entrada só para descobrir
+isso. O filtro responde "já vi" sem nenhuma chamada:
+
+- negativo: o hash nunca foi adicionado; a entrada segue para a
+  verificação normal no DynamoDB (o filtro pode estar desatualizado)
+- positivo: a entrada é descartada como existente, com uma chance de falso
+  positivo limitada pela taxa configurada
+
+Uma amostra dos positivos é conferida no DynamoDB para medir a taxa real
+de falsos positivos. O filtro é reconstruído a partir da tabela quando
+fica velho (as notícias expiram pelo TTL e um filtro de Bloom não remove
+itens) ou quando passa da capacidade.
+
+O snapshot fica na tabela djblog-dedup-index, num item com a chave
+reservada nicho = "#hashes", comprimido para respeitar o limite de 400 KB
+por item.
+"""
+
+import hashlib
+import math
+import time
+import zlib
+from typing import Dict, Any, Iterable, Optional
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+# Chave reservada na tabela djblog-dedup-index (nichos nunca começam com "#")
+FILTER_KEY = "#hashes"
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom com dupla hash (Kirsch-Mitzenmacher) sobre BLAKE2b
+
+    Dimensionado para `capacity` itens com taxa de falsos positivos
+    `fp_rate`: m = -n ln p / (ln 2)^2 bits e k = m/n ln 2 funções de hash.
+    """
+
+    def __init__(self, capacity: int = 50000, fp_rate: float = 0.001,
+                 created_at: Optional[int] = None):
+        if capacity <= 0 or not 0 < fp_rate < 1:
+            raise ValueError("capacity deve ser positiva e fp_rate deve estar entre 0 e 1")
+
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.created_at = created_at if created_at is not None else int(time.time())
+
+        # Conferências de positivos no DynamoDB, acumuladas entre execuções
+        self.checks = 0
+        self.false_positives = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """
+        Adiciona uma chave
+
+        Returns:
+            True se a chave ainda não estava no filtro
+        """
+        new = False
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def record_check(self, false_positive: bool) -> None:
+        """Registra a conferência de um positivo no DynamoDB"""
+        self.checks += 1
+        if false_positive:
+            self.false_positives += 1
+
+    def estimated_fp_rate(self) -> float:
+        """Taxa de falsos positivos esperada para o número atual de itens"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def observed_fp_rate(self) -> Optional[float]:
+        """Taxa de falsos positivos medida nas conferências, ou None sem conferências"""
+        return self.false_positives / self.checks if self.checks else None
+
+    def needs_rebuild(self, max_age_seconds: int, now: Optional[int] = None) -> bool:
+        """True se o filtro passou da idade máxima ou da capacidade"""
+        now = now if now is not None else int(time.time())
+        return now - self.created_at >= max_age_seconds or self.count > self.capacity
+
+    def stats(self) -> Dict[str, Any]:
+        observed = self.observed_fp_rate()
+        return {
+            "itens": self.count,
+            "capacidade": self.capacity,
+            "bytes": len(self.bits),
+            "fp_estimado": round(self.estimated_fp_rate(), 6),
+            "conferencias": self.checks,
+            "falsos_positivos": self.false_positives,
+            "fp_observado": round(observed, 6) if observed is not None else None,
+            "idade_segundos": int(time.time()) - self.created_at
+        }
+
+    def to_item(self) -> Dict[str, Any]:
+        """Serializa o filtro num item da tabela djblog-dedup-index"""
+        return {
+            'nicho': FILTER_KEY,
+            'parte': 0,
+            'capacidade': self.capacity,
+            'fp_rate': str(self.fp_rate),
+            'itens': self.count,
+            'criado_em': self.created_at,
+            'conferencias': self.checks,
+            'falsos_positivos': self.false_positives,
+            'dados': zlib.compress(bytes(self.bits))
+        }
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "BloomFilter":
+        """Restaura o filtro gravado por to_item"""
+        bloom = cls(int(item['capacidade']), float(item['fp_rate']), created_at=int(item['criado_em']))
+        bits = zlib.decompress(getattr(item['dados'], 'value', item['dados']))
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Tamanho do filtro não confere com os parâmetros gravados")
+        bloom.bits = bytearray(bits)
+        bloom.count = int(item.get('itens', 0))
+        bloom.checks = int(item.get('conferencias', 0))
+        bloom.false_positives = int(item.get('falsos_positivos', 0))
+        return bloom
+
+
+class ContentFilterStore:
+    """Persiste o filtro de hashes na tabela djblog-dedup-index"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def load(self) -> Optional[BloomFilter]:
+        """Carrega o filtro; retorna None se não houver ou em caso de erro"""
+        try:
+            response = self.table.get_item(Key={'nicho': FILTER_KEY, 'parte': 0})
+            if 'Item' not in response:
+                return None
+            return BloomFilter.from_item(response['Item'])
+        except Exception as e:
+            logger.warning(f"Erro ao carregar filtro de hashes: {e}")
+            return None
+
+    def save(self, bloom: BloomFilter) -> bool:
+        """Grava o filtro"""
+        try:
+            self.table.put_item(Item=bloom.to_item())
+            return True
+        except Exception as e:
+            logger.warning(f"Erro ao salvar filtro de hashes: {e}")
+            return False
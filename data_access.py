@@ -0,0 +1,310 @@
+"""
+Camada de acesso aos dados da tabela de notícias
+
+Atende os padrões de leitura das Lambdas com Query nos índices secundários,
+em vez de Scan com FilterExpression, para que o custo acompanhe o volume
+consultado e não o tamanho da tabela:
+
+- nicho-data-index: notícias de um nicho por data de inserção
+- status-insercao-index: fila de publicação (status_publicacao = "pendente")
+- status-publicacao-index: notícias publicadas por data de publicação
+- nicho-publicacao-index: notícias publicadas de um nicho por data de publicação
+
+status_publicacao só existe em notícias aprovadas e ainda não descartadas,
+e publicado_em só nas publicadas, então os três últimos índices são esparsos.
+"""
+
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+INDICE_NICHO_DATA = "nicho-data-index"
+INDICE_STATUS_INSERCAO = "status-insercao-index"
+INDICE_STATUS_PUBLICACAO = "status-publicacao-index"
+INDICE_NICHO_PUBLICACAO = "nicho-publicacao-index"
+
+# Atributos devolvidos pela API de leitura (projetados nos índices de publicadas)
+CAMPOS_API = ("id", "titulo", "link", "resumo", "nicho", "fonte", "idioma", "publicado_em", "wp_post_url")
+
+STATUS_PENDENTE = "pendente"
+STATUS_PUBLICADA = "publicada"
+
+# Máximo de ações por TransactWriteItems
+TRANSACAO_MAX_ITENS = 100
+
+# As atualizações de status não recriam notícias apagadas pela limpeza
+CONDICAO_EXISTE = 'attribute_exists(id)'
+
+
+def query_paginated(table, max_items: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+    """
+    Executa uma Query seguindo LastEvaluatedKey até o fim
+
+    Args:
+        table: Tabela do DynamoDB
+        max_items: Para depois de devolver este número de itens (opcional)
+        **kwargs: Parâmetros repassados para table.query
+
+    Yields:
+        Itens encontrados, página a página
+    """
+    returned = 0
+    while True:
+        response = table.query(**kwargs)
+        for item in response.get('Items', []):
+            yield item
+            returned += 1
+            if max_items is not None and returned >= max_items:
+                return
+
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def buscar_por_nicho(table, nicho: str, desde: Optional[int] = None, ate: Optional[int] = None,
+                     projection: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Busca as notícias de um nicho numa faixa de data_insercao
+
+    Args:
+        table: Tabela do DynamoDB
+        nicho: Nicho das notícias
+        desde: data_insercao mínima, inclusive (opcional)
+        ate: data_insercao máxima, exclusiva (opcional)
+        projection: ProjectionExpression (opcional)
+
+    Returns:
+        Lista de itens do nicho
+    """
+    from boto3.dynamodb.conditions import Key
+
+    condition = Key('nicho').eq(nicho)
+    if desde is not None and ate is not None:
+        condition = condition & Key('data_insercao').between(desde, ate - 1)
+    elif desde is not None:
+        condition = condition & Key('data_insercao').gte(desde)
+    elif ate is not None:
+        condition = condition & Key('data_insercao').lt(ate)
+
+    kwargs = {'IndexName': INDICE_NICHO_DATA, 'KeyConditionExpression': condition}
+    if projection:
+        kwargs['ProjectionExpression'] = projection
+
+    return list(query_paginated(table, **kwargs))
+
+
+def buscar_pendentes_publicacao(table, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Busca as notícias aprovadas e ainda não publicadas, mais recentes primeiro
+
+    Args:
+        table: Tabela do DynamoDB
+        limit: Número máximo de notícias
+
+    Returns:
+        Lista de notícias pendentes, completas (o índice projeta todos os
+        atributos, e o publicador precisa do texto da notícia)
+    """
+    from boto3.dynamodb.conditions import Key
+
+    return list(query_paginated(
+        table,
+        max_items=limit,
+        IndexName=INDICE_STATUS_INSERCAO,
+        KeyConditionExpression=Key('status_publicacao').eq(STATUS_PENDENTE),
+        ScanIndexForward=False,
+        Limit=limit
+    ))
+
+
+def buscar_publicadas(table, desde: int, projection: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Busca as notícias publicadas a partir de uma data
+
+    Args:
+        table: Tabela do DynamoDB
+        desde: Timestamp mínimo de publicado_em
+        projection: ProjectionExpression (opcional)
+
+    Returns:
+        Lista de notícias publicadas
+    """
+    from boto3.dynamodb.conditions import Key
+
+    kwargs = {
+        'IndexName': INDICE_STATUS_PUBLICACAO,
+        'KeyConditionExpression': (
+            Key('status_publicacao').eq(STATUS_PUBLICADA) & Key('publicado_em').gte(desde)
+        )
+    }
+    if projection:
+        kwargs['ProjectionExpression'] = projection
+
+    return list(query_paginated(table, **kwargs))
+
+
+def buscar_pagina_publicadas(table, nicho: Optional[str] = None, limit: int = 20,
+                             start_key: Optional[Dict[str, Any]] = None,
+                             campos: Tuple[str, ...] = CAMPOS_API
+                             ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Busca uma página de notícias publicadas, mais recentes primeiro
+
+    Faz uma única Query (sem FilterExpression), então o custo de cada página
+    depende só de `limit`, não do tamanho da tabela.
+
+    Args:
+        table: Tabela do DynamoDB
+        nicho: Nicho das notícias (opcional; todos os nichos por padrão)
+        limit: Tamanho da página
+        start_key: LastEvaluatedKey da página anterior (opcional)
+        campos: Atributos lidos (padrão: os CAMPOS_API)
+
+    Returns:
+        (itens da página com os `campos`, chave da próxima página ou None)
+    """
+    from boto3.dynamodb.conditions import Key
+
+    if nicho:
+        kwargs = {
+            'IndexName': INDICE_NICHO_PUBLICACAO,
+            'KeyConditionExpression': Key('nicho').eq(nicho)
+        }
+    else:
+        kwargs = {
+            'IndexName': INDICE_STATUS_PUBLICACAO,
+            'KeyConditionExpression': Key('status_publicacao').eq(STATUS_PUBLICADA)
+        }
+
+    names = {f"#c{i}": campo for i, campo in enumerate(campos)}
+    kwargs.update(
+        ProjectionExpression=", ".join(names),
+        ExpressionAttributeNames=names,
+        ScanIndexForward=False,
+        Limit=limit
+    )
+    if start_key:
+        kwargs['ExclusiveStartKey'] = start_key
+
+    response = table.query(**kwargs)
+    return response.get('Items', []), response.get('LastEvaluatedKey')
+
+
+def chave_publicada(noticia: Dict[str, Any], nicho: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Monta a LastEvaluatedKey que continua a listagem depois de uma notícia
+
+    Args:
+        noticia: Notícia com id, nicho e publicado_em
+        nicho: Nicho da listagem (None para a listagem de todos os nichos)
+
+    Returns:
+        Chave no formato do índice usado por buscar_pagina_publicadas
+    """
+    chave = {'id': noticia['id'], 'publicado_em': noticia['publicado_em']}
+    if nicho:
+        chave['nicho'] = noticia['nicho']
+    else:
+        chave['status_publicacao'] = STATUS_PUBLICADA
+    return chave
+
+
+def _atualizacao_publicada(post_id: Any, post_url: str, timestamp: int) -> Dict[str, Any]:
+    return {
+        'UpdateExpression': (
+            'SET publicado = :pub, wp_post_id = :pid, wp_post_url = :url, '
+            'data_publicacao = :data, publicado_em = :data, status_publicacao = :status'
+        ),
+        'ExpressionAttributeValues': {
+            ':pub': True,
+            ':pid': post_id,
+            ':url': post_url,
+            ':data': timestamp,
+            ':status': STATUS_PUBLICADA
+        }
+    }
+
+
+def _atualizacao_duplicada() -> Dict[str, Any]:
+    return {
+        'UpdateExpression': 'SET duplicada = :val REMOVE status_publicacao',
+        'ExpressionAttributeValues': {':val': True}
+    }
+
+
+def marcar_publicada(table, noticia_id: str, post_id: Any, post_url: str, timestamp: int) -> None:
+    """Marca a notícia como publicada e a move para o índice de publicadas"""
+    table.update_item(
+        Key={'id': noticia_id},
+        ConditionExpression=CONDICAO_EXISTE,
+        **_atualizacao_publicada(post_id, post_url, timestamp)
+    )
+
+
+def marcar_duplicada(table, noticia_id: str) -> None:
+    """Marca a notícia como duplicada e a retira da fila de publicação"""
+    table.update_item(
+        Key={'id': noticia_id},
+        ConditionExpression=CONDICAO_EXISTE,
+        **_atualizacao_duplicada()
+    )
+
+
+def aplicar_publicacao(noticia: Dict[str, Any], post_id: Any, post_url: str, timestamp: int) -> Dict[str, Any]:
+    """Retorna uma cópia da notícia com os campos gravados por marcar_publicada"""
+    return {
+        **noticia,
+        'publicado': True,
+        'wp_post_id': post_id,
+        'wp_post_url': post_url,
+        'data_publicacao': timestamp,
+        'publicado_em': timestamp,
+        'status_publicacao': STATUS_PUBLICADA
+    }
+
+
+def aplicar_duplicada(noticia: Dict[str, Any]) -> Dict[str, Any]:
+    """Retorna uma cópia da notícia com os campos gravados por marcar_duplicada"""
+    item = {**noticia, 'duplicada': True}
+    item.pop('status_publicacao', None)
+    return item
+
+
+def gravar_em_lote(table, itens: List[Dict[str, Any]]) -> bool:
+    """
+    Grava os novos status das notícias em transações (TransactWriteItems)
+
+    Cada notícia vira um Update só dos campos de status, os mesmos de
+    marcar_publicada ou marcar_duplicada, condicionado a attribute_exists(id).
+    Assim, uma notícia apagada pela limpeza entre a leitura e a gravação não é
+    recriada, e os demais atributos gravados por outro processo não são
+    sobrescritos. Uma notícia que não existe mais cancela a transação
+    inteira; o chamador então grava item a item.
+
+    Args:
+        table: Tabela do DynamoDB
+        itens: Notícias devolvidas por aplicar_publicacao ou aplicar_duplicada
+
+    Returns:
+        True se todos os itens foram gravados
+    """
+    client = table.meta.client
+    try:
+        for start in range(0, len(itens), TRANSACAO_MAX_ITENS):
+            client.transact_write_items(TransactItems=[
+                {'Update': {
+                    'TableName': table.name,
+                    'Key': {'id': item['id']},
+                    'ConditionExpression': CONDICAO_EXISTE,
+                    **(_atualizacao_duplicada() if item.get('duplicada') else _atualizacao_publicada(
+                        item['wp_post_id'], item['wp_post_url'], item['publicado_em']))
+                }}
+                for item in itens[start:start + TRANSACAO_MAX_ITENS]
+            ])
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao gravar notícias em lote: {e}")
+        return False
@@ -0,0 +1,441 @@
+"""
+Índices de quase-duplicatas: plágio local no coletor e títulos no publicador
+
+Substitui a varredura com SequenceMatcher sobre uma página arbitrária da
+tabela por um índice MinHash/LSH sobre shingles de palavras do título e do
+resumo. Uma busca só devolve as notícias que compartilham pelo menos uma
+banda LSH com o texto novo, e apenas esses candidatos passam pela
+comparação exata com SequenceMatcher. O limiar de similaridade continua,
+portanto, com o mesmo significado de antes.
+
+O índice cobre a janela inteira de cada nicho (7 dias) e é persistido na
+tabela djblog-dedup-index, dividido em partes comprimidas para respeitar o
+limite de 400 KB por item do DynamoDB.
+"""
+
+import base64
+import gzip
+import json
+import random
+import re
+import struct
+import time
+import zlib
+from array import array
+from collections import Counter
+from itertools import chain
+from difflib import SequenceMatcher
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+FIELDS = ("titulo", "resumo")
+
+# Janela de comparação, igual à da verificação de plágio original
+JANELA_DIAS = 7
+
+
+def shingles(text: str) -> Set[str]:
+    """
+    Quebra o texto em shingles de duas palavras
+
+    Args:
+        text: Texto de entrada
+
+    Returns:
+        Conjunto de bigramas de palavras (ou a palavra única, para textos curtos)
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+class NearDuplicateIndex:
+    """Índice MinHash/LSH em memória de títulos e resumos"""
+
+    def __init__(self, num_perm: int = 48, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm deve ser múltiplo de bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._buckets = {field: [{} for _ in range(bands)] for field in FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def signature(self, text: str) -> List[int]:
+        """Assinatura MinHash dos shingles do texto (vazia se não houver shingles)"""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles(text)]
+        if not hashes:
+            return []
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def band_keys(self, text: str) -> List[int]:
+        """Chaves LSH de cada banda da assinatura do texto"""
+        signature = self.signature(text)
+        if not signature:
+            return []
+        rows = self.rows
+        return [
+            zlib.crc32(struct.pack(f"<{rows}I", *signature[i * rows:(i + 1) * rows]))
+            for i in range(self.bands)
+        ]
+
+    def add(self, doc_id: str, titulo: str, resumo: str, timestamp: int,
+            band_keys: Optional[Dict[str, List[int]]] = None) -> None:
+        """
+        Adiciona (ou substitui) uma notícia no índice
+
+        Args:
+            doc_id: ID da notícia
+            titulo: Título da notícia
+            resumo: Resumo da notícia
+            timestamp: data_insercao da notícia
+            band_keys: Chaves LSH já calculadas, usadas ao restaurar um snapshot
+        """
+        if doc_id in self.docs:
+            self.remove(doc_id)
+
+        texts = {"titulo": titulo or "", "resumo": resumo or ""}
+        if band_keys is None:
+            band_keys = {field: self.band_keys(texts[field]) for field in FIELDS}
+
+        self.docs[doc_id] = {**texts, "ts": int(timestamp), "bands": band_keys}
+        for field in FIELDS:
+            for band, key in enumerate(band_keys[field]):
+                self._buckets[field][band].setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove uma notícia do índice"""
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for field in FIELDS:
+            for band, key in enumerate(doc["bands"][field]):
+                bucket = self._buckets[field][band].get(key)
+                if bucket is not None:
+                    bucket.discard(doc_id)
+                    if not bucket:
+                        del self._buckets[field][band][key]
+
+    def prune(self, cutoff_timestamp: int) -> int:
+        """
+        Remove as notícias inseridas antes do limite
+
+        Args:
+            cutoff_timestamp: Timestamp mínimo de data_insercao
+
+        Returns:
+            Número de notícias removidas
+        """
+        old = [doc_id for doc_id, doc in self.docs.items() if doc["ts"] < cutoff_timestamp]
+        for doc_id in old:
+            self.remove(doc_id)
+        return len(old)
+
+    def candidates(self, titulo: str, resumo: str) -> Set[str]:
+        """IDs das notícias que compartilham alguma banda LSH com o título ou o resumo"""
+        found: Set[str] = set()
+        for field, text in (("titulo", titulo), ("resumo", resumo)):
+            for band, key in enumerate(self.band_keys(text or "")):
+                found.update(self._buckets[field][band].get(key, ()))
+        return found
+
+    def find_duplicate(self, titulo: str, resumo: str,
+                       threshold: float = 0.8) -> Optional[Tuple[str, float, float]]:
+        """
+        Procura uma notícia quase idêntica no índice
+
+        Args:
+            titulo: Título da notícia
+            resumo: Resumo da notícia
+            threshold: Limiar de similaridade (0-1) do SequenceMatcher
+
+        Returns:
+            (id, similaridade do título, similaridade do resumo) da primeira
+            notícia acima do limiar, ou None
+        """
+        title_normalized = (titulo or "").lower().strip()
+        resumo_normalized = (resumo or "").lower().strip()
+
+        for doc_id in self.candidates(titulo, resumo):
+            doc = self.docs[doc_id]
+            sim_titulo = SequenceMatcher(None, doc["titulo"].lower().strip(), title_normalized).ratio()
+            sim_resumo = SequenceMatcher(None, doc["resumo"].lower().strip(), resumo_normalized).ratio()
+
+            if sim_titulo > threshold or sim_resumo > threshold:
+                return doc_id, sim_titulo, sim_resumo
+
+        return None
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]], **kwargs) -> "NearDuplicateIndex":
+        """
+        Monta o índice a partir de itens da tabela de notícias
+
+        Args:
+            items: Itens com id, titulo, resumo e data_insercao
+
+        Returns:
+            Índice preenchido
+        """
+        index = cls(**kwargs)
+        for item in items:
+            index.add(item["id"], item.get("titulo", ""), item.get("resumo", ""),
+                      int(item.get("data_insercao", 0)))
+        return index
+
+    def to_parts(self, docs_per_part: int = 400) -> List[bytes]:
+        """
+        Serializa o índice em partes comprimidas
+
+        Args:
+            docs_per_part: Número máximo de notícias por parte
+
+        Returns:
+            Lista de blobs gzip com JSON
+        """
+        entries = [
+            [doc_id, doc["ts"], doc["titulo"], doc["resumo"],
+             {field: _pack_keys(doc["bands"][field]) for field in FIELDS}]
+            for doc_id, doc in self.docs.items()
+        ]
+        header = {"num_perm": self.num_perm, "bands": self.bands, "seed": self.seed}
+        parts = []
+        for start in range(0, max(len(entries), 1), docs_per_part):
+            payload = {**header, "docs": entries[start:start + docs_per_part]}
+            parts.append(gzip.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8')))
+        return parts
+
+    @classmethod
+    def from_parts(cls, parts: Iterable[bytes]) -> "NearDuplicateIndex":
+        """Restaura o índice a partir das partes geradas por to_parts"""
+        index = None
+        for blob in parts:
+            payload = json.loads(gzip.decompress(blob).decode('utf-8'))
+            if index is None:
+                index = cls(num_perm=payload["num_perm"], bands=payload["bands"], seed=payload["seed"])
+            for doc_id, ts, titulo, resumo, packed in payload["docs"]:
+                index.add(doc_id, titulo, resumo, ts,
+                          band_keys={field: _unpack_keys(packed[field]) for field in FIELDS})
+        return index if index is not None else cls()
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Quebra o texto em trigramas de caracteres, com bordas marcadas por espaço
+
+    Args:
+        text: Texto já normalizado
+
+    Returns:
+        Conjunto de trigramas
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """
+    Índice invertido de trigramas de caracteres de títulos publicados
+
+    Usado pelo publicador para checar duplicidade de título sem comparar
+    com todos os títulos da janela. Um título só é comparado com
+    SequenceMatcher se compartilhar pelo menos `min_overlap` dos trigramas
+    do título buscado e se a diferença de tamanho permitir passar do limiar
+    (2 * menor / soma > threshold). Títulos com similaridade acima de 0.8
+    diferem em poucas palavras e compartilham a maior parte dos trigramas;
+    o recall em relação à comparação completa é medido em
+    scripts/benchmark_title_index.py.
+    """
+
+    def __init__(self, threshold: float = 0.8, min_overlap: float = 0.5):
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.titles: Dict[str, Tuple[str, int]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @staticmethod
+    def normalize(titulo: str) -> str:
+        return (titulo or "").lower().strip()
+
+    def add(self, doc_id: str, titulo: str, timestamp: int) -> None:
+        """
+        Adiciona (ou substitui) um título no índice
+
+        Args:
+            doc_id: ID da notícia
+            titulo: Título da notícia
+            timestamp: Data de publicação, usada por prune
+        """
+        if doc_id in self.titles:
+            self.remove(doc_id)
+
+        normalized = self.normalize(titulo)
+        grams = trigrams(normalized)
+        self.titles[doc_id] = (normalized, int(timestamp))
+        self._grams[doc_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Remove um título do índice"""
+        if self.titles.pop(doc_id, None) is None:
+            return
+        for gram in self._grams.pop(doc_id):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def prune(self, cutoff_timestamp: int) -> int:
+        """
+        Remove os títulos publicados antes do limite
+
+        Returns:
+            Número de títulos removidos
+        """
+        old = [doc_id for doc_id, (_, ts) in self.titles.items() if ts < cutoff_timestamp]
+        for doc_id in old:
+            self.remove(doc_id)
+        return len(old)
+
+    def candidates(self, titulo: str, exclude: Optional[str] = None) -> List[str]:
+        """IDs dos títulos que passam nos filtros de trigramas e tamanho, mais parecidos primeiro"""
+        normalized = self.normalize(titulo)
+        grams = trigrams(normalized)
+        # Contagem feita em C pelo Counter; é o passo dominante da busca
+        counts = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+        needed = self.min_overlap * len(grams)
+
+        found = []
+        for doc_id, shared in counts.items():
+            if shared < needed or doc_id == exclude:
+                continue
+            other = self.titles[doc_id][0]
+            if 2 * min(len(normalized), len(other)) <= self.threshold * (len(normalized) + len(other)):
+                continue
+            found.append((shared, doc_id))
+
+        return [doc_id for _, doc_id in sorted(found, reverse=True)]
+
+    def find_duplicate(self, titulo: str, exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Procura um título com similaridade acima do limiar
+
+        Args:
+            titulo: Título da notícia
+            exclude: ID ignorado na busca (a própria notícia)
+
+        Returns:
+            ID do título similar, ou None
+        """
+        normalized = self.normalize(titulo)
+        for doc_id in self.candidates(titulo, exclude):
+            if SequenceMatcher(None, normalized, self.titles[doc_id][0]).ratio() > self.threshold:
+                return doc_id
+        return None
+
+
+def _pack_keys(keys: List[int]) -> str:
+    return base64.b64encode(array('I', keys).tobytes()).decode('ascii')
+
+
+def _unpack_keys(data: str) -> List[int]:
+    keys = array('I')
+    keys.frombytes(base64.b64decode(data))
+    return keys.tolist()
+
+
+class DedupIndexStore:
+    """
+    Persiste um índice por nicho na tabela djblog-dedup-index
+
+    Chave: nicho (HASH) + parte (RANGE). Todas as partes de um snapshot levam
+    a mesma versão; partes de versões diferentes são descartadas na leitura.
+    """
+
+    def __init__(self, table, docs_per_part: int = 400):
+        self.table = table
+        self.docs_per_part = docs_per_part
+        self._part_counts: Dict[str, int] = {}
+
+    def load(self, nicho: str) -> Optional[NearDuplicateIndex]:
+        """Carrega o snapshot do nicho; retorna None se não houver ou estiver inconsistente"""
+        try:
+            from boto3.dynamodb.conditions import Key
+
+            items = []
+            kwargs = {'KeyConditionExpression': Key('nicho').eq(nicho)}
+            while True:
+                response = self.table.query(**kwargs)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    break
+                kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+            if not items:
+                return None
+
+            items.sort(key=lambda item: int(item['parte']))
+            self._part_counts[nicho] = len(items)
+            versao = items[0].get('versao')
+            total = int(items[0].get('total_partes', len(items)))
+            if len(items) < total or any(item.get('versao') != versao for item in items[:total]):
+                logger.warning(f"Snapshot do índice de duplicatas inconsistente para {nicho}")
+                return None
+
+            blobs = [getattr(item['dados'], 'value', item['dados']) for item in items[:total]]
+            return NearDuplicateIndex.from_parts(blobs)
+
+        except Exception as e:
+            logger.warning(f"Erro ao carregar índice de duplicatas de {nicho}: {e}")
+            return None
+
+    def save(self, nicho: str, index: NearDuplicateIndex) -> bool:
+        """Grava o snapshot do nicho, removendo partes antigas que sobrarem"""
+        try:
+            parts = index.to_parts(self.docs_per_part)
+            versao = int(time.time() * 1000)
+            for number, blob in enumerate(parts):
+                self.table.put_item(Item={
+                    'nicho': nicho,
+                    'parte': number,
+                    'versao': versao,
+                    'total_partes': len(parts),
+                    'dados': blob
+                })
+
+            for number in range(len(parts), self._part_counts.get(nicho, 0)):
+                self.table.delete_item(Key={'nicho': nicho, 'parte': number})
+            self._part_counts[nicho] = len(parts)
+            return True
+
+        except Exception as e:
+            logger.warning(f"Erro ao salvar índice de duplicatas de {nicho}: {e}")
+            return False
@@ -27,6 +27,14 @@ NOTICIAS_TABLE_SCHEMA = {
         {
             "AttributeName": "fonte",
             "AttributeType": "S"
+        },
+        {
+            "AttributeName": "status_publicacao",
+            "AttributeType": "S"
+        },
+        {
+            "AttributeName": "publicado_em",
+            "AttributeType": "N"
         }
     ],
     "GlobalSecondaryIndexes": [
@@ -69,6 +77,59 @@ NOTICIAS_TABLE_SCHEMA = {
                 "ReadCapacityUnits": 5,
                 "WriteCapacityUnits": 5
             }
+        },
+        {
+            # Esparso: só notícias aprovadas têm status_publicacao
+            "IndexName": "status-insercao-index",
+            "KeySchema": [
+                {
+                    "AttributeName": "status_publicacao",
+                    "KeyType": "HASH"
+                },
+                {
+                    "AttributeName": "data_insercao",
+                    "KeyType": "RANGE"
+                }
+            ],
+            "Projection": {
+                "ProjectionType": "ALL"
+            }
+        },
+        {
+            # Esparso: só notícias publicadas têm publicado_em
+            "IndexName": "status-publicacao-index",
+            "KeySchema": [
+                {
+                    "AttributeName": "status_publicacao",
+                    "KeyType": "HASH"
+                },
+                {
+                    "AttributeName": "publicado_em",
+                    "KeyType": "RANGE"
+                }
+            ],
+            "Projection": {
+                "ProjectionType": "INCLUDE",
+                "NonKeyAttributes": ["titulo", "nicho", "link", "resumo", "fonte", "idioma", "wp_post_url", "ttl"]
+            }
+        },
+        {
+            # Esparso: publicadas de um nicho, para a API de leitura paginada
+            "IndexName": "nicho-publicacao-index",
+            "KeySchema": [
+                {
+                    "AttributeName": "nicho",
+                    "KeyType": "HASH"
+                },
+                {
+                    "AttributeName": "publicado_em",
+                    "KeyType": "RANGE"
+                }
+            ],
+            "Projection": {
+                "ProjectionType": "INCLUDE",
+                "NonKeyAttributes": ["titulo", "link", "resumo", "fonte", "idioma", "wp_post_url", "ttl"]
+            }
         }
     ],
     "BillingMode": "PAY_PER_REQUEST"  # On-demand pricing
@@ -162,6 +223,99 @@ FONTES_TABLE_SCHEMA = {
     "BillingMode": "PAY_PER_REQUEST"
 }
 
+# Tabela de estado dos feeds (ETag, Last-Modified e últimas entradas vistas)
+FEED_STATE_TABLE_SCHEMA = {
+    "TableName": "djblog-feed-state",
+    "KeySchema": [
+        {
+            "AttributeName": "url",
+            "KeyType": "HASH"
+        }
+    ],
+    "AttributeDefinitions": [
+        {
+            "AttributeName": "url",
+            "AttributeType": "S"
+        }
+    ],
+    "BillingMode": "PAY_PER_REQUEST"
+}
+
+# Tabela com os snapshots do índice de quase-duplicatas (um conjunto de partes por nicho)
+# e do filtro de hashes de conteúdo do coletor (chave reservada nicho = "#hashes")
+DEDUP_INDEX_TABLE_SCHEMA = {
+    "TableName": "djblog-dedup-index",
+    "KeySchema": [
+        {
+            "AttributeName": "nicho",
+            "KeyType": "HASH"
+        },
+        {
+            "AttributeName": "parte",
+            "KeyType": "RANGE"
+        }
+    ],
+    "AttributeDefinitions": [
+        {
+            "AttributeName": "nicho",
+            "AttributeType": "S"
+        },
+        {
+            "AttributeName": "parte",
+            "AttributeType": "N"
+        }
+    ],
+    "BillingMode": "PAY_PER_REQUEST"
+}
+
+# Tabela do modelo de leitura da API: um documento versionado com as últimas
+# notícias publicadas por nicho (chave reservada nicho = "#todos" para todos)
+READ_MODEL_TABLE_SCHEMA = {
+    "TableName": "djblog-read-model",
+    "KeySchema": [
+        {
+            "AttributeName": "nicho",
+            "KeyType": "HASH"
+        }
+    ],
+    "AttributeDefinitions": [
+        {
+            "AttributeName": "nicho",
+            "AttributeType": "S"
+        }
+    ],
+    "BillingMode": "PAY_PER_REQUEST"
+}
+
+# Tabela do cache de resumos e traduções da IA, endereçada pelo conteúdo
+# (chave = operação#modelo#idioma#sha256 do texto), com expiração por TTL
+SUMMARY_CACHE_TABLE_SCHEMA = {
+    "TableName": "djblog-summary-cache",
+    "KeySchema": [
+        {
+            "AttributeName": "chave",
+            "KeyType": "HASH"
+        }
+    ],
+    "AttributeDefinitions": [
+        {
+            "AttributeName": "chave",
+            "AttributeType": "S"
+        }
+    ],
+    "BillingMode": "PAY_PER_REQUEST"
+}
+
+
+TTL_ATTRIBUTE = "ttl"
+
+# Tabelas cujos itens expiram pelo TTL do DynamoDB
+TABLES_WITH_TTL = [
+    NOTICIAS_TABLE_SCHEMA["TableName"],
+    NOTICIAS_RESUMIDAS_TABLE_SCHEMA["TableName"],
+    SUMMARY_CACHE_TABLE_SCHEMA["TableName"]
+]
+
 
 def create_tables_if_not_exist():
     """Cria as tabelas DynamoDB se elas não existirem"""
@@ -173,7 +327,11 @@ def create_tables_if_not_exist():
     tables_to_create = [
         NOTICIAS_TABLE_SCHEMA,
         NOTICIAS_RESUMIDAS_TABLE_SCHEMA,
-        FONTES_TABLE_SCHEMA
+        FONTES_TABLE_SCHEMA,
+        FEED_STATE_TABLE_SCHEMA,
+        DEDUP_INDEX_TABLE_SCHEMA,
+        READ_MODEL_TABLE_SCHEMA,
+        SUMMARY_CACHE_TABLE_SCHEMA
     ]
 
     for table_schema in tables_to_create:
@@ -185,11 +343,257 @@ def create_tables_if_not_exist():
             waiter = dynamodb.get_waiter('table_exists')
             waiter.wait(TableName=table_schema['TableName'])
 
+            if table_schema['TableName'] in TABLES_WITH_TTL:
+                habilitar_ttl(table_schema['TableName'])
+
         except ResourceExistsError:
             print(f"Tabela {table_schema['TableName']} já existe.")
         except Exception as e:
             print(f"Erro ao criar tabela {table_schema['TableName']}: {e}")
 
 
+def atributos_projetados(index_name: str, table_schema=NOTICIAS_TABLE_SCHEMA):
+    """
+    Retorna os atributos que um GSI do schema devolve numa Query
+
+    Args:
+        index_name: Nome do índice
+        table_schema: Schema da tabela
+
+    Returns:
+        Conjunto com as chaves da tabela e do índice e os NonKeyAttributes,
+        ou None se o índice projeta todos os atributos (ALL)
+    """
+    gsi = next(i for i in table_schema["GlobalSecondaryIndexes"] if i["IndexName"] == index_name)
+    projection = gsi["Projection"]
+    if projection["ProjectionType"] == "ALL":
+        return None
+    keys = {key["AttributeName"] for key in table_schema["KeySchema"] + gsi["KeySchema"]}
+    return keys | set(projection.get("NonKeyAttributes", []))
+
+
+def _mesma_projecao(atual: dict, esperada: dict) -> bool:
+    return (atual.get("ProjectionType") == esperada.get("ProjectionType")
+            and sorted(atual.get("NonKeyAttributes", [])) == sorted(esperada.get("NonKeyAttributes", [])))
+
+
+def _aguardar_indice(dynamodb, table_name: str, index_name: str, removido: bool = False) -> None:
+    import time
+
+    while True:
+        time.sleep(10)
+        indexes = dynamodb.describe_table(TableName=table_name)["Table"].get("GlobalSecondaryIndexes", [])
+        status = next((i["IndexStatus"] for i in indexes if i["IndexName"] == index_name), None)
+        if (status is None) if removido else (status == "ACTIVE"):
+            return
+
+
+def migrar_indices(table_schema=NOTICIAS_TABLE_SCHEMA, table_name: str = None):
+    """
+    Cria numa tabela existente os índices do schema que ainda não existem
+
+    O DynamoDB não altera a projeção de um GSI: um índice existente cuja
+    projeção difere da do schema é removido e criado de novo (as Querys nele
+    falham até o índice voltar a ficar ativo). Só há uma criação ou remoção
+    de GSI por UpdateTable, então os índices são tratados um de cada vez,
+    esperando cada operação terminar.
+
+    Args:
+        table_schema: Schema de referência
+        table_name: Nome real da tabela (padrão: o do schema)
+    """
+    import boto3
+
+    dynamodb = boto3.client('dynamodb')
+    table_name = table_name or table_schema["TableName"]
+
+    description = dynamodb.describe_table(TableName=table_name)["Table"]
+    existing = {gsi["IndexName"]: gsi for gsi in description.get("GlobalSecondaryIndexes", [])}
+    attribute_types = {
+        attr["AttributeName"]: attr for attr in table_schema["AttributeDefinitions"]
+    }
+
+    for gsi in table_schema.get("GlobalSecondaryIndexes", []):
+        atual = existing.get(gsi["IndexName"])
+        if atual is not None:
+            if _mesma_projecao(atual.get("Projection", {}), gsi["Projection"]):
+                continue
+            print(f"Removendo índice {gsi['IndexName']} em {table_name} (projeção mudou)...")
+            dynamodb.update_table(
+                TableName=table_name,
+                GlobalSecondaryIndexUpdates=[{"Delete": {"IndexName": gsi["IndexName"]}}]
+            )
+            _aguardar_indice(dynamodb, table_name, gsi["IndexName"], removido=True)
+
+        create = {key: value for key, value in gsi.items() if key != "ProvisionedThroughput"}
+        attributes = [attribute_types[key["AttributeName"]] for key in gsi["KeySchema"]]
+        print(f"Criando índice {gsi['IndexName']} em {table_name}...")
+        dynamodb.update_table(
+            TableName=table_name,
+            AttributeDefinitions=attributes,
+            GlobalSecondaryIndexUpdates=[{"Create": create}]
+        )
+        _aguardar_indice(dynamodb, table_name, gsi["IndexName"])
+        print(f"Índice {gsi['IndexName']} ativo.")
+
+
+def preencher_status_publicacao(table_name: str = None) -> int:
+    """
+    Preenche status_publicacao/publicado_em nas notícias gravadas antes dos
+    índices esparsos de publicação
+
+    Args:
+        table_name: Nome da tabela de notícias
+
+    Returns:
+        Número de notícias atualizadas
+    """
+    from decimal import Decimal
+    import boto3
+    from boto3.dynamodb.conditions import Attr
+
+    table = boto3.resource('dynamodb').Table(table_name or NOTICIAS_TABLE_SCHEMA["TableName"])
+    kwargs = {
+        'FilterExpression': Attr('aprovado').eq(True) & Attr('status_publicacao').not_exists(),
+        'ProjectionExpression': 'id, publicado, duplicada, data_publicacao, data_insercao'
+    }
+
+    updated = 0
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get('Items', []):
+            if item.get('duplicada'):
+                continue
+
+            if item.get('publicado'):
+                publicado_em = item.get('data_publicacao')
+                if not isinstance(publicado_em, (int, Decimal)):
+                    # Itens antigos guardam aqui o published_parsed do feed
+                    publicado_em = item.get('data_insercao', 0)
+                table.update_item(
+                    Key={'id': item['id']},
+                    UpdateExpression='SET status_publicacao = :s, publicado_em = :p',
+                    ExpressionAttributeValues={':s': 'publicada', ':p': publicado_em}
+                )
+            else:
+                table.update_item(
+                    Key={'id': item['id']},
+                    UpdateExpression='SET status_publicacao = :s',
+                    ExpressionAttributeValues={':s': 'pendente'}
+                )
+            updated += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f"{updated} notícias atualizadas com status_publicacao.")
+    return updated
+
+
+def habilitar_ttl(table_name: str = None):
+    """
+    Habilita o TTL do DynamoDB no atributo "ttl", se ainda não estiver ativo
+
+    Args:
+        table_name: Nome da tabela (padrão: tabela de notícias)
+    """
+    import boto3
+
+    dynamodb = boto3.client('dynamodb')
+    table_name = table_name or NOTICIAS_TABLE_SCHEMA["TableName"]
+
+    description = dynamodb.describe_time_to_live(TableName=table_name)["TimeToLiveDescription"]
+    if description.get("TimeToLiveStatus") in ("ENABLED", "ENABLING"):
+        print(f"TTL já habilitado em {table_name}.")
+        return
+
+    dynamodb.update_time_to_live(
+        TableName=table_name,
+        TimeToLiveSpecification={"Enabled": True, "AttributeName": TTL_ATTRIBUTE}
+    )
+    print(f"TTL habilitado em {table_name} ({TTL_ATTRIBUTE}).")
+
+
+def preencher_ttl(table_name: str = None, segmentos: int = 4, client=None) -> int:
+    """
+    Grava "ttl" nas notícias que foram salvas antes do coletor preenchê-lo
+
+    A tabela é lida em Scan paralelo (Segment/TotalSegments) e cada segmento
+    atualiza os próprios itens. A expiração segue a mesma regra do coletor:
+    data_insercao + dias de retenção do nicho. UpdateItem é usado porque o
+    BatchWriteItem só grava itens inteiros; a condição evita recriar itens
+    apagados durante o preenchimento e sobrescrever um "ttl" já gravado.
+
+    Args:
+        table_name: Nome da tabela de notícias
+        segmentos: Número de segmentos lidos em paralelo
+        client: Cliente DynamoDB (padrão: boto3.client('dynamodb'))
+
+    Returns:
+        Número de notícias atualizadas
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from config import get_config
+
+    if client is None:
+        import boto3
+        client = boto3.client('dynamodb')
+
+    config = get_config()
+    table_name = table_name or NOTICIAS_TABLE_SCHEMA["TableName"]
+    agora = int(time.time())
+
+    def preencher_segmento(segmento: int) -> int:
+        kwargs = {
+            'TableName': table_name,
+            'Segment': segmento,
+            'TotalSegments': segmentos,
+            'FilterExpression': 'attribute_not_exists(#ttl)',
+            'ProjectionExpression': 'id, nicho, data_insercao',
+            'ExpressionAttributeNames': {'#ttl': TTL_ATTRIBUTE}
+        }
+        updated = 0
+        while True:
+            response = client.scan(**kwargs)
+            for item in response.get('Items', []):
+                nicho = item.get('nicho', {}).get('S', 'geral')
+                data_insercao = int(item.get('data_insercao', {}).get('N', agora))
+                ttl = data_insercao + config.get_retention_days(nicho) * 86400
+                try:
+                    client.update_item(
+                        TableName=table_name,
+                        Key={'id': item['id']},
+                        UpdateExpression='SET #ttl = :ttl',
+                        ConditionExpression='attribute_exists(id) AND attribute_not_exists(#ttl)',
+                        ExpressionAttributeNames={'#ttl': TTL_ATTRIBUTE},
+                        ExpressionAttributeValues={':ttl': {'N': str(ttl)}}
+                    )
+                    updated += 1
+                except client.exceptions.ConditionalCheckFailedException:
+                    pass
+
+            if 'LastEvaluatedKey' not in response:
+                return updated
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    with ThreadPoolExecutor(max_workers=segmentos) as executor:
+        updated = sum(executor.map(preencher_segmento, range(segmentos)))
+
+    print(f"{updated} notícias atualizadas com {TTL_ATTRIBUTE}.")
+    return updated
+
+
 if __name__ == "__main__":
-    create_tables_if_not_exist()
+    import sys
+
+    if "--migrar" in sys.argv:
+        migrar_indices()
+        preencher_status_publicacao()
+    elif "--ttl" in sys.argv:
+        for ttl_table in TABLES_WITH_TTL:
+            habilitar_ttl(ttl_table)
+        preencher_ttl()
+    else:
+        create_tables_if_not_exist()
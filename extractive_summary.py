@@ -0,0 +1,193 @@
+"""
+Resumo extrativo local (português e inglês)
+
+Escolhe as frases do próprio texto em vez de cortar as primeiras palavras.
+Cada frase recebe uma nota que combina:
+- centralidade: similaridade de cosseno entre o vetor TF-IDF da frase e o
+  do texto inteiro (as frases são os "documentos" do IDF)
+- posição: notícias concentram o essencial no início (lead)
+
+As frases com maior nota entram até max_frases e max_chars, na ordem em que
+aparecem no texto, pulando as quase repetidas. Usa só a biblioteca padrão e
+leva cerca de 1 ms num texto de 1.200 caracteres; a OpenAI (summarize_ai)
+fica para quando AI_SUMMARY=true.
+"""
+
+import html
+import math
+import re
+from collections import Counter
+from typing import Dict, List
+
+# Pesos da nota de cada frase
+PESO_CENTRALIDADE = 0.4
+PESO_POSICAO = 0.6
+
+# Frases com cosseno acima disso em relação a uma já escolhida são puladas
+LIMIAR_REDUNDANCIA = 0.8
+
+# Frases com menos palavras relevantes valem menos (legendas, créditos, "Leia mais")
+MIN_TOKENS = 4
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_SENTENCE_RE = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’»)\]]))\s+(?=[\"'“‘«(\[]?[A-ZÀ-Ý0-9])")
+_INICIAL_RE = re.compile(r"(?:^|\s)[A-Z]\.$")
+
+# Só abreviações que não são palavras comuns ("mar", "out" e "ago" ficam de fora)
+ABREVIACOES = frozenset({
+    "sr", "sra", "srs", "dr", "dra", "prof", "profa", "eng", "gen", "cel", "av", "etc",
+    "mr", "mrs", "ms", "st", "jr", "vs", "inc", "ltd", "co", "corp", "nº",
+    "e.g", "i.e", "u.s", "u.k", "p.ex"
+})
+
+STOPWORDS = frozenset("""
+a à às ao aos as o os um uma uns umas de da das do dos em na nas no nos num numa
+por pela pelas pelo pelos para pra com sem sob sobre entre até após desde contra
+e ou mas nem que se como quando onde porque pois porém também já ainda só mais
+menos muito muita muitos muitas pouco pouca outro outra outros outras mesmo mesma
+ele ela eles elas eu tu nós vós você vocês me te lhe lhes nos vos seu sua seus
+suas meu minha meus minhas nosso nossa este esta estes estas esse essa esses essas
+isto isso aquele aquela aquilo ser é são foi foram era eram será serão sido sendo
+estar está estão estava estavam esteve ter tem têm tinha tinham teve há havia
+fazer faz fez pode podem deve devem vai vão diz disse segundo cada todo toda
+todos todas qual quais quem cujo cuja não sim lá aqui aí então assim
+the an of to in on at by for with from into onto over under about after before
+and or but nor so yet if then than that this these those there here it its it's
+is are was were be been being am do does did done has have had having will would
+shall should can could may might must not no yes as such he she they them his her
+their our we you your i me my mine us who whom whose which what when where why how
+all any both each few more most other some own same too very just also only
+""".split())
+
+
+def limpar_texto(texto: str) -> str:
+    """Remove tags HTML, decodifica entidades e normaliza os espaços"""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", texto or ""))).strip()
+
+
+def dividir_frases(texto: str) -> List[str]:
+    """
+    Divide o texto em frases
+
+    Quebra após ., !, ? ou … seguidos de espaço e de letra maiúscula ou
+    dígito, sem quebrar depois de abreviações comuns (Sr., Dr., U.S., Inc.)
+    ou de iniciais (J. K. Rowling).
+
+    Args:
+        texto: Texto limpo
+
+    Returns:
+        Frases, na ordem do texto
+    """
+    frases: List[str] = []
+    for pedaco in _SENTENCE_RE.split(texto):
+        if frases:
+            anterior = frases[-1]
+            ultima = anterior.rsplit(" ", 1)[-1].rstrip(".").lower()
+            if anterior.endswith(".") and (ultima in ABREVIACOES or _INICIAL_RE.search(anterior)):
+                frases[-1] = f"{anterior} {pedaco}"
+                continue
+        frases.append(pedaco)
+    return [frase.strip() for frase in frases if frase.strip()]
+
+
+def tokenizar(frase: str) -> List[str]:
+    """Palavras relevantes da frase, em minúsculas e sem stopwords"""
+    return [token for token in _TOKEN_RE.findall(frase.lower())
+            if token not in STOPWORDS and (len(token) > 1 or token.isdigit())]
+
+
+def truncar(texto: str, max_chars: int) -> str:
+    """Corta o texto no último espaço antes de max_chars e acrescenta "..." """
+    if len(texto) <= max_chars:
+        return texto
+    corte = texto[:max_chars]
+    espaco = corte.rfind(" ")
+    if espaco > max_chars // 2:
+        corte = corte[:espaco]
+    return corte.rstrip(" ,;:-") + "..."
+
+
+def _cosseno(a: Dict[str, float], b: Dict[str, float], norma_a: float, norma_b: float) -> float:
+    if not norma_a or not norma_b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(peso * b.get(token, 0.0) for token, peso in a.items()) / (norma_a * norma_b)
+
+
+def pontuar_frases(frases: List[str]) -> List[float]:
+    """
+    Nota de cada frase (centralidade TF-IDF + posição)
+
+    Args:
+        frases: Frases do texto
+
+    Returns:
+        Notas entre 0 e 1, na ordem das frases
+    """
+    tokens = [tokenizar(frase) for frase in frases]
+    total = len(frases)
+    df = Counter(token for lista in tokens for token in set(lista))
+    idf = {token: math.log((1 + total) / (1 + freq)) + 1 for token, freq in df.items()}
+
+    vetores = [{token: freq * idf[token] for token, freq in Counter(lista).items()} for lista in tokens]
+    documento: Dict[str, float] = Counter()
+    for vetor in vetores:
+        documento.update(vetor)
+    norma_doc = math.sqrt(sum(peso * peso for peso in documento.values()))
+
+    notas = []
+    for posicao, (vetor, lista) in enumerate(zip(vetores, tokens)):
+        norma = math.sqrt(sum(peso * peso for peso in vetor.values()))
+        nota = (PESO_CENTRALIDADE * _cosseno(vetor, documento, norma, norma_doc)
+                + PESO_POSICAO / math.sqrt(posicao + 1))
+        if len(lista) < MIN_TOKENS:
+            nota *= 0.5
+        notas.append(nota)
+    return notas
+
+
+def resumir_extrativo(texto: str, max_frases: int = 3, max_chars: int = 400) -> str:
+    """
+    Resume o texto escolhendo as frases mais representativas
+
+    Args:
+        texto: Texto original (HTML é removido)
+        max_frases: Número máximo de frases no resumo
+        max_chars: Tamanho máximo do resumo
+
+    Returns:
+        Frases escolhidas na ordem original; se nem a melhor frase couber em
+        max_chars, ela é truncada com "..."
+    """
+    texto = limpar_texto(texto)
+    frases = dividir_frases(texto)
+    if len(texto) <= max_chars and len(frases) <= max_frases:
+        return texto
+    if len(frases) <= 1:
+        return truncar(texto, max_chars)
+
+    notas = pontuar_frases(frases)
+    vetores = [Counter(tokenizar(frase)) for frase in frases]
+    normas = [math.sqrt(sum(v * v for v in vetor.values())) for vetor in vetores]
+
+    escolhidas: List[int] = []
+    tamanho = 0
+    for i in sorted(range(len(frases)), key=lambda i: notas[i], reverse=True):
+        if len(escolhidas) >= max_frases:
+            break
+        extra = len(frases[i]) + (1 if escolhidas else 0)
+        if tamanho + extra > max_chars:
+            continue
+        if any(_cosseno(vetores[i], vetores[j], normas[i], normas[j]) > LIMIAR_REDUNDANCIA for j in escolhidas):
+            continue
+        escolhidas.append(i)
+        tamanho += extra
+
+    if not escolhidas:
+        melhor = max(range(len(frases)), key=lambda i: notas[i])
+        return truncar(frases[melhor], max_chars)
+    return " ".join(frases[i] for i in sorted(escolhidas))
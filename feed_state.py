@@ -0,0 +1,245 @@
+"""
+Estado persistente dos feeds RSS para requisições condicionais
+
+Guarda, por fonte, o ETag, o Last-Modified, os IDs das últimas entradas
+vistas, a marca d'água (a data de publicação mais recente já vista) e as
+contagens de idioma do perfil da fonte (language_detect). Com
+isso o coletor envia GETs condicionais, ignora respostas 304 e descarta as
+entradas antigas antes de qualquer trabalho por entrada, processando
+apenas o conteúdo novo desde a última execução.
+
+Há duas implementações de armazenamento com a mesma interface (get/save):
+- DynamoDBFeedStateStore: tabela djblog-feed-state, usada pelas Lambdas
+- LocalFeedStateStore: arquivo JSON, usado pelo sistema_local_completo.py
+"""
+
+import calendar
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+# Quantidade máxima de IDs de entradas guardados por fonte
+MAX_SEEN_IDS = 200
+
+# Datas de publicação além deste limite no futuro não movem a marca d'água
+# (um feed com data errada bloquearia as entradas seguintes)
+MAX_FUTURE_SKEW = 3600
+
+
+def entry_id(entry: Dict[str, Any]) -> str:
+    """
+    Retorna um identificador estável para uma entrada do feed
+
+    Args:
+        entry: Item do feed RSS
+
+    Returns:
+        GUID/ID da entrada, ou o link, ou o título como último recurso
+    """
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> Optional[int]:
+    """
+    Retorna a data de publicação (ou atualização) da entrada em epoch UTC
+
+    Args:
+        entry: Item do feed RSS
+
+    Returns:
+        Timestamp, ou None se o feed não informar a data
+    """
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else None
+
+
+@dataclass
+class FeedState:
+    """Estado de um feed entre execuções do coletor"""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    seen_ids: List[str] = field(default_factory=list)
+    newest_published: Optional[int] = None
+    updated_at: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_feed(cls, url: str, feed, previous: Optional["FeedState"] = None) -> "FeedState":
+        """
+        Cria o estado a partir de um feed recém-baixado
+
+        Args:
+            url: URL do feed
+            feed: Feed parseado pelo feedparser
+            previous: Estado anterior, cuja marca d'água nunca retrocede
+
+        Returns:
+            Novo estado com os validadores HTTP, os IDs das entradas atuais e
+            a data de publicação mais recente (que forget recua se alguma
+            entrada não for gravada)
+        """
+        headers = feed.get("headers") or {}
+        now = int(time.time())
+        published = [
+            ts for ts in (entry_timestamp(entry) for entry in feed.entries)
+            if ts is not None and ts <= now + MAX_FUTURE_SKEW
+        ]
+        if previous is not None and previous.newest_published is not None:
+            published.append(previous.newest_published)
+
+        return cls(
+            url=url,
+            etag=feed.get("etag") or headers.get("etag"),
+            last_modified=feed.get("modified") or headers.get("last-modified"),
+            seen_ids=[entry_id(entry) for entry in feed.entries][:MAX_SEEN_IDS],
+            newest_published=max(published) if published else None,
+            updated_at=now,
+            languages=dict(previous.languages) if previous is not None else {}
+        )
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "FeedState":
+        """Reconstrói o estado a partir de um registro armazenado"""
+        return cls(
+            url=item["url"],
+            etag=item.get("etag"),
+            last_modified=item.get("last_modified"),
+            seen_ids=list(item.get("seen_ids", [])),
+            newest_published=(
+                int(item["newest_published"]) if item.get("newest_published") is not None else None
+            ),
+            updated_at=int(item.get("updated_at", 0)),
+            languages={lang: int(count) for lang, count in (item.get("languages") or {}).items()}
+        )
+
+    def to_item(self) -> Dict[str, Any]:
+        """Converte o estado em registro, omitindo campos vazios"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+    def forget(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Tira do estado as entradas que não foram gravadas
+
+        Os GUIDs saem da lista de vistos, a marca d'água volta para a data
+        da mais antiga delas (from_feed a calcula sobre o feed inteiro) e os
+        validadores HTTP são descartados (um 304 esconderia as entradas),
+        para que a próxima execução baixe o feed inteiro e processe essas
+        entradas de novo. As entradas gravadas continuam filtradas pelo GUID.
+
+        Args:
+            entries: Entradas do feed que falharam (erro do DynamoDB, por exemplo)
+        """
+        if not entries:
+            return
+        ids = {entry_id(entry) for entry in entries}
+        self.seen_ids = [seen for seen in self.seen_ids if seen not in ids]
+        self.etag = None
+        self.last_modified = None
+
+        published = [ts for ts in map(entry_timestamp, entries) if ts is not None]
+        if published and self.newest_published is not None:
+            self.newest_published = min(self.newest_published, min(published))
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Cabeçalhos para um GET condicional"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def filter_new(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Filtra as entradas já vistas na execução anterior
+
+        Descarta as entradas com GUID já visto e as publicadas antes da marca
+        d'água. Entradas publicadas exatamente na marca passam se o GUID for
+        novo (duas notícias no mesmo segundo); entradas sem data dependem só
+        do GUID.
+
+        Args:
+            entries: Entradas do feed
+
+        Returns:
+            Apenas as entradas novas, na ordem original
+        """
+        seen = set(self.seen_ids)
+        mark = self.newest_published
+        new = []
+        for entry in entries:
+            if entry_id(entry) in seen:
+                continue
+            if mark is not None:
+                published = entry_timestamp(entry)
+                if published is not None and published < mark:
+                    continue
+            new.append(entry)
+        return new
+
+
+class DynamoDBFeedStateStore:
+    """Armazena o estado dos feeds numa tabela DynamoDB com chave 'url'"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def get(self, url: str) -> Optional[FeedState]:
+        """Busca o estado de um feed; retorna None se não houver ou em caso de erro"""
+        try:
+            response = self.table.get_item(Key={'url': url})
+            if 'Item' not in response:
+                return None
+            return FeedState.from_item(response['Item'])
+        except Exception as e:
+            logger.warning(f"Erro ao ler estado do feed {url}: {e}")
+            return None
+
+    def save(self, state: FeedState) -> bool:
+        """Grava o estado de um feed"""
+        try:
+            self.table.put_item(Item=state.to_item())
+            return True
+        except Exception as e:
+            logger.warning(f"Erro ao salvar estado do feed {state.url}: {e}")
+            return False
+
+
+class LocalFeedStateStore:
+    """Armazena o estado dos feeds num arquivo JSON local"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._states = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Erro ao carregar estado dos feeds: {e}")
+        return {}
+
+    def get(self, url: str) -> Optional[FeedState]:
+        """Busca o estado de um feed"""
+        item = self._states.get(url)
+        return FeedState.from_item(item) if item else None
+
+    def save(self, state: FeedState) -> bool:
+        """Grava o estado de um feed e persiste o arquivo"""
+        self._states[state.url] = state.to_item()
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            logger.warning(f"Erro ao salvar estado dos feeds: {e}")
+            return False
@@ -1,12 +1,248 @@
+"""
+API de leitura das notícias publicadas (GET /noticias)
+
+Parâmetros de query:
+- nicho: filtra por nicho (opcional)
+- limit: tamanho da página (padrão API_PAGE_SIZE, máximo API_MAX_PAGE_SIZE)
+- cursor: token devolvido em "proximo_cursor" pela página anterior
+
+A primeira página sai do modelo de leitura (read_model): um único item com
+as últimas READ_MODEL_SIZE notícias do nicho, mantido pelo publicador. As
+páginas seguintes, ou a primeira quando o documento ainda não existe, são
+uma única Query num índice esparso de notícias publicadas, então a latência
+não cresce com a tabela. As respostas levam ETag e
+Cache-Control, para que CDNs e navegadores possam guardá-las; um
+If-None-Match igual ao ETag atual devolve 304 sem corpo.
+
+Dentro do container, as páginas prontas ficam num TTLCache (utils) entre
+invocações "quentes": consultas repetidas não chegam ao DynamoDB. Uma
+página velha é recarregada antes de responder, e só é servida (STALE) se a
+recarga falhar, por até API_LOCAL_CACHE_STALE segundos; não há recarga em
+segundo plano porque a Lambda congela as threads assim que o handler
+retorna. O header X-Cache diz se a resposta veio do cache (HIT, STALE ou
+MISS) e X-Cache-Stats traz os contadores do container.
+"""
+
+import base64
+import binascii
+import hashlib
 import json
-from utils import buscar_noticias_resumidas
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
 
+from utils import setup_logging, get_dynamodb_table, TTLCache
+from config import get_config
+from data_access import buscar_pagina_publicadas, chave_publicada
+from read_model import ReadModelStore, READ_MODEL_ALL, para_api, vigentes
 
-def lambda_handler(event, context):
-    noticias = buscar_noticias_resumidas()
-    publicadas = [n for n in noticias if n.get('publicado')]
+logger = setup_logging()
+
+# Páginas prontas (corpo e ETag), mantidas entre invocações "quentes"
+_response_cache: Optional[TTLCache] = None
+
+
+def get_response_cache(config) -> Optional[TTLCache]:
+    """Retorna o cache de páginas do container (None se API_LOCAL_CACHE_SIZE=0)"""
+    global _response_cache
+    if _response_cache is None and config.news_api.local_cache_size > 0:
+        _response_cache = TTLCache(
+            max_entries=config.news_api.local_cache_size,
+            ttl=config.news_api.local_cache_ttl,
+            stale_ttl=config.news_api.local_cache_stale
+        )
+    return _response_cache
+
+
+def reset_response_cache() -> None:
+    """Descarta o cache de páginas (usado nos testes)"""
+    global _response_cache
+    _response_cache = None
+
+
+def _json_default(value: Any) -> Any:
+    """Converte os Decimal do DynamoDB para int ou float"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def encode_cursor(start_key: Dict[str, Any], nicho: Optional[str]) -> str:
+    """
+    Gera o token opaco da próxima página
+
+    Args:
+        start_key: LastEvaluatedKey da Query
+        nicho: Nicho consultado (o token só vale para o mesmo nicho)
+
+    Returns:
+        Token em base64 url-safe, sem padding
+    """
+    payload = json.dumps({"k": start_key, "n": nicho}, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, nicho: Optional[str]) -> Dict[str, Any]:
+    """
+    Lê o token de paginação
+
+    Args:
+        token: Token recebido no parâmetro cursor
+        nicho: Nicho da requisição atual
+
+    Returns:
+        ExclusiveStartKey para a Query
+
+    Raises:
+        ValueError: Se o token for inválido ou de outro nicho
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("cursor inválido") from None
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("k"), dict):
+        raise ValueError("cursor inválido")
+    if payload.get("n") != nicho:
+        raise ValueError("cursor pertence a outra consulta")
+    return payload["k"]
+
+
+def compute_etag(body: str) -> str:
+    """ETag forte derivado do corpo da resposta"""
+    return '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara o If-None-Match (lista de ETags, fracos ou não, ou *) com o ETag atual"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def _response(status_code: int, body: Optional[str], headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     return {
-        'statusCode': 200,
-        'headers': {'Content-Type': 'application/json'},
-        'body': json.dumps(publicadas)
+        'statusCode': status_code,
+        'headers': {'Content-Type': 'application/json', **(headers or {})},
+        'body': body or ''
+    }
+
+
+def _error(status_code: int, message: str) -> Dict[str, Any]:
+    return _response(status_code, json.dumps({'erro': message}, ensure_ascii=False),
+                     {'Cache-Control': 'no-store'})
+
+
+def _parse_limit(value: Optional[str], config) -> int:
+    """Tamanho da página pedido, limitado a API_MAX_PAGE_SIZE"""
+    if value in (None, ""):
+        return config.news_api.page_size
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError("limit deve ser um número inteiro") from None
+    if limit <= 0:
+        raise ValueError("limit deve ser maior que 0")
+    return min(limit, config.news_api.max_page_size)
+
+
+def read_model_page(nicho: Optional[str], limit: int, config):
+    """
+    Primeira página a partir do modelo de leitura
+
+    Args:
+        nicho: Nicho pedido (None para todos)
+        limit: Tamanho da página
+        config: Configuração
+
+    Returns:
+        (notícias, chave da próxima página ou None), ou None se a página for
+        maior que o documento, se o documento não existir ou se notícias
+        dele venceram e não dá para saber se há mais além delas
+    """
+    if limit > config.news_api.read_model_size:
+        return None
+
+    store = ReadModelStore(get_dynamodb_table(config.database.read_model_table_name))
+    documento = store.load(nicho or READ_MODEL_ALL)
+    if documento is None:
+        return None
+
+    # Notícias vencidas já foram (ou serão) apagadas pelo TTL e pela limpeza
+    noticias = vigentes(documento['noticias'])
+    if len(noticias) > limit:
+        mais = True
+    elif len(noticias) < len(documento['noticias']) and documento['mais']:
+        return None
+    else:
+        mais = documento['mais']
+    noticias = [para_api(noticia) for noticia in noticias[:limit]]
+    last_key = chave_publicada(noticias[-1], nicho) if mais and noticias else None
+    return noticias, last_key
+
+
+def render_page(nicho: Optional[str], limit: int, start_key: Optional[Dict[str, Any]], config) -> Tuple[str, str]:
+    """
+    Monta o corpo JSON e o ETag de uma página
+
+    Args:
+        nicho: Nicho pedido (None para todos)
+        limit: Tamanho da página
+        start_key: Chave de início vinda do cursor (None na primeira página)
+        config: Configuração
+
+    Returns:
+        (corpo, ETag)
+    """
+    page = read_model_page(nicho, limit, config) if start_key is None else None
+    noticias, last_key = page or buscar_pagina_publicadas(
+        get_dynamodb_table(), nicho=nicho, limit=limit, start_key=start_key
+    )
+    body = json.dumps({
+        'noticias': noticias,
+        'proximo_cursor': encode_cursor(last_key, nicho) if last_key else None
+    }, default=_json_default, ensure_ascii=False)
+    return body, compute_etag(body)
+
+
+def lambda_handler(event, context):
+    """Devolve uma página de notícias publicadas"""
+    event = event or {}
+    params = event.get('queryStringParameters') or {}
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    config = get_config()
+
+    nicho = (params.get('nicho') or '').strip().lower() or None
+    try:
+        limit = _parse_limit(params.get('limit'), config)
+        start_key = decode_cursor(params['cursor'], nicho) if params.get('cursor') else None
+    except ValueError as e:
+        return _error(400, str(e))
+
+    cache = get_response_cache(config)
+    try:
+        if cache is None:
+            (body, etag), cache_status = render_page(nicho, limit, start_key, config), TTLCache.MISS
+        else:
+            # Páginas seguintes só mudam quando notícias expiram: TTL maior
+            ttl = config.news_api.local_cache_cursor_ttl if start_key else config.news_api.local_cache_ttl
+            (body, etag), cache_status = cache.get(
+                (nicho, limit, params.get('cursor')),
+                lambda: render_page(nicho, limit, start_key, config),
+                ttl=ttl
+            )
+    except Exception as e:
+        logger.error(f"Erro ao buscar notícias publicadas: {e}")
+        return _error(500, "erro ao buscar notícias")
+
+    cache_headers = {
+        'ETag': etag,
+        'Cache-Control': f"public, max-age={config.news_api.cache_max_age}",
+        'X-Cache': cache_status
     }
+    if cache is not None:
+        cache_headers['X-Cache-Stats'] = ", ".join(f"{key}={value}" for key, value in cache.stats().items())
+    if etag_matches(headers.get('if-none-match'), cache_headers['ETag']):
+        return _response(304, None, cache_headers)
+    return _response(200, body, cache_headers)
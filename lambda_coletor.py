@@ -14,44 +14,96 @@ Como usar:
 4. Agende via EventBridge (CloudWatch Events) para rodar periodicamente
 """
 
-import feedparser
 from datetime import datetime, UTC
-import requests
+import importlib.util
+import random
+import threading
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 # Imports locais
 from utils import (
     setup_logging,
     buscar_fontes,
     checar_plagio_local,
+    buscar_noticias_recentes,
     get_dynamodb_table,
-    validar_url,
     sanitize_text,
     generate_content_hash,
-    rate_limit_delay,
-    retry_on_failure
+    get_rate_limiter,
+    get_http_client,
+    retry_on_failure,
+    wrap_datadog
 )
 from config import get_config
+from feed_state import FeedState, DynamoDBFeedStateStore
+from feed_stream import parse_response
+from dedup_index import NearDuplicateIndex, DedupIndexStore, JANELA_DIAS
+from content_filter import BloomFilter, ContentFilterStore
+from data_access import STATUS_PENDENTE, buscar_por_nicho
+from summarize_ai import get_summary_pipeline
+from extractive_summary import resumir_extrativo
+from language_detect import NgramLanguageDetector, SourceLanguageProfiler, langdetect_detect
+
+# Dependência opcional, importada só na primeira detecção: coletas sem
+# entradas novas (feeds 304 ou já vistos) não pagam a importação
+LANGDETECT_AVAILABLE = importlib.util.find_spec("langdetect") is not None
 
-# Imports opcionais
-try:
-    from datadog_lambda.wrapper import datadog_lambda_wrapper
-    DATADOG_AVAILABLE = True
-except ImportError:
-    DATADOG_AVAILABLE = False
+logger = setup_logging()
 
-    def datadog_lambda_wrapper(func):
-        return func
+BATCH_GET_SIZE = 100  # Limite do BatchGetItem
+BATCH_WRITE_SIZE = 25  # Limite do BatchWriteItem
+BATCH_MAX_RETRIES = 8
 
-try:
-    from langdetect import detect
-    LANGDETECT_AVAILABLE = True
-except ImportError:
-    LANGDETECT_AVAILABLE = False
+# Resultado da consulta ao filtro de hashes
+FILTRO_NOVA = "nova"  # negativo: verificar no DynamoDB
+FILTRO_CONHECIDA = "conhecida"  # positivo: descartar sem chamada
+FILTRO_CONFERIR = "conferir"  # positivo sorteado para medir falsos positivos
+
+# Filtro mantido entre invocações do mesmo container
+_content_filter: Optional[BloomFilter] = None
+
+
+def reset_content_filter_cache() -> None:
+    """Descarta o filtro de hashes em cache (usado nos testes)"""
+    global _content_filter
+    _content_filter = None
 
-logger = setup_logging()
+
+# Perfis de idioma das fontes, mantidos entre invocações do mesmo container
+_language_profiler: Optional[SourceLanguageProfiler] = None
+
+
+def get_language_profiler() -> Optional[SourceLanguageProfiler]:
+    """
+    Retorna o perfilador de idioma do container, configurado por config.collector
+
+    Returns:
+        SourceLanguageProfiler, ou None se o LANGUAGE_DETECTOR escolhido
+        (langdetect) não estiver instalado
+    """
+    global _language_profiler
+    if _language_profiler is None:
+        config = get_config().collector
+        if config.language_detector == "langdetect" and not LANGDETECT_AVAILABLE:
+            return None
+        verifier = NgramLanguageDetector()
+        _language_profiler = SourceLanguageProfiler(
+            langdetect_detect if config.language_detector == "langdetect" else verifier.detect,
+            verifier,
+            min_samples=config.language_min_samples,
+            dominance=config.language_dominance
+        )
+    return _language_profiler
+
+
+def reset_language_profiler() -> None:
+    """Descarta os perfis de idioma em cache (usado nos testes)"""
+    global _language_profiler
+    _language_profiler = None
 
 
 @dataclass
@@ -65,44 +117,362 @@ class CollectionStats:
 class NewsCollector:
     """Coletor de notícias otimizado para Lambda"""
 
-    def __init__(self):
+    def __init__(self, feed_state_store=None, dedup_store=None, rate_limiter=None, http_client=None,
+                 content_filter_store=None, summary_pipeline=None, language_profiler=None):
         self.start_time = time.time()
         self.total_saved = 0
         self.total_existing = 0
         self.total_errors = 0
+        self.total_not_modified = 0
+        self.total_skipped_entries = 0
+        self.fetch_latencies: Dict[str, float] = {}
+        self.feed_state_store = feed_state_store
+        self.feed_states: Dict[str, FeedState] = {}
+        self.pending_feed_states: Dict[str, FeedState] = {}
+        self.unsaved_entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.dedup_store = dedup_store
+        self.dedup_indexes: Dict[str, NearDuplicateIndex] = {}
+        self._lock = threading.Lock()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.http = http_client or get_http_client()
+        self._rate_limit_wait_start = self.rate_limiter.total_wait
+        self.content_filter_store = content_filter_store
+        self.content_filter: Optional[BloomFilter] = None
+        self.content_filter_check_rate = 0.0
+        self.content_filter_skipped = 0
+        self.content_filter_rebuilt = False
+        self.summary_pipeline = summary_pipeline
+        self.total_ai_summaries = 0
+        self.summary_cache_stats = None
+        self.language_profiler = language_profiler
+        self.dynamodb_calls: Dict[str, int] = {
+            "get_item": 0,
+            "put_item": 0,
+            "batch_get_item": 0,
+            "batch_write_item": 0
+        }
 
-    def validate_rss_feed(self, rss_url: str, source_name: str) -> bool:
+    def download_feed(self, rss_url: str, state: Optional[FeedState] = None):
         """
-        Valida se o feed RSS está acessível
+        Baixa o feed RSS com uma única requisição HTTP e faz o parse do conteúdo
+
+        Com FEED_PARSER=stream o corpo é lido aos pedaços pelo parser
+        incremental, que para de ler quando já há max_news_per_source
+        entradas novas; caso contrário o documento inteiro vai para o
+        feedparser.
 
         Args:
             rss_url: URL do feed RSS
+            state: Estado da coleta anterior, usado para o GET condicional
+
+        Returns:
+            Feed parseado, ou None se o servidor responder 304 (não modificado)
+
+        Raises:
+            ValueError: Se a URL for inválida ou o servidor responder com erro
+        """
+        parsed = urlparse(rss_url)
+        if not parsed.scheme or not parsed.netloc:
+            raise ValueError(f"URL inválida: {rss_url}")
+
+        config = get_config()
+        stream = config.collector.feed_parser == "stream"
+        headers = state.conditional_headers() if state else {}
+        self.rate_limiter.acquire(rss_url)
+        response = self.http.get(rss_url, headers=headers, stream=stream)
+        if response.status_code == 304 or response.status_code >= 400:
+            response.close()
+            if response.status_code == 304:
+                return None
+            raise ValueError(f"HTTP {response.status_code} ao baixar {rss_url}")
+
+        if stream:
+            accept = (lambda entry: bool(state.filter_new([entry]))) if state else None
+            return parse_response(response, limit=config.content.max_news_per_source, accept=accept)
+
+        import feedparser
+
+        # feedparser só reconhece os cabeçalhos em minúsculas
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        return feedparser.parse(response.content, response_headers=headers)
+
+    def validate_feed(self, feed, source_name: str) -> bool:
+        """
+        Valida um feed RSS já baixado, sem novas requisições
+
+        Args:
+            feed: Feed parseado
             source_name: Nome da fonte
 
         Returns:
             True se o feed está válido
         """
+        if getattr(feed, 'bozo', False):
+            logger.warning(f"Feed RSS com problemas para {source_name}: {feed.bozo_exception}")
+            return False
+
+        if not feed.entries:
+            logger.warning(f"Feed RSS vazio para {source_name}")
+            return False
+
+        return True
+
+    def get_dedup_index(self, nicho: str, table) -> NearDuplicateIndex:
+        """
+        Retorna o índice de quase-duplicatas do nicho
+
+        Carrega o snapshot persistido ou, na falta dele, monta o índice com as
+        notícias da janela de comparação. O índice fica em memória até o fim
+        da coleta.
+
+        Args:
+            nicho: Nicho das notícias
+            table: Tabela DynamoDB de notícias
+
+        Returns:
+            Índice do nicho
+        """
+        index = self.dedup_indexes.get(nicho)
+        if index is not None:
+            return index
+
+        index = self.dedup_store.load(nicho) if self.dedup_store is not None else None
+        if index is None:
+            logger.info(f"Montando índice de duplicatas do nicho {nicho}")
+            index = NearDuplicateIndex.from_items(buscar_noticias_recentes(table, nicho=nicho))
+
+        cutoff = int(datetime.now(UTC).timestamp()) - JANELA_DIAS * 86400
+        index.prune(cutoff)
+        self.dedup_indexes[nicho] = index
+        return index
+
+    def save_dedup_indexes(self) -> None:
+        """Persiste os índices de quase-duplicatas usados na coleta"""
+        if self.dedup_store is None:
+            return
+
+        for nicho, index in self.dedup_indexes.items():
+            self.dedup_store.save(nicho, index)
+
+    def load_content_filter(self, table) -> Optional[BloomFilter]:
+        """
+        Carrega o filtro de hashes de conteúdo já gravados
+
+        Reaproveita o filtro do container em invocações quentes; na partida a
+        frio, lê o snapshot persistido. O filtro é reconstruído a partir da
+        tabela quando não existe, quando fica mais velho que o intervalo de
+        reconstrução (um filtro de Bloom não remove as notícias expiradas)
+        ou quando passa da capacidade.
+
+        Args:
+            table: Tabela DynamoDB de notícias
+
+        Returns:
+            Filtro carregado, ou None se estiver desativado ou indisponível
+        """
+        global _content_filter
+
         try:
-            # Valida URL
-            if not validar_url(rss_url):
-                logger.warning(f"URL inválida para {source_name}: {rss_url}")
-                return False
+            config = get_config()
+            if not config.collector.content_filter:
+                return None
 
-            # Testa parse do feed
-            feed = feedparser.parse(rss_url)
-            if hasattr(feed, 'bozo') and feed.bozo:
-                logger.warning(f"Feed RSS com problemas para {source_name}: {feed.bozo_exception}")
-                return False
+            bloom = _content_filter
+            if bloom is None and self.content_filter_store is not None:
+                bloom = self.content_filter_store.load()
 
-            if not feed.entries:
-                logger.warning(f"Feed RSS vazio para {source_name}")
-                return False
+            if (bloom is None
+                    or bloom.needs_rebuild(config.collector.content_filter_rebuild_hours * 3600)
+                    or bloom.capacity != config.collector.content_filter_capacity
+                    or bloom.fp_rate != config.collector.content_filter_fp_rate):
+                bloom = self.rebuild_content_filter(table)
 
-            return True
+            _content_filter = bloom
+            self.content_filter = bloom
+            self.content_filter_check_rate = config.collector.content_filter_check_rate
+            return bloom
 
         except Exception as e:
-            logger.error(f"Erro ao validar RSS de {source_name}: {e}")
-            return False
+            logger.warning(f"Filtro de hashes indisponível, usando apenas o DynamoDB: {e}")
+            self.content_filter = None
+            return None
+
+    def rebuild_content_filter(self, table) -> BloomFilter:
+        """
+        Monta um filtro novo com os IDs das notícias de todos os nichos
+
+        Args:
+            table: Tabela DynamoDB de notícias
+
+        Returns:
+            Filtro preenchido
+        """
+        config = get_config()
+        bloom = BloomFilter(config.collector.content_filter_capacity, config.collector.content_filter_fp_rate)
+        for nicho in config.content.nichos + ["geral"]:
+            bloom.update(item["id"] for item in buscar_por_nicho(table, nicho, projection='id'))
+
+        self.content_filter_rebuilt = True
+        logger.info(f"Filtro de hashes reconstruído com {len(bloom)} notícias")
+        return bloom
+
+    def save_content_filter(self) -> None:
+        """Persiste o filtro de hashes usado na coleta"""
+        if self.content_filter is not None and self.content_filter_store is not None:
+            self.content_filter_store.save(self.content_filter)
+
+    def check_content_filter(self, content_id: str) -> str:
+        """
+        Consulta o filtro de hashes antes de ir ao DynamoDB
+
+        Args:
+            content_id: ID (hash de conteúdo) da notícia
+
+        Returns:
+            FILTRO_NOVA, FILTRO_CONHECIDA ou FILTRO_CONFERIR
+        """
+        if self.content_filter is None or content_id not in self.content_filter:
+            return FILTRO_NOVA
+        if random.random() < self.content_filter_check_rate:
+            return FILTRO_CONFERIR
+        self.content_filter_skipped += 1
+        return FILTRO_CONHECIDA
+
+    def record_content_filter(self, content_id: str, status: str, exists: bool) -> None:
+        """
+        Atualiza o filtro com o resultado da verificação no DynamoDB
+
+        Args:
+            content_id: ID da notícia verificada
+            status: Resultado de check_content_filter
+            exists: Se a notícia já estava na tabela
+        """
+        if self.content_filter is None:
+            return
+        if status == FILTRO_CONFERIR:
+            self.content_filter.record_check(false_positive=not exists)
+        if exists:
+            self.content_filter.add(content_id)
+
+    def prepare_entry(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extrai e normaliza os campos de uma entrada do feed
+
+        Args:
+            entry: Item do feed RSS
+
+        Returns:
+            Dicionário com id, título, link, descrição e resumo, ou None se
+            faltarem dados obrigatórios
+        """
+        title = sanitize_text(entry.get("title", "(Sem título)"))
+        link = entry.get("link", "")
+        description = sanitize_text(entry.get("summary", ""))
+
+        # Valida dados obrigatórios
+        if not title or not link:
+            logger.warning(f"Dados insuficientes: título='{title}', link='{link}'")
+            return None
+
+        # Gera resumo se necessário
+        config = get_config()
+        if len(description) > config.content.threshold_caracteres:
+            resumo = resumir_extrativo(description, config.summary.extractive_sentences,
+                                       config.summary.extractive_max_chars)
+            # O id segue derivado das primeiras 60 palavras, como antes do
+            # resumo extrativo, para notícias já gravadas não voltarem como novas
+            resumo_id = " ".join(description.split()[:60]) + "..."
+        else:
+            resumo = resumo_id = description
+
+        return {
+            # ID único baseado no conteúdo
+            "id": generate_content_hash(title, resumo_id),
+            "titulo": title,
+            "link": link,
+            "descricao": description,
+            "resumo": resumo
+        }
+
+    def build_news_item(self, prepared: Dict[str, Any], entry: Dict[str, Any],
+                        source: Dict[str, Any], table) -> Dict[str, Any]:
+        """
+        Verifica plágio e idioma e monta o documento da notícia
+
+        Notícias aprovadas entram no índice de quase-duplicatas do nicho, para
+        que as próximas entradas da mesma coleta já sejam comparadas com elas.
+
+        Args:
+            prepared: Campos extraídos por prepare_entry
+            entry: Item do feed RSS
+            source: Informações da fonte
+            table: Tabela DynamoDB
+
+        Returns:
+            Documento da notícia, com o campo "aprovado"
+        """
+        title = prepared["titulo"]
+        resumo = prepared["resumo"]
+        description = prepared["descricao"]
+        nicho = source.get("nicho", "geral")
+
+        # Verifica plágio local
+        dedup_index = self.get_dedup_index(nicho, table)
+        is_plagio_local = checar_plagio_local(title, resumo, table, index=dedup_index)
+
+        # Verifica plágio Copyscape se configurado
+        plagio_copyscape = False
+        if (not is_plagio_local and
+            get_config().is_copyscape_configured() and
+                len(resumo) > get_config().content.threshold_caracteres):
+            try:
+                plagio_copyscape = self.check_copyscape_plagiarism(resumo)
+            except Exception as e:
+                logger.error(f"Erro ao verificar plágio Copyscape: {e}")
+                plagio_copyscape = False
+
+        # Determina se está aprovado
+        aprovado = not (is_plagio_local or plagio_copyscape)
+
+        # Detecta idioma se disponível, pelo perfil da fonte
+        language = "pt-BR"  # Default
+        profiler = self.get_language_profiler()
+        if profiler is not None and description:
+            try:
+                language = profiler.detect(source.get("url") or source["name"], description)
+            except Exception as e:
+                logger.debug(f"Erro ao detectar idioma: {e}")
+
+        # Cria documento da notícia, com expiração pelo TTL da tabela
+        data_insercao = int(datetime.now(UTC).timestamp())
+        noticia = {
+            "id": prepared["id"],
+            "titulo": title,
+            "link": prepared["link"],
+            "resumo": resumo,
+            "descricao_completa": description,
+            "fonte": source["name"],
+            "nicho": nicho,
+            "data_insercao": data_insercao,
+            "ttl": data_insercao + get_config().get_retention_days(nicho) * 86400,
+            "data_publicacao": entry.get("published_parsed"),
+            "aprovado": aprovado,
+            "plagio_local": is_plagio_local,
+            "plagio_copyscape": plagio_copyscape,
+            "idioma": language,
+            "publicado": False,
+            "duplicada": False,
+            "status_publicacao": STATUS_PENDENTE,
+            "metadata": {
+                "source_type": source.get("type", "rss"),
+                "source_url": source.get("url", ""),
+                "processing_time": time.time() - self.start_time
+            }
+        }
+
+        if aprovado:
+            dedup_index.add(noticia["id"], title, resumo, data_insercao)
+        return noticia
 
     def process_news_item(self, entry: Dict[str, Any], source: Dict[str, Any], table) -> bool:
         """
@@ -116,91 +486,39 @@ class NewsCollector:
         Returns:
             True se a notícia foi salva com sucesso
         """
+        noticia = None
         try:
-            # Extrai dados básicos
-            title = sanitize_text(entry.get("title", "(Sem título)"))
-            link = entry.get("link", "")
-            description = sanitize_text(entry.get("summary", ""))
-
-            # Valida dados obrigatórios
-            if not title or not link:
-                logger.warning(f"Dados insuficientes: título= ("
-                    '{title}', link='{link}'")"
-                )
+            prepared = self.prepare_entry(entry)
+            if prepared is None:
                 return False
 
-            # Gera resumo se necessário
-            if len(description) > get_config().content.threshold_caracteres:
-                resumo = " ".join(description.split()[:60]) + "..."
-            else:
-                resumo = description
-
-            # Gera ID único baseado no link
-            noticia_id = generate_content_hash(title, resumo)
+            # Descarta as notícias já conhecidas pelo filtro de hashes
+            filter_status = self.check_content_filter(prepared["id"])
+            if filter_status == FILTRO_CONHECIDA:
+                self.total_existing += 1
+                return False
 
             # Verifica se já existe no DynamoDB
             try:
-                response = table.get_item(Key={'id': noticia_id})
+                self.dynamodb_calls["get_item"] += 1
+                response = table.get_item(Key={'id': prepared["id"]})
+                self.record_content_filter(prepared["id"], filter_status, 'Item' in response)
                 if 'Item' in response:
                     self.total_existing += 1
                     return False
             except Exception as e:
                 logger.debug(f"Erro ao verificar existência: {e}")
 
-            # Verifica plágio local
-            is_plagio_local = checar_plagio_local(title, resumo, table)
-
-            # Verifica plágio Copyscape se configurado
-            plagio_copyscape = False
-            if (not is_plagio_local and
-                get_config().is_copyscape_configured() and
-                    len(resumo) > get_config().content.threshold_caracteres):
-                try:
-                    plagio_copyscape = self.check_copyscape_plagiarism(resumo)
-                except Exception as e:
-                    logger.error(f"Erro ao verificar plágio Copyscape: {e}")
-                    plagio_copyscape = False
-
-            # Determina se está aprovado
-            aprovado = not (is_plagio_local or plagio_copyscape)
-
-            # Detecta idioma se disponível
-            language = "pt-BR"  # Default
-            if LANGDETECT_AVAILABLE and description:
-                try:
-                    language = detect(description)
-                except Exception as e:
-                    logger.debug(f"Erro ao detectar idioma: {e}")
-
-            # Cria documento da notícia
-            noticia = {
-                "id": noticia_id,
-                "titulo": title,
-                "link": link,
-                "resumo": resumo,
-                "descricao_completa": description,
-                "fonte": source["name"],
-                "nicho": source.get("nicho", "geral"),
-                "data_insercao": int(datetime.now(UTC).timestamp()),
-                "data_publicacao": entry.get("published_parsed"),
-                "aprovado": aprovado,
-                "plagio_local": is_plagio_local,
-                "plagio_copyscape": plagio_copyscape,
-                "idioma": language,
-                "publicado": False,
-                "duplicada": False,
-                "metadata": {
-                    "source_type": source.get("type", "rss"),
-                    "source_url": source.get("url", ""),
-                    "processing_time": time.time() - self.start_time
-                }
-            }
+            noticia = self.build_news_item(prepared, entry, source, table)
 
             # Salva no DynamoDB
-            if aprovado:
+            if noticia["aprovado"]:
+                self.dynamodb_calls["put_item"] += 1
                 table.put_item(Item=noticia)
                 self.total_saved += 1
-                logger.info(f"Notícia salva: {title[:50]}...")
+                if self.content_filter is not None:
+                    self.content_filter.add(noticia["id"])
+                logger.info(f"Notícia salva: {noticia['titulo'][:50]}...")
                 return True
             else:
                 self.total_existing += 1
@@ -209,8 +527,229 @@ class NewsCollector:
         except Exception as e:
             logger.error(f"Erro ao processar notícia: {e}")
             self.total_errors += 1
+            # A notícia não foi gravada: sai do índice, ou a nova tentativa
+            # seria rejeitada como plágio dela mesma
+            if noticia is not None and noticia["aprovado"]:
+                self.dedup_indexes[noticia["nicho"]].remove(noticia["id"])
+            self.mark_unsaved(source, entry)
+            return False
+
+    def mark_unsaved(self, source: Dict[str, Any], entry: Dict[str, Any]) -> None:
+        """
+        Registra uma entrada que não foi gravada por erro
+
+        O estado do feed da fonte não dará a entrada como vista, e ela é
+        processada de novo na próxima execução.
+
+        Args:
+            source: Informações da fonte
+            entry: Item do feed RSS
+        """
+        if source.get("url"):
+            self.unsaved_entries.setdefault(source["url"], []).append(entry)
+
+    def batch_get_existing_ids(self, table, ids: List[str]) -> Tuple[set, set]:
+        """
+        Verifica quais IDs já existem na tabela com BatchGetItem
+
+        As chaves são consultadas em lotes de 100 (limite do BatchGetItem) e
+        as UnprocessedKeys são reenviadas com backoff exponencial.
+
+        Args:
+            table: Tabela DynamoDB
+            ids: IDs das notícias
+
+        Returns:
+            Tupla (IDs existentes, IDs que não puderam ser verificados)
+        """
+        client = table.meta.client
+        existing = set()
+        failed = set()
+
+        for start in range(0, len(ids), BATCH_GET_SIZE):
+            chunk = ids[start:start + BATCH_GET_SIZE]
+            request = {
+                table.name: {
+                    'Keys': [{'id': noticia_id} for noticia_id in chunk],
+                    'ProjectionExpression': 'id'
+                }
+            }
+            try:
+                for attempt in range(BATCH_MAX_RETRIES + 1):
+                    self.dynamodb_calls["batch_get_item"] += 1
+                    response = client.batch_get_item(RequestItems=request)
+                    for item in response.get('Responses', {}).get(table.name, []):
+                        existing.add(item['id'])
+
+                    request = response.get('UnprocessedKeys') or {}
+                    if not request:
+                        break
+                    time.sleep(min(0.05 * 2 ** attempt, 2.0))
+
+                if request:
+                    failed.update(key['id'] for key in request[table.name]['Keys'])
+            except Exception as e:
+                logger.error(f"Erro no BatchGetItem: {e}")
+                failed.update(chunk)
+
+        return existing, failed
+
+    def batch_write_news(self, table, noticias: List[Dict[str, Any]]) -> bool:
+        """
+        Grava as notícias com batch_writer (BatchWriteItem em lotes de 25)
+
+        Args:
+            table: Tabela DynamoDB
+            noticias: Documentos das notícias aprovadas
+
+        Returns:
+            True se todas as notícias foram gravadas
+        """
+        if not noticias:
+            return True
+
+        try:
+            # O batch_writer reenvia sozinho os itens não processados
+            with table.batch_writer() as batch:
+                for noticia in noticias:
+                    batch.put_item(Item=noticia)
+            self.dynamodb_calls["batch_write_item"] += -(-len(noticias) // BATCH_WRITE_SIZE)
+            return True
+        except Exception as e:
+            logger.error(f"Erro no BatchWriteItem: {e}")
             return False
 
+    def process_feeds_batch(self, fetched: List[Tuple[Dict[str, Any], Any]], table) -> None:
+        """
+        Processa as entradas de todos os feeds em lote
+
+        As entradas são normalizadas e têm o ID calculado primeiro; a
+        existência é verificada com BatchGetItem e as notícias novas e
+        aprovadas são gravadas juntas, trocando duas chamadas por entrada
+        por uma chamada a cada 100 verificações e 25 gravações. As entradas
+        já conhecidas pelo filtro de hashes nem chegam ao BatchGetItem.
+
+        Args:
+            fetched: Pares (fonte, feed) já baixados
+            table: Tabela DynamoDB
+        """
+        max_news = get_config().content.max_news_per_source
+        candidates = []
+        seen = set()
+        filter_statuses = {}
+
+        for source, feed in fetched:
+            for entry in feed.entries[:max_news]:
+                try:
+                    prepared = self.prepare_entry(entry)
+                except Exception as e:
+                    logger.error(f"Erro ao processar notícia: {e}")
+                    self.total_errors += 1
+                    self.mark_unsaved(source, entry)
+                    continue
+
+                if prepared is None:
+                    continue
+                if prepared["id"] in seen:
+                    # Mesma notícia publicada em mais de uma fonte
+                    self.total_existing += 1
+                    continue
+                seen.add(prepared["id"])
+
+                filter_statuses[prepared["id"]] = self.check_content_filter(prepared["id"])
+                if filter_statuses[prepared["id"]] == FILTRO_CONHECIDA:
+                    self.total_existing += 1
+                    continue
+                candidates.append((entry, source, prepared))
+
+        existing, failed = self.batch_get_existing_ids(table, [c[2]["id"] for c in candidates])
+        self.total_errors += len(failed)
+        for _, _, prepared in candidates:
+            if prepared["id"] not in failed:
+                self.record_content_filter(prepared["id"], filter_statuses[prepared["id"]],
+                                           prepared["id"] in existing)
+
+        noticias = []
+        origens = {}
+        for entry, source, prepared in candidates:
+            if prepared["id"] in failed:
+                self.mark_unsaved(source, entry)
+                continue
+            if prepared["id"] in existing:
+                self.total_existing += 1
+                continue
+
+            try:
+                noticia = self.build_news_item(prepared, entry, source, table)
+            except Exception as e:
+                logger.error(f"Erro ao processar notícia: {e}")
+                self.total_errors += 1
+                self.mark_unsaved(source, entry)
+                continue
+
+            if noticia["aprovado"]:
+                noticias.append(noticia)
+                origens[noticia["id"]] = (source, entry)
+            else:
+                self.total_existing += 1
+
+        self.summarize_news(noticias)
+
+        if self.batch_write_news(table, noticias):
+            self.total_saved += len(noticias)
+            if self.content_filter is not None:
+                self.content_filter.update(noticia["id"] for noticia in noticias)
+            logger.info(f"{len(noticias)} notícias salvas em lote")
+        else:
+            self.total_errors += len(noticias)
+            for noticia in noticias:
+                self.dedup_indexes[noticia["nicho"]].remove(noticia["id"])
+                self.mark_unsaved(*origens[noticia["id"]])
+
+    def summarize_news(self, noticias: List[Dict[str, Any]]) -> None:
+        """
+        Troca o resumo das notícias novas pelo resumo da IA, num único lote
+
+        Só roda com AI_SUMMARY=true e a OpenAI configurada. As notícias que
+        a IA não resumir mantêm o resumo extrativo de prepare_entry; o id não
+        muda, já que é calculado antes.
+
+        Args:
+            noticias: Notícias prontas para gravação
+        """
+        config = get_config()
+        if not noticias or not (config.summary.enabled and config.is_openai_configured()):
+            return
+
+        try:
+            pipeline = self.summary_pipeline or get_summary_pipeline()
+            resumos = pipeline.summarize({
+                noticia["id"]: noticia.get("descricao_completa") or noticia["resumo"] for noticia in noticias
+            })
+            self.summary_cache_stats = pipeline.cache.stats()
+        except Exception as e:
+            logger.error(f"Erro ao resumir notícias com IA: {e}")
+            return
+
+        for noticia in noticias:
+            if noticia["id"] in resumos:
+                noticia["resumo"] = resumos[noticia["id"]]
+                self.total_ai_summaries += 1
+
+    def get_language_profiler(self) -> Optional[SourceLanguageProfiler]:
+        """Perfilador de idioma injetado ou o do container"""
+        return self.language_profiler or get_language_profiler()
+
+    def content_filter_stats(self) -> Optional[Dict[str, Any]]:
+        """Estatísticas do filtro de hashes na coleta, ou None se desativado"""
+        if self.content_filter is None:
+            return None
+        return {
+            **self.content_filter.stats(),
+            "descartadas": self.content_filter_skipped,
+            "reconstruido": self.content_filter_rebuilt
+        }
+
     @retry_on_failure
     def check_copyscape_plagiarism(self, text: str) -> bool:
         """
@@ -230,78 +769,288 @@ class NewsCollector:
             "t": text[:10000]  # Limite da API
         }
 
-        response = requests.post(url, data=params, timeout=10)
+        self.rate_limiter.acquire(url)
+        response = self.http.post(url, data=params)
 
         if "<r>" in response.text and "<count>0</count>" in response.text:
             return False  # Não é plágio
         return True  # Possível plágio
 
-    def collect_from_source(self, source: Dict[str, Any], table) -> None:
+    def fetch_feed(self, source: Dict[str, Any]):
         """
-        Coleta notícias de uma fonte específica
+        Baixa, faz o parse e valida o feed RSS de uma fonte
 
         Args:
             source: Informações da fonte
-            table: Tabela DynamoDB
+
+        Returns:
+            Feed parseado ou None se o feed for inválido
         """
+        state = self.feed_states.get(source["url"])
         try:
-            if not source.get("url"):
-                logger.warning(f"Fonte sem URL RSS: {source['name']}")
-                return
+            feed = self.download_feed(source["url"], state)
+        except ValueError as e:
+            logger.warning(f"Feed inacessível para {source['name']}: {e}")
+            return None
+
+        if feed is None:
+            logger.info(f"Feed não modificado desde a última coleta: {source['name']}")
+            with self._lock:
+                self.total_not_modified += 1
+            return None
+
+        if not self.validate_feed(feed, source["name"]):
+            return None
+
+        if self.feed_state_store is not None:
+            self.pending_feed_states[source["url"]] = FeedState.from_feed(source["url"], feed, previous=state)
+
+        # Descarta as entradas já vistas ou anteriores à marca d'água antes de
+        # qualquer trabalho por entrada (sanitização, hash, DynamoDB, idioma)
+        if state is not None:
+            total = len(feed.entries)
+            feed["entries"] = state.filter_new(feed.entries)
+            with self._lock:
+                self.total_skipped_entries += total - len(feed.entries)
+
+        return feed
+
+    def load_feed_states(self, sources: List[Dict[str, Any]]) -> None:
+        """
+        Carrega o estado salvo dos feeds das fontes informadas
 
-            # Valida feed RSS
-            if not self.validate_rss_feed(source["url"], source["name"]):
-                return
+        Args:
+            sources: Lista de fontes com URL
+        """
+        if self.feed_state_store is None:
+            return
+
+        profiler = self.get_language_profiler()
+        for source in sources:
+            state = self.feed_state_store.get(source["url"])
+            if state is not None:
+                self.feed_states[source["url"]] = state
+                if profiler is not None:
+                    profiler.load(source["url"], state.languages)
+
+    def save_feed_state(self, source: Dict[str, Any]) -> None:
+        """
+        Grava o estado do feed de uma fonte depois que ele foi processado
+
+        As entradas que não foram gravadas (mark_unsaved) ficam fora do
+        estado, para serem processadas de novo na próxima execução.
+
+        Args:
+            source: Informações da fonte
+        """
+        state = self.pending_feed_states.pop(source["url"], None)
+        unsaved = self.unsaved_entries.pop(source["url"], [])
+        if state is not None and self.feed_state_store is not None:
+            if unsaved:
+                logger.warning(f"{len(unsaved)} entradas de {source['name']} não foram gravadas; "
+                               f"serão reprocessadas na próxima coleta")
+                state.forget(unsaved)
+            profiler = self.get_language_profiler()
+            if profiler is not None:
+                state.languages = profiler.counts(source["url"]) or state.languages
+            self.feed_state_store.save(state)
+
+    def fetch_all_feeds(self, sources: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Any]]:
+        """
+        Baixa os feeds de todas as fontes em paralelo
+
+        Usa um pool de threads limitado e um semáforo por host, para não abrir
+        conexões demais contra o mesmo servidor. A latência de cada fonte é
+        registrada em self.fetch_latencies pela URL do feed (fontes de nichos
+        diferentes podem ter o mesmo nome).
+
+        Args:
+            sources: Lista de fontes com URL
+
+        Returns:
+            Lista de (fonte, feed) na mesma ordem das fontes; feed é None em caso de falha
+        """
+        if not sources:
+            return []
+
+        collector_config = get_config().collector
+        host_limits = {}
+        for source in sources:
+            host = urlparse(source["url"]).netloc
+            if host not in host_limits:
+                host_limits[host] = threading.BoundedSemaphore(
+                    collector_config.max_connections_per_host
+                )
 
-            # Parse do feed
-            feed = feedparser.parse(source["url"])
+        def fetch(source: Dict[str, Any]) -> Tuple[Optional[Any], float, bool]:
+            with host_limits[urlparse(source["url"]).netloc]:
+                started = time.time()
+                try:
+                    return self.fetch_feed(source), time.time() - started, False
+                except Exception as e:
+                    logger.error(f"Erro ao baixar feed de {source['name']}: {e}")
+                    return None, time.time() - started, True
+
+        workers = min(collector_config.fetch_workers, len(sources))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, sources))
+
+        feeds = []
+        for source, (feed, latency, failed) in zip(sources, results):
+            self.fetch_latencies[source["url"]] = round(latency, 3)
+            if failed:
+                self.total_errors += 1
+            feeds.append((source, feed))
+
+        return feeds
 
-            # Processa itens do feed
+    def process_feed(self, source: Dict[str, Any], feed, table) -> None:
+        """
+        Processa as entradas de um feed já baixado
+
+        Args:
+            source: Informações da fonte
+            feed: Feed parseado
+            table: Tabela DynamoDB
+        """
+        processed = 0
+        try:
             processed_count = 0
             for entry in feed.entries[:get_config().content.max_news_per_source]:
                 if self.process_news_item(entry, source, table):
                     processed_count += 1
-
-                # Rate limiting
-                rate_limit_delay(0.5)
+                processed += 1
 
             logger.info(f"Processadas {processed_count} notícias de {source['name']}")
 
         except Exception as e:
             logger.error(f"Erro ao coletar de {source['name']}: {e}")
             self.total_errors += 1
+            for entry in feed.entries[processed:]:
+                self.mark_unsaved(source, entry)
+
+    def collect_from_source(self, source: Dict[str, Any], table) -> None:
+        """
+        Coleta notícias de uma fonte específica
+
+        Args:
+            source: Informações da fonte
+            table: Tabela DynamoDB
+        """
+        try:
+            if not source.get("url"):
+                logger.warning(f"Fonte sem URL RSS: {source['name']}")
+                return
+
+            self.load_feed_states([source])
+            feed = self.fetch_feed(source)
+            if feed is None:
+                return
+
+            self.process_feed(source, feed, table)
+            self.save_feed_state(source)
+
+        except Exception as e:
+            logger.error(f"Erro ao coletar de {source['name']}: {e}")
+            self.total_errors += 1
+
+    def gather_sources(self) -> List[Dict[str, Any]]:
+        """
+        Reúne as fontes com URL de todos os nichos configurados
+
+        Returns:
+            Lista de fontes, cada uma marcada com o seu nicho
+        """
+        sources = []
+        for nicho in get_config().content.nichos:
+            fontes = buscar_fontes(nicho=nicho)
+            if not fontes:
+                logger.warning(f"Nenhuma fonte encontrada para nicho: {nicho}")
+                continue
+
+            for fonte in fontes:
+                if not fonte.get("url"):
+                    logger.warning(f"Fonte sem URL RSS: {fonte['name']}")
+                    continue
+                sources.append({**fonte, "nicho": fonte.get("nicho", nicho)})
+
+        return sources
 
     def collect_all_news(self) -> Dict[str, Any]:
         """
         Coleta notícias de todas as fontes configuradas
 
+        Os feeds são baixados em paralelo e depois processados em sequência,
+        de forma que as escritas no DynamoDB e os contadores continuam num
+        único thread. No modo de escrita "batch" as entradas de todas as
+        fontes são verificadas e gravadas em lote; no modo "single", uma
+        chamada de leitura e uma de escrita por entrada.
+
         Returns:
             Dicionário com estatísticas da coleta
         """
         logger.info("Iniciando coleta de notícias")
 
         try:
+            config = get_config()
             table = get_dynamodb_table()
 
-            # Coleta por nicho
-            for nicho in get_config().content.nichos:
-                logger.info(f"Coletando notícias do nicho: {nicho}")
+            if self.feed_state_store is None and config.collector.conditional_get:
+                self.feed_state_store = DynamoDBFeedStateStore(
+                    get_dynamodb_table(config.database.feed_state_table_name)
+                )
 
-                fontes = buscar_fontes(nicho=nicho)
-                if not fontes:
-                    logger.warning(f"Nenhuma fonte encontrada para nicho: {nicho}")
-                    continue
+            if self.dedup_store is None:
+                self.dedup_store = DedupIndexStore(
+                    get_dynamodb_table(config.database.dedup_index_table_name)
+                )
+
+            if self.content_filter_store is None:
+                self.content_filter_store = ContentFilterStore(
+                    get_dynamodb_table(config.database.dedup_index_table_name)
+                )
+            self.load_content_filter(table)
+
+            sources = self.gather_sources()
+            self.load_feed_states(sources)
+            logger.info(f"Baixando {len(sources)} feeds em paralelo")
+
+            fetched = [
+                (source, feed) for source, feed in self.fetch_all_feeds(sources) if feed is not None
+            ]
+
+            if config.collector.write_mode == "batch":
+                self.process_feeds_batch(fetched, table)
+            else:
+                for source, feed in fetched:
+                    self.process_feed(source, feed, table)
+
+            for source, _ in fetched:
+                self.save_feed_state(source)
 
-                for fonte in fontes:
-                    self.collect_from_source(fonte, table)
+            self.save_dedup_indexes()
+            self.save_content_filter()
 
             # Estatísticas finais
             execution_time = time.time() - self.start_time
+            profiler = self.get_language_profiler()
+            language_stats = profiler.stats() if profiler is not None else None
             stats = {
                 "salvas": self.total_saved,
                 "existentes": self.total_existing,
                 "erros": self.total_errors,
+                "nao_modificados": self.total_not_modified,
+                "entradas_ignoradas": self.total_skipped_entries,
+                "resumos_ia": self.total_ai_summaries,
+                "cache_resumos": self.summary_cache_stats,
+                "idioma": language_stats,
+                "modo_escrita": config.collector.write_mode,
+                "chamadas_dynamodb": dict(self.dynamodb_calls),
+                "filtro_hashes": self.content_filter_stats(),
+                "espera_rate_limit": round(self.rate_limiter.total_wait - self._rate_limit_wait_start, 3),
                 "tempo_execucao": execution_time,
+                "latencia_fetch": self.fetch_latencies,
+                "http": self.http.host_stats(),
                 "timestamp": datetime.now(UTC).isoformat()
             }
 
@@ -353,6 +1102,5 @@ def lambda_handler(event, context):
         }
 
 
-# Wrapper Datadog se disponível
-if DATADOG_AVAILABLE:
-    lambda_handler = datadog_lambda_wrapper(lambda_handler)
+# Wrapper Datadog se disponível e configurado
+lambda_handler = wrap_datadog(lambda_handler)
@@ -1,51 +1,241 @@
 """
 Função AWS Lambda para limpeza automática de notícias antigas
-Remove notícias com mais de 7 dias do DynamoDB
+
+A expiração normal é feita pelo TTL do DynamoDB (atributo "ttl" gravado
+pelo coletor). Esta função é uma rede de segurança: remove o que o TTL
+ainda não apagou e as notícias antigas gravadas sem "ttl".
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, UTC
+from typing import Dict, Any, Iterator, List, Optional
+
 from utils import setup_logging, get_dynamodb_table
+from config import get_config
+from data_access import INDICE_NICHO_DATA
 
 logger = setup_logging()
 
+BATCH_SIZE = 25  # Limite do BatchWriteItem
+MAX_RETRIES = 8
 
-def lambda_handler(event, context):
-    """Remove notícias antigas do DynamoDB"""
-    try:
-        logger.info("Iniciando limpeza de notícias antigas")
 
-        table = get_dynamodb_table()
+class CleanupEngine:
+    """
+    Remove notícias antigas lendo em paralelo e apagando em lotes
+
+    Usa o cliente de baixo nível do boto3 (thread-safe, ao contrário do
+    resource) para que cada worker pagine e apague sem estado compartilhado.
+    Não serve o table.meta.client, que converte valores Python sozinho e
+    transformaria as chaves {'S': ...} em mapas. Há dois modos:
+
+    - modo "index": uma Query por nicho no nicho-data-index, com o limite
+      de retenção do nicho
+    - modo "scan": Scan paralelo com Segment/TotalSegments, que também
+      encontra notícias sem nicho; remove as com "ttl" vencido e, sem
+      "ttl", as anteriores ao limite padrão
 
-        # Data limite (7 dias atrás)
-        cutoff_date = datetime.now(UTC) - timedelta(days=7)
-        cutoff_timestamp = int(cutoff_date.timestamp())
+    As remoções usam BatchWriteItem com 25 chaves por chamada, reenviando
+    UnprocessedItems com backoff exponencial.
+    """
 
-        # Busca notícias antigas
-        from boto3.dynamodb.conditions import Attr
+    def __init__(self, table, cutoff_timestamp: int, mode: str = "index", segments: int = 4,
+                 niche_cutoffs: Optional[Dict[str, int]] = None, now_timestamp: Optional[int] = None,
+                 client=None):
+        self.client = client or get_config().get_dynamodb_client()
+        self.table_name = table.name
+        self.cutoff_timestamp = cutoff_timestamp
+        self.mode = mode
+        self.segments = segments
+        self.niche_cutoffs = niche_cutoffs or {}
+        self.now_timestamp = now_timestamp or int(time.time())
 
-        response = table.scan(
-            FilterExpression=Attr('data_insercao').lt(cutoff_timestamp),
-            ProjectionExpression='id'
+    def _paginate(self, operation, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Segue LastEvaluatedKey até a última página"""
+        while True:
+            response = operation(**kwargs)
+            yield response
+            if 'LastEvaluatedKey' not in response:
+                return
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _query_pages(self, nicho: str) -> Iterator[Dict[str, Any]]:
+        """Páginas das notícias antigas de um nicho"""
+        return self._paginate(
+            self.client.query,
+            TableName=self.table_name,
+            IndexName=INDICE_NICHO_DATA,
+            KeyConditionExpression='nicho = :nicho AND data_insercao < :cutoff',
+            ExpressionAttributeValues={
+                ':nicho': {'S': nicho},
+                ':cutoff': {'N': str(self.niche_cutoffs.get(nicho, self.cutoff_timestamp))}
+            },
+            ProjectionExpression='id',
+            ReturnConsumedCapacity='TOTAL'
         )
 
-        items_to_delete = response.get('Items', [])
-        deleted_count = 0
+    def _scan_pages(self, segment: int) -> Iterator[Dict[str, Any]]:
+        """Páginas das notícias antigas de um segmento da tabela"""
+        return self._paginate(
+            self.client.scan,
+            TableName=self.table_name,
+            Segment=segment,
+            TotalSegments=self.segments,
+            FilterExpression='#ttl < :agora OR (attribute_not_exists(#ttl) AND data_insercao < :cutoff)',
+            ExpressionAttributeNames={'#ttl': 'ttl'},
+            ExpressionAttributeValues={
+                ':agora': {'N': str(self.now_timestamp)},
+                ':cutoff': {'N': str(self.cutoff_timestamp)}
+            },
+            ProjectionExpression='id',
+            ReturnConsumedCapacity='TOTAL'
+        )
 
-        # Remove em lotes
-        for item in items_to_delete:
+    def _write_batch(self, keys: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+        """
+        Apaga até 25 chaves, reenviando os itens não processados
+
+        Args:
+            keys: Chaves no formato do cliente ({'id': {'S': ...}})
+            stats: Contadores do worker
+        """
+        request_items = {
+            self.table_name: [{'DeleteRequest': {'Key': key}} for key in keys]
+        }
+
+        for attempt in range(MAX_RETRIES + 1):
             try:
-                table.delete_item(Key={'id': item['id']})
-                deleted_count += 1
+                response = self.client.batch_write_item(
+                    RequestItems=request_items,
+                    ReturnConsumedCapacity='TOTAL'
+                )
             except Exception as e:
-                logger.error(f"Erro ao deletar item {item['id']}: {e}")
+                logger.error(f"Erro no BatchWriteItem: {e}")
+                stats['falhas'] += len(request_items[self.table_name])
+                return
+
+            for capacity in response.get('ConsumedCapacity', []):
+                stats['capacidade_escrita'] += capacity.get('CapacityUnits', 0)
+
+            unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            stats['removidas'] += len(request_items[self.table_name]) - len(unprocessed)
+            if not unprocessed:
+                return
+
+            stats['reenvios'] += 1
+            request_items = {self.table_name: unprocessed}
+            time.sleep(min(0.05 * 2 ** attempt, 2.0))
+
+        logger.error(f"{len(request_items[self.table_name])} itens não removidos após {MAX_RETRIES} reenvios")
+        stats['falhas'] += len(request_items[self.table_name])
+
+    def _drain(self, pages: Iterator[Dict[str, Any]]) -> Dict[str, Any]:
+        """Lê as páginas e apaga os itens à medida que os lotes enchem"""
+        stats = {
+            'examinadas': 0,
+            'removidas': 0,
+            'falhas': 0,
+            'reenvios': 0,
+            'capacidade_leitura': 0.0,
+            'capacidade_escrita': 0.0
+        }
+        batch = []
+        try:
+            for page in pages:
+                stats['examinadas'] += page.get('ScannedCount', 0)
+                stats['capacidade_leitura'] += page.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+                for item in page.get('Items', []):
+                    batch.append(item)
+                    if len(batch) == BATCH_SIZE:
+                        self._write_batch(batch, stats)
+                        batch = []
+        except Exception as e:
+            logger.error(f"Erro ao ler notícias antigas: {e}")
+            stats['falhas'] += 1
+
+        if batch:
+            self._write_batch(batch, stats)
+        return stats
 
-        logger.info(f"Limpeza concluída: {deleted_count} notícias removidas")
+    def run(self, nichos: List[str]) -> Dict[str, Any]:
+        """
+        Executa a limpeza
+
+        Args:
+            nichos: Nichos consultados no modo "index"
+
+        Returns:
+            Estatísticas agregadas, com vazão e capacidade consumida
+        """
+        start_time = time.time()
+
+        if self.mode == "scan":
+            sources = [self._scan_pages(segment) for segment in range(self.segments)]
+        else:
+            sources = [self._query_pages(nicho) for nicho in nichos]
+
+        totals = {
+            'modo': self.mode,
+            'examinadas': 0,
+            'removidas': 0,
+            'falhas': 0,
+            'reenvios': 0,
+            'capacidade_leitura': 0.0,
+            'capacidade_escrita': 0.0
+        }
+        if sources:
+            with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+                for stats in executor.map(self._drain, sources):
+                    for key, value in stats.items():
+                        totals[key] += value
+
+        elapsed = time.time() - start_time
+        totals['tempo_execucao'] = round(elapsed, 3)
+        totals['itens_por_segundo'] = round(totals['removidas'] / elapsed, 1) if elapsed > 0 else 0.0
+        return totals
+
+
+def lambda_handler(event, context):
+    """Remove notícias antigas do DynamoDB"""
+    try:
+        logger.info("Iniciando limpeza de notícias antigas")
+
+        config = get_config()
+        event = event or {}
+        table = get_dynamodb_table()
+
+        # Datas limite: padrão e por nicho (as mesmas usadas no "ttl" do coletor)
+        now = datetime.now(UTC)
+        nichos = config.content.nichos + ["geral"]
+        cutoff_timestamp = int((now - timedelta(days=config.cleanup.retention_days)).timestamp())
+        niche_cutoffs = {
+            nicho: int((now - timedelta(days=config.get_retention_days(nicho))).timestamp())
+            for nicho in nichos
+        }
+
+        engine = CleanupEngine(
+            table,
+            cutoff_timestamp,
+            mode=event.get('modo', config.cleanup.mode),
+            segments=int(event.get('segmentos', config.cleanup.scan_segments)),
+            niche_cutoffs=niche_cutoffs,
+            now_timestamp=int(now.timestamp())
+        )
+        stats = engine.run(nichos)
+
+        logger.info(
+            f"Limpeza concluída ({stats['modo']}): {stats['removidas']} notícias removidas, "
+            f"{stats['itens_por_segundo']} itens/s, "
+            f"{stats['capacidade_leitura']} RCU / {stats['capacidade_escrita']} WCU consumidas"
+        )
 
         return {
             'statusCode': 200,
             'body': {
                 'message': 'Limpeza executada com sucesso',
-                'deleted_count': deleted_count
+                'deleted_count': stats['removidas'],
+                'stats': stats
             }
         }
 
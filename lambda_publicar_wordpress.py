@@ -11,41 +11,125 @@ Como usar:
 2. Agende via EventBridge para rodar periodicamente
 """
 
-import requests
+import asyncio
+import random
 import time
 from datetime import datetime, UTC
-from typing import Dict, Any, List
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 
 from utils import (
     setup_logging,
     get_dynamodb_table,
     sanitize_text,
-    retry_on_failure
+    get_rate_limiter,
+    get_http_client,
+    retry_on_failure,
+    wrap_datadog
 )
 from config import get_config
+from dedup_index import TitleIndex
+from read_model import ReadModelStore
+from data_access import (
+    buscar_pendentes_publicacao,
+    buscar_publicadas,
+    marcar_publicada,
+    marcar_duplicada,
+    aplicar_publicacao,
+    aplicar_duplicada,
+    gravar_em_lote
+)
+
+logger = setup_logging()
 
-# Imports opcionais
-try:
-    from datadog_lambda.wrapper import datadog_lambda_wrapper
-    DATADOG_AVAILABLE = True
-except ImportError:
-    DATADOG_AVAILABLE = False
+# Janela, em dias, das publicações usadas na verificação de duplicidade
+JANELA_DUPLICATAS_DIAS = 30
 
-    def datadog_lambda_wrapper(func):
-        return func
+# Status HTTP do WordPress que indicam sobrecarga e pedem nova tentativa
+STATUS_THROTTLE = (429, 503)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
 
-logger = setup_logging()
+# Publicações relidas a cada atualização incremental do índice de títulos,
+# para cobrir gravações concorrentes de outros containers
+MARGEM_ATUALIZACAO = 3600
+
+# Índice de títulos publicados, mantido entre invocações "quentes"
+_title_index: TitleIndex = None
+_title_index_ate = 0
+
+
+def reset_title_index_cache() -> None:
+    """Descarta o índice de títulos em cache (usado nos testes)"""
+    global _title_index, _title_index_ate
+    _title_index = None
+    _title_index_ate = 0
+
+
+class AdaptiveConcurrency:
+    """
+    Limite de publicações simultâneas que se ajusta às respostas do WordPress
+
+    Aumento aditivo e redução multiplicativa (AIMD): cada 429/503 corta o
+    limite pela metade e pausa novas requisições pelo tempo de backoff; a
+    cada `limite` publicações bem-sucedidas o limite sobe 1, até o máximo
+    configurado. Usado só dentro do event loop, então não precisa de lock.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self.throttles = 0
+        self._successes = 0
+        self._pause_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+        delay = self._pause_until - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Registra uma publicação bem-sucedida (aumento aditivo)"""
+        self._successes += 1
+        if self.limit < self.max_concurrency and self._successes >= self.limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self, delay: float) -> None:
+        """Registra um 429/503 (redução multiplicativa e pausa)"""
+        self.throttles += 1
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+        resume_at = asyncio.get_running_loop().time() + delay
+        self._pause_until = max(self._pause_until, resume_at)
 
 
 class WordPressPublisher:
     """Publicador de notícias no WordPress"""
 
-    def __init__(self):
+    def __init__(self, rate_limiter=None, http_client=None, read_model_store=None):
         self.start_time = time.time()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.http = http_client or get_http_client()
+        self.read_model_store = read_model_store
+        self.publicadas: List[Dict[str, Any]] = []
+        self._rate_limit_wait_start = self.rate_limiter.total_wait
         self.published_count = 0
         self.skipped_count = 0
         self.error_count = 0
         self.duplicate_count = 0
+        self.throttle_count = 0
 
     def get_unpublished_news(self, table, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -56,69 +140,121 @@ class WordPressPublisher:
             limit: Número máximo de notícias
 
         Returns:
-            Lista de notícias para publicar
+            Lista de notícias para publicar, mais recentes primeiro
         """
         try:
-            from boto3.dynamodb.conditions import Attr
-
-            # Busca notícias aprovadas e não publicadas
-            response = table.scan(
-                FilterExpression=(
-                    Attr('aprovado').eq(True) & Attr('publicado').eq(False)
-                ),
-                Limit=limit
-            )
-
-            noticias = response.get('Items', [])
+            noticias = buscar_pendentes_publicacao(table, limit)
             logger.info(f"Encontradas {len(noticias)} notícias para publicar")
-
-            # Ordena por data de inserção (mais recentes primeiro)
-            noticias.sort(
-                key=lambda x: x.get('data_insercao', 0), 
-                reverse=True
-            )
-
             return noticias
 
         except Exception as e:
             logger.error(f"Erro ao buscar notícias: {e}")
             return []
 
-    def is_duplicate_content(self, noticia: Dict[str, Any], table) -> bool:
+    def is_duplicate_content(self, noticia: Dict[str, Any], table, index: Optional[TitleIndex] = None) -> bool:
         """
         Verifica se a notícia é duplicada com base no título
 
+        Compara com as notícias publicadas nos últimos JANELA_DUPLICATAS_DIAS dias.
+
         Args:
             noticia: Dados da notícia
             table: Tabela DynamoDB
+            index: Índice de títulos já carregado nesta execução (padrão:
+                load_title_index)
 
         Returns:
             True se for duplicada
         """
         try:
-            from boto3.dynamodb.conditions import Attr
-            from difflib import SequenceMatcher
+            if index is None:
+                index = self.load_title_index(table)
+            return index.find_duplicate(noticia['titulo'], exclude=noticia.get('id')) is not None
 
-            titulo_normalizado = noticia['titulo'].lower().strip()
+        except Exception as e:
+            logger.error(f"Erro ao verificar duplicidade: {e}")
+            return False
 
-            # Busca notícias publicadas com títulos similares
-            response = table.scan(
-                FilterExpression=Attr('publicado').eq(True),
-                ProjectionExpression='titulo'
-            )
+    def load_title_index(self, table) -> TitleIndex:
+        """
+        Retorna o índice de títulos publicados na janela de duplicidade
 
-            for item in response.get('Items', []):
-                titulo_existente = item.get('titulo', '').lower().strip()
-                similarity = SequenceMatcher(None, titulo_normalizado, titulo_existente).ratio()
+        Na primeira invocação do container o índice é montado com uma consulta
+        à janela inteira; nas seguintes, só as publicações desde a última
+        carga (com MARGEM_ATUALIZACAO de folga) são lidas, e as que saíram da
+        janela são descartadas.
 
-                if similarity > 0.8:  # 80% de similaridade
-                    return True
+        Args:
+            table: Tabela DynamoDB
 
-            return False
+        Returns:
+            Índice de títulos
+        """
+        global _title_index, _title_index_ate
+
+        cutoff = int(datetime.now(UTC).timestamp()) - JANELA_DUPLICATAS_DIAS * 86400
+        index = _title_index if _title_index is not None else TitleIndex()
+        desde = max(cutoff, _title_index_ate - MARGEM_ATUALIZACAO) if _title_index is not None else cutoff
+
+        try:
+            publicadas = buscar_publicadas(table, desde=desde, projection='id, titulo, publicado_em')
+            for item in publicadas:
+                publicado_em = int(item.get('publicado_em', 0))
+                index.add(item['id'], item.get('titulo', ''), publicado_em)
+                _title_index_ate = max(_title_index_ate, publicado_em)
+
+            index.prune(cutoff)
+            _title_index = index
+            logger.info(f"Índice de títulos com {len(index)} publicações ({len(publicadas)} lidas)")
 
         except Exception as e:
-            logger.error(f"Erro ao verificar duplicidade: {e}")
-            return False
+            logger.error(f"Erro ao buscar notícias publicadas: {e}")
+
+        return index
+
+    def build_post_data(self, noticia: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Monta o corpo do post para a API REST do WordPress
+
+        Args:
+            noticia: Dados da notícia
+
+        Returns:
+            Dados do post
+        """
+        return {
+            "title": sanitize_text(noticia['titulo'], 100),
+            "content": self.prepare_post_content(noticia),
+            "status": "publish",
+            "categories": [get_config().get_categoria_wp(noticia['nicho'])],
+            "excerpt": sanitize_text(noticia['resumo'], 200),
+            "meta": {
+                "fonte_original": noticia['fonte'],
+                "link_original": noticia['link'],
+                "nicho": noticia['nicho'],
+                "data_coleta": noticia.get('data_insercao')
+            }
+        }
+
+    def post_to_wordpress(self, post_data: Dict[str, Any]):
+        """
+        Envia um post ao WordPress pelo cliente HTTP compartilhado
+
+        Args:
+            post_data: Dados do post
+
+        Returns:
+            Resposta HTTP
+        """
+        wp_config = get_config().wordpress
+        self.rate_limiter.acquire(wp_config.wp_url)
+        return self.http.post(
+            f"{wp_config.wp_url}/posts",
+            json=post_data,
+            auth=(wp_config.wp_user, wp_config.wp_app_password),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
 
     def prepare_post_content(self, noticia: Dict[str, Any]) -> str:
         """
@@ -159,13 +295,15 @@ class WordPressPublisher:
         return content.strip()
 
     @retry_on_failure
-    def publish_to_wordpress(self, noticia: Dict[str, Any], table) -> bool:
+    def publish_to_wordpress(self, noticia: Dict[str, Any], table, index: Optional[TitleIndex] = None) -> bool:
         """
         Publica uma notícia no WordPress
 
         Args:
             noticia: Dados da notícia
             table: Tabela DynamoDB
+            index: Índice de títulos carregado uma vez para a execução, que
+                recebe a notícia publicada (padrão: load_title_index)
 
         Returns:
             True se publicação foi bem-sucedida
@@ -177,61 +315,29 @@ class WordPressPublisher:
                 return False
 
             # Verifica duplicidade
-            if self.is_duplicate_content(noticia, table):
+            if index is None:
+                index = self.load_title_index(table)
+            if self.is_duplicate_content(noticia, table, index):
                 logger.info(f"Notícia duplicada detectada: {noticia['titulo'][:50]}...")
 
                 # Marca como duplicada
-                table.update_item(
-                    Key={'id': noticia['id']},
-                    UpdateExpression='SET duplicada = :val',
-                    ExpressionAttributeValues={':val': True}
-                )
+                marcar_duplicada(table, noticia['id'])
 
                 self.duplicate_count += 1
                 return False
 
-            # Prepara dados do post
-            post_data = {
-                "title": sanitize_text(noticia['titulo'], 100),
-                "content": self.prepare_post_content(noticia),
-                "status": "publish",
-                "categories": [get_config().get_categoria_wp(noticia['nicho'])],
-                "excerpt": sanitize_text(noticia['resumo'], 200),
-                "meta": {
-                    "fonte_original": noticia['fonte'],
-                    "link_original": noticia['link'],
-                    "nicho": noticia['nicho'],
-                    "data_coleta": noticia.get('data_insercao')
-                }
-            }
-
             # Faz requisição para WordPress
-            wp_config = get_config().wordpress
-            response = requests.post(
-                f"{wp_config.wp_url}/posts",
-                json=post_data,
-                auth=(wp_config.wp_user, wp_config.wp_app_password),
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            response = self.post_to_wordpress(self.build_post_data(noticia))
 
             if response.status_code == 201:
                 post_id = response.json().get("id")
                 post_url = response.json().get("link")
 
                 # Atualiza notícia como publicada
-                table.update_item(
-                    Key={
-                        'id': noticia['id']},
-                    UpdateExpression=(
-                        'SET publicado = :pub, wp_post_id = :pid, wp_post_url = :url, data_publicacao = :data'
-                    ),
-                    ExpressionAttributeValues={
-                        ':pub': True,
-                        ':pid': post_id,
-                        ':url': post_url,
-                        ':data': int(
-                            datetime.now(UTC).timestamp())})
+                timestamp = int(datetime.now(UTC).timestamp())
+                marcar_publicada(table, noticia['id'], post_id, post_url, timestamp)
+                index.add(noticia['id'], noticia['titulo'], timestamp)
+                self.publicadas.append(aplicar_publicacao(noticia, post_id, post_url, timestamp))
 
                 logger.info(f"Notícia publicada com sucesso: {noticia['titulo'][:50]}... (ID: {post_id})")
                 self.published_count += 1
@@ -247,6 +353,193 @@ class WordPressPublisher:
             self.error_count += 1
             return False
 
+    @staticmethod
+    def _retry_delay(response, attempt: int) -> float:
+        """Tempo de espera após um 429/503: Retry-After ou backoff exponencial com jitter"""
+        retry_after = response.headers.get("Retry-After") if response.headers else None
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+        return min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+    async def _publish_one(self, gate: AdaptiveConcurrency, post_data: Dict[str, Any],
+                           max_retries: int) -> Dict[str, Any]:
+        """
+        Publica um post respeitando o limite adaptativo
+
+        Returns:
+            {"status": "publicada", "post_id", "post_url"} ou {"status": "erro", "erro"}
+        """
+        for attempt in range(max_retries + 1):
+            async with gate:
+                try:
+                    response = await asyncio.to_thread(self.post_to_wordpress, post_data)
+                except Exception as e:
+                    return {"status": "erro", "erro": str(e)}
+
+            if response.status_code == 201:
+                gate.on_success()
+                body = response.json()
+                return {"status": "publicada", "post_id": body.get("id"), "post_url": body.get("link")}
+
+            if response.status_code in STATUS_THROTTLE:
+                delay = self._retry_delay(response, attempt)
+                logger.warning(f"WordPress respondeu {response.status_code}, aguardando {delay:.1f}s")
+                gate.on_throttle(delay)
+                continue
+
+            return {"status": "erro", "erro": f"HTTP {response.status_code} - {response.text[:200]}"}
+
+        return {"status": "erro", "erro": f"limite de {max_retries} novas tentativas atingido"}
+
+    async def _publish_batch(self, posts: List[Dict[str, Any]],
+                             on_result: Optional[Callable[[int, Dict[str, Any]], Awaitable[None]]] = None
+                             ) -> List[Dict[str, Any]]:
+        """
+        Publica os posts com concorrência limitada, mantendo a ordem dos resultados
+
+        Args:
+            posts: Dados dos posts
+            on_result: Chamada com (posição, resultado) assim que cada post termina
+
+        Returns:
+            Resultados de _publish_one, na ordem dos posts
+        """
+        wp_config = get_config().wordpress
+        gate = AdaptiveConcurrency(wp_config.publish_concurrency)
+
+        async def publish(position: int, post: Dict[str, Any]) -> Dict[str, Any]:
+            result = await self._publish_one(gate, post, wp_config.publish_max_retries)
+            if on_result is not None:
+                await on_result(position, result)
+            return result
+
+        try:
+            return await asyncio.gather(*(publish(i, post) for i, post in enumerate(posts)))
+        finally:
+            self.throttle_count += gate.throttles
+
+    def publish_async(self, noticias: List[Dict[str, Any]], table) -> None:
+        """
+        Publica as notícias em paralelo e grava os status em lote
+
+        A verificação de duplicidade usa o índice de títulos publicados, que
+        também recebe as notícias desta execução para compará-las entre si
+        (as que falharem são retiradas). Os posts são enviados com
+        concorrência limitada, e os status das publicadas são gravados em
+        lote à medida que os posts terminam, a cada publish_concurrency
+        publicações: se a Lambda cair no meio, no máximo esse bloco de posts
+        já criados no WordPress continua pendente (e seria publicado de
+        novo). As duplicadas são gravadas no fim.
+
+        Args:
+            noticias: Notícias pendentes (itens completos)
+            table: Tabela DynamoDB
+        """
+        index = self.load_title_index(table)
+        agora = int(datetime.now(UTC).timestamp())
+        a_publicar: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        duplicadas: List[Dict[str, Any]] = []
+
+        for noticia in noticias:
+            try:
+                if noticia.get("publicado"):
+                    logger.info(f"Notícia já publicada: {noticia['titulo'][:50]}...")
+                    self.skipped_count += 1
+                elif index.find_duplicate(noticia['titulo'], exclude=noticia['id']) is not None:
+                    logger.info(f"Notícia duplicada detectada: {noticia['titulo'][:50]}...")
+                    duplicadas.append(noticia)
+                    self.duplicate_count += 1
+                    self.skipped_count += 1
+                else:
+                    a_publicar.append((noticia, self.build_post_data(noticia)))
+                    index.add(noticia['id'], noticia['titulo'], agora)
+            except Exception as e:
+                logger.error(f"Erro ao processar notícia: {e}")
+                self.error_count += 1
+
+        bloco = get_config().wordpress.publish_concurrency
+        publicadas: List[Dict[str, Any]] = []
+        a_gravar: List[Dict[str, Any]] = []
+
+        async def on_result(position: int, result: Dict[str, Any]) -> None:
+            noticia = a_publicar[position][0]
+            if result["status"] == "publicada":
+                logger.info(f"Notícia publicada com sucesso: {noticia['titulo'][:50]}... "
+                            f"(ID: {result['post_id']})")
+                timestamp = int(datetime.now(UTC).timestamp())
+                item = aplicar_publicacao(noticia, result["post_id"], result["post_url"], timestamp)
+                publicadas.append(item)
+                a_gravar.append(item)
+                self.published_count += 1
+            else:
+                logger.error(f"Erro ao publicar notícia: {result['erro']}")
+                index.remove(noticia['id'])
+                self.error_count += 1
+                self.skipped_count += 1
+
+            if len(a_gravar) >= bloco:
+                lote = a_gravar[:]
+                a_gravar.clear()
+                await asyncio.to_thread(self.save_statuses, table, lote, [])
+
+        if a_publicar:
+            asyncio.run(self._publish_batch([post for _, post in a_publicar], on_result))
+
+        self.save_statuses(table, a_gravar, [aplicar_duplicada(n) for n in duplicadas])
+        self.publicadas.extend(publicadas)
+
+    def save_statuses(self, table, publicadas: List[Dict[str, Any]], duplicadas: List[Dict[str, Any]]) -> None:
+        """
+        Grava os novos status em lote, item a item se o lote falhar
+
+        Uma notícia publicada que continuasse pendente seria publicada de
+        novo na próxima execução, por isso o fallback.
+        """
+        itens = publicadas + duplicadas
+        if not itens or gravar_em_lote(table, itens):
+            return
+
+        for item in publicadas:
+            try:
+                marcar_publicada(table, item['id'], item['wp_post_id'], item['wp_post_url'], item['publicado_em'])
+            except Exception as e:
+                logger.error(f"Erro ao marcar notícia {item['id']} como publicada: {e}")
+        for item in duplicadas:
+            try:
+                marcar_duplicada(table, item['id'])
+            except Exception as e:
+                logger.error(f"Erro ao marcar notícia {item['id']} como duplicada: {e}")
+
+    def update_read_model(self, table) -> int:
+        """
+        Atualiza o modelo de leitura da API com as notícias publicadas nesta execução
+
+        Só os documentos dos nichos afetados (e o de todos os nichos) são
+        regravados. READ_MODEL_SIZE=0 desativa o modelo de leitura.
+
+        Args:
+            table: Tabela DynamoDB de notícias
+
+        Returns:
+            Número de documentos atualizados
+        """
+        config = get_config()
+        if not self.publicadas or config.news_api.read_model_size <= 0:
+            return 0
+
+        try:
+            store = self.read_model_store or ReadModelStore(
+                get_dynamodb_table(config.database.read_model_table_name),
+                config.news_api.read_model_size
+            )
+            return store.update(table, self.publicadas)
+        except Exception as e:
+            logger.error(f"Erro ao atualizar modelo de leitura: {e}")
+            return 0
+
     def publish_all_pending(self) -> Dict[str, Any]:
         """
         Publica todas as notícias pendentes
@@ -273,19 +566,23 @@ class WordPressPublisher:
                     "timestamp": datetime.now(UTC).isoformat()
                 }
 
-            # Publica cada notícia
-            for noticia in noticias:
-                try:
-                    success = self.publish_to_wordpress(noticia, table)
-                    if not success:
-                        self.skipped_count += 1
+            publish_mode = get_config().wordpress.publish_mode
+            if publish_mode == "async":
+                self.publish_async(noticias, table)
+            else:
+                # Publica cada notícia, com o índice de títulos lido uma vez
+                index = self.load_title_index(table)
+                for noticia in noticias:
+                    try:
+                        success = self.publish_to_wordpress(noticia, table, index)
+                        if not success:
+                            self.skipped_count += 1
 
-                    # Rate limiting para evitar sobrecarga
-                    time.sleep(2)
+                    except Exception as e:
+                        logger.error(f"Erro ao processar notícia: {e}")
+                        self.error_count += 1
 
-                except Exception as e:
-                    logger.error(f"Erro ao processar notícia: {e}")
-                    self.error_count += 1
+            read_model_docs = self.update_read_model(table)
 
             # Estatísticas finais
             execution_time = time.time() - self.start_time
@@ -294,6 +591,11 @@ class WordPressPublisher:
                 "ignoradas": self.skipped_count,
                 "erros": self.error_count,
                 "duplicadas": self.duplicate_count,
+                "modo_publicacao": publish_mode,
+                "throttles": self.throttle_count,
+                "modelo_leitura": read_model_docs,
+                "espera_rate_limit": round(self.rate_limiter.total_wait - self._rate_limit_wait_start, 3),
+                "http": self.http.host_stats(),
                 "tempo_execucao": execution_time,
                 "timestamp": datetime.now(UTC).isoformat()
             }
@@ -354,6 +656,5 @@ def lambda_handler(event, context):
         }
 
 
-# Wrapper Datadog se disponível
-if DATADOG_AVAILABLE:
-    lambda_handler = datadog_lambda_wrapper(lambda_handler)
+# Wrapper Datadog se disponível e configurado
+lambda_handler = wrap_datadog(lambda_handler)
@@ -0,0 +1,233 @@
+"""
+Detecção de idioma das notícias, com perfil por fonte
+
+O langdetect é lento (carrega dezenas de perfis na primeira chamada e faz
+amostragem aleatória a cada texto) e, sem semente, nem sempre dá a mesma
+resposta para o mesmo texto. Como quase toda fonte publica num único
+idioma, o SourceLanguageProfiler conta os idiomas detectados por fonte e,
+quando um deles domina, passa a confirmar cada texto só com o detector de
+n-gramas (rápido e determinístico). O detector completo roda apenas para
+as fontes ainda sem perfil e para os textos que o detector rápido aponta,
+com confiança, como de outro idioma.
+
+NgramLanguageDetector é um classificador bayesiano sobre n-gramas de
+caracteres (1 a 3), com os perfis compactos de language_profiles.json
+(gerados dos perfis do langdetect por scripts/gerar_perfis_idioma.py).
+Também pode ser o detector principal (LANGUAGE_DETECTOR=ngram).
+
+As contagens por fonte são gravadas no estado do feed (feed_state), então
+o perfil sobrevive entre execuções. Fontes num idioma sem perfil de
+n-gramas continuam passando pelo detector completo.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "language_profiles.json")
+
+# Caracteres analisados por texto (o começo basta para o idioma)
+MAX_CHARS = 600
+
+# Caracteres usados para confirmar o idioma dominante de uma fonte
+MAX_CHARS_CONFIRMACAO = 200
+
+# Teto das contagens por fonte: acima dele as contagens caem pela metade,
+# para que uma fonte que muda de idioma seja reaprendida
+MAX_AMOSTRAS = 100
+
+_PALAVRA_RE = re.compile(r"[^\W\d_]+")
+
+
+def langdetect_detect(text: str) -> str:
+    """Detecta o idioma com o langdetect, com semente fixa (resultado reproduzível)"""
+    from langdetect import DetectorFactory, detect
+    DetectorFactory.seed = 0
+    return detect(text)
+
+
+class NgramLanguageDetector:
+    """Classificador de idioma por n-gramas de caracteres"""
+
+    def __init__(self, profiles: Optional[Dict[str, Dict]] = None, max_chars: int = MAX_CHARS):
+        """
+        Args:
+            profiles: {"idioma": {"ngramas": {n-grama: log P}, "minimo": log P}}
+                (padrão: language_profiles.json)
+            max_chars: Caracteres analisados por texto
+        """
+        if profiles is None:
+            with open(PROFILES_PATH, encoding="utf-8") as f:
+                profiles = json.load(f)
+        self.max_chars = max_chars
+        self.languages = sorted(profiles)
+        # N-gramas ausentes de um perfil recebem metade da menor probabilidade guardada
+        self._floors = [profiles[lang]["minimo"] - math.log(2) for lang in self.languages]
+        self._table: Dict[str, Tuple[float, ...]] = {}
+        for i, lang in enumerate(self.languages):
+            for ngram, logp in profiles[lang]["ngramas"].items():
+                row = self._table.setdefault(ngram, list(self._floors))
+                row[i] = logp
+        self._table = {ngram: tuple(row) for ngram, row in self._table.items()}
+
+    def ngrams(self, text: str) -> List[str]:
+        """N-gramas de 1 a 3 caracteres das palavras do texto (com espaços nas bordas)"""
+        ngrams: List[str] = []
+        for word in _PALAVRA_RE.findall(text[:self.max_chars]):
+            padded = f" {word} "
+            size = len(padded)
+            ngrams.extend(padded[1:-1])
+            ngrams.extend([padded[i:i + 2] for i in range(size - 1)])
+            ngrams.extend([padded[i:i + 3] for i in range(size - 2)])
+        return ngrams
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """
+        Probabilidade de cada idioma
+
+        Args:
+            text: Texto a classificar
+
+        Returns:
+            {"idioma": probabilidade}, somando 1; vazio se o texto não tiver
+            n-gramas conhecidos
+        """
+        rows = [row for row in map(self._table.get, self.ngrams(text)) if row is not None]
+        if not rows:
+            return {}
+
+        # Soma por idioma (colunas) sem laço Python por n-grama
+        totals = [sum(column) for column in zip(*rows)]
+        best = max(totals)
+        weights = [math.exp(total - best) for total in totals]
+        norm = sum(weights)
+        return {lang: weight / norm for lang, weight in zip(self.languages, weights)}
+
+    def detect_with_confidence(self, text: str) -> Tuple[Optional[str], float]:
+        """Idioma mais provável e sua probabilidade (None, 0.0 se indeterminado)"""
+        scores = self.scores(text)
+        if not scores:
+            return None, 0.0
+        lang = max(scores, key=scores.get)
+        return lang, scores[lang]
+
+    def detect(self, text: str) -> str:
+        """
+        Idioma mais provável do texto
+
+        Raises:
+            ValueError: Se o texto não tiver letras de nenhum perfil
+        """
+        lang, _ = self.detect_with_confidence(text)
+        if lang is None:
+            raise ValueError("idioma indeterminado")
+        return lang
+
+
+class SourceLanguageProfiler:
+    """
+    Aprende o idioma dominante de cada fonte e evita o detector completo
+
+    Uma fonte tem idioma dominante quando já teve pelo menos `min_samples`
+    textos detectados e um idioma responde por `dominance` deles. Seguro
+    entre threads.
+    """
+
+    def __init__(self, detector: Callable[[str], str], verifier: NgramLanguageDetector,
+                 min_samples: int = 5, dominance: float = 0.8, confidence: float = 0.95):
+        """
+        Args:
+            detector: Detector completo (langdetect_detect ou NgramLanguageDetector.detect)
+            verifier: Detector rápido que confirma o idioma dominante
+            min_samples: Textos detectados antes de confiar no perfil da fonte
+            dominance: Fração mínima do idioma dominante
+            confidence: Probabilidade a partir da qual o verificador aponta
+                outro idioma (e o texto vai para o detector completo)
+        """
+        self.detector = detector
+        self.verifier = verifier
+        self.min_samples = min_samples
+        self.dominance = dominance
+        self.confidence = confidence
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.profile_hits = 0
+        self.detections = 0
+        self.outliers = 0
+
+    def load(self, source: str, counts: Optional[Dict[str, int]]) -> None:
+        """Restaura as contagens de uma fonte (do estado do feed), se ainda não houver"""
+        if counts:
+            with self._lock:
+                self._counts.setdefault(source, {lang: int(n) for lang, n in counts.items()})
+
+    def counts(self, source: str) -> Dict[str, int]:
+        """Contagens de idioma da fonte"""
+        with self._lock:
+            return dict(self._counts.get(source, {}))
+
+    def dominant(self, source: str) -> Optional[str]:
+        """Idioma dominante da fonte, ou None se ainda não houver"""
+        with self._lock:
+            counts = self._counts.get(source)
+            if not counts:
+                return None
+            total = sum(counts.values())
+            lang, count = max(counts.items(), key=lambda item: item[1])
+        if total >= self.min_samples and count / total >= self.dominance:
+            return lang
+        return None
+
+    def detect(self, source: str, text: str) -> str:
+        """
+        Idioma de um texto da fonte
+
+        Args:
+            source: Identificador da fonte (URL do feed)
+            text: Texto da notícia
+
+        Returns:
+            Código do idioma (pt, en, ...)
+
+        Raises:
+            Exception: Erros do detector completo (texto sem idioma, por exemplo)
+        """
+        dominant = self.dominant(source)
+        if dominant is not None:
+            lang, probability = self.verifier.detect_with_confidence(text[:MAX_CHARS_CONFIRMACAO])
+            if lang is None or lang == dominant or probability < self.confidence:
+                with self._lock:
+                    self.profile_hits += 1
+                self._record(source, dominant)
+                return dominant
+            with self._lock:
+                self.outliers += 1
+
+        lang = self.detector(text)
+        with self._lock:
+            self.detections += 1
+        self._record(source, lang)
+        return lang
+
+    def _record(self, source: str, lang: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(source, {})
+            counts[lang] = counts.get(lang, 0) + 1
+            if sum(counts.values()) > MAX_AMOSTRAS:
+                self._counts[source] = {key: n // 2 for key, n in counts.items() if n // 2}
+
+    def stats(self) -> Dict[str, int]:
+        """Textos resolvidos pelo perfil, detecções completas e fora do padrão"""
+        return {
+            "perfil": self.profile_hits,
+            "deteccoes": self.detections,
+            "fora_do_padrao": self.outliers,
+            "fontes": len(self._counts)
+        }
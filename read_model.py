@@ -0,0 +1,246 @@
+"""
+Modelo de leitura pré-calculado da API de notícias
+
+Para cada nicho há um documento JSON compacto com as últimas N notícias
+publicadas (só os CAMPOS_API), e um documento com a chave reservada
+"#todos" para a listagem sem nicho. A API lê um único item por requisição
+em vez de consultar os índices.
+
+O publicador atualiza os documentos depois de gravar os status: cada nicho
+afetado recebe as notícias novas por merge (uma leitura e uma gravação,
+sem consultar a tabela de notícias); se o documento ainda não existe, ele
+é montado com uma Query no índice de publicadas do nicho.
+
+Cada notícia do documento guarda a sua expiração ("ttl", a mesma do item
+na tabela). Notícias vencidas, que o TTL do DynamoDB e a lambda_limpeza
+apagam da tabela, saem do documento no merge e não são servidas pela API.
+Se alguma venceu num documento que indicava haver mais notícias além
+dele, só o índice sabe o que sobrou: o publicador remonta o documento com
+a Query e a API usa a Query até lá.
+
+Cada documento é um único item com um número de versão. A gravação é um
+PutItem condicionado à versão lida, então um leitor sempre vê o documento
+inteiro de uma versão, e dois publicadores concorrentes não perdem as
+notícias um do outro: quem perde a corrida relê e refaz o merge.
+"""
+
+import json
+import time
+from decimal import Decimal
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils import setup_logging
+from data_access import CAMPOS_API, buscar_pagina_publicadas
+
+logger = setup_logging()
+
+# Chave reservada do documento com todos os nichos (nichos nunca começam com "#")
+READ_MODEL_ALL = "#todos"
+
+# Tentativas de merge quando outro publicador grava a mesma versão antes
+MAX_TENTATIVAS = 3
+
+# Expiração (epoch) de cada notícia, o atributo de TTL da tabela de notícias
+CAMPO_EXPIRACAO = "ttl"
+
+
+def _plain(value: Any) -> Any:
+    """Converte os Decimal do DynamoDB para int ou float"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def compactar(noticia: Dict[str, Any]) -> Dict[str, Any]:
+    """Mantém só os campos servidos pela API e a expiração, prontos para JSON"""
+    return {campo: _plain(noticia[campo]) for campo in CAMPOS_API + (CAMPO_EXPIRACAO,) if campo in noticia}
+
+
+def para_api(noticia: Dict[str, Any]) -> Dict[str, Any]:
+    """Notícia compacta sem a expiração, no formato das respostas da API"""
+    return {campo: valor for campo, valor in noticia.items() if campo != CAMPO_EXPIRACAO}
+
+
+def vigentes(noticias: Iterable[Dict[str, Any]], agora: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Descarta as notícias vencidas
+
+    Args:
+        noticias: Notícias compactas
+        agora: Epoch de referência (padrão: agora)
+
+    Returns:
+        Notícias sem expiração ou com expiração ainda no futuro, na mesma ordem
+    """
+    agora = int(time.time()) if agora is None else agora
+    return [n for n in noticias if n.get(CAMPO_EXPIRACAO) is None or n[CAMPO_EXPIRACAO] >= agora]
+
+
+def merge_noticias(atuais: List[Dict[str, Any]], novas: Iterable[Dict[str, Any]],
+                   size: int) -> List[Dict[str, Any]]:
+    """
+    Junta notícias novas a um documento, mais recentes primeiro
+
+    Args:
+        atuais: Notícias do documento atual
+        novas: Notícias recém-publicadas (substituem as de mesmo id)
+        size: Número máximo de notícias no documento
+
+    Returns:
+        Lista ordenada por publicado_em decrescente, sem as vencidas, com no
+        máximo `size` itens
+    """
+    por_id = {noticia["id"]: noticia for noticia in atuais}
+    for noticia in novas:
+        por_id[noticia["id"]] = compactar(noticia)
+    ordenadas = sorted(vigentes(por_id.values()), key=lambda n: (n.get("publicado_em", 0), n["id"]),
+                       reverse=True)
+    return ordenadas[:size]
+
+
+class ReadModelStore:
+    """Persiste os documentos do modelo de leitura (um item por nicho)"""
+
+    def __init__(self, table, size: int = 50):
+        self.table = table
+        self.size = size
+        self.conflicts = 0
+
+    def load(self, nicho: str) -> Optional[Dict[str, Any]]:
+        """
+        Lê o documento de um nicho
+
+        Args:
+            nicho: Nicho ou READ_MODEL_ALL
+
+        Returns:
+            {"versao", "gerado_em", "noticias", "mais"} ou None se não houver
+            documento ou em caso de erro
+        """
+        try:
+            response = self.table.get_item(Key={'nicho': nicho})
+            if 'Item' not in response:
+                return None
+            item = response['Item']
+            documento = json.loads(item['documento'])
+            documento['versao'] = int(item['versao'])
+            return documento
+        except Exception as e:
+            logger.warning(f"Erro ao carregar modelo de leitura de {nicho}: {e}")
+            return None
+
+    def save(self, nicho: str, noticias: List[Dict[str, Any]], mais: bool, versao_anterior: int) -> bool:
+        """
+        Grava uma nova versão do documento se a atual ainda for `versao_anterior`
+
+        Args:
+            nicho: Nicho ou READ_MODEL_ALL
+            noticias: Notícias compactas, mais recentes primeiro
+            mais: Se há notícias publicadas além das do documento
+            versao_anterior: Versão lida antes do merge (0 se não havia documento)
+
+        Returns:
+            True se gravou; False em conflito de versão ou erro
+        """
+        gerado_em = int(time.time())
+        documento = json.dumps({'gerado_em': gerado_em, 'noticias': noticias, 'mais': mais},
+                               ensure_ascii=False, separators=(",", ":"))
+        try:
+            self.table.put_item(
+                Item={'nicho': nicho, 'versao': versao_anterior + 1, 'gerado_em': gerado_em, 'documento': documento},
+                ConditionExpression='attribute_not_exists(nicho) OR versao = :anterior',
+                ExpressionAttributeValues={':anterior': versao_anterior}
+            )
+            return True
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                self.conflicts += 1
+                logger.info(f"Modelo de leitura de {nicho} alterado por outro processo, refazendo")
+            else:
+                logger.warning(f"Erro ao salvar modelo de leitura de {nicho}: {e}")
+            return False
+
+    def rebuild(self, data_table, nicho: str, novas: Iterable[Dict[str, Any]] = ()) -> bool:
+        """
+        Monta o documento do zero com uma Query no índice de publicadas
+
+        Args:
+            data_table: Tabela de notícias
+            nicho: Nicho ou READ_MODEL_ALL
+            novas: Notícias recém-publicadas, que o índice (eventualmente
+                consistente) pode ainda não devolver
+
+        Returns:
+            True se o documento foi gravado
+        """
+        try:
+            noticias, last_key = buscar_pagina_publicadas(
+                data_table, nicho=None if nicho == READ_MODEL_ALL else nicho, limit=self.size,
+                campos=CAMPOS_API + (CAMPO_EXPIRACAO,)
+            )
+        except Exception as e:
+            logger.warning(f"Erro ao consultar publicadas de {nicho}: {e}")
+            return False
+
+        atual = self.load(nicho)
+        versao = atual['versao'] if atual else 0
+        merged = merge_noticias([compactar(n) for n in noticias], novas, self.size)
+        return self.save(nicho, merged, last_key is not None, versao)
+
+    def apply(self, data_table, nicho: str, novas: List[Dict[str, Any]]) -> bool:
+        """
+        Acrescenta notícias recém-publicadas ao documento de um nicho
+
+        Se alguma notícia do documento venceu e ele indicava haver mais
+        notícias além dele, o documento é remontado com a Query.
+
+        Args:
+            data_table: Tabela de notícias (usada só se o documento não existir)
+            nicho: Nicho ou READ_MODEL_ALL
+            novas: Notícias publicadas
+
+        Returns:
+            True se o documento foi gravado
+        """
+        for _ in range(MAX_TENTATIVAS):
+            atual = self.load(nicho)
+            if atual is None:
+                if self.rebuild(data_table, nicho, novas):
+                    return True
+                continue
+
+            atuais = vigentes(atual['noticias'])
+            if atual['mais'] and len(atuais) < len(atual['noticias']):
+                if self.rebuild(data_table, nicho, novas):
+                    return True
+                continue
+
+            noticias = merge_noticias(atuais, novas, self.size)
+            total = len({n['id'] for n in atuais} | {n['id'] for n in novas})
+            mais = atual['mais'] or total > len(noticias)
+            if self.save(nicho, noticias, mais, atual['versao']):
+                return True
+
+        logger.warning(f"Modelo de leitura de {nicho} não atualizado após {MAX_TENTATIVAS} tentativas")
+        return False
+
+    def update(self, data_table, publicadas: List[Dict[str, Any]]) -> int:
+        """
+        Atualiza só os documentos dos nichos afetados e o de todos os nichos
+
+        Args:
+            data_table: Tabela de notícias
+            publicadas: Notícias publicadas nesta execução
+
+        Returns:
+            Número de documentos gravados
+        """
+        if not publicadas:
+            return 0
+
+        por_nicho: Dict[str, List[Dict[str, Any]]] = {}
+        for noticia in publicadas:
+            por_nicho.setdefault(noticia['nicho'], []).append(noticia)
+        por_nicho[READ_MODEL_ALL] = publicadas
+
+        return sum(self.apply(data_table, nicho, novas) for nicho, novas in por_nicho.items())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória e latência do parse de feeds grandes
+
+Gera feeds RSS sintéticos de vários tamanhos e compara:
+- feedparser.parse com o documento inteiro (FEED_PARSER=feedparser)
+- parser incremental lendo o documento inteiro
+- parser incremental parando após max_news_per_source entradas (o caso do
+  coletor com FEED_PARSER=stream)
+
+A latência é medida numa execução sem tracemalloc (que deixa o parse
+várias vezes mais lento) e a memória, numa segunda execução, como o pico
+do tracemalloc; o documento de entrada é alocado antes das medições.
+
+Uso:
+    python scripts/benchmark_feed_parser.py --itens 500,5000 --limite 3
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import feedparser
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feed_stream import parse_response  # noqa: E402
+
+
+def gerar_feed_rss(total_itens: int) -> bytes:
+    """Gera um feed RSS 2.0 com descrições em HTML, como os de portais de notícias"""
+    itens = "".join(
+        f"<item><title>Notícia {i} sobre economia e tecnologia</title>"
+        f"<link>https://example.com/noticia/{i}</link>"
+        f"<guid>https://example.com/noticia/{i}</guid>"
+        f"<pubDate>Sun, 22 Jun 2025 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} GMT</pubDate>"
+        f"<description><![CDATA[<p>Resumo da notícia {i}. " + "Texto de exemplo do corpo. " * 20
+        + "</p>]]></description></item>"
+        for i in range(total_itens)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0"><channel><title>Feed de teste</title>'
+        f'<link>https://example.com</link>{itens}</channel></rss>'
+    ).encode("utf-8")
+
+
+class RespostaEmPedacos:
+    """Imita requests.Response com stream=True sobre um documento em memória"""
+
+    def __init__(self, corpo: bytes):
+        self.corpo = corpo
+        self.headers = {"Content-Type": "application/rss+xml"}
+        self.bytes_lidos = 0
+
+    def iter_content(self, chunk_size: int = 16 * 1024):
+        for inicio in range(0, len(self.corpo), chunk_size):
+            pedaco = self.corpo[inicio:inicio + chunk_size]
+            self.bytes_lidos += len(pedaco)
+            yield pedaco
+
+    def close(self):
+        pass
+
+
+def medir(funcao):
+    """Executa a função duas vezes e devolve (resultado, segundos, pico de memória em bytes)"""
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, duracao, pico
+
+
+def executar(total_itens: int, limite: int) -> None:
+    corpo = gerar_feed_rss(total_itens)
+    print(f"\n📊 {total_itens} itens ({len(corpo) / 1024 / 1024:.1f} MB)")
+
+    casos = [
+        ("feedparser", lambda: (feedparser.parse(corpo), len(corpo))),
+        ("stream completo", lambda: _stream(corpo, None)),
+        (f"stream limite={limite}", lambda: _stream(corpo, limite)),
+    ]
+    for nome, funcao in casos:
+        (feed, lidos), duracao, pico = medir(funcao)
+        print(f"  {nome:<18} {duracao * 1000:9.1f} ms  pico {pico / 1024 / 1024:7.2f} MB  "
+              f"{len(feed.entries):6d} entradas  {lidos / 1024:9.0f} KB lidos")
+
+
+def _stream(corpo: bytes, limite):
+    resposta = RespostaEmPedacos(corpo)
+    return parse_response(resposta, limit=limite), resposta.bytes_lidos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--itens", default="500,5000",
+                        help="número de itens por feed, separados por vírgula")
+    parser.add_argument("--limite", type=int, default=3, help="max_news_per_source simulado")
+    args = parser.parse_args()
+
+    for total in [int(t) for t in args.itens.split(",")]:
+        executar(total, args.limite)
+
+
+if __name__ == "__main__":
+    main()
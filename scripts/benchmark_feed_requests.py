@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark de requisições HTTP por execução da coleta
+
+Sobe um servidor HTTP local com feeds RSS de exemplo, conta quantas
+requisições chegam ao servidor e compara o pipeline antigo (HEAD de
+validação + dois feedparser.parse por fonte) com o pipeline atual do
+NewsCollector (um único GET por fonte).
+
+Uso:
+    python scripts/benchmark_feed_requests.py --fontes 20
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import feedparser
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lambda_coletor import NewsCollector  # noqa: E402
+from utils import validar_url  # noqa: E402
+
+
+def gerar_feed_rss(total_itens: int, prefixo: str = "Notícia") -> bytes:
+    """Gera um feed RSS 2.0 com o número de itens pedido"""
+    itens = "".join(
+        f"<item><title>{prefixo} {i}</title>"
+        f"<link>https://example.com/{prefixo.lower()}/{i}</link>"
+        f"<guid>https://example.com/{prefixo.lower()}/{i}</guid>"
+        f"<pubDate>Sun, 22 Jun 2025 20:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description>Resumo da {prefixo.lower()} {i} com texto suficiente "
+        f"para ser processado pelo coletor.</description></item>"
+        for i in range(total_itens)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<rss version="2.0"><channel><title>Feed de teste</title>'
+        f'<link>https://example.com</link>{itens}</channel></rss>'
+    ).encode("utf-8")
+
+
+class ContadorHandler(BaseHTTPRequestHandler):
+    """Serve o mesmo feed para qualquer caminho e conta as requisições"""
+
+    feed = b""
+    contador = Counter()
+    lock = threading.Lock()
+
+    def _registrar(self):
+        with self.lock:
+            self.contador[self.command] += 1
+
+    def do_HEAD(self):
+        self._registrar()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.feed)))
+        self.end_headers()
+
+    def do_GET(self):
+        self._registrar()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.feed)))
+        self.end_headers()
+        self.wfile.write(self.feed)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def pipeline_antigo(fontes):
+    """Reproduz o fluxo anterior: validar_url + parse de validação + parse de coleta"""
+    for fonte in fontes:
+        if not validar_url(fonte["url"]):
+            continue
+        feed = feedparser.parse(fonte["url"])
+        if feed.bozo or not feed.entries:
+            continue
+        feedparser.parse(fonte["url"])
+
+
+def pipeline_atual(fontes):
+    """Fluxo atual do coletor: um GET por fonte, em paralelo"""
+    NewsCollector().fetch_all_feeds(fontes)
+
+
+def medir(nome, funcao, fontes):
+    ContadorHandler.contador.clear()
+    inicio = time.perf_counter()
+    funcao(fontes)
+    duracao = time.perf_counter() - inicio
+    total = sum(ContadorHandler.contador.values())
+    detalhes = ", ".join(f"{k}={v}" for k, v in sorted(ContadorHandler.contador.items()))
+    print(f"{nome:<10} {total:>5} requisições ({detalhes}) "
+          f"{total / len(fontes):.1f}/fonte  {duracao:.2f}s")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fontes", type=int, default=20, help="número de fontes simuladas")
+    parser.add_argument("--itens", type=int, default=50, help="itens por feed")
+    args = parser.parse_args()
+
+    ContadorHandler.feed = gerar_feed_rss(args.itens)
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ContadorHandler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    fontes = [
+        {"name": f"Fonte {i}", "url": f"{base}/feed/{i}.xml", "nicho": "tecnologia"}
+        for i in range(args.fontes)
+    ]
+
+    print(f"📊 {args.fontes} fontes, {args.itens} itens por feed")
+    antes = medir("antigo", pipeline_antigo, fontes)
+    depois = medir("atual", pipeline_atual, fontes)
+    print(f"Redução: {antes - depois} requisições ({(1 - depois / antes) * 100:.0f}%)")
+
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
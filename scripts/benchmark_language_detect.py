@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da detecção de idioma do coletor
+
+Compara, sobre os resumos de noticias_local.json (e frases curtas em pt,
+es, fr, de e it), a vazão e a concordância de:
+- langdetect (detector completo, com semente fixa)
+- NgramLanguageDetector (language_detect, perfis compactos)
+- SourceLanguageProfiler com langdetect atrás, depois de aprender o perfil
+  de cada fonte (o caminho do coletor em regime)
+
+A concordância é medida contra o langdetect. A primeira chamada do
+langdetect (carga dos perfis) é mostrada à parte.
+
+Uso:
+    python scripts/benchmark_language_detect.py --repeticoes 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from language_detect import NgramLanguageDetector, SourceLanguageProfiler, langdetect_detect  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noticias_local.json")
+
+FRASES = {
+    "pt": "O governo anunciou hoje um novo programa de vacinação contra a gripe para idosos e crianças.",
+    "es": "El gobierno anunció hoy un nuevo programa de vacunación contra la gripe para mayores y niños.",
+    "fr": "Le gouvernement a annoncé aujourd'hui un nouveau programme de vaccination contre la grippe.",
+    "de": "Die Regierung hat heute ein neues Impfprogramm gegen die Grippe für Ältere angekündigt.",
+    "it": "Il governo ha annunciato oggi un nuovo programma di vaccinazione contro l'influenza."
+}
+
+
+def carregar():
+    """(fonte, texto) das notícias de exemplo e das frases de outros idiomas"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        noticias = json.load(f)
+    textos = [(n["fonte"], n["resumo"]) for n in noticias if n.get("resumo")]
+    return textos + [(f"fonte-{idioma}", frase) for idioma, frase in FRASES.items()]
+
+
+def medir(nome, funcao, textos, repeticoes, referencia=None):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultados = [funcao(fonte, texto) for fonte, texto in textos]
+    segundos = time.perf_counter() - inicio
+    total = repeticoes * len(textos)
+    linha = f"  {nome:<26} {total / segundos:10.0f} textos/s {segundos / total * 1e6:9.1f} µs/texto"
+    if referencia is not None:
+        iguais = sum(a == b for a, b in zip(resultados, referencia))
+        linha += f"  concordância {iguais}/{len(referencia)}"
+    print(linha)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=20, help="passadas sobre os textos")
+    args = parser.parse_args()
+
+    textos = carregar()
+    print(f"\n📊 {len(textos)} textos")
+
+    inicio = time.perf_counter()
+    langdetect_detect("warm up do langdetect")
+    print(f"  primeira chamada do langdetect: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    inicio = time.perf_counter()
+    ngram = NgramLanguageDetector()
+    print(f"  carga dos perfis de n-gramas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    referencia = medir("langdetect", lambda fonte, texto: langdetect_detect(texto), textos, args.repeticoes)
+    medir("n-gramas", lambda fonte, texto: ngram.detect(texto), textos, args.repeticoes, referencia)
+
+    profiler = SourceLanguageProfiler(langdetect_detect, ngram)
+    for fonte, texto in textos:
+        for _ in range(profiler.min_samples):
+            profiler.detect(fonte, texto)
+    profiler.profile_hits = profiler.detections = profiler.outliers = 0
+    medir("perfil por fonte", profiler.detect, textos, args.repeticoes, referencia)
+    print(f"  perfil por fonte: {profiler.stats()}")
+
+
+if __name__ == "__main__":
+    main()
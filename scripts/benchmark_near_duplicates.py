@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark da detecção de quase-duplicatas
+
+Compara, com corpora sintéticos de 1k, 10k e 100k notícias:
+- varredura original: SequenceMatcher sobre uma página de 100 itens
+- varredura completa: SequenceMatcher sobre a janela inteira
+- índice MinHash/LSH de dedup_index (candidatos + SequenceMatcher)
+
+As consultas são metade quase-duplicatas (título e resumo de uma notícia
+existente com algumas palavras trocadas) e metade notícias novas. A
+referência de recall é o rótulo de construção, conferido com SequenceMatcher
+contra a notícia de origem.
+
+Uso:
+    python scripts/benchmark_near_duplicates.py --tamanhos 1000,10000,100000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import NearDuplicateIndex  # noqa: E402
+
+THRESHOLD = 0.8
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noticias_local.json")
+
+
+def carregar_vocabulario():
+    """Vocabulário a partir das notícias de exemplo do projeto"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        noticias = json.load(f)
+    palavras = set()
+    for noticia in noticias:
+        texto = f"{noticia.get('titulo', '')} {noticia.get('resumo', '')}"
+        palavras.update(re.findall(r"[^\W\d_]+", texto.lower()))
+    return sorted(palavras)
+
+
+def gerar_noticia(rng, vocab):
+    titulo = " ".join(rng.choices(vocab, k=rng.randint(8, 14)))
+    resumo = " ".join(rng.choices(vocab, k=rng.randint(30, 50)))
+    return titulo, resumo
+
+
+def perturbar(rng, vocab, texto, trocas):
+    palavras = texto.split()
+    for _ in range(trocas):
+        palavras[rng.randrange(len(palavras))] = rng.choice(vocab)
+    return " ".join(palavras)
+
+
+def similar(a, b):
+    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio() > THRESHOLD
+
+
+def varredura(itens, titulo, resumo):
+    """Algoritmo original da checar_plagio_local sobre a lista de itens"""
+    for item_titulo, item_resumo in itens:
+        if similar(item_titulo, titulo) or similar(item_resumo, resumo):
+            return True
+    return False
+
+
+def medir_consultas(funcao, consultas):
+    inicio = time.perf_counter()
+    resultados = [funcao(titulo, resumo) for titulo, resumo, _ in consultas]
+    return resultados, (time.perf_counter() - inicio) / len(consultas)
+
+
+def recall_e_falsos(resultados, consultas):
+    positivos = [r for r, (_, _, rotulo) in zip(resultados, consultas) if rotulo]
+    negativos = [r for r, (_, _, rotulo) in zip(resultados, consultas) if not rotulo]
+    recall = sum(positivos) / len(positivos) if positivos else 1.0
+    return recall, sum(negativos)
+
+
+def executar(tamanho, total_consultas, amostra_scan, vocab, seed):
+    rng = random.Random(seed)
+    corpus = [gerar_noticia(rng, vocab) for _ in range(tamanho)]
+
+    consultas = []
+    for i in range(total_consultas):
+        if i % 2 == 0:
+            titulo, resumo = corpus[rng.randrange(tamanho)]
+            novo_titulo = perturbar(rng, vocab, titulo, 1)
+            novo_resumo = perturbar(rng, vocab, resumo, 2)
+            rotulo = similar(titulo, novo_titulo) or similar(resumo, novo_resumo)
+            consultas.append((novo_titulo, novo_resumo, rotulo))
+        else:
+            consultas.append((*gerar_noticia(rng, vocab), False))
+
+    print(f"\n📊 {tamanho} notícias armazenadas, {total_consultas} consultas")
+
+    # Varredura original (página de 100 itens)
+    pagina = corpus[:100]
+    resultados, latencia = medir_consultas(lambda t, r: varredura(pagina, t, r), consultas)
+    recall, falsos = recall_e_falsos(resultados, consultas)
+    print(f"  {'scan 100 itens':<18} recall={recall:6.1%}  falsos+={falsos:<3} {latencia * 1000:9.2f} ms/consulta")
+
+    # Varredura completa (latência numa amostra)
+    amostra = consultas[:amostra_scan]
+    _, latencia = medir_consultas(lambda t, r: varredura(corpus, t, r), amostra)
+    print(f"  {'scan completo':<18} recall= 100.0%  (referência)  {latencia * 1000:9.2f} ms/consulta "
+          f"(amostra de {len(amostra)})")
+
+    # Índice MinHash/LSH
+    inicio = time.perf_counter()
+    index = NearDuplicateIndex()
+    for i, (titulo, resumo) in enumerate(corpus):
+        index.add(str(i), titulo, resumo, 0)
+    construcao = time.perf_counter() - inicio
+    resultados, latencia = medir_consultas(
+        lambda t, r: index.find_duplicate(t, r, THRESHOLD) is not None, consultas
+    )
+    recall, falsos = recall_e_falsos(resultados, consultas)
+    print(f"  {'índice LSH':<18} recall={recall:6.1%}  falsos+={falsos:<3} {latencia * 1000:9.2f} ms/consulta "
+          f"(construção {construcao:.1f}s, {len(b''.join(index.to_parts())) / 1024:.0f} KB serializado)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", default="1000,10000,100000",
+                        help="tamanhos do corpus separados por vírgula")
+    parser.add_argument("--consultas", type=int, default=200, help="número de consultas")
+    parser.add_argument("--amostra-scan", type=int, default=5,
+                        help="consultas usadas para medir a varredura completa")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    vocab = carregar_vocabulario()
+    for tamanho in [int(t) for t in args.tamanhos.split(",")]:
+        executar(tamanho, args.consultas, args.amostra_scan, vocab, args.seed)
+
+
+if __name__ == "__main__":
+    main()
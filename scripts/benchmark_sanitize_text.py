@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do sanitize_text (utils)
+
+Compara, sobre os títulos e resumos de noticias_local.json, em três formas
+(texto limpo, com HTML e entidades, e com HTML repetido até virar um artigo
+longo):
+- a versão anterior (import re dentro da função, só espaços)
+- várias passadas (tags de frase, demais tags, entidades, espaços)
+- sanitize_text atual (um regex pré-compilado, uma varredura com parada
+  em max_length)
+
+Uso:
+    python scripts/benchmark_sanitize_text.py --repeticoes 2000 --max-length 1000
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import sanitize_text  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noticias_local.json")
+
+_INLINE_TAG_RE = re.compile(r"</?(?:a|b|em|i|span|strong)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def anterior(text, max_length=1000):
+    """sanitize_text antes da normalização de HTML"""
+    if not text:
+        return ""
+    import re
+    text = re.sub(r'\s+', ' ', text.strip())
+    return text[:max_length]
+
+
+def varias_passadas(text, max_length=1000):
+    """Tags de frase, demais tags, entidades e espaços em passadas separadas sobre o texto inteiro"""
+    if not text:
+        return ""
+    text = _TAG_RE.sub(" ", _INLINE_TAG_RE.sub("", text))
+    return _SPACE_RE.sub(" ", html.unescape(text)).strip()[:max_length]
+
+
+def com_html(texto):
+    palavras = texto.replace("'", "&#8217;").split(" ")
+    meio = len(palavras) // 2
+    return (f"<p>{' '.join(palavras[:meio])} <strong>{' '.join(palavras[meio:])}</strong>&#8230;</p>\n"
+            f"<p>Leia&nbsp;mais &amp; comente</p>")
+
+
+def carregar():
+    """Textos limpos, com HTML e longos (artigo de ~20 KB)"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        noticias = json.load(f)
+    limpos = [t for n in noticias for t in (n.get("titulo"), n.get("resumo")) if t]
+    marcados = [com_html(t) for t in limpos]
+    longos = [" ".join(marcados[i:] + marcados[:i]) * 4 for i in range(0, len(marcados), 4)]
+    return {"limpo": limpos, "html": marcados, "artigo longo": longos}
+
+
+def medir(funcao, textos, repeticoes, max_length):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for texto in textos:
+            funcao(texto, max_length)
+    return (time.perf_counter() - inicio) / (repeticoes * len(textos)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=2000, help="passadas sobre os textos")
+    parser.add_argument("--max-length", type=int, default=1000, help="max_length do sanitize_text")
+    args = parser.parse_args()
+
+    metodos = {"anterior": anterior, "várias passadas": varias_passadas, "sanitize_text": sanitize_text}
+    for nome, textos in carregar().items():
+        media = sum(len(t) for t in textos) / len(textos)
+        repeticoes = max(1, args.repeticoes // 20) if nome == "artigo longo" else args.repeticoes
+        print(f"\n📊 {nome}: {len(textos)} textos, {media:.0f} caracteres em média")
+        for metodo, funcao in metodos.items():
+            print(f"  {metodo:<16} {medir(funcao, textos, repeticoes, args.max_length):8.2f} µs/texto")
+        iguais = sum(sanitize_text(t, args.max_length) == varias_passadas(t, args.max_length) for t in textos)
+        print(f"  mesmo resultado que várias passadas: {iguais}/{len(textos)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos resumos locais sobre as notícias de noticias_local.json
+
+Compara, por notícia, a latência e a sobreposição com uma referência de:
+- primeiras 60 palavras (o corte antigo do coletor)
+- primeiros 200 caracteres (o resumir_texto antigo)
+- resumo extrativo (extractive_summary, TF-IDF + posição)
+
+As notícias de exemplo não têm resumo humano, então a referência é o
+título (avaliação no estilo "headline"): ROUGE-1, ROUGE-2 e ROUGE-L medem
+quanto do título o resumo cobre. Com --concatenar, cada notícia vira um
+texto mais longo, seguido dos resumos das outras notícias do mesmo nicho,
+para medir o comportamento em artigos com muitas frases.
+
+Uso:
+    python scripts/benchmark_summarizer.py
+    python scripts/benchmark_summarizer.py --concatenar --repeticoes 200 --max-chars 300
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractive_summary import limpar_texto, resumir_extrativo, truncar  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noticias_local.json")
+
+_PALAVRA_RE = re.compile(r"[^\W_]+")
+
+
+def carregar(concatenar):
+    """(texto, título) de cada notícia de exemplo"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        noticias = json.load(f)
+
+    textos = [(limpar_texto(n.get("resumo", "")), n.get("titulo", ""), n.get("nicho")) for n in noticias]
+    if not concatenar:
+        return [(texto, titulo) for texto, titulo, _ in textos]
+    return [
+        (" ".join([texto] + [outro for outro, _, n in textos if n == nicho and outro != texto]), titulo)
+        for texto, titulo, nicho in textos
+    ]
+
+
+def palavras(texto):
+    return _PALAVRA_RE.findall(texto.lower())
+
+
+def _f1(sobreposicao, total_resumo, total_ref):
+    if not sobreposicao:
+        return 0.0
+    precisao = sobreposicao / total_resumo
+    recall = sobreposicao / total_ref
+    return 2 * precisao * recall / (precisao + recall)
+
+
+def rouge_n(resumo, referencia, n):
+    """F1 de n-gramas entre o resumo e a referência"""
+    def ngramas(tokens):
+        return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+    a, b = ngramas(palavras(resumo)), ngramas(palavras(referencia))
+    return _f1(sum((a & b).values()), sum(a.values()), sum(b.values()))
+
+
+def rouge_l(resumo, referencia):
+    """F1 da maior subsequência comum de palavras"""
+    a, b = palavras(resumo), palavras(referencia)
+    if not a or not b:
+        return 0.0
+    anterior = [0] * (len(b) + 1)
+    for x in a:
+        atual = [0]
+        for j, y in enumerate(b):
+            atual.append(anterior[j] + 1 if x == y else max(anterior[j + 1], atual[j]))
+        anterior = atual
+    return _f1(anterior[-1], len(a), len(b))
+
+
+def metodos(max_chars):
+    return {
+        "primeiras 60 palavras": lambda t: " ".join(t.split()[:60]) + ("..." if len(t.split()) > 60 else ""),
+        "primeiros 200 chars": lambda t: t[:200] + ("..." if len(t) > 200 else ""),
+        "extrativo": lambda t: resumir_extrativo(t, max_chars=max_chars),
+        "extrativo (truncado)": lambda t: truncar(resumir_extrativo(t, max_chars=max_chars), 200)
+    }
+
+
+def executar(nome, funcao, corpus, repeticoes):
+    latencias = []
+    for texto, _ in corpus:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            funcao(texto)
+        latencias.append((time.perf_counter() - inicio) / repeticoes * 1000)
+
+    resumos = [funcao(texto) for texto, _ in corpus]
+    r1 = statistics.mean(rouge_n(r, titulo, 1) for r, (_, titulo) in zip(resumos, corpus))
+    r2 = statistics.mean(rouge_n(r, titulo, 2) for r, (_, titulo) in zip(resumos, corpus))
+    rl = statistics.mean(rouge_l(r, titulo) for r, (_, titulo) in zip(resumos, corpus))
+    tamanho = statistics.mean(len(r) for r in resumos)
+    p95 = sorted(latencias)[int(0.95 * (len(latencias) - 1))]
+    print(f"  {nome:<22} {statistics.median(latencias):7.3f} {p95:7.3f} ms "
+          f"R1={r1:.3f} R2={r2:.3f} RL={rl:.3f} {tamanho:6.0f} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticoes", type=int, default=100, help="execuções por notícia na medição de latência")
+    parser.add_argument("--max-chars", type=int, default=400, help="tamanho máximo do resumo extrativo")
+    parser.add_argument("--concatenar", action="store_true",
+                        help="junta os resumos do mesmo nicho para formar textos longos")
+    args = parser.parse_args()
+
+    corpus = carregar(args.concatenar)
+    media = statistics.mean(len(texto) for texto, _ in corpus)
+    print(f"\n📊 {len(corpus)} notícias, {media:.0f} caracteres em média (referência: título)")
+    print(f"  {'método':<22} {'p50':>7} {'p95':>7}")
+    for nome, funcao in metodos(args.max_chars).items():
+        executar(nome, funcao, corpus, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark da verificação de títulos duplicados do publicador
+
+Compara, para corpora sintéticos de títulos publicados de tamanhos
+crescentes, a latência por post de:
+- comparação completa: SequenceMatcher contra todos os títulos publicados
+- índice de trigramas (dedup_index.TitleIndex) + SequenceMatcher nos candidatos
+
+As consultas são metade quase-duplicatas (uma palavra trocada ou um erro de
+digitação num título existente) e metade títulos novos. O recall do índice é
+medido contra a comparação completa, que é a referência.
+
+Uso:
+    python scripts/benchmark_title_index.py --tamanhos 100,1000,10000,50000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+
+# Adicionar path do projeto
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_index import TitleIndex  # noqa: E402
+
+THRESHOLD = 0.8
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noticias_local.json")
+
+
+def carregar_vocabulario():
+    """Vocabulário a partir das notícias de exemplo do projeto"""
+    with open(FIXTURE, encoding="utf-8") as f:
+        noticias = json.load(f)
+    palavras = set()
+    for noticia in noticias:
+        texto = f"{noticia.get('titulo', '')} {noticia.get('resumo', '')}"
+        palavras.update(re.findall(r"[^\W\d_]+", texto.lower()))
+    return sorted(palavras)
+
+
+def gerar_titulo(rng, vocab):
+    return " ".join(rng.choices(vocab, k=rng.randint(7, 13))).capitalize()
+
+
+def perturbar(rng, vocab, titulo):
+    palavras = titulo.split()
+    if rng.random() < 0.5:
+        palavras[rng.randrange(len(palavras))] = rng.choice(vocab)
+    else:
+        i = rng.randrange(len(palavras))
+        palavra = palavras[i]
+        j = rng.randrange(len(palavra))
+        palavras[i] = palavra[:j] + rng.choice("aeiou") + palavra[j + 1:]
+    return " ".join(palavras)
+
+
+def comparacao_completa(titulos, titulo):
+    """Algoritmo original de is_duplicate_content"""
+    normalizado = titulo.lower().strip()
+    return any(SequenceMatcher(None, normalizado, t).ratio() > THRESHOLD for t in titulos)
+
+
+def medir(funcao, consultas):
+    inicio = time.perf_counter()
+    resultados = [funcao(titulo) for titulo in consultas]
+    return resultados, (time.perf_counter() - inicio) / len(consultas)
+
+
+def executar(tamanho, total_consultas, amostra_completa, vocab, seed):
+    rng = random.Random(seed)
+    corpus = [gerar_titulo(rng, vocab) for _ in range(tamanho)]
+    consultas = [
+        perturbar(rng, vocab, rng.choice(corpus)) if i % 2 == 0 else gerar_titulo(rng, vocab)
+        for i in range(total_consultas)
+    ]
+
+    print(f"\n📊 {tamanho} títulos publicados, {total_consultas} consultas")
+
+    normalizados = [t.lower().strip() for t in corpus]
+    amostra = consultas[:amostra_completa]
+    referencia, latencia = medir(lambda t: comparacao_completa(normalizados, t), amostra)
+    print(f"  {'comparação completa':<20} {latencia * 1000:9.2f} ms/post (amostra de {len(amostra)})")
+
+    inicio = time.perf_counter()
+    index = TitleIndex(threshold=THRESHOLD)
+    for i, titulo in enumerate(corpus):
+        index.add(str(i), titulo, 0)
+    construcao = time.perf_counter() - inicio
+
+    resultados, latencia = medir(lambda t: index.find_duplicate(t) is not None, consultas)
+    positivos = [r for r, ref in zip(resultados, referencia) if ref]
+    falsos = sum(1 for r, ref in zip(resultados, referencia) if r and not ref)
+    recall = sum(positivos) / len(positivos) if positivos else 1.0
+    print(f"  {'índice de trigramas':<20} {latencia * 1000:9.2f} ms/post "
+          f"recall={recall:6.1%} falsos+={falsos} (amostra) construção {construcao:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanhos", default="100,1000,10000,50000",
+                        help="tamanhos do corpus separados por vírgula")
+    parser.add_argument("--consultas", type=int, default=200, help="número de consultas")
+    parser.add_argument("--amostra-completa", type=int, default=200,
+                        help="consultas comparadas com todos os títulos (referência de recall)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    vocab = carregar_vocabulario()
+    for tamanho in [int(t) for t in args.tamanhos.split(",")]:
+        executar(tamanho, args.consultas, args.amostra_completa, vocab, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -127,13 +127,13 @@ rm -f *.zip
 
 # Empacotar cada Lambda
 log "📦 Empacotando coletor..."
-zip -j lambda_coletor.zip lambda_coletor.py utils.py summarize_ai.py
+zip -j lambda_coletor.zip lambda_coletor.py utils.py summarize_ai.py summary_cache.py extractive_summary.py language_detect.py language_profiles.json feed_state.py feed_stream.py dedup_index.py content_filter.py data_access.py
 
 log "📦 Empacotando publicador..."
-zip -j lambda_publicar_wordpress.zip lambda_publicar_wordpress.py utils.py
+zip -j lambda_publicar_wordpress.zip lambda_publicar_wordpress.py utils.py dedup_index.py read_model.py data_access.py
 
 log "📦 Empacotando limpeza..."
-zip -j lambda_limpeza.zip lambda_limpeza.py utils.py
+zip -j lambda_limpeza.zip lambda_limpeza.py utils.py data_access.py
 
 log "📦 Empacotando health check..."
 zip -j lambda_health_check.zip lambda_health_check.py utils.py
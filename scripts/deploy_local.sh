@@ -286,6 +286,15 @@ zip -r dist/lambda_coletor.zip \
     utils.py \
     config.py \
     summarize_ai.py \
+    summary_cache.py \
+    extractive_summary.py \
+    language_detect.py \
+    language_profiles.json \
+    feed_state.py \
+    feed_stream.py \
+    dedup_index.py \
+    content_filter.py \
+    data_access.py \
     -x "*.pyc" "__pycache__/*" "*.git*"
 
 log_info "Criando lambda_publicar_wordpress.zip..."
@@ -293,6 +302,9 @@ zip -r dist/lambda_publicar_wordpress.zip \
     lambda_publicar_wordpress.py \
     utils.py \
     config.py \
+    dedup_index.py \
+    read_model.py \
+    data_access.py \
     -x "*.pyc" "__pycache__/*" "*.git*"
 
 log_info "Criando lambda_limpeza.zip..."
@@ -300,6 +312,7 @@ zip -r dist/lambda_limpeza.zip \
     lambda_limpeza.py \
     utils.py \
     config.py \
+    data_access.py \
     -x "*.pyc" "__pycache__/*" "*.git*"
 
 log_info "Criando lambda_health_check.zip..."
@@ -314,6 +327,8 @@ zip -r dist/lambda_api_noticias.zip \
     lambda_api_noticias.py \
     utils.py \
     config.py \
+    read_model.py \
+    data_access.py \
     -x "*.pyc" "__pycache__/*" "*.git*"
 
 log_success "Pacotes Lambda criados!"
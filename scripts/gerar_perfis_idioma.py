@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Gera language_profiles.json a partir dos perfis do langdetect
+
+Mantém, por idioma, os n-gramas de caracteres (1 a 3) mais frequentes e o
+log da probabilidade de cada um dentro do seu tamanho de n-grama. O arquivo
+resultante é usado pelo NgramLanguageDetector (language_detect), que assim
+não depende do langdetect em tempo de execução.
+
+Uso:
+    python scripts/gerar_perfis_idioma.py
+    python scripts/gerar_perfis_idioma.py --idiomas pt,en,es --top 300,200,60
+"""
+
+import argparse
+import json
+import math
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DESTINO = os.path.join(ROOT, "language_profiles.json")
+
+
+def gerar(idioma, tops):
+    """Perfil compacto de um idioma: {"n-grama": log P(n-grama | tamanho)}"""
+    import langdetect
+
+    caminho = os.path.join(os.path.dirname(langdetect.__file__), "profiles", idioma)
+    with open(caminho, encoding="utf-8") as f:
+        perfil = json.load(f)
+
+    ngramas = {}
+    minimos = []
+    for n, top in zip((3, 2, 1), tops):
+        total = perfil["n_words"][n - 1]
+        maiores = sorted(((g, c) for g, c in perfil["freq"].items() if len(g) == n),
+                         key=lambda item: item[1], reverse=True)[:top]
+        for grama, contagem in maiores:
+            ngramas[grama] = round(math.log(contagem / total), 3)
+        minimos.append(round(math.log(maiores[-1][1] / total), 3))
+    return {"ngramas": ngramas, "minimo": min(minimos)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--idiomas", default="pt,en,es,fr,de,it", help="idiomas separados por vírgula")
+    parser.add_argument("--top", default="300,150,60",
+                        help="n-gramas mantidos de tamanho 3, 2 e 1")
+    args = parser.parse_args()
+
+    tops = [int(t) for t in args.top.split(",")]
+    perfis = {idioma: gerar(idioma, tops) for idioma in args.idiomas.split(",")}
+    with open(DESTINO, "w", encoding="utf-8") as f:
+        json.dump(perfis, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    print(f"✅ {len(perfis)} perfis gravados em {DESTINO} ({os.path.getsize(DESTINO) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Perfil do tempo de importação dos handlers Lambda (partida a frio)
+
+Importa cada handler num processo Python novo com `-X importtime`, várias
+vezes, e mostra a mediana do tempo total e o custo de cada pacote (soma do
+tempo próprio de todos os módulos do pacote), do maior para o menor. Com
+isso dá para ver qual dependência pesa na partida a frio de cada função.
+
+Uso:
+    python scripts/profile_imports.py
+    python scripts/profile_imports.py --handlers lambda_coletor --repeticoes 7 --top 15
+    python scripts/profile_imports.py --json > imports.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HANDLERS = [
+    "lambda_coletor",
+    "lambda_publicar_wordpress",
+    "lambda_limpeza",
+    "lambda_api_noticias",
+    "lambda_health_check"
+]
+
+
+def importar(modulo: str) -> Tuple[int, Dict[str, int]]:
+    """
+    Importa o módulo num processo novo
+
+    Returns:
+        (tempo total em µs, tempo próprio em µs por módulo importado)
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}: {resultado.stderr.strip().splitlines()[-1]}")
+
+    proprio = {}
+    total = 0
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        self_us, cumulativo_us, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        proprio[nome] = int(self_us)
+        if nome == modulo:
+            total = int(cumulativo_us)
+    return total, proprio
+
+
+def perfilar(modulo: str, repeticoes: int) -> Dict[str, object]:
+    """Mediana do tempo total e do custo por pacote em várias importações"""
+    totais: List[int] = []
+    por_pacote: Dict[str, List[int]] = defaultdict(list)
+
+    for _ in range(repeticoes):
+        total, proprio = importar(modulo)
+        totais.append(total)
+        pacotes: Dict[str, int] = defaultdict(int)
+        for nome, self_us in proprio.items():
+            pacotes[nome.split(".")[0]] += self_us
+        for pacote, tempo in pacotes.items():
+            por_pacote[pacote].append(tempo)
+
+    pacotes_ms = {
+        pacote: round(statistics.median(tempos) / 1000, 2)
+        for pacote, tempos in por_pacote.items()
+    }
+    return {
+        "handler": modulo,
+        "total_ms": round(statistics.median(totais) / 1000, 2),
+        "pacotes_ms": dict(sorted(pacotes_ms.items(), key=lambda item: item[1], reverse=True))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--handlers", default=",".join(HANDLERS),
+                        help="módulos dos handlers separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=5, help="importações por handler")
+    parser.add_argument("--top", type=int, default=10, help="pacotes listados por handler")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args()
+
+    perfis = [perfilar(modulo, args.repeticoes) for modulo in args.handlers.split(",")]
+
+    if args.json:
+        print(json.dumps(perfis, indent=2, ensure_ascii=False))
+        return
+
+    for perfil in perfis:
+        print(f"\n⏱️  {perfil['handler']}: {perfil['total_ms']:.1f} ms (mediana de {args.repeticoes})")
+        for pacote, tempo in list(perfil["pacotes_ms"].items())[:args.top]:
+            print(f"  {pacote:<28} {tempo:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
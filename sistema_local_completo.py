@@ -13,12 +13,16 @@ from difflib import SequenceMatcher
 import logging
 import os
 
+from feed_state import FeedState, LocalFeedStateStore
+from utils import get_http_client
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
 
 # Configurações
 ARQUIVO_NOTICIAS = "noticias_local.json"
 ARQUIVO_FONTES = "fontes_local.json"
+ARQUIVO_ESTADO_FEEDS = "feed_state_local.json"
 ARQUIVO_LOG = "sistema_local.log"
 
 # Fontes expandidas (subconjunto das principais)
@@ -68,6 +72,7 @@ class SistemaLocalNoticias:
         self.noticias = self.carregar_noticias()
         self.fontes = FONTES_SISTEMA
         self.log_file = ARQUIVO_LOG
+        self.estado_feeds = LocalFeedStateStore(ARQUIVO_ESTADO_FEEDS)
 
     def carregar_noticias(self):
         """Carrega notícias do arquivo JSON"""
@@ -111,6 +116,17 @@ class SistemaLocalNoticias:
                 return True
         return False
 
+    def baixar_feed(self, url, estado=None):
+        """Baixa e interpreta um feed pelo cliente HTTP compartilhado (None se 304)"""
+        headers = estado.conditional_headers() if estado else {}
+        response = get_http_client().get(url, headers=headers)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        # feedparser só reconhece os cabeçalhos em minúsculas
+        cabecalhos = {chave.lower(): valor for chave, valor in response.headers.items()}
+        return feedparser.parse(response.content, response_headers=cabecalhos)
+
     def coletar_noticias(self):
         """Coleta notícias das fontes RSS"""
         self.log_evento("🚀 Iniciando coleta de notícias")
@@ -124,15 +140,22 @@ class SistemaLocalNoticias:
 
             try:
                 self.log_evento(f"📰 Coletando de: {fonte['name']} ({fonte['nicho']})")
-                feed = feedparser.parse(fonte["rss"])
+                estado = self.estado_feeds.get(fonte["rss"])
+                feed = self.baixar_feed(fonte["rss"], estado)
+
+                if feed is None:
+                    self.log_evento(f"⏭️  {fonte['name']}: Feed sem alterações")
+                    continue
 
                 if not feed.entries:
                     self.log_evento(
-                        f"⚠️  {"
-                            fonte['name']}: Sem notícias disponíveis")"
+                        f"⚠️  {fonte['name']}: Sem notícias disponíveis")
                     continue
 
-                for entry in feed.entries[:3]:  # Máximo 3 notícias por fonte
+                novo_estado = FeedState.from_feed(fonte["rss"], feed, previous=estado)
+                entradas = estado.filter_new(feed.entries) if estado else feed.entries
+
+                for entry in entradas[:3]:  # Máximo 3 notícias por fonte
                     title = entry.get("title", "(Sem título)")
                     link = entry.get("link", "")
                     description = entry.get("summary", "")
@@ -170,6 +193,8 @@ class SistemaLocalNoticias:
                         self.log_evento(
                             f"❌ {fonte['name']}: {title[:50]}... (duplicada)")
 
+                self.estado_feeds.save(novo_estado)
+
             except Exception as e:
                 self.log_evento(f"❌ Erro ao coletar de {fonte['name']}: {e}")
 
@@ -205,7 +230,7 @@ class SistemaLocalNoticias:
 
         for fonte in self.fontes:
             try:
-                feed = feedparser.parse(fonte["rss"])
+                feed = self.baixar_feed(fonte["rss"])
                 if not feed.entries:
                     fontes_quebradas.append(fonte["name"])
                     self.log_evento(f"⚠️  {fonte['name']}: Sem notícias")
@@ -218,8 +243,7 @@ class SistemaLocalNoticias:
 
         if fontes_quebradas:
             self.log_evento(
-                f"⚠️  Fontes com problemas: {"
-                    ', '.join(fontes_quebradas)}")"
+                f"⚠️  Fontes com problemas: {', '.join(fontes_quebradas)}")
         else:
             self.log_evento("✅ Todas as fontes estão funcionando")
 
@@ -11,53 +11,427 @@ Exemplo:
 from summarize_ai import resumir_com_ia
 resumo = resumir_com_ia("Seu texto aqui", "SUA_CHAVE_OPENAI")
 print(resumo)
+
+Para muitos textos, use o SummaryPipeline (get_summary_pipeline()):
+- o cliente OpenAI é criado uma vez por processo e reaproveitado
+- vários artigos vão num único prompt, com resposta em JSON estruturado
+- os resultados ficam em cache pelo hash do conteúdo, na memória e na
+  tabela djblog-summary-cache (summary_cache), então textos repetidos
+  (duplicatas entre fontes, recoletas, outros containers) não voltam à API
+- os lotes rodam em paralelo sob um orçamento de tokens por minuto
+
+Sem a OpenAI, resumir_texto usa o resumo extrativo local
+(extractive_summary), que não faz chamadas de rede.
+
+OPENAI_BASE_URL aponta o cliente para outro servidor compatível (por
+exemplo, um stub local nos testes).
 """
 
-import openai
+import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from extractive_summary import resumir_extrativo
+from summary_cache import (
+    DynamoDBSummaryCache,
+    MemorySummaryCache,
+    TieredSummaryCache,
+    cache_key
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
 
+OP_RESUMO = "resumo"
+OP_TRADUCAO = "traducao"
+
+INSTRUCOES = {
+    OP_RESUMO: "Resuma cada texto em 3 frases objetivas e curtas, no idioma do texto.",
+    OP_TRADUCAO: ("Traduza cada texto para o idioma {idioma} de forma natural e jornalística, "
+                  "mantendo o sentido original.")
+}
+
+SYSTEM_PROMPT = (
+    "Você recebe um JSON no formato {{\"textos\": [{{\"id\": \"...\", \"texto\": \"...\"}}]}}. "
+    "{instrucao} Responda apenas com um JSON no formato "
+    "{{\"resultados\": [{{\"id\": \"...\", \"texto\": \"...\"}}]}}, com um resultado para cada id recebido."
+)
+
+# Aproximação de tokens por caractere (em português e inglês, ~4 caracteres por token)
+CHARS_POR_TOKEN = 4
+
+# Tokens de saída estimados por resumo (3 frases curtas)
+TOKENS_RESUMO = 120
+
+# Tempo máximo de uma chamada (um lote inteiro de resumos)
+OPENAI_TIMEOUT = 60.0
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], object] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    Retorna o cliente OpenAI do processo para a chave e o endereço dados
+
+    O cliente mantém o pool de conexões HTTP, então criá-lo a cada chamada
+    desperdiça o handshake TLS. É thread-safe e compartilhado pelos lotes.
+    O httpx.Client é passado explicitamente: o cliente padrão da openai
+    1.12 usa o argumento proxies, removido no httpx 0.28.
+
+    Args:
+        api_key: Chave da API
+        base_url: Endereço da API (opcional; padrão da biblioteca)
+
+    Returns:
+        Instância de openai.OpenAI
+    """
+    key = (api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            import httpx
+            import openai
+            client = openai.OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=httpx.Client(timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=5.0), follow_redirects=True)
+            )
+            _clients[key] = client
+        return client
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa barata de tokens de um texto"""
+    return len(texto) // CHARS_POR_TOKEN + 1
+
+
+class TokenBudget:
+    """
+    Orçamento de tokens por minuto, no modelo token bucket
+
+    Cada chamada reserva a estimativa de tokens antes de sair e, com a
+    resposta, acerta a diferença para o consumo real (usage.total_tokens).
+    Sem saldo, a chamada espera só o tempo necessário. Seguro entre threads.
+    """
+
+    def __init__(self, tokens_per_minute: int, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            tokens_per_minute: Limite de tokens por minuto (<= 0 desliga)
+            clock: Relógio monotônico (injetável nos testes)
+            sleep: Função de espera (injetável nos testes)
+        """
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Reserva tokens, esperando se o orçamento do minuto acabou
+
+        Args:
+            tokens: Tokens estimados da chamada
+
+        Returns:
+            Tempo esperado em segundos
+        """
+        if self.capacity <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Uma chamada maior que o orçamento inteiro ainda precisa passar
+            self._tokens -= min(float(tokens), self.capacity)
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.total_wait += wait
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Devolve (ou cobra) a diferença entre a estimativa e o consumo real"""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + estimated - actual)
+
+
+class SummaryPipeline:
+    """
+    Resume ou traduz muitos textos com poucas chamadas à API
+
+    Os textos sem resultado em cache são agrupados em lotes de até
+    `batch_size` textos e `max_batch_tokens` tokens estimados; cada lote é
+    uma chamada com response_format JSON, e os lotes rodam em paralelo
+    (até `concurrency`) sob o TokenBudget. Um lote que falha, ou um id que
+    a resposta não trouxe, fica fora do resultado: quem chama decide o
+    fallback. O cache pode ser qualquer objeto de summary_cache (get_many,
+    set_many e stats); o padrão é só a memória.
+    """
+
+    def __init__(self, client, model: str = "gpt-3.5-turbo", batch_size: int = 8,
+                 concurrency: int = 4, max_batch_tokens: int = 6000,
+                 budget: Optional[TokenBudget] = None, cache=None):
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_batch_tokens = max_batch_tokens
+        self.budget = budget or TokenBudget(0)
+        self.cache = cache if cache is not None else MemorySummaryCache()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.tokens = 0
+        self.failures = 0
+
+    def summarize(self, textos: Dict[str, str]) -> Dict[str, str]:
+        """
+        Resume vários textos
+
+        Args:
+            textos: Mapa id -> texto
+
+        Returns:
+            Mapa id -> resumo, só com os textos resumidos com sucesso
+        """
+        return self.run(OP_RESUMO, textos)
+
+    def translate(self, textos: Dict[str, str], idioma: str) -> Dict[str, str]:
+        """
+        Traduz vários textos
+
+        Args:
+            textos: Mapa id -> texto
+            idioma: Idioma de destino
+
+        Returns:
+            Mapa id -> tradução, só com os textos traduzidos com sucesso
+        """
+        return self.run(OP_TRADUCAO, textos, idioma)
+
+    def run(self, op: str, textos: Dict[str, str], idioma: Optional[str] = None) -> Dict[str, str]:
+        """
+        Executa a operação, usando o cache e agrupando o restante em lotes
+
+        Args:
+            op: OP_RESUMO ou OP_TRADUCAO
+            textos: Mapa id -> texto
+            idioma: Idioma de destino (só na tradução)
+
+        Returns:
+            Mapa id -> resultado
+        """
+        resultados: Dict[str, str] = {}
+        pendentes: Dict[str, List[str]] = {}
+        conteudo: Dict[str, str] = {}
+
+        for item_id, texto in textos.items():
+            if not texto:
+                continue
+            key = cache_key(op, self.model, texto, idioma)
+            # Textos iguais vão uma vez só para a API
+            pendentes.setdefault(key, []).append(item_id)
+            conteudo[key] = texto
+
+        for key, cached in self.cache.get_many(list(pendentes)).items():
+            for item_id in pendentes.pop(key):
+                resultados[item_id] = cached
+                with self._stats_lock:
+                    self.cache_hits += 1
+
+        lotes = self._batches([(key, conteudo[key]) for key in pendentes], op)
+        novos: Dict[str, str] = {}
+        if lotes:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(lotes))) as executor:
+                for respostas in executor.map(lambda lote: self._call(op, lote, idioma), lotes):
+                    novos.update(respostas)
+                    for key, valor in respostas.items():
+                        for item_id in pendentes[key]:
+                            resultados[item_id] = valor
+        if novos:
+            self.cache.set_many(novos)
+
+        return resultados
+
+    def stats(self) -> Dict[str, object]:
+        """Contadores de uso da API e do cache"""
+        return {
+            "requisicoes": self.requests,
+            "cache_hits": self.cache_hits,
+            "tokens": self.tokens,
+            "falhas": self.failures,
+            "espera_orcamento": round(self.budget.total_wait, 3),
+            "cache": self.cache.stats()
+        }
+
+    def _estimate(self, op: str, texto: str) -> int:
+        entrada = estimar_tokens(texto)
+        return entrada + (TOKENS_RESUMO if op == OP_RESUMO else entrada)
+
+    def _batches(self, itens: List[Tuple[str, str]], op: str) -> List[List[Tuple[str, str]]]:
+        """Agrupa os textos respeitando o número de itens e os tokens por lote"""
+        lotes: List[List[Tuple[str, str]]] = []
+        atual: List[Tuple[str, str]] = []
+        tokens = 0
+        for key, texto in itens:
+            estimado = self._estimate(op, texto)
+            if atual and (len(atual) >= self.batch_size or tokens + estimado > self.max_batch_tokens):
+                lotes.append(atual)
+                atual, tokens = [], 0
+            atual.append((key, texto))
+            tokens += estimado
+        if atual:
+            lotes.append(atual)
+        return lotes
+
+    def _call(self, op: str, lote: List[Tuple[str, str]], idioma: Optional[str]) -> Dict[str, str]:
+        """
+        Envia um lote e lê a resposta estruturada
+
+        Returns:
+            Mapa chave de cache -> resultado (vazio se a chamada falhar)
+        """
+        # Ids curtos no prompt economizam tokens; o índice volta para a chave
+        entrada = json.dumps({"textos": [{"id": str(i), "texto": texto} for i, (_, texto) in enumerate(lote)]},
+                             ensure_ascii=False)
+        instrucao = INSTRUCOES[op].format(idioma=idioma)
+        estimado = estimar_tokens(SYSTEM_PROMPT) + sum(self._estimate(op, texto) for _, texto in lote)
+        self.budget.acquire(estimado)
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT.format(instrucao=instrucao)},
+                    {"role": "user", "content": entrada}
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Erro na chamada à OpenAI ({len(lote)} textos): {e}")
+            self.budget.settle(estimado, 0)
+            with self._stats_lock:
+                self.failures += 1
+            return {}
+
+        usage = getattr(response, "usage", None)
+        consumido = getattr(usage, "total_tokens", None) or estimado
+        self.budget.settle(estimado, consumido)
+        with self._stats_lock:
+            self.requests += 1
+            self.tokens += consumido
+
+        try:
+            resultados = json.loads(response.choices[0].message.content)["resultados"]
+            por_indice = {str(r["id"]): str(r["texto"]).strip() for r in resultados if r.get("texto")}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Resposta da OpenAI fora do formato esperado: {e}")
+            with self._stats_lock:
+                self.failures += 1
+            return {}
+
+        faltando = len(lote) - sum(str(i) in por_indice for i in range(len(lote)))
+        if faltando:
+            logger.warning(f"Resposta da OpenAI sem {faltando} de {len(lote)} textos")
+        return {key: por_indice[str(i)] for i, (key, _) in enumerate(lote) if str(i) in por_indice}
+
+
+_pipelines: Dict[Optional[str], SummaryPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+
+def build_summary_cache(config) -> TieredSummaryCache:
+    """
+    Monta o cache em camadas a partir de config.summary
+
+    Args:
+        config: Configuração
+
+    Returns:
+        Cache em memória, com a tabela do DynamoDB atrás se
+        SUMMARY_CACHE_TABLE_NAME não estiver vazio
+    """
+    ttl = config.summary.cache_ttl_days * 24 * 3600
+    memory = MemorySummaryCache(config.summary.cache_memory_size, ttl=ttl)
+    store = None
+    if config.database.summary_cache_table_name:
+        store = DynamoDBSummaryCache(config.get_dynamodb_table(config.database.summary_cache_table_name), ttl=ttl)
+    return TieredSummaryCache(memory, store)
+
+
+def get_summary_pipeline(api_key: Optional[str] = None) -> SummaryPipeline:
+    """
+    Retorna o pipeline do processo para a chave, configurado por config.summary
+
+    Criado uma vez por container: o cliente, o cache em memória e o
+    orçamento de tokens valem para todas as invocações "quentes"; a tabela
+    de cache vale entre containers. Se a configuração não
+    puder ser lida, usa os padrões do SummaryPipeline.
+
+    Args:
+        api_key: Chave da API (padrão: OPENAI_API_KEY da configuração)
+    """
+    with _pipelines_lock:
+        pipeline = _pipelines.get(api_key)
+        if pipeline is None:
+            try:
+                from config import get_config
+                config = get_config()
+                summary = config.summary
+                pipeline = SummaryPipeline(
+                    get_openai_client(api_key or config.api.openai_api_key, summary.base_url),
+                    model=summary.model,
+                    batch_size=summary.batch_size,
+                    concurrency=summary.concurrency,
+                    max_batch_tokens=summary.max_batch_tokens,
+                    budget=TokenBudget(summary.tokens_per_minute),
+                    cache=build_summary_cache(config)
+                )
+            except Exception as e:
+                logger.warning(f"Configuração de resumo indisponível, usando padrão: {e}")
+                pipeline = SummaryPipeline(get_openai_client(api_key))
+            _pipelines[api_key] = pipeline
+        return pipeline
+
+
+def reset_summary_pipeline() -> None:
+    """Descarta os pipelines e os clientes em cache (usado nos testes)"""
+    with _pipelines_lock:
+        _pipelines.clear()
+    with _clients_lock:
+        _clients.clear()
+
 
 def resumir_com_ia(texto, api_key):
-    """Resume texto usando OpenAI GPT-3.5-turbo"""
-    try:
-        client = openai.OpenAI(api_key=api_key)
-        prompt = (
-            f"Resuma o texto a seguir em 3 frases objetivas e curtas:\n\n{texto}"
-        )
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        logger.error(f"Erro ao resumir com IA: {e}")
-        return texto[:200] + ("..." if len(texto) > 200 else "")
+    """Resume texto usando a OpenAI (com cache pelo conteúdo)"""
+    resultado = get_summary_pipeline(api_key).summarize({"0": texto}).get("0")
+    if resultado is None:
+        return resumir_texto(texto)
+    return resultado
 
 
 def traduzir_com_ia(texto, api_key, idioma_destino):
-    """Traduz texto usando OpenAI GPT-3.5-turbo"""
-    try:
-        client = openai.OpenAI(api_key=api_key)
-        prompt = (
-            f"Traduza o texto a seguir para o idioma {idioma_destino} de forma natural e jornalística, mantendo o sentido original.\n\nTexto:\n{texto}"
-        )
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        logger.error(f"Erro ao traduzir com IA: {e}")
-        return texto
+    """Traduz texto usando a OpenAI (com cache pelo conteúdo)"""
+    return get_summary_pipeline(api_key).translate({"0": texto}, idioma_destino).get("0", texto)
 
 
 def resumir_texto(texto):
-    """Resume texto de forma simples (fallback)"""
+    """Resume texto localmente, com o resumo extrativo (fallback)"""
     try:
-        return texto[:200] + ("..." if len(texto) > 200 else "")
+        return resumir_extrativo(texto, max_chars=200)
     except Exception as e:
         logger.error(f"Erro ao resumir texto: {e}")
         return texto
@@ -0,0 +1,281 @@
+"""
+Cache de resumos e traduções endereçado pelo conteúdo
+
+A chave combina a operação, o modelo, o idioma de destino e o hash SHA-256
+do texto, então o mesmo artigo coletado em várias execuções ou nichos é
+enviado à OpenAI uma vez só enquanto o resultado não expira.
+
+Há duas camadas:
+- MemorySummaryCache: LRU no container, com TTL
+- DynamoDBSummaryCache: tabela djblog-summary-cache, compartilhada entre
+  containers e execuções, com expiração pelo TTL do DynamoDB
+
+TieredSummaryCache consulta a memória primeiro, busca as chaves que
+faltam no DynamoDB com BatchGetItem e promove o que encontrar para a
+memória. Os contadores de acerto por camada saem em stats().
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils import setup_logging
+
+logger = setup_logging()
+
+# Limite de chaves por BatchGetItem
+BATCH_GET_SIZE = 100
+
+# Reenvios das UnprocessedKeys do BatchGetItem
+BATCH_MAX_RETRIES = 3
+
+# Validade padrão de um resultado (o modelo e o prompt não mudam com frequência)
+TTL_PADRAO = 30 * 24 * 3600
+
+
+def content_hash(texto: str) -> str:
+    """Hash SHA-256 do texto"""
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def cache_key(op: str, model: str, texto: str, idioma: Optional[str] = None) -> str:
+    """
+    Chave de cache de um resultado
+
+    Args:
+        op: Operação (resumo ou tradução)
+        model: Modelo da OpenAI
+        texto: Texto de entrada
+        idioma: Idioma de destino (só na tradução)
+
+    Returns:
+        "op#modelo#idioma#hash", legível na tabela do DynamoDB
+    """
+    return f"{op}#{model}#{idioma or '-'}#{content_hash(texto)}"
+
+
+class MemorySummaryCache:
+    """Cache LRU em memória dos resultados, pela chave de conteúdo"""
+
+    def __init__(self, max_entries: int = 5000, ttl: float = TTL_PADRAO, clock=time.monotonic):
+        """
+        Args:
+            max_entries: Número máximo de resultados guardados
+            ttl: Validade de cada resultado em segundos (<= 0: sem expiração)
+            clock: Relógio monotônico (injetável nos testes)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.set_many({key: value})
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca vários resultados
+
+        Args:
+            keys: Chaves de cache
+
+        Returns:
+            Mapa chave -> resultado, só com as chaves encontradas e válidas
+        """
+        found: Dict[str, str] = {}
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl > 0 and entry[1] <= now:
+                    del self._entries[key]
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+                self.hits += 1
+        return found
+
+    def set_many(self, values: Dict[str, str]) -> None:
+        """Guarda vários resultados, descartando os menos usados acima do limite"""
+        expira = self.clock() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (value, expira)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Acertos, faltas e tamanho do cache"""
+        return {"hits": self.hits, "misses": self.misses, "tamanho": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DynamoDBSummaryCache:
+    """
+    Persiste os resultados na tabela djblog-summary-cache
+
+    Chave: chave (HASH), no formato de cache_key. O item guarda também a
+    operação, o modelo, o idioma e o hash do texto, para consulta, e o
+    atributo "ttl" com a expiração. Como o DynamoDB apaga itens expirados
+    com atraso, a leitura também descarta os que já passaram do ttl.
+    """
+
+    def __init__(self, table, ttl: int = TTL_PADRAO):
+        self.table = table
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca vários resultados com BatchGetItem
+
+        Args:
+            keys: Chaves de cache
+
+        Returns:
+            Mapa chave -> resultado; chaves com erro contam como falta
+        """
+        keys = list(dict.fromkeys(keys))
+        client = self.table.meta.client
+        now = int(time.time())
+        found: Dict[str, str] = {}
+
+        for start in range(0, len(keys), BATCH_GET_SIZE):
+            request = {
+                self.table.name: {
+                    'Keys': [{'chave': key} for key in keys[start:start + BATCH_GET_SIZE]],
+                    'ProjectionExpression': 'chave, texto, #ttl',
+                    'ExpressionAttributeNames': {'#ttl': 'ttl'}
+                }
+            }
+            try:
+                for attempt in range(BATCH_MAX_RETRIES + 1):
+                    response = client.batch_get_item(RequestItems=request)
+                    for item in response.get('Responses', {}).get(self.table.name, []):
+                        if int(item.get('ttl', now + 1)) > now:
+                            found[item['chave']] = item['texto']
+
+                    request = response.get('UnprocessedKeys') or {}
+                    if not request:
+                        break
+                    time.sleep(min(0.05 * 2 ** attempt, 1.0))
+            except Exception as e:
+                logger.warning(f"Erro ao ler o cache de resumos: {e}")
+                self.errors += 1
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, values: Dict[str, str]) -> None:
+        """Grava vários resultados com BatchWriteItem (erros só são registrados)"""
+        if not values:
+            return
+        now = int(time.time())
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=['chave']) as batch:
+                for key, value in values.items():
+                    op, model, idioma, hash_conteudo = key.split("#", 3)
+                    batch.put_item(Item={
+                        'chave': key,
+                        'op': op,
+                        'modelo': model,
+                        'idioma': idioma,
+                        'hash_conteudo': hash_conteudo,
+                        'texto': value,
+                        'criado_em': now,
+                        'ttl': now + self.ttl
+                    })
+        except Exception as e:
+            logger.warning(f"Erro ao gravar o cache de resumos: {e}")
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Acertos, faltas e erros de acesso à tabela"""
+        return {"hits": self.hits, "misses": self.misses, "erros": self.errors}
+
+
+class TieredSummaryCache:
+    """Memória do container na frente de uma camada persistente (opcional)"""
+
+    def __init__(self, memory: MemorySummaryCache, store=None):
+        """
+        Args:
+            memory: Camada em memória do container
+            store: Camada persistente (DynamoDBSummaryCache ou outra com
+                get_many, set_many e stats), ou None para só memória
+        """
+        self.memory = memory
+        self.store = store
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.set_many({key: value})
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca na memória e, para o que faltar, na camada persistente
+
+        Args:
+            keys: Chaves de cache
+
+        Returns:
+            Mapa chave -> resultado, só com as chaves encontradas
+        """
+        keys = list(dict.fromkeys(keys))
+        found = self.memory.get_many(keys)
+        faltando = [key for key in keys if key not in found]
+        persistidos = self.store.get_many(faltando) if self.store is not None and faltando else {}
+        if persistidos:
+            self.memory.set_many(persistidos)
+            found.update(persistidos)
+
+        with self._lock:
+            self.lookups += len(keys)
+            self.memory_hits += len(found) - len(persistidos)
+            self.store_hits += len(persistidos)
+        return found
+
+    def set_many(self, values: Dict[str, str]) -> None:
+        """Guarda os resultados nas duas camadas"""
+        self.memory.set_many(values)
+        if self.store is not None:
+            self.store.set_many(values)
+
+    def stats(self) -> Dict[str, object]:
+        """Consultas, acertos por camada e taxa de acerto"""
+        acertos = self.memory_hits + self.store_hits
+        return {
+            "consultas": self.lookups,
+            "hits_memoria": self.memory_hits,
+            "hits_dynamodb": self.store_hits,
+            "misses": self.lookups - acertos,
+            "taxa_acerto": round(acertos / self.lookups, 3) if self.lookups else 0.0,
+            "erros_dynamodb": self.store.stats().get("erros", 0) if self.store is not None else 0,
+            "tamanho_memoria": len(self.memory)
+        }
+
+    def __len__(self) -> int:
+        return len(self.memory)
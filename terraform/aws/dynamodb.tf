@@ -28,6 +28,16 @@ resource "aws_dynamodb_table" "djblog_noticias" {
     type = "S"
   }
 
+  attribute {
+    name = "status_publicacao"
+    type = "S"
+  }
+
+  attribute {
+    name = "publicado_em"
+    type = "N"
+  }
+
   global_secondary_index {
     name     = "nicho-data-index"
     hash_key = "nicho"
@@ -42,6 +52,32 @@ resource "aws_dynamodb_table" "djblog_noticias" {
     projection_type = "ALL"
   }
 
+  # Fila de publicação (esparso: só notícias aprovadas têm status_publicacao)
+  global_secondary_index {
+    name     = "status-insercao-index"
+    hash_key = "status_publicacao"
+    range_key = "data_insercao"
+    projection_type = "ALL"
+  }
+
+  # Publicadas por data (esparso: só notícias publicadas têm publicado_em)
+  global_secondary_index {
+    name     = "status-publicacao-index"
+    hash_key = "status_publicacao"
+    range_key = "publicado_em"
+    projection_type = "INCLUDE"
+    non_key_attributes = ["titulo", "nicho", "link", "resumo", "fonte", "idioma", "wp_post_url", "ttl"]
+  }
+
+  # Publicadas por nicho, para a API de leitura paginada (esparso pelo publicado_em)
+  global_secondary_index {
+    name     = "nicho-publicacao-index"
+    hash_key = "nicho"
+    range_key = "publicado_em"
+    projection_type = "INCLUDE"
+    non_key_attributes = ["titulo", "link", "resumo", "fonte", "idioma", "wp_post_url", "ttl"]
+  }
+
   ttl {
     attribute_name = "ttl"
     enabled        = true
@@ -120,6 +156,85 @@ resource "aws_dynamodb_table" "djblog_fontes" {
   }
 }
 
+# Tabela de estado dos feeds (requisições condicionais do coletor)
+resource "aws_dynamodb_table" "djblog_feed_state" {
+  name           = "${var.project_name}-feed-state"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "url"
+
+  attribute {
+    name = "url"
+    type = "S"
+  }
+
+  tags = {
+    Name = "${var.project_name}-feed-state"
+    Description = "ETag, Last-Modified e últimas entradas vistas de cada feed"
+  }
+}
+
+# Tabela com os snapshots do índice de quase-duplicatas por nicho
+resource "aws_dynamodb_table" "djblog_dedup_index" {
+  name           = "${var.project_name}-dedup-index"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "nicho"
+  range_key      = "parte"
+
+  attribute {
+    name = "nicho"
+    type = "S"
+  }
+
+  attribute {
+    name = "parte"
+    type = "N"
+  }
+
+  tags = {
+    Name = "${var.project_name}-dedup-index"
+    Description = "Snapshots do índice MinHash/LSH de quase-duplicatas e do filtro de hashes"
+  }
+}
+
+# Tabela do modelo de leitura da API (últimas notícias publicadas por nicho)
+resource "aws_dynamodb_table" "djblog_read_model" {
+  name           = "${var.project_name}-read-model"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "nicho"
+
+  attribute {
+    name = "nicho"
+    type = "S"
+  }
+
+  tags = {
+    Name = "${var.project_name}-read-model"
+    Description = "Documentos versionados com as últimas notícias publicadas por nicho"
+  }
+}
+
+# Tabela do cache de resumos e traduções da IA (chave = operação#modelo#idioma#hash do texto)
+resource "aws_dynamodb_table" "djblog_summary_cache" {
+  name           = "${var.project_name}-summary-cache"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "chave"
+
+  attribute {
+    name = "chave"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${var.project_name}-summary-cache"
+    Description = "Resumos e traduções da IA endereçados pelo hash do conteúdo"
+  }
+}
+
 # Outputs
 output "dynamodb_table_noticias_name" {
   description = "Nome da tabela principal de notícias"
@@ -139,4 +254,24 @@ output "dynamodb_table_resumidas_name" {
 output "dynamodb_table_fontes_name" {
   description = "Nome da tabela de fontes"
   value       = aws_dynamodb_table.djblog_fontes.name
-} 
\ No newline at end of file
+} 
+
+output "dynamodb_table_feed_state_name" {
+  description = "Nome da tabela de estado dos feeds"
+  value       = aws_dynamodb_table.djblog_feed_state.name
+}
+
+output "dynamodb_table_dedup_index_name" {
+  description = "Nome da tabela do índice de quase-duplicatas"
+  value       = aws_dynamodb_table.djblog_dedup_index.name
+}
+
+output "dynamodb_table_read_model_name" {
+  description = "Nome da tabela do modelo de leitura da API"
+  value       = aws_dynamodb_table.djblog_read_model.name
+}
+
+output "dynamodb_table_summary_cache_name" {
+  description = "Nome da tabela do cache de resumos da IA"
+  value       = aws_dynamodb_table.djblog_summary_cache.name
+}
@@ -101,6 +101,12 @@ variable "max_news_per_source" {
   default     = 3
 }
 
+variable "ai_summary" {
+  description = "Resumir as notícias novas com a OpenAI na coleta"
+  type        = bool
+  default     = false
+}
+
 variable "copys_api_user" {
   description = "Usuário da API Copyscape"
   type        = string
@@ -348,6 +354,10 @@ resource "aws_lambda_function" "coletor" {
       MAX_NEWS_PER_SOURCE = var.max_news_per_source
       COPYS_API_USER    = var.copys_api_user
       COPYS_API_KEY     = var.copys_api_key
+      FEED_STATE_TABLE_NAME = aws_dynamodb_table.djblog_feed_state.name
+      DEDUP_INDEX_TABLE_NAME = aws_dynamodb_table.djblog_dedup_index.name
+      AI_SUMMARY        = var.ai_summary
+      SUMMARY_CACHE_TABLE_NAME = aws_dynamodb_table.djblog_summary_cache.name
     }
   }
 }
@@ -366,6 +376,7 @@ resource "aws_lambda_function" "publicador" {
       WP_USER        = var.wp_user
       WP_APP_PASSWORD= var.wp_app_password
       CATEGORIAS_WP  = jsonencode(var.categorias_wp)
+      READ_MODEL_TABLE_NAME = aws_dynamodb_table.djblog_read_model.name
     }
   }
   source_code_hash = filebase64sha256("../../lambda_publicar_wordpress.zip")
@@ -381,6 +392,8 @@ resource "aws_lambda_function" "limpeza" {
   role          = aws_iam_role.lambda_coletor_role.arn
   environment {
     variables = {
+      CLEANUP_MODE          = "index"
+      CLEANUP_SCAN_SEGMENTS = "4"
     }
   }
   source_code_hash = filebase64sha256("../../lambda_limpeza.zip")
@@ -411,7 +424,7 @@ resource "aws_lambda_function" "api_noticias" {
   timeout       = 10
   environment {
     variables = {
-      # Adicione variáveis se necessário
+      READ_MODEL_TABLE_NAME = aws_dynamodb_table.djblog_read_model.name
     }
   }
 }
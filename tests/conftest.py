@@ -27,11 +27,11 @@ def mock_lambda_context():
 
 
 @pytest.fixture(autouse=True)
-def disable_datadog():
-    """Desabilita decorador Datadog Lambda para testes"""
-    with patch('lambda_coletor.datadog_lambda_wrapper') as mock_dd:
-        mock_dd.side_effect = lambda f: f  # Retorna função sem modificação
-        yield
+def disable_datadog(monkeypatch):
+    """Desabilita decorador Datadog Lambda para testes (sem chave o wrapper não é aplicado)"""
+    from utils import DATADOG_KEY_VARS
+    for name in DATADOG_KEY_VARS:
+        monkeypatch.delenv(name, raising=False)
 
 
 @pytest.fixture(autouse=True)
@@ -45,3 +45,19 @@ def mock_aws_credentials():
         'AWS_DEFAULT_REGION': 'us-east-1'
     }):
         yield
+
+
+@pytest.fixture(autouse=True)
+def reset_aws_registry():
+    """Descarta clientes e tabelas memoizados entre testes"""
+    yield
+    from config import reset_aws_clients
+    reset_aws_clients()
+
+
+@pytest.fixture(autouse=True)
+def reset_language_profiler():
+    """Descarta os perfis de idioma do container entre testes"""
+    yield
+    from lambda_coletor import reset_language_profiler
+    reset_language_profiler()
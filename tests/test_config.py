@@ -2,6 +2,8 @@
 Testes para o módulo de configuração
 """
 import importlib
+import threading
+from unittest.mock import Mock, patch
 
 
 class TestConfig:
@@ -21,6 +23,82 @@ class TestConfig:
         assert config.content.max_news_per_source == 3
         assert config.content.threshold_caracteres == 250
 
+    def test_retention_by_niche(self, monkeypatch):
+        """Testa retenção padrão e por nicho"""
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
+        monkeypatch.setenv("RETENTION_DAYS_BY_NICHE", "saude:14, Economia:30")
+        importlib.reload(importlib.import_module("config"))
+        from config import get_config
+        config = get_config()
+
+        assert config.get_retention_days("saude") == 14
+        assert config.get_retention_days("economia") == 30
+        assert config.get_retention_days("tecnologia") == 7
+
+    def test_dynamodb_resource_is_cached(self, monkeypatch):
+        """Testa que o recurso DynamoDB é criado uma vez por região"""
+        monkeypatch.setenv("AWS_REGION", "us-east-1")
+        importlib.reload(importlib.import_module("config"))
+        from config import get_config
+        config = get_config()
+
+        with patch("boto3.session.Session") as mock_session:
+            assert config.get_dynamodb_resource() is config.get_dynamodb_resource()
+            mock_session.return_value.resource.assert_called_once_with("dynamodb", region_name="us-east-1")
+
+    def test_registry_memoizes_tables_and_clients(self):
+        """Testa que Tables e clientes são reaproveitados por nome e região"""
+        from config import AWSClientRegistry
+        registry = AWSClientRegistry()
+
+        with patch("boto3.session.Session") as mock_session:
+            session = mock_session.return_value
+            session.resource.return_value.Table.side_effect = lambda name: Mock(name=name)
+
+            noticias = registry.table("noticias", "us-east-1")
+            assert registry.table("noticias", "us-east-1") is noticias
+            assert registry.table("fontes", "us-east-1") is not noticias
+            assert registry.client("dynamodb", "us-east-1") is registry.client("dynamodb", "us-east-1")
+
+            mock_session.assert_called_once()
+            session.resource.assert_called_once_with("dynamodb", region_name="us-east-1")
+            session.client.assert_called_once_with("dynamodb", region_name="us-east-1")
+
+    def test_registry_resources_per_thread(self):
+        """Testa que cada thread recebe o seu recurso, mas o cliente é compartilhado"""
+        from config import AWSClientRegistry
+        registry = AWSClientRegistry()
+
+        with patch("boto3.session.Session") as mock_session:
+            session = mock_session.return_value
+            session.resource.side_effect = lambda *args, **kwargs: Mock()
+            session.client.side_effect = lambda *args, **kwargs: Mock()
+            results = {}
+
+            def worker():
+                results["resource"] = registry.resource("dynamodb", "us-east-1")
+                results["client"] = registry.client("dynamodb", "us-east-1")
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+            assert registry.resource("dynamodb", "us-east-1") is not results["resource"]
+            assert registry.client("dynamodb", "us-east-1") is results["client"]
+
+    def test_reset_aws_clients(self):
+        """Testa que o reset descarta os objetos memoizados"""
+        import config as config_module
+
+        with patch("boto3.session.Session") as mock_session:
+            mock_session.return_value.resource.side_effect = lambda *args, **kwargs: Mock()
+            registry = config_module.get_aws_registry()
+            before = registry.resource("dynamodb", "us-east-1")
+            config_module.reset_aws_clients()
+
+            assert registry.resource("dynamodb", "us-east-1") is not before
+            assert mock_session.call_count == 2
+
     def test_nichos_default(self, monkeypatch):
         """Testa nichos padrão"""
         monkeypatch.setenv("AWS_REGION", "us-east-1")
@@ -0,0 +1,86 @@
+"""
+Testes para o módulo content_filter
+"""
+from unittest.mock import Mock
+
+from boto3.dynamodb.types import Binary
+
+from content_filter import BloomFilter, ContentFilterStore, FILTER_KEY
+
+
+class TestBloomFilter:
+    """Testes para o filtro de Bloom"""
+
+    def test_no_false_negatives(self):
+        """Testa que toda chave adicionada é encontrada"""
+        bloom = BloomFilter(capacity=1000, fp_rate=0.01)
+        keys = [f"hash-{i}" for i in range(1000)]
+        bloom.update(keys)
+
+        assert all(key in bloom for key in keys)
+        # Uma chave nova que cai só em bits já marcados não conta como item
+        assert 990 <= len(bloom) <= 1000
+
+    def test_false_positive_rate_near_target(self):
+        """Testa que a taxa de falsos positivos na capacidade fica perto da configurada"""
+        bloom = BloomFilter(capacity=5000, fp_rate=0.01)
+        bloom.update(f"hash-{i}" for i in range(5000))
+
+        false_positives = sum(f"outro-{i}" in bloom for i in range(20000))
+
+        assert false_positives / 20000 < 0.02
+        assert 0.005 < bloom.estimated_fp_rate() < 0.015
+
+    def test_roundtrip(self):
+        """Testa que o snapshot restaura bits, contadores e data de criação"""
+        bloom = BloomFilter(capacity=100, fp_rate=0.01, created_at=1000)
+        bloom.update(["a", "b"])
+        bloom.record_check(false_positive=True)
+        bloom.record_check(false_positive=False)
+
+        item = bloom.to_item()
+        item["dados"] = Binary(item["dados"])
+        restored = BloomFilter.from_item(item)
+
+        assert "a" in restored and "b" in restored
+        assert len(restored) == 2
+        assert restored.created_at == 1000
+        assert restored.observed_fp_rate() == 0.5
+
+    def test_needs_rebuild(self):
+        """Testa reconstrução por idade e por capacidade"""
+        bloom = BloomFilter(capacity=2, fp_rate=0.01, created_at=1000)
+
+        assert bloom.needs_rebuild(3600, now=2000) is False
+        assert bloom.needs_rebuild(3600, now=4600) is True
+
+        bloom.update(["a", "b", "c"])
+        assert bloom.needs_rebuild(3600, now=2000) is True
+
+
+class TestContentFilterStore:
+    """Testes para a persistência do filtro"""
+
+    def test_save_and_load(self):
+        """Testa gravação e leitura na chave reservada"""
+        table = Mock()
+        store = ContentFilterStore(table)
+        bloom = BloomFilter(capacity=100, fp_rate=0.01)
+        bloom.add("a")
+
+        assert store.save(bloom) is True
+        item = table.put_item.call_args.kwargs["Item"]
+        assert item["nicho"] == FILTER_KEY and item["parte"] == 0
+
+        table.get_item.return_value = {"Item": item}
+        assert "a" in store.load()
+        table.get_item.assert_called_with(Key={"nicho": FILTER_KEY, "parte": 0})
+
+    def test_load_missing_or_error(self):
+        """Testa que ausência ou erro de leitura retornam None"""
+        table = Mock()
+        table.get_item.return_value = {}
+        assert ContentFilterStore(table).load() is None
+
+        table.get_item.side_effect = Exception("erro")
+        assert ContentFilterStore(table).load() is None
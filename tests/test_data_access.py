@@ -0,0 +1,169 @@
+"""
+Testes para o módulo data_access
+"""
+from unittest.mock import Mock
+
+from data_access import (
+    query_paginated,
+    buscar_por_nicho,
+    buscar_pendentes_publicacao,
+    buscar_publicadas,
+    buscar_pagina_publicadas,
+    marcar_publicada,
+    marcar_duplicada,
+    gravar_em_lote,
+    aplicar_publicacao,
+    aplicar_duplicada,
+    INDICE_NICHO_DATA,
+    INDICE_STATUS_INSERCAO,
+    INDICE_STATUS_PUBLICACAO,
+    INDICE_NICHO_PUBLICACAO,
+    CAMPOS_API
+)
+from dynamodb_schema import atributos_projetados
+
+
+class TestQueryPaginated:
+    """Testes para a paginação de queries"""
+
+    def test_follows_last_evaluated_key(self):
+        """Testa que todas as páginas são lidas"""
+        table = Mock()
+        table.query.side_effect = [
+            {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}},
+            {"Items": [{"id": "2"}]}
+        ]
+
+        items = list(query_paginated(table, IndexName="x"))
+
+        assert [item["id"] for item in items] == ["1", "2"]
+        assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"id": "1"}
+
+    def test_stops_at_max_items(self):
+        """Testa que a leitura para ao atingir o limite"""
+        table = Mock()
+        table.query.return_value = {"Items": [{"id": "1"}, {"id": "2"}], "LastEvaluatedKey": {"id": "2"}}
+
+        items = list(query_paginated(table, max_items=2))
+
+        assert len(items) == 2
+        table.query.assert_called_once()
+
+
+class TestConsultas:
+    """Testes para as consultas por índice"""
+
+    def test_buscar_por_nicho_usa_indice(self):
+        """Testa consulta no índice nicho-data-index sem scan"""
+        table = Mock()
+        table.query.return_value = {"Items": [{"id": "1"}]}
+
+        items = buscar_por_nicho(table, "tecnologia", desde=100, projection="id")
+
+        assert items == [{"id": "1"}]
+        kwargs = table.query.call_args.kwargs
+        assert kwargs["IndexName"] == INDICE_NICHO_DATA
+        assert kwargs["ProjectionExpression"] == "id"
+        table.scan.assert_not_called()
+
+    def test_fila_de_publicacao_projeta_todos_os_atributos(self):
+        """Testa que o índice da fila devolve as notícias completas que o publicador usa"""
+        assert atributos_projetados(INDICE_STATUS_INSERCAO) is None
+
+    def test_buscar_pendentes_publicacao(self):
+        """Testa a fila de publicação ordenada da mais recente para a mais antiga"""
+        table = Mock()
+        table.query.return_value = {"Items": [{"id": "1"}]}
+
+        buscar_pendentes_publicacao(table, limit=10)
+
+        kwargs = table.query.call_args.kwargs
+        assert kwargs["IndexName"] == INDICE_STATUS_INSERCAO
+        assert kwargs["ScanIndexForward"] is False
+        assert kwargs["Limit"] == 10
+
+    def test_buscar_publicadas(self):
+        """Testa consulta de publicadas por data"""
+        table = Mock()
+        table.query.return_value = {"Items": []}
+
+        buscar_publicadas(table, desde=100, projection="titulo")
+
+        assert table.query.call_args.kwargs["IndexName"] == INDICE_STATUS_PUBLICACAO
+
+    def test_buscar_pagina_publicadas(self):
+        """Testa página única por nicho, mais recentes primeiro, com a chave da próxima"""
+        table = Mock()
+        table.query.return_value = {"Items": [{"id": "1"}], "LastEvaluatedKey": {"id": "1"}}
+
+        items, last_key = buscar_pagina_publicadas(table, nicho="saude", limit=10, start_key={"id": "0"})
+
+        assert items == [{"id": "1"}]
+        assert last_key == {"id": "1"}
+        kwargs = table.query.call_args.kwargs
+        assert kwargs["IndexName"] == INDICE_NICHO_PUBLICACAO
+        assert kwargs["Limit"] == 10
+        assert kwargs["ScanIndexForward"] is False
+        assert kwargs["ExclusiveStartKey"] == {"id": "0"}
+        assert sorted(kwargs["ExpressionAttributeNames"].values()) == sorted(CAMPOS_API)
+        table.query.assert_called_once()
+
+    def test_buscar_pagina_publicadas_todos_nichos(self):
+        """Testa que sem nicho a consulta usa o índice de publicadas"""
+        table = Mock()
+        table.query.return_value = {"Items": []}
+
+        items, last_key = buscar_pagina_publicadas(table)
+
+        assert items == [] and last_key is None
+        assert table.query.call_args.kwargs["IndexName"] == INDICE_STATUS_PUBLICACAO
+        assert "ExclusiveStartKey" not in table.query.call_args.kwargs
+
+
+class TestAtualizacoes:
+    """Testes para as mudanças de status"""
+
+    def test_marcar_publicada(self):
+        """Testa que a notícia sai da fila e entra no índice de publicadas"""
+        table = Mock()
+        marcar_publicada(table, "n1", 10, "https://blog/post", 1700000000)
+
+        values = table.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        assert values[":status"] == "publicada"
+        assert values[":data"] == 1700000000
+
+    def test_marcar_duplicada(self):
+        """Testa que a notícia duplicada sai da fila de publicação"""
+        table = Mock()
+        marcar_duplicada(table, "n1")
+
+        expression = table.update_item.call_args.kwargs["UpdateExpression"]
+        assert "REMOVE status_publicacao" in expression
+        assert table.update_item.call_args.kwargs["ConditionExpression"] == "attribute_exists(id)"
+
+    def test_gravar_em_lote_atualiza_so_status_de_itens_existentes(self):
+        """Testa Updates condicionais só com os campos de status, em transações de até 100"""
+        table = Mock()
+        table.name = "noticias"
+        lida = {"id": "n0", "titulo": "Título", "resumo": "Resumo", "status_publicacao": "pendente"}
+        itens = [aplicar_publicacao({**lida, "id": f"n{i}"}, i, f"https://blog/{i}", 1700000000)
+                 for i in range(150)] + [aplicar_duplicada(lida)]
+
+        assert gravar_em_lote(table, itens) is True
+
+        calls = table.meta.client.transact_write_items.call_args_list
+        assert [len(call.kwargs["TransactItems"]) for call in calls] == [100, 51]
+        primeiro = calls[0].kwargs["TransactItems"][0]["Update"]
+        assert primeiro["TableName"] == "noticias" and primeiro["Key"] == {"id": "n0"}
+        assert primeiro["ConditionExpression"] == "attribute_exists(id)"
+        assert set(primeiro["ExpressionAttributeValues"].values()) == {
+            True, 0, "https://blog/0", 1700000000, "publicada"}
+        ultimo = calls[1].kwargs["TransactItems"][-1]["Update"]
+        assert "REMOVE status_publicacao" in ultimo["UpdateExpression"]
+
+    def test_gravar_em_lote_cancelado(self):
+        """Testa que uma transação cancelada (notícia apagada) devolve False"""
+        table = Mock()
+        table.meta.client.transact_write_items.side_effect = Exception("TransactionCanceledException")
+
+        assert gravar_em_lote(table, [aplicar_duplicada({"id": "n1"})]) is False
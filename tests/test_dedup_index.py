@@ -0,0 +1,169 @@
+"""
+Testes para o módulo dedup_index
+"""
+from unittest.mock import Mock
+
+from dedup_index import NearDuplicateIndex, DedupIndexStore, TitleIndex, shingles, trigrams
+
+TITULO = "Governo anuncia novo pacote de investimentos em tecnologia para escolas públicas"
+RESUMO = (
+    "O pacote prevê a compra de computadores, a instalação de internet de alta "
+    "velocidade e a formação de professores em mais de cinco mil escolas até o fim do ano"
+)
+
+
+class TestShingles:
+    """Testes para a geração de shingles"""
+
+    def test_shingles_bigrams(self):
+        """Testa bigramas de palavras normalizados"""
+        assert shingles("Olá, Mundo Novo") == {"olá mundo", "mundo novo"}
+
+    def test_shingles_short_text(self):
+        """Testa textos com menos de duas palavras"""
+        assert shingles("Palavra") == {"palavra"}
+        assert shingles("") == set()
+
+
+class TestNearDuplicateIndex:
+    """Testes para o índice MinHash/LSH"""
+
+    def setup_method(self):
+        self.index = NearDuplicateIndex()
+        self.index.add("a1", TITULO, RESUMO, 1000)
+        self.index.add("a2", "Time vence campeonato estadual", "Final decidida nos pênaltis", 1000)
+
+    def test_find_exact_duplicate(self):
+        """Testa que a mesma notícia é encontrada"""
+        match = self.index.find_duplicate(TITULO, RESUMO)
+        assert match is not None
+        assert match[0] == "a1"
+
+    def test_find_near_duplicate(self):
+        """Testa que uma pequena alteração ainda é detectada"""
+        titulo = TITULO.replace("novo", "grande")
+        match = self.index.find_duplicate(titulo, "Resumo totalmente diferente")
+        assert match is not None
+        assert match[0] == "a1"
+
+    def test_unrelated_text_is_not_duplicate(self):
+        """Testa que textos não relacionados não geram falso positivo"""
+        assert self.index.find_duplicate(
+            "Pesquisadores descobrem nova espécie de sapo na Amazônia",
+            "A espécie foi encontrada em uma expedição no norte do Pará"
+        ) is None
+
+    def test_empty_text_is_not_indexed(self):
+        """Testa que textos vazios não geram candidatos"""
+        self.index.add("vazio", "", "", 1000)
+        assert self.index.find_duplicate("", "") is None
+
+    def test_prune_and_remove(self):
+        """Testa remoção de notícias fora da janela"""
+        self.index.add("novo", "Outra notícia", "Outro resumo", 5000)
+        assert self.index.prune(2000) == 2
+        assert len(self.index) == 1
+        assert self.index.find_duplicate(TITULO, RESUMO) is None
+
+    def test_serialization_roundtrip(self):
+        """Testa serialização em partes e restauração"""
+        parts = self.index.to_parts(docs_per_part=1)
+        assert len(parts) == 2
+
+        restored = NearDuplicateIndex.from_parts(parts)
+        assert len(restored) == 2
+        assert restored.find_duplicate(TITULO, RESUMO)[0] == "a1"
+
+
+class TestDedupIndexStore:
+    """Testes para a persistência do índice"""
+
+    def test_save_and_load(self):
+        """Testa gravação e leitura das partes no DynamoDB"""
+        table = Mock()
+        store = DedupIndexStore(table, docs_per_part=1)
+        index = NearDuplicateIndex()
+        index.add("a1", TITULO, RESUMO, 1000)
+        index.add("a2", "Outro título", "Outro resumo", 1000)
+
+        assert store.save("tecnologia", index) is True
+        items = [call.kwargs["Item"] for call in table.put_item.call_args_list]
+        assert [item["parte"] for item in items] == [0, 1]
+
+        table.query.return_value = {"Items": list(reversed(items))}
+        loaded = store.load("tecnologia")
+        assert len(loaded) == 2
+        assert loaded.find_duplicate(TITULO, RESUMO)[0] == "a1"
+
+    def test_load_discards_mixed_versions(self):
+        """Testa que partes de snapshots diferentes são descartadas"""
+        table = Mock()
+        blob = NearDuplicateIndex().to_parts()[0]
+        table.query.return_value = {"Items": [
+            {"nicho": "n", "parte": 0, "versao": 2, "total_partes": 2, "dados": blob},
+            {"nicho": "n", "parte": 1, "versao": 1, "total_partes": 2, "dados": blob}
+        ]}
+
+        assert DedupIndexStore(table).load("n") is None
+
+    def test_save_deletes_stale_parts(self):
+        """Testa remoção das partes que sobraram do snapshot anterior"""
+        table = Mock()
+        store = DedupIndexStore(table)
+        store._part_counts["n"] = 3
+
+        store.save("n", NearDuplicateIndex())
+
+        deleted = [call.kwargs["Key"]["parte"] for call in table.delete_item.call_args_list]
+        assert deleted == [1, 2]
+
+
+class TestTitleIndex:
+    """Testes para o índice de trigramas de títulos"""
+
+    def setup_method(self):
+        self.index = TitleIndex()
+        self.index.add("t1", TITULO, 1000)
+        self.index.add("t2", "Time vence campeonato estadual nos pênaltis", 1000)
+
+    def test_trigrams(self):
+        """Testa trigramas com bordas"""
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+
+    def test_find_near_duplicate(self):
+        """Testa título com uma palavra trocada"""
+        assert self.index.find_duplicate(TITULO.replace("novo", "grande")) == "t1"
+
+    def test_unrelated_title(self):
+        """Testa que títulos diferentes não são duplicados"""
+        assert self.index.find_duplicate("Pesquisadores descobrem nova espécie de sapo") is None
+
+    def test_exclude_and_remove(self):
+        """Testa exclusão do próprio ID e remoção"""
+        assert self.index.find_duplicate(TITULO, exclude="t1") is None
+        self.index.remove("t1")
+        assert self.index.find_duplicate(TITULO) is None
+        assert len(self.index) == 1
+
+    def test_prune(self):
+        """Testa remoção dos títulos fora da janela"""
+        self.index.add("t3", "Outro título qualquer", 5000)
+        assert self.index.prune(2000) == 2
+        assert list(self.index.titles) == ["t3"]
+
+    def test_matches_full_comparison(self):
+        """Testa que o índice concorda com SequenceMatcher sobre todos os títulos"""
+        from difflib import SequenceMatcher
+
+        titulos = [
+            "Governo anuncia pacote de investimentos em tecnologia",
+            "Governo anuncia pacote de investimento em tecnologia",
+            "Governo anuncia novo pacote de investimentos em tecnologia",
+            "Governo divulga pacote de investimentos para a saúde",
+            "Bolsa fecha em alta com otimismo externo"
+        ]
+        index = TitleIndex()
+        index.add("base", titulos[0], 0)
+        for titulo in titulos[1:]:
+            esperado = SequenceMatcher(None, titulo.lower(), titulos[0].lower()).ratio() > 0.8
+            assert (index.find_duplicate(titulo) == "base") is esperado
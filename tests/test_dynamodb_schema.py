@@ -0,0 +1,139 @@
+"""
+Testes de consistência entre dynamodb_schema.py e o Terraform
+"""
+import os
+import re
+from unittest.mock import Mock, patch
+
+from dynamodb_schema import (
+    NOTICIAS_TABLE_SCHEMA,
+    NOTICIAS_RESUMIDAS_TABLE_SCHEMA,
+    FONTES_TABLE_SCHEMA,
+    READ_MODEL_TABLE_SCHEMA,
+    SUMMARY_CACHE_TABLE_SCHEMA,
+    atributos_projetados,
+    migrar_indices,
+    preencher_ttl
+)
+
+TERRAFORM_DYNAMODB = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "terraform", "aws", "dynamodb.tf"
+)
+
+
+def _terraform_table(resource_name):
+    """Extrai atributos e índices (chaves e projeção) de um aws_dynamodb_table do Terraform"""
+    with open(TERRAFORM_DYNAMODB, encoding="utf-8") as f:
+        content = f.read()
+
+    start = content.index(f'resource "aws_dynamodb_table" "{resource_name}"')
+    end = content.find('\nresource "', start + 1)
+    block = content[start:end if end != -1 else len(content)]
+
+    attributes = dict(re.findall(r'attribute \{\s*name = "(\w+)"\s*type = "(\w)"', block))
+    indexes = {}
+    for body in re.findall(r'global_secondary_index \{(.*?)\n  \}', block, re.S):
+        name = re.search(r'name\s*=\s*"([\w-]+)"', body).group(1)
+        hash_key = re.search(r'hash_key\s*=\s*"(\w+)"', body).group(1)
+        range_key = re.search(r'range_key\s*=\s*"(\w+)"', body)
+        projection = re.search(r'projection_type\s*=\s*"(\w+)"', body).group(1)
+        non_key = re.search(r'non_key_attributes\s*=\s*\[(.*?)\]', body)
+        indexes[name] = (hash_key, range_key.group(1) if range_key else None, projection,
+                         sorted(re.findall(r'"(\w+)"', non_key.group(1))) if non_key else [])
+    return attributes, indexes
+
+
+def _schema_table(schema):
+    attributes = {a["AttributeName"]: a["AttributeType"] for a in schema["AttributeDefinitions"]}
+    indexes = {}
+    for gsi in schema.get("GlobalSecondaryIndexes", []):
+        keys = {k["KeyType"]: k["AttributeName"] for k in gsi["KeySchema"]}
+        indexes[gsi["IndexName"]] = (keys["HASH"], keys.get("RANGE"), gsi["Projection"]["ProjectionType"],
+                                     sorted(gsi["Projection"].get("NonKeyAttributes", [])))
+    return attributes, indexes
+
+
+class TestSchemaTerraform:
+    """Garante que o schema Python e o Terraform descrevem as mesmas tabelas"""
+
+    def test_noticias(self):
+        assert _schema_table(NOTICIAS_TABLE_SCHEMA) == _terraform_table("djblog_noticias")
+
+    def test_noticias_resumidas(self):
+        assert _schema_table(NOTICIAS_RESUMIDAS_TABLE_SCHEMA) == _terraform_table("djblog_noticias_resumidas")
+
+    def test_fontes(self):
+        assert _schema_table(FONTES_TABLE_SCHEMA) == _terraform_table("djblog_fontes")
+
+    def test_read_model(self):
+        assert _schema_table(READ_MODEL_TABLE_SCHEMA) == _terraform_table("djblog_read_model")
+
+    def test_summary_cache(self):
+        assert _schema_table(SUMMARY_CACHE_TABLE_SCHEMA) == _terraform_table("djblog_summary_cache")
+
+
+class TestProjecoes:
+    """Testes para as projeções dos índices de notícias"""
+
+    def test_atributos_projetados(self):
+        """Testa chaves mais NonKeyAttributes, e None para projeção ALL"""
+        campos = atributos_projetados("nicho-publicacao-index")
+        assert {"id", "nicho", "publicado_em", "titulo", "ttl"} <= campos
+        assert "descricao_completa" not in campos
+        assert atributos_projetados("status-insercao-index") is None
+
+
+class TestMigrarIndices:
+    """Testes para a migração dos índices de uma tabela existente"""
+
+    @patch("time.sleep")
+    @patch("boto3.client")
+    def test_recria_indice_com_projecao_diferente(self, mock_client, mock_sleep):
+        """Testa que só o índice com projeção antiga é removido e criado de novo"""
+        atuais = [
+            {"IndexName": gsi["IndexName"], "Projection": gsi["Projection"], "IndexStatus": "ACTIVE"}
+            for gsi in NOTICIAS_TABLE_SCHEMA["GlobalSecondaryIndexes"]
+        ]
+        antigo = next(i for i in atuais if i["IndexName"] == "nicho-publicacao-index")
+        antigo["Projection"] = {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["titulo", "link"]}
+        sem_indice = [i for i in atuais if i is not antigo]
+        client = mock_client.return_value
+        client.describe_table.side_effect = [
+            {"Table": {"GlobalSecondaryIndexes": atuais}},
+            {"Table": {"GlobalSecondaryIndexes": sem_indice}},
+            {"Table": {"GlobalSecondaryIndexes": sem_indice + [{**antigo, "IndexStatus": "ACTIVE"}]}}
+        ]
+
+        migrar_indices()
+
+        updates = [call.kwargs["GlobalSecondaryIndexUpdates"][0] for call in client.update_table.call_args_list]
+        assert updates[0] == {"Delete": {"IndexName": "nicho-publicacao-index"}}
+        assert updates[1]["Create"]["IndexName"] == "nicho-publicacao-index"
+        assert "ttl" in updates[1]["Create"]["Projection"]["NonKeyAttributes"]
+        assert len(updates) == 2
+
+
+class TestPreencherTTL:
+    """Testes para o preenchimento de ttl nas notícias antigas"""
+
+    @patch("config.get_config")
+    def test_preenche_ttl_por_nicho(self, mock_get_config):
+        """Testa que cada notícia recebe data_insercao + retenção do nicho"""
+        mock_get_config.return_value.get_retention_days.side_effect = (
+            lambda nicho: 30 if nicho == "economia" else 7
+        )
+        client = Mock()
+        client.exceptions.ConditionalCheckFailedException = KeyError
+        client.scan.side_effect = [
+            {"Items": [{"id": {"S": "1"}, "nicho": {"S": "economia"}, "data_insercao": {"N": "1000"}}],
+             "LastEvaluatedKey": {"id": {"S": "1"}}},
+            {"Items": [{"id": {"S": "2"}, "data_insercao": {"N": "2000"}}]}
+        ]
+
+        assert preencher_ttl("noticias", segmentos=1, client=client) == 2
+
+        ttls = [call.kwargs["ExpressionAttributeValues"][":ttl"]["N"]
+                for call in client.update_item.call_args_list]
+        assert ttls == [str(1000 + 30 * 86400), str(2000 + 7 * 86400)]
+        assert client.scan.call_args.kwargs["FilterExpression"] == "attribute_not_exists(#ttl)"
@@ -0,0 +1,58 @@
+"""
+Testes para o módulo extractive_summary
+"""
+from extractive_summary import dividir_frases, resumir_extrativo, truncar
+
+
+def test_dividir_frases_respeita_abreviacoes_e_iniciais():
+    texto = ("O Sr. Silva disse que a U.S. Steel vai investir. J. K. Rowling lançou um livro. "
+             "\"Isso é ótimo.\" Depois de 2 anos, a empresa cresceu!")
+
+    assert dividir_frases(texto) == [
+        "O Sr. Silva disse que a U.S. Steel vai investir.",
+        "J. K. Rowling lançou um livro.",
+        "\"Isso é ótimo.\"",
+        "Depois de 2 anos, a empresa cresceu!"
+    ]
+
+
+def test_texto_curto_so_e_limpo():
+    assert resumir_extrativo("<p>Chuva forte em São Paulo &amp; no Rio.</p>") == "Chuva forte em São Paulo & no Rio."
+
+
+def test_escolhe_frases_centrais_na_ordem_original():
+    """Testa que a frase fora do assunto fica de fora e a ordem é mantida"""
+    texto = (
+        "The central bank raised interest rates to fight inflation. "
+        "Follow us on social media for more updates and newsletters. "
+        "Inflation reached its highest level in a decade, the central bank said. "
+        "Analysts expect interest rates to stay high while inflation persists."
+    )
+
+    resumo = resumir_extrativo(texto, max_frases=2, max_chars=400)
+
+    assert resumo == ("The central bank raised interest rates to fight inflation. "
+                      "Inflation reached its highest level in a decade, the central bank said.")
+
+
+def test_respeita_limites_e_pula_repeticoes():
+    texto = ("O governo anunciou um novo programa de vacinação contra a gripe. "
+             "O governo anunciou um novo programa de vacinação contra a gripe hoje. "
+             "A campanha começa na segunda-feira em todos os postos de saúde. "
+             "Idosos e crianças terão prioridade no atendimento da campanha.")
+
+    resumo = resumir_extrativo(texto, max_frases=2, max_chars=150)
+
+    assert len(resumo) <= 150
+    assert dividir_frases(resumo) == [
+        "O governo anunciou um novo programa de vacinação contra a gripe.",
+        "A campanha começa na segunda-feira em todos os postos de saúde."
+    ]
+
+
+def test_frase_unica_longa_e_truncada_na_palavra():
+    resumo = resumir_extrativo("Palavra " * 300, max_chars=200)
+
+    assert len(resumo) <= 203
+    assert resumo.endswith("Palavra...")
+    assert truncar("x" * 300, 200) == "x" * 200 + "..."
@@ -0,0 +1,155 @@
+"""
+Testes para o módulo feed_state
+"""
+import calendar
+import time
+from decimal import Decimal
+from unittest.mock import Mock
+
+import feedparser
+
+from feed_state import (
+    FeedState,
+    DynamoDBFeedStateStore,
+    LocalFeedStateStore,
+    entry_id,
+    entry_timestamp
+)
+
+FEED_XML = (
+    b"<?xml version='1.0' encoding='utf-8'?><rss version='2.0'><channel><title>T</title>"
+    b"<item><guid>g1</guid><title>Um</title><link>https://example.com/1</link></item>"
+    b"<item><guid>g2</guid><title>Dois</title><link>https://example.com/2</link></item>"
+    b"</channel></rss>"
+)
+
+
+class TestFeedState:
+    """Testes para a classe FeedState"""
+
+    def test_entry_id_fallbacks(self):
+        """Testa a ordem de preferência do identificador da entrada"""
+        assert entry_id({"id": "g1", "link": "l"}) == "g1"
+        assert entry_id({"link": "l", "title": "t"}) == "l"
+        assert entry_id({"title": "t"}) == "t"
+
+    def test_from_feed_reads_validators_and_ids(self):
+        """Testa a criação do estado a partir de um feed baixado"""
+        feed = feedparser.parse(FEED_XML, response_headers={
+            "etag": '"abc"',
+            "last-modified": "Sun, 22 Jun 2025 20:00:00 GMT"
+        })
+
+        state = FeedState.from_feed("https://example.com/rss", feed)
+
+        assert state.etag == '"abc"'
+        assert state.last_modified == "Sun, 22 Jun 2025 20:00:00 GMT"
+        assert state.seen_ids == ["g1", "g2"]
+        assert state.languages == {}
+        assert FeedState.from_feed("u", feed, previous=FeedState(url="u", languages={"en": 3})).languages == {"en": 3}
+
+    def test_conditional_headers(self):
+        """Testa os cabeçalhos do GET condicional"""
+        state = FeedState(url="u", etag='"abc"', last_modified="ontem")
+        assert state.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "ontem"
+        }
+        assert FeedState(url="u").conditional_headers() == {}
+
+    def test_filter_new(self):
+        """Testa que apenas as entradas novas são mantidas"""
+        state = FeedState(url="u", seen_ids=["g1"])
+        entries = [{"id": "g0"}, {"id": "g1"}]
+        assert state.filter_new(entries) == [{"id": "g0"}]
+
+    def test_filter_new_drops_entries_before_high_water_mark(self):
+        """Testa o descarte pelas datas de publicação, mantendo GUIDs novos na marca"""
+        state = FeedState(url="u", newest_published=calendar.timegm((2025, 6, 22, 20, 0, 0)))
+        entries = [
+            {"id": "nova", "published_parsed": time.struct_time((2025, 6, 22, 21, 0, 0, 6, 173, 0))},
+            {"id": "mesmo-segundo", "published_parsed": time.struct_time((2025, 6, 22, 20, 0, 0, 6, 173, 0))},
+            {"id": "antiga", "published_parsed": time.struct_time((2025, 6, 21, 8, 0, 0, 5, 172, 0))},
+            {"id": "sem-data"}
+        ]
+
+        assert [entry["id"] for entry in state.filter_new(entries)] == ["nova", "mesmo-segundo", "sem-data"]
+
+    def test_high_water_mark_never_moves_back_or_to_the_future(self):
+        """Testa que a marca só avança e ignora datas no futuro"""
+        previous = FeedState(url="u", newest_published=2000)
+        feed = feedparser.FeedParserDict(entries=[
+            {"id": "a", "published_parsed": time.gmtime(1000)},
+            {"id": "b", "published_parsed": time.gmtime(time.time() + 86400)}
+        ])
+
+        assert FeedState.from_feed("u", feed, previous=previous).newest_published == 2000
+        assert FeedState.from_feed("u", feed).newest_published == 1000
+        assert entry_timestamp({"id": "sem-data"}) is None
+
+    def test_forget_drops_unsaved_entries_and_validators(self):
+        """Testa que entradas não gravadas saem do estado junto com o ETag"""
+        state = FeedState(url="u", etag='"abc"', last_modified="ontem", seen_ids=["g1", "g2"])
+
+        state.forget([{"id": "g2"}])
+
+        assert state.seen_ids == ["g1"]
+        assert state.conditional_headers() == {}
+        assert state.filter_new([{"id": "g1"}, {"id": "g2"}]) == [{"id": "g2"}]
+
+    def test_forget_moves_high_water_mark_back_to_unsaved_entry(self):
+        """Testa que a marca d'água não passa da entrada que não foi gravada"""
+        previous = FeedState(url="u", newest_published=500)
+        feed = feedparser.FeedParserDict(entries=[
+            {"id": "gravada", "published_parsed": time.gmtime(2000)},
+            {"id": "falhou", "published_parsed": time.gmtime(1000)}
+        ])
+        state = FeedState.from_feed("u", feed, previous=previous)
+        assert state.newest_published == 2000
+
+        state.forget([feed.entries[1]])
+
+        assert state.newest_published == 1000
+        assert [entry["id"] for entry in state.filter_new(feed.entries)] == ["falhou"]
+
+
+class TestFeedStateStores:
+    """Testes para os armazenamentos de estado"""
+
+    def test_dynamodb_store_roundtrip(self):
+        """Testa leitura e gravação na tabela DynamoDB"""
+        table = Mock()
+        table.get_item.return_value = {
+            "Item": {"url": "u", "etag": '"abc"', "seen_ids": ["g1"], "newest_published": Decimal(500),
+                     "updated_at": 10, "languages": {"pt": Decimal(7)}}
+        }
+        store = DynamoDBFeedStateStore(table)
+
+        state = store.get("u")
+        assert state.etag == '"abc"'
+        assert state.seen_ids == ["g1"]
+        assert state.newest_published == 500
+        assert state.languages == {"pt": 7}
+
+        assert store.save(state) is True
+        saved = table.put_item.call_args.kwargs["Item"]
+        assert "last_modified" not in saved
+
+    def test_dynamodb_store_errors_are_not_fatal(self):
+        """Testa que erros do DynamoDB não interrompem a coleta"""
+        table = Mock()
+        table.get_item.side_effect = Exception("ResourceNotFound")
+        table.put_item.side_effect = Exception("ResourceNotFound")
+        store = DynamoDBFeedStateStore(table)
+
+        assert store.get("u") is None
+        assert store.save(FeedState(url="u")) is False
+
+    def test_local_store_persists_to_file(self, tmp_path):
+        """Testa persistência do estado em arquivo JSON"""
+        path = tmp_path / "feed_state.json"
+        LocalFeedStateStore(str(path)).save(FeedState(url="u", etag='"abc"'))
+
+        state = LocalFeedStateStore(str(path)).get("u")
+        assert state.etag == '"abc"'
+        assert LocalFeedStateStore(str(path)).get("outra") is None
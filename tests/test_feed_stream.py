@@ -0,0 +1,115 @@
+"""
+Testes para o módulo feed_stream
+"""
+import calendar
+
+import feedparser
+
+from feed_stream import iter_entries, parse_date, parse_response
+
+RSS_XML = (
+    b"<?xml version='1.0' encoding='utf-8'?>"
+    b"<rss version='2.0' xmlns:content='http://purl.org/rss/1.0/modules/content/'><channel><title>T</title>"
+    b"<item><guid>g1</guid><title>Um &amp; dois</title><link>https://example.com/1</link>"
+    b"<pubDate>Sun, 22 Jun 2025 20:00:00 GMT</pubDate><description>Resumo um</description></item>"
+    b"<item><guid>g2</guid><title>Dois</title><link>https://example.com/2</link>"
+    b"<pubDate>Sun, 22 Jun 2025 17:00:00 -0300</pubDate>"
+    b"<content:encoded><![CDATA[<p>Texto dois</p>]]></content:encoded></item>"
+    b"<item><guid>g3</guid><title>Tr\xc3\xaas</title><link>https://example.com/3</link></item>"
+    b"</channel></rss>"
+)
+
+ATOM_XML = (
+    b"<?xml version='1.0' encoding='utf-8'?><feed xmlns='http://www.w3.org/2005/Atom'><title>T</title>"
+    b"<entry><id>urn:a</id><title>Atom</title>"
+    b"<link rel='self' href='https://example.com/self'/><link href='https://example.com/a'/>"
+    b"<published>2025-06-22T20:00:00Z</published><updated>2025-06-23T08:00:00+00:00</updated>"
+    b"<summary>Resumo atom</summary></entry></feed>"
+)
+
+
+class FakeResponse:
+    """Resposta com corpo entregue em pedaços, contando quantos foram lidos"""
+
+    def __init__(self, body, chunk_size=64, headers=None):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.headers = headers or {}
+        self.chunks_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for start in range(0, len(self.body), self.chunk_size):
+            self.chunks_read += 1
+            yield self.body[start:start + self.chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class TestParser:
+    """Testes para o parse incremental"""
+
+    def test_rss_matches_feedparser_fields(self):
+        """Testa que id, título, link, resumo e datas batem com o feedparser"""
+        chunks = [RSS_XML[i:i + 7] for i in range(0, len(RSS_XML), 7)]
+        entries = list(iter_entries(chunks))
+        reference = feedparser.parse(RSS_XML).entries
+
+        assert [e["id"] for e in entries] == ["g1", "g2", "g3"]
+        for entry, expected in zip(entries, reference):
+            assert entry["title"] == expected.title
+            assert entry["link"] == expected.link
+        assert entries[0]["summary"] == reference[0].summary
+        assert entries[0]["published_parsed"] == reference[0].published_parsed
+        assert entries[1]["published_parsed"] == reference[1].published_parsed
+        assert entries[1]["summary"] == "<p>Texto dois</p>"
+        assert "published_parsed" not in entries[2]
+
+    def test_atom_entries(self):
+        """Testa links alternativos, datas ISO 8601 e namespace do Atom"""
+        entry = list(iter_entries([ATOM_XML]))[0]
+
+        assert entry["id"] == "urn:a"
+        assert entry["link"] == "https://example.com/a"
+        assert entry["summary"] == "Resumo atom"
+        assert calendar.timegm(entry["published_parsed"]) == calendar.timegm((2025, 6, 22, 20, 0, 0))
+        assert calendar.timegm(entry["updated_parsed"]) == calendar.timegm((2025, 6, 23, 8, 0, 0))
+
+    def test_parse_date_invalid(self):
+        """Testa que datas inválidas viram None"""
+        assert parse_date("ontem") is None
+        assert parse_date("") is None
+
+
+class TestParseResponse:
+    """Testes para a leitura da resposta HTTP"""
+
+    def test_stops_after_limit_new_entries(self):
+        """Testa que a leitura para quando há entradas novas suficientes"""
+        body = RSS_XML.replace(b"</channel>", b"<item><guid>x</guid><title>X</title></item>" * 200 + b"</channel>")
+        response = FakeResponse(body, headers={"ETag": '"v1"'})
+
+        feed = parse_response(response, limit=2, accept=lambda entry: entry["id"] != "g1")
+
+        assert [e["id"] for e in feed.entries] == ["g1", "g2", "g3"]
+        assert feed.truncated is True
+        assert feed.etag == '"v1"'
+        assert response.closed is True
+        assert response.chunks_read < len(body) // 64 // 2
+
+    def test_reads_whole_small_feed(self):
+        """Testa leitura completa quando o limite não é atingido"""
+        feed = parse_response(FakeResponse(RSS_XML), limit=10)
+
+        assert len(feed.entries) == 3
+        assert feed.truncated is False
+        assert feed.bozo is False
+
+    def test_falls_back_to_feedparser(self):
+        """Testa o fallback para documentos com entidades HTML"""
+        body = RSS_XML.replace(b"Resumo um", b"Resumo&nbsp;um")
+
+        feed = parse_response(FakeResponse(body), limit=10)
+
+        assert [e.id for e in feed.entries] == ["g1", "g2", "g3"]
@@ -0,0 +1,216 @@
+"""
+Testes para a API de leitura de notícias
+"""
+import json
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import pytest
+
+from lambda_api_noticias import (
+    lambda_handler,
+    encode_cursor,
+    decode_cursor,
+    etag_matches,
+    reset_response_cache
+)
+
+
+@pytest.fixture
+def mock_config():
+    config = Mock()
+    config.news_api.page_size = 20
+    config.news_api.max_page_size = 100
+    config.news_api.cache_max_age = 60
+    config.news_api.read_model_size = 50
+    config.news_api.local_cache_size = 0
+    config.news_api.local_cache_ttl = 30
+    config.news_api.local_cache_cursor_ttl = 300
+    config.news_api.local_cache_stale = 300
+    reset_response_cache()
+    with patch('lambda_api_noticias.get_config', return_value=config):
+        yield config
+    reset_response_cache()
+
+
+@pytest.fixture
+def mock_read_model():
+    with patch('lambda_api_noticias.ReadModelStore') as mock_store:
+        mock_store.return_value.load.return_value = None
+        yield mock_store.return_value
+
+
+@pytest.fixture
+def mock_buscar(mock_read_model):
+    with patch('lambda_api_noticias.get_dynamodb_table'), \
+         patch('lambda_api_noticias.buscar_pagina_publicadas') as mock_buscar:
+        mock_buscar.return_value = (
+            [{"id": "1", "titulo": "Título", "publicado_em": Decimal("1750000000")}],
+            {"id": "1", "nicho": "saude", "publicado_em": Decimal("1750000000")}
+        )
+        yield mock_buscar
+
+
+class TestCursor:
+    """Testes para os tokens de paginação"""
+
+    def test_roundtrip(self):
+        """Testa que o token devolve a chave, com Decimal convertido"""
+        token = encode_cursor({"id": "1", "publicado_em": Decimal("10")}, "saude")
+
+        assert "=" not in token
+        assert decode_cursor(token, "saude") == {"id": "1", "publicado_em": 10}
+
+    def test_rejects_other_niche_and_garbage(self):
+        """Testa que tokens de outro nicho ou corrompidos são recusados"""
+        token = encode_cursor({"id": "1"}, "saude")
+
+        with pytest.raises(ValueError):
+            decode_cursor(token, "esportes")
+        with pytest.raises(ValueError):
+            decode_cursor("não-é-token", "saude")
+
+    def test_etag_matches(self):
+        """Testa listas, ETags fracos e curinga no If-None-Match"""
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestLambdaHandler:
+    """Testes para o handler da API"""
+
+    def test_returns_page_with_cache_headers(self, mock_config, mock_buscar):
+        """Testa corpo paginado, ETag e Cache-Control"""
+        event = {"queryStringParameters": {"nicho": "Saude", "limit": "500"}}
+
+        response = lambda_handler(event, None)
+
+        assert response["statusCode"] == 200
+        body = json.loads(response["body"])
+        assert body["noticias"] == [{"id": "1", "titulo": "Título", "publicado_em": 1750000000}]
+        assert decode_cursor(body["proximo_cursor"], "saude")["id"] == "1"
+        assert response["headers"]["Cache-Control"] == "public, max-age=60"
+        assert response["headers"]["ETag"].startswith('"')
+        kwargs = mock_buscar.call_args.kwargs
+        assert kwargs["nicho"] == "saude"
+        assert kwargs["limit"] == 100
+
+    def test_follows_cursor(self, mock_config, mock_buscar):
+        """Testa que o cursor vira ExclusiveStartKey da próxima página"""
+        cursor = encode_cursor({"id": "9", "status_publicacao": "publicada", "publicado_em": 5}, None)
+
+        lambda_handler({"queryStringParameters": {"cursor": cursor}}, None)
+
+        kwargs = mock_buscar.call_args.kwargs
+        assert kwargs["start_key"]["id"] == "9"
+        assert kwargs["nicho"] is None
+        assert kwargs["limit"] == 20
+
+    def test_not_modified(self, mock_config, mock_buscar):
+        """Testa 304 sem corpo quando o If-None-Match bate com o ETag"""
+        etag = lambda_handler({}, None)["headers"]["ETag"]
+
+        response = lambda_handler({"headers": {"If-None-Match": etag}}, None)
+
+        assert response["statusCode"] == 304
+        assert response["body"] == ""
+        assert response["headers"]["ETag"] == etag
+
+    def test_invalid_parameters(self, mock_config, mock_buscar):
+        """Testa 400 para limit e cursor inválidos"""
+        assert lambda_handler({"queryStringParameters": {"limit": "abc"}}, None)["statusCode"] == 400
+        assert lambda_handler({"queryStringParameters": {"limit": "0"}}, None)["statusCode"] == 400
+        assert lambda_handler({"queryStringParameters": {"cursor": "xyz"}}, None)["statusCode"] == 400
+        mock_buscar.assert_not_called()
+
+    def test_query_error(self, mock_config, mock_buscar):
+        """Testa 500 sem cache quando a consulta falha"""
+        mock_buscar.side_effect = Exception("erro")
+
+        response = lambda_handler({}, None)
+
+        assert response["statusCode"] == 500
+        assert response["headers"]["Cache-Control"] == "no-store"
+
+    def test_first_page_from_read_model(self, mock_config, mock_buscar, mock_read_model):
+        """Testa que a primeira página sai do documento, sem Query, com cursor para a seguinte"""
+        mock_read_model.load.return_value = {
+            "versao": 3,
+            "mais": False,
+            "noticias": [
+                {"id": "2", "nicho": "saude", "publicado_em": 20},
+                {"id": "1", "nicho": "saude", "publicado_em": 10}
+            ]
+        }
+
+        response = lambda_handler({"queryStringParameters": {"nicho": "saude", "limit": "1"}}, None)
+
+        body = json.loads(response["body"])
+        assert [n["id"] for n in body["noticias"]] == ["2"]
+        assert decode_cursor(body["proximo_cursor"], "saude") == {"id": "2", "publicado_em": 20, "nicho": "saude"}
+        mock_read_model.load.assert_called_once_with("saude")
+        mock_buscar.assert_not_called()
+
+    def test_read_model_skips_expired_news(self, mock_config, mock_buscar, mock_read_model):
+        """Testa que notícias vencidas não são servidas e que a Query decide quando havia mais"""
+        mock_read_model.load.return_value = {
+            "versao": 3,
+            "mais": False,
+            "noticias": [
+                {"id": "2", "nicho": "saude", "publicado_em": 20, "ttl": 4102444800},
+                {"id": "1", "nicho": "saude", "publicado_em": 10, "ttl": 1000}
+            ]
+        }
+
+        body = json.loads(lambda_handler({"queryStringParameters": {"nicho": "saude"}}, None)["body"])
+
+        assert body == {"noticias": [{"id": "2", "nicho": "saude", "publicado_em": 20}], "proximo_cursor": None}
+        mock_buscar.assert_not_called()
+
+        reset_response_cache()
+        mock_read_model.load.return_value["mais"] = True
+        lambda_handler({"queryStringParameters": {"nicho": "saude"}}, None)
+
+        mock_buscar.assert_called_once()
+
+    def test_read_model_skipped_for_cursor_and_large_pages(self, mock_config, mock_buscar, mock_read_model):
+        """Testa que páginas seguintes e maiores que o documento usam a Query"""
+        cursor = encode_cursor({"id": "9", "nicho": "saude", "publicado_em": 5}, "saude")
+
+        lambda_handler({"queryStringParameters": {"nicho": "saude", "cursor": cursor}}, None)
+        lambda_handler({"queryStringParameters": {"limit": "80"}}, None)
+
+        mock_read_model.load.assert_not_called()
+        assert mock_buscar.call_count == 2
+
+
+class TestResponseCache:
+    """Testes para o cache de páginas do container"""
+
+    def test_repeated_queries_hit_cache(self, mock_config, mock_buscar):
+        """Testa que a mesma consulta não volta ao DynamoDB e expõe as métricas"""
+        mock_config.news_api.local_cache_size = 10
+        event = {"queryStringParameters": {"nicho": "saude", "limit": "80"}}
+
+        first = lambda_handler(event, None)
+        second = lambda_handler(event, None)
+        other = lambda_handler({"queryStringParameters": {"nicho": "esportes", "limit": "80"}}, None)
+
+        assert first["headers"]["X-Cache"] == "MISS"
+        assert second["headers"]["X-Cache"] == "HIT"
+        assert other["headers"]["X-Cache"] == "MISS"
+        assert second["body"] == first["body"]
+        assert second["headers"]["ETag"] == first["headers"]["ETag"]
+        assert "hits=1" in other["headers"]["X-Cache-Stats"]
+        assert "misses=2" in other["headers"]["X-Cache-Stats"]
+        assert mock_buscar.call_count == 2
+
+    def test_errors_are_not_cached(self, mock_config, mock_buscar):
+        """Testa que uma falha de consulta não fica no cache"""
+        mock_config.news_api.local_cache_size = 10
+        mock_buscar.side_effect = [Exception("erro"), mock_buscar.return_value]
+
+        assert lambda_handler({}, None)["statusCode"] == 500
+        assert lambda_handler({}, None)["headers"]["X-Cache"] == "MISS"
@@ -4,10 +4,14 @@ Testes para o lambda_coletor
 import pytest
 from unittest.mock import Mock, patch
 
+from content_filter import BloomFilter
+from feed_state import FeedState
 from lambda_coletor import (
     NewsCollector,
-    lambda_handler
+    lambda_handler,
+    reset_content_filter_cache
 )
+from utils import RateLimiter
 
 
 class TestNewsCollector:
@@ -15,7 +19,7 @@ class TestNewsCollector:
 
     def setup_method(self):
         """Setup para cada teste"""
-        self.collector = NewsCollector()
+        self.collector = NewsCollector(rate_limiter=RateLimiter(rate=0))
 
     def test_collector_initialization(self):
         """Testa inicialização do coletor"""
@@ -24,60 +28,152 @@ class TestNewsCollector:
         assert self.collector.total_errors == 0
         assert self.collector.start_time > 0
 
-    @patch('lambda_coletor.validar_url')
-    @patch('lambda_coletor.feedparser.parse')
-    def test_validate_rss_feed_success(self, mock_parse, mock_validate_url):
-        """Testa validação de feed RSS bem-sucedida"""
-        mock_validate_url.return_value = True
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_success(self, mock_get):
+        """Testa download e validação de feed RSS com uma única requisição"""
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"Content-Type": "application/rss+xml"}
+        mock_get.return_value.content = (
+            b"<rss version='2.0'><channel><title>T</title>"
+            b"<item><title>Entry</title><link>https://example.com/1</link></item>"
+            b"</channel></rss>"
+        )
 
-        mock_feed = Mock()
-        mock_feed.entries = ["entry1", "entry2"]
-        mock_feed.bozo = False
-        mock_parse.return_value = mock_feed
+        feed = self.collector.fetch_feed(
+            {"name": "Test Source", "url": "https://example.com/rss"}
+        )
+
+        assert feed is not None
+        assert len(feed.entries) == 1
+        mock_get.assert_called_once()
+
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_invalid_url(self, mock_get):
+        """Testa feed RSS com URL inválida sem fazer requisições"""
+        feed = self.collector.fetch_feed({"name": "Test Source", "url": "invalid-url"})
+
+        assert feed is None
+        mock_get.assert_not_called()
 
-        result = (
-            self.collector.validate_rss_feed("https://example.com/rss", "Test Source")
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_http_error(self, mock_get):
+        """Testa feed RSS que responde com erro HTTP"""
+        mock_get.return_value.status_code = 404
+
+        feed = self.collector.fetch_feed(
+            {"name": "Test Source", "url": "https://example.com/rss"}
         )
-        assert result is True
 
-    @patch('lambda_coletor.validar_url')
-    def test_validate_rss_feed_invalid_url(self, mock_validate_url):
-        """Testa validação de feed RSS com URL inválida"""
-        mock_validate_url.return_value = False
+        assert feed is None
 
-        result = self.collector.validate_rss_feed("invalid-url", "Test Source")
-        assert result is False
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_not_modified(self, mock_get):
+        """Testa que uma resposta 304 é ignorada sem parse"""
+        from feed_state import FeedState
 
-    @patch('lambda_coletor.validar_url')
-    @patch('lambda_coletor.feedparser.parse')
-    def test_validate_rss_feed_no_entries(self, mock_parse, mock_validate_url):
-        """Testa validação de feed RSS sem entradas"""
-        mock_validate_url.return_value = True
+        mock_get.return_value.status_code = 304
+        self.collector.feed_states["https://example.com/rss"] = FeedState(
+            url="https://example.com/rss", etag='"abc"'
+        )
+
+        feed = self.collector.fetch_feed(
+            {"name": "Test Source", "url": "https://example.com/rss"}
+        )
 
+        assert feed is None
+        assert self.collector.total_not_modified == 1
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_skips_seen_entries(self, mock_get):
+        """Testa que entradas vistas na coleta anterior são descartadas"""
+        from feed_state import FeedState
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"Content-Type": "application/rss+xml; charset=utf-8", "ETag": '"v2"'}
+        mock_get.return_value.content = (
+            b"<rss version='2.0'><channel><title>T</title>"
+            b"<item><guid>novo</guid><title>Novo</title><link>https://example.com/2</link></item>"
+            b"<item><guid>velho</guid><title>Velho</title><link>https://example.com/1</link></item>"
+            b"</channel></rss>"
+        )
+        store = Mock()
+        collector = NewsCollector(feed_state_store=store)
+        source = {"name": "Test Source", "url": "https://example.com/rss"}
+        collector.feed_states[source["url"]] = FeedState(url=source["url"], seen_ids=["velho"])
+
+        feed = collector.fetch_feed(source)
+        collector.save_feed_state(source)
+
+        assert [entry["id"] for entry in feed.entries] == ["novo"]
+        assert collector.total_skipped_entries == 1
+        saved = store.save.call_args.args[0]
+        assert saved.etag == '"v2"'
+        assert saved.seen_ids == ["novo", "velho"]
+
+    @patch('lambda_coletor.get_config')
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_stream_parser(self, mock_get, mock_get_config):
+        """Testa o parser incremental, que para de ler ao achar entradas novas suficientes"""
+        from feed_state import FeedState
+
+        mock_get_config.return_value.collector.feed_parser = "stream"
+        mock_get_config.return_value.content.max_news_per_source = 1
+        body = (
+            b"<rss version='2.0'><channel><title>T</title>"
+            b"<item><guid>velho</guid><title>Velho</title><link>https://example.com/1</link></item>"
+            b"<item><guid>novo</guid><title>Novo</title><link>https://example.com/2</link></item>"
+            b"<item><guid>outro</guid><title>Outro</title><link>https://example.com/3</link></item>"
+            b"</channel></rss>"
+        )
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"ETag": '"v2"'}
+        mock_get.return_value.iter_content.return_value = iter([body[:150], body[150:]])
+        collector = NewsCollector(feed_state_store=Mock(), rate_limiter=RateLimiter(rate=0))
+        source = {"name": "Test Source", "url": "https://example.com/rss"}
+        collector.feed_states[source["url"]] = FeedState(url=source["url"], seen_ids=["velho"])
+
+        feed = collector.fetch_feed(source)
+
+        assert mock_get.call_args.kwargs["stream"] is True
+        assert [entry["id"] for entry in feed.entries] == ["novo"]
+        assert collector.pending_feed_states[source["url"]].seen_ids == ["velho", "novo"]
+        mock_get.return_value.close.assert_called_once()
+
+    @patch('utils.HttpClient.get')
+    def test_fetch_feed_uses_rate_limiter(self, mock_get):
+        """Testa que só a requisição HTTP real consome o limite do host"""
+        mock_get.return_value.status_code = 304
+        limiter = Mock()
+        collector = NewsCollector(rate_limiter=limiter)
+
+        collector.fetch_feed({"name": "Test Source", "url": "https://example.com/rss"})
+
+        limiter.acquire.assert_called_once_with("https://example.com/rss")
+
+    def test_validate_feed_success(self):
+        """Testa validação de feed RSS bem-sucedida"""
+        mock_feed = Mock()
+        mock_feed.entries = ["entry1", "entry2"]
+        mock_feed.bozo = False
+
+        assert self.collector.validate_feed(mock_feed, "Test Source") is True
+
+    def test_validate_feed_no_entries(self):
+        """Testa validação de feed RSS sem entradas"""
         mock_feed = Mock()
         mock_feed.entries = []
-        mock_parse.return_value = mock_feed
+        mock_feed.bozo = False
 
-        result = (
-            self.collector.validate_rss_feed("https://example.com/rss", "Test Source")
-        )
-        assert result is False
+        assert self.collector.validate_feed(mock_feed, "Test Source") is False
 
-    @patch('lambda_coletor.validar_url')
-    @patch('lambda_coletor.feedparser.parse')
-    def test_validate_rss_feed_bozo(self, mock_parse, mock_validate_url):
+    def test_validate_feed_bozo(self):
         """Testa validação de feed RSS malformado"""
-        mock_validate_url.return_value = True
-
         mock_feed = Mock()
         mock_feed.entries = ["entry1"]
         mock_feed.bozo = True
-        mock_parse.return_value = mock_feed
 
-        result = (
-            self.collector.validate_rss_feed("https://example.com/rss", "Test Source")
-        )
-        assert result is False
+        assert self.collector.validate_feed(mock_feed, "Test Source") is False
 
     def test_process_news_item_success(self):
         """Testa processamento bem-sucedido de item de notícia"""
@@ -105,6 +201,28 @@ class TestNewsCollector:
             assert self.collector.total_saved == 1
             collection.insert_one.assert_called_once()
 
+    @patch('lambda_coletor.get_config')
+    def test_process_news_item_stamps_ttl(self, mock_get_config):
+        """Testa que a notícia é gravada com expiração pela retenção do nicho"""
+        mock_config = Mock()
+        mock_config.content.threshold_caracteres = 250
+        mock_config.is_copyscape_configured.return_value = False
+        mock_config.get_retention_days.return_value = 14
+        mock_get_config.return_value = mock_config
+
+        table = Mock()
+        table.get_item.return_value = {}
+        entry = {"title": "Test Title", "link": "https://example.com", "summary": "Resumo"}
+        source = {"name": "Test Source", "nicho": "saude"}
+
+        with patch('lambda_coletor.checar_plagio_local', return_value=False), \
+                patch.object(self.collector, 'get_dedup_index'):
+            assert self.collector.process_news_item(entry, source, table) is True
+
+        item = table.put_item.call_args.kwargs["Item"]
+        mock_config.get_retention_days.assert_called_with("saude")
+        assert item["ttl"] == item["data_insercao"] + 14 * 86400
+
     def test_process_news_item_missing_data(self):
         """Testa processamento de item com dados insuficientes"""
         entry = {
@@ -170,7 +288,7 @@ class TestNewsCollector:
             assert result is False
             assert self.collector.total_existing == 1
 
-    @patch('lambda_coletor.requests.post')
+    @patch('utils.HttpClient.post')
     @patch('lambda_coletor.get_config')
     def test_check_copyscape_plagiarism_no_plagio(self, mock_get_config, mock_post):
         """Testa verificação de plágio Copyscape sem plágio"""
@@ -185,7 +303,7 @@ class TestNewsCollector:
         result = collector.check_copyscape_plagiarism("texto teste")
         assert result is False
 
-    @patch('lambda_coletor.requests.post')
+    @patch('utils.HttpClient.post')
     @patch('lambda_coletor.get_config')
     def test_check_copyscape_plagiarism_with_plagio(self, mock_get_config, mock_post):
         """Testa verificação de plágio Copyscape com plágio"""
@@ -216,10 +334,10 @@ class TestNewsCollector:
         mock_config.get_dynamodb_resource.return_value.Table.return_value = mock_table
         mock_get_config.return_value = mock_config
 
-        with patch.object(self.collector, 'validate_rss_feed') as mock_validate:
+        with patch.object(self.collector, 'validate_feed') as mock_validate:
             mock_validate.return_value = True
 
-            with patch('lambda_coletor.feedparser.parse') as mock_parse:
+            with patch.object(self.collector, 'download_feed') as mock_parse:
                 mock_feed = Mock()
                 mock_feed.entries = [
                     {
@@ -254,6 +372,451 @@ class TestNewsCollector:
         assert collector.total_errors == 0
 
 
+class TestBatchMode:
+    """Testes para o modo de escrita em lote"""
+
+    def setup_method(self):
+        self.collector = NewsCollector(rate_limiter=RateLimiter(rate=0))
+
+    def _table(self):
+        table = Mock()
+        table.name = "djblog-noticias"
+        table.batch_writer.return_value.__enter__ = Mock(return_value=table.writer)
+        table.batch_writer.return_value.__exit__ = Mock(return_value=False)
+        return table
+
+    def test_batch_get_chunks_of_100(self):
+        """Testa que a existência é verificada em lotes de 100 chaves"""
+        table = self._table()
+        table.meta.client.batch_get_item.return_value = {
+            "Responses": {"djblog-noticias": [{"id": "id-7"}]}
+        }
+
+        existing, failed = self.collector.batch_get_existing_ids(
+            table, [f"id-{i}" for i in range(250)]
+        )
+
+        sizes = [len(call.kwargs["RequestItems"]["djblog-noticias"]["Keys"])
+                 for call in table.meta.client.batch_get_item.call_args_list]
+        assert sizes == [100, 100, 50]
+        assert existing == {"id-7"}
+        assert failed == set()
+        assert self.collector.dynamodb_calls["batch_get_item"] == 3
+
+    @patch('lambda_coletor.time.sleep')
+    def test_batch_get_retries_unprocessed_keys(self, mock_sleep):
+        """Testa reenvio das UnprocessedKeys"""
+        table = self._table()
+        unprocessed = {"djblog-noticias": {"Keys": [{"id": "b"}], "ProjectionExpression": "id"}}
+        table.meta.client.batch_get_item.side_effect = [
+            {"Responses": {"djblog-noticias": [{"id": "a"}]}, "UnprocessedKeys": unprocessed},
+            {"Responses": {"djblog-noticias": [{"id": "b"}]}}
+        ]
+
+        existing, failed = self.collector.batch_get_existing_ids(table, ["a", "b"])
+
+        assert existing == {"a", "b"}
+        assert table.meta.client.batch_get_item.call_args_list[1].kwargs["RequestItems"] == unprocessed
+
+    def test_batch_get_with_boto3_table(self):
+        """Testa com uma Table do boto3 que as chaves chegam ao DynamoDB como strings"""
+        import json
+        import boto3
+        from botocore.stub import Stubber
+
+        table = boto3.resource('dynamodb', region_name='us-east-1').Table('djblog-noticias')
+        bodies = []
+        table.meta.client.meta.events.register_first(
+            'before-call.*.*', lambda params, **kwargs: bodies.append(json.loads(params['body']))
+        )
+        stubber = Stubber(table.meta.client)
+        stubber.add_response('batch_get_item', {"Responses": {"djblog-noticias": [{"id": {"S": "a"}}]}})
+
+        with stubber:
+            existing, failed = self.collector.batch_get_existing_ids(table, ["a", "b"])
+
+        assert existing == {"a"} and failed == set()
+        assert bodies[0]["RequestItems"]["djblog-noticias"]["Keys"] == [{"id": {"S": "a"}}, {"id": {"S": "b"}}]
+
+    @patch('lambda_coletor.get_config')
+    def test_process_feeds_batch(self, mock_get_config):
+        """Testa que só as notícias novas são gravadas, numa única chamada"""
+        mock_config = Mock()
+        mock_config.content.max_news_per_source = 5
+        mock_config.content.threshold_caracteres = 250
+        mock_config.is_copyscape_configured.return_value = False
+        mock_config.get_retention_days.return_value = 7
+        mock_get_config.return_value = mock_config
+
+        feed = Mock()
+        feed.entries = [
+            {"title": f"Notícia {i}", "link": f"https://example.com/{i}", "summary": f"Resumo {i}"}
+            for i in range(3)
+        ]
+        existing_id = self.collector.prepare_entry(feed.entries[0])["id"]
+        table = self._table()
+        table.meta.client.batch_get_item.return_value = {
+            "Responses": {"djblog-noticias": [{"id": existing_id}]}
+        }
+
+        with patch('lambda_coletor.checar_plagio_local', return_value=False), \
+                patch.object(self.collector, 'get_dedup_index'):
+            self.collector.process_feeds_batch(
+                [({"name": "A", "nicho": "tecnologia"}, feed), ({"name": "B", "nicho": "tecnologia"}, feed)],
+                table
+            )
+
+        assert self.collector.total_saved == 2
+        assert self.collector.total_existing == 4  # 1 já gravada + 3 repetidas na fonte B
+        assert table.writer.put_item.call_count == 2
+        table.get_item.assert_not_called()
+        table.put_item.assert_not_called()
+        assert self.collector.dynamodb_calls == {
+            "get_item": 0, "put_item": 0, "batch_get_item": 1, "batch_write_item": 1
+        }
+
+    @patch('lambda_coletor.get_config')
+    @patch('utils.HttpClient.get')
+    def test_failed_batch_write_is_retried_next_run(self, mock_get, mock_get_config, tmp_path):
+        """Testa que a entrada cuja gravação em lote falhou é processada na coleta seguinte"""
+        from dedup_index import NearDuplicateIndex
+        from feed_state import LocalFeedStateStore
+
+        mock_config = Mock()
+        mock_config.collector.feed_parser = "feedparser"
+        mock_config.content.max_news_per_source = 5
+        mock_config.content.threshold_caracteres = 250
+        mock_config.is_copyscape_configured.return_value = False
+        mock_config.get_retention_days.return_value = 7
+        mock_get_config.return_value = mock_config
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {"Content-Type": "application/rss+xml; charset=utf-8", "ETag": '"v1"'}
+        mock_get.return_value.content = (
+            b"<rss version='2.0'><channel><title>T</title>"
+            b"<item><guid>g1</guid><title>Nova</title><link>https://example.com/1</link>"
+            b"<pubDate>Sun, 22 Jun 2025 20:00:00 GMT</pubDate><description>Resumo</description></item>"
+            b"</channel></rss>"
+        )
+        store = LocalFeedStateStore(str(tmp_path / "feeds.json"))
+        source = {"name": "A", "nicho": "tecnologia", "url": "https://example.com/rss"}
+        table = self._table()
+        table.meta.client.batch_get_item.return_value = {"Responses": {}}
+
+        def run():
+            collector = NewsCollector(feed_state_store=store, rate_limiter=RateLimiter(rate=0))
+            collector.dedup_indexes["tecnologia"] = NearDuplicateIndex()
+            collector.load_feed_states([source])
+            feed = collector.fetch_feed(source)
+            with patch('lambda_coletor.checar_plagio_local', return_value=False):
+                collector.process_feeds_batch([(source, feed)], table)
+            collector.save_feed_state(source)
+            return collector, feed
+
+        table.writer.put_item.side_effect = Exception("ProvisionedThroughputExceededException")
+        collector, feed = run()
+        assert table.writer.put_item.called
+        assert collector.total_saved == 0
+        assert store.get(source["url"]).seen_ids == []
+        assert store.get(source["url"]).etag is None
+
+        table.writer.put_item.side_effect = None
+        collector, feed = run()
+        assert mock_get.call_args.kwargs["headers"] == {}
+        assert [entry["id"] for entry in feed.entries] == ["g1"]
+        assert collector.total_saved == 1
+        assert store.get(source["url"]).seen_ids == ["g1"]
+
+        collector, feed = run()
+        assert feed.entries == []
+
+    @patch('lambda_coletor.get_config')
+    def test_failed_put_item_is_saved_on_retry(self, mock_get_config):
+        """Testa que a notícia cujo put_item falhou sai do índice e é gravada na nova tentativa"""
+        from dedup_index import NearDuplicateIndex
+
+        mock_config = Mock()
+        mock_config.content.threshold_caracteres = 250
+        mock_config.is_copyscape_configured.return_value = False
+        mock_config.get_retention_days.return_value = 7
+        mock_get_config.return_value = mock_config
+        collector = NewsCollector(rate_limiter=RateLimiter(rate=0))
+        index = collector.dedup_indexes["tecnologia"] = NearDuplicateIndex()
+        source = {"name": "A", "nicho": "tecnologia", "url": "https://example.com/rss"}
+        entry = {"id": "g1", "title": "Nova linguagem de programação lançada hoje",
+                 "link": "https://example.com/1",
+                 "summary": "A empresa anunciou uma nova linguagem de programação para sistemas distribuídos."}
+        table = Mock()
+        table.get_item.return_value = {}
+
+        table.put_item.side_effect = Exception("ProvisionedThroughputExceededException")
+        assert collector.process_news_item(entry, source, table) is False
+        assert len(index) == 0
+
+        table.put_item.side_effect = None
+        assert collector.process_news_item(entry, source, table) is True
+        assert collector.total_saved == 1
+        assert collector.total_existing == 0
+        assert len(index) == 1
+
+    def test_process_news_item_error_is_not_marked_seen(self):
+        """Testa que uma falha no modo single deixa a entrada fora do estado do feed"""
+        store = Mock()
+        collector = NewsCollector(feed_state_store=store, rate_limiter=RateLimiter(rate=0))
+        source = {"name": "A", "url": "https://example.com/rss"}
+        entry = {"id": "g1", "title": "Nova", "link": "https://example.com/1", "summary": "Resumo"}
+        collector.pending_feed_states[source["url"]] = FeedState(url=source["url"], etag='"v1"', seen_ids=["g1", "g0"])
+        table = Mock()
+        table.get_item.return_value = {}
+
+        with patch.object(collector, 'build_news_item', side_effect=Exception("DynamoDB indisponível")):
+            assert collector.process_news_item(entry, source, table) is False
+        collector.save_feed_state(source)
+
+        saved = store.save.call_args.args[0]
+        assert saved.seen_ids == ["g0"]
+        assert saved.etag is None
+
+
+class TestAISummary:
+    """Testes para o resumo em lote com IA"""
+
+    def setup_method(self):
+        self.pipeline = Mock()
+        self.collector = NewsCollector(rate_limiter=RateLimiter(rate=0), summary_pipeline=self.pipeline)
+
+    @patch('lambda_coletor.get_config')
+    def test_summarize_news_replaces_only_returned(self, mock_config):
+        """Testa que só as notícias resumidas pela IA têm o resumo trocado"""
+        mock_config.return_value.summary.enabled = True
+        mock_config.return_value.is_openai_configured.return_value = True
+        self.pipeline.summarize.return_value = {"a": "Resumo da IA"}
+        noticias = [
+            {"id": "a", "resumo": "curto", "descricao_completa": "texto completo"},
+            {"id": "b", "resumo": "original"}
+        ]
+
+        self.collector.summarize_news(noticias)
+
+        self.pipeline.summarize.assert_called_once_with({"a": "texto completo", "b": "original"})
+        assert [n["resumo"] for n in noticias] == ["Resumo da IA", "original"]
+        assert self.collector.total_ai_summaries == 1
+
+    @patch('lambda_coletor.get_config')
+    def test_summarize_news_disabled(self, mock_config):
+        """Testa que nada é enviado com AI_SUMMARY desligado"""
+        mock_config.return_value.summary.enabled = False
+
+        self.collector.summarize_news([{"id": "a", "resumo": "original"}])
+
+        self.pipeline.summarize.assert_not_called()
+
+
+class TestLanguageProfile:
+    """Testes para o perfil de idioma das fontes no estado do feed"""
+
+    def test_profile_roundtrip_through_feed_state(self):
+        """Testa que as contagens carregadas do estado voltam a ele atualizadas"""
+        profiler = Mock()
+        profiler.counts.return_value = {"pt": 6}
+        store = Mock()
+        store.get.return_value = FeedState(url="https://example.com/rss", languages={"pt": 5})
+        collector = NewsCollector(feed_state_store=store, rate_limiter=RateLimiter(rate=0),
+                                  language_profiler=profiler)
+        source = {"url": "https://example.com/rss"}
+
+        collector.load_feed_states([source])
+        collector.pending_feed_states[source["url"]] = FeedState(url=source["url"], languages={"pt": 5})
+        collector.save_feed_state(source)
+
+        profiler.load.assert_called_once_with(source["url"], {"pt": 5})
+        assert store.save.call_args.args[0].languages == {"pt": 6}
+
+
+class TestContentFilter:
+    """Testes para o filtro de hashes de conteúdo"""
+
+    def setup_method(self):
+        reset_content_filter_cache()
+        self.collector = NewsCollector(rate_limiter=RateLimiter(rate=0), content_filter_store=Mock())
+        self.config_patch = patch('lambda_coletor.get_config')
+        self.config = self.config_patch.start().return_value
+        self.config.collector.content_filter = True
+        self.config.collector.content_filter_capacity = 1000
+        self.config.collector.content_filter_fp_rate = 0.01
+        self.config.collector.content_filter_rebuild_hours = 24
+        self.config.collector.content_filter_check_rate = 0.0
+        self.config.content.nichos = ["tecnologia"]
+        self.config.content.max_news_per_source = 5
+        self.config.content.threshold_caracteres = 250
+
+    def teardown_method(self):
+        self.config_patch.stop()
+        reset_content_filter_cache()
+
+    def _entries(self, n):
+        return [{"title": f"Notícia {i}", "link": f"https://example.com/{i}", "summary": f"Resumo {i}"}
+                for i in range(n)]
+
+    @patch('lambda_coletor.buscar_por_nicho')
+    def test_rebuilds_on_cold_start_and_reuses_when_warm(self, mock_buscar):
+        """Testa reconstrução sem snapshot e reaproveitamento no container quente"""
+        self.collector.content_filter_store.load.return_value = None
+        mock_buscar.return_value = [{"id": "a"}, {"id": "b"}]
+
+        bloom = self.collector.load_content_filter(Mock())
+
+        assert "a" in bloom and "b" in bloom
+        assert [call.args[1] for call in mock_buscar.call_args_list] == ["tecnologia", "geral"]
+        assert self.collector.content_filter_rebuilt is True
+
+        warm = NewsCollector(rate_limiter=RateLimiter(rate=0), content_filter_store=Mock())
+        assert warm.load_content_filter(Mock()) is bloom
+        warm.content_filter_store.load.assert_not_called()
+
+    @patch('lambda_coletor.buscar_por_nicho', return_value=[])
+    def test_rebuilds_expired_snapshot(self, mock_buscar):
+        """Testa que um snapshot mais velho que o intervalo é descartado"""
+        old = BloomFilter(capacity=1000, fp_rate=0.01, created_at=0)
+        old.add("antiga")
+        self.collector.content_filter_store.load.return_value = old
+
+        bloom = self.collector.load_content_filter(Mock())
+
+        assert bloom is not old
+        assert "antiga" not in bloom
+
+    def test_known_entry_skips_dynamodb(self):
+        """Testa que uma entrada conhecida é descartada sem get_item"""
+        entry = self._entries(1)[0]
+        self.collector.content_filter = BloomFilter(capacity=1000, fp_rate=0.01)
+        self.collector.content_filter.add(self.collector.prepare_entry(entry)["id"])
+        table = Mock()
+
+        assert self.collector.process_news_item(entry, {"name": "A", "nicho": "tecnologia"}, table) is False
+
+        table.get_item.assert_not_called()
+        assert self.collector.total_existing == 1
+        assert self.collector.content_filter_stats()["descartadas"] == 1
+
+    def test_sampled_positive_measures_false_positive(self):
+        """Testa que um positivo sorteado e ausente na tabela conta como falso positivo e é gravado"""
+        entry = self._entries(1)[0]
+        self.collector.content_filter = BloomFilter(capacity=1000, fp_rate=0.01)
+        self.collector.content_filter.add(self.collector.prepare_entry(entry)["id"])
+        self.collector.content_filter_check_rate = 1.0
+        self.config.is_copyscape_configured.return_value = False
+        self.config.get_retention_days.return_value = 7
+        table = Mock()
+        table.get_item.return_value = {}
+
+        with patch('lambda_coletor.checar_plagio_local', return_value=False), \
+                patch.object(self.collector, 'get_dedup_index'):
+            assert self.collector.process_news_item(entry, {"name": "A", "nicho": "tecnologia"}, table) is True
+
+        assert self.collector.content_filter.checks == 1
+        assert self.collector.content_filter.false_positives == 1
+
+    def test_batch_skips_known_and_learns_new(self):
+        """Testa que o lote só consulta as entradas desconhecidas e adiciona as gravadas"""
+        entries = self._entries(3)
+        ids = [self.collector.prepare_entry(entry)["id"] for entry in entries]
+        self.collector.content_filter = BloomFilter(capacity=1000, fp_rate=0.01)
+        self.collector.content_filter.add(ids[0])
+        self.config.is_copyscape_configured.return_value = False
+        self.config.get_retention_days.return_value = 7
+
+        feed = Mock()
+        feed.entries = entries
+        table = Mock()
+        table.name = "djblog-noticias"
+        table.batch_writer.return_value.__enter__ = Mock(return_value=table.writer)
+        table.batch_writer.return_value.__exit__ = Mock(return_value=False)
+        table.meta.client.batch_get_item.return_value = {
+            "Responses": {"djblog-noticias": [{"id": ids[1]}]}
+        }
+
+        with patch('lambda_coletor.checar_plagio_local', return_value=False), \
+                patch.object(self.collector, 'get_dedup_index'):
+            self.collector.process_feeds_batch([({"name": "A", "nicho": "tecnologia"}, feed)], table)
+
+        keys = table.meta.client.batch_get_item.call_args.kwargs["RequestItems"]["djblog-noticias"]["Keys"]
+        assert [key["id"] for key in keys] == ids[1:]
+        assert self.collector.total_saved == 1
+        assert self.collector.total_existing == 2
+        assert all(content_id in self.collector.content_filter for content_id in ids)
+
+
+class TestConcurrentFetch:
+    """Testes para o download paralelo de feeds"""
+
+    def _mock_config(self, workers=4, per_host=1):
+        mock_config = Mock()
+        mock_config.collector.fetch_workers = workers
+        mock_config.collector.max_connections_per_host = per_host
+        return mock_config
+
+    @patch('lambda_coletor.get_config')
+    def test_fetch_all_feeds_keeps_order_and_latency(self, mock_get_config):
+        """Testa que os feeds voltam na ordem das fontes com latência por URL do feed"""
+        mock_get_config.return_value = self._mock_config()
+        sources = [
+            {"name": "A", "url": "https://a.example.com/rss"},
+            {"name": "B", "url": "https://b.example.com/rss"},
+            {"name": "C", "url": "https://c.example.com/rss"},
+            {"name": "A", "nicho": "esportes", "url": "https://a.example.com/esportes/rss"}
+        ]
+        collector = NewsCollector()
+
+        with patch.object(collector, 'fetch_feed') as mock_fetch:
+            mock_fetch.side_effect = lambda source: f"feed-{source['name']}"
+            results = collector.fetch_all_feeds(sources)
+
+        assert [feed for _, feed in results] == ["feed-A", "feed-B", "feed-C", "feed-A"]
+        assert set(collector.fetch_latencies) == {source["url"] for source in sources}
+
+    @patch('lambda_coletor.get_config')
+    def test_fetch_all_feeds_respects_per_host_limit(self, mock_get_config):
+        """Testa que o limite de conexões por host é respeitado"""
+        import threading
+        import time
+
+        mock_get_config.return_value = self._mock_config(workers=4, per_host=1)
+        sources = [
+            {"name": f"S{i}", "url": f"https://mesmo-host.com/rss/{i}"}
+            for i in range(4)
+        ]
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow_fetch(source):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return "feed"
+
+        collector = NewsCollector()
+        with patch.object(collector, 'fetch_feed', side_effect=slow_fetch):
+            collector.fetch_all_feeds(sources)
+
+        assert active["max"] == 1
+
+    @patch('lambda_coletor.get_config')
+    def test_fetch_all_feeds_counts_errors(self, mock_get_config):
+        """Testa que falhas de download são contadas como erro"""
+        mock_get_config.return_value = self._mock_config()
+        sources = [{"name": "A", "url": "https://a.example.com/rss"}]
+        collector = NewsCollector()
+
+        with patch.object(collector, 'fetch_feed', side_effect=Exception("timeout")):
+            results = collector.fetch_all_feeds(sources)
+
+        assert results == [(sources[0], None)]
+        assert collector.total_errors == 1
+
+
 class TestLambdaHandler:
     """Testes para o handler principal do Lambda"""
 
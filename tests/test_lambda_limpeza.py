@@ -0,0 +1,168 @@
+"""
+Testes para o lambda_limpeza
+"""
+from unittest.mock import Mock, patch
+
+from lambda_limpeza import CleanupEngine, lambda_handler
+
+
+def _table():
+    table = Mock()
+    table.name = "djblog-noticias"
+    return table
+
+
+def _keys(*ids):
+    return [{"id": {"S": i}} for i in ids]
+
+
+class TestCleanupEngine:
+    """Testes para o motor de limpeza"""
+
+    def test_query_follows_pagination(self):
+        """Testa que todas as páginas do índice são lidas e apagadas"""
+        client = Mock()
+        client.query.side_effect = [
+            {"Items": _keys("1", "2"), "ScannedCount": 2, "LastEvaluatedKey": {"id": {"S": "2"}},
+             "ConsumedCapacity": {"CapacityUnits": 0.5}},
+            {"Items": _keys("3"), "ScannedCount": 1, "ConsumedCapacity": {"CapacityUnits": 0.5}}
+        ]
+        client.batch_write_item.return_value = {"ConsumedCapacity": [{"CapacityUnits": 3.0}]}
+
+        stats = CleanupEngine(_table(), 1000, client=client).run(["tecnologia"])
+
+        assert client.query.call_count == 2
+        assert client.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"id": {"S": "2"}}
+        assert stats["examinadas"] == 3
+        assert stats["removidas"] == 3
+        assert stats["capacidade_leitura"] == 1.0
+        assert stats["capacidade_escrita"] == 3.0
+        client.batch_write_item.assert_called_once()
+
+    def test_batches_of_25(self):
+        """Testa que as remoções são agrupadas em lotes de 25"""
+        client = Mock()
+        client.query.return_value = {"Items": _keys(*[str(i) for i in range(60)]), "ScannedCount": 60}
+        client.batch_write_item.return_value = {}
+
+        stats = CleanupEngine(_table(), 1000, client=client).run(["tecnologia"])
+
+        sizes = [len(call.kwargs["RequestItems"]["djblog-noticias"])
+                 for call in client.batch_write_item.call_args_list]
+        assert sizes == [25, 25, 10]
+        assert stats["removidas"] == 60
+
+    @patch("lambda_limpeza.time.sleep")
+    def test_retries_unprocessed_items(self, mock_sleep):
+        """Testa reenvio dos itens não processados"""
+        client = Mock()
+        client.query.return_value = {"Items": _keys("1", "2"), "ScannedCount": 2}
+        unprocessed = [{"DeleteRequest": {"Key": {"id": {"S": "2"}}}}]
+        client.batch_write_item.side_effect = [
+            {"UnprocessedItems": {"djblog-noticias": unprocessed}},
+            {}
+        ]
+
+        stats = CleanupEngine(_table(), 1000, client=client).run(["tecnologia"])
+
+        assert client.batch_write_item.call_args_list[1].kwargs["RequestItems"] == {
+            "djblog-noticias": unprocessed
+        }
+        assert stats["removidas"] == 2
+        assert stats["reenvios"] == 1
+        assert stats["falhas"] == 0
+        mock_sleep.assert_called_once()
+
+    def test_parallel_segmented_scan(self):
+        """Testa que cada segmento é lido com Segment/TotalSegments"""
+        client = Mock()
+        client.scan.return_value = {"Items": _keys("1"), "ScannedCount": 10}
+        client.batch_write_item.return_value = {}
+
+        stats = CleanupEngine(_table(), 1000, mode="scan", segments=4, client=client).run([])
+
+        segments = sorted(call.kwargs["Segment"] for call in client.scan.call_args_list)
+        assert segments == [0, 1, 2, 3]
+        assert all(call.kwargs["TotalSegments"] == 4 for call in client.scan.call_args_list)
+        assert stats["examinadas"] == 40
+        assert stats["removidas"] == 4
+        client.query.assert_not_called()
+
+    def test_scan_removes_expired_ttl(self):
+        """Testa que o scan remove TTL vencido e itens antigos sem TTL"""
+        client = Mock()
+        client.scan.return_value = {"Items": [], "ScannedCount": 0}
+
+        CleanupEngine(_table(), 1000, mode="scan", segments=1, now_timestamp=5000, client=client).run([])
+
+        kwargs = client.scan.call_args.kwargs
+        assert kwargs["ExpressionAttributeNames"] == {"#ttl": "ttl"}
+        assert kwargs["ExpressionAttributeValues"][":agora"] == {"N": "5000"}
+        assert "attribute_not_exists(#ttl)" in kwargs["FilterExpression"]
+
+    def test_read_error_is_counted(self):
+        """Testa que erros de leitura não interrompem os demais nichos"""
+        client = Mock()
+        client.query.side_effect = [Exception("throttled"), {"Items": _keys("1"), "ScannedCount": 1}]
+        client.batch_write_item.return_value = {}
+
+        engine = CleanupEngine(_table(), 1000, client=client)
+        with patch("lambda_limpeza.ThreadPoolExecutor") as mock_executor:
+            mock_executor.return_value.__enter__.return_value.map = map
+            stats = engine.run(["a", "b"])
+
+        assert stats["falhas"] == 1
+        assert stats["removidas"] == 1
+
+    @patch("lambda_limpeza.get_config")
+    def test_uses_low_level_client(self, mock_get_config):
+        """Testa que as chaves {'S': ...} chegam ao DynamoDB como estão, com uma Table do boto3"""
+        import json
+        import boto3
+        from botocore.stub import Stubber
+
+        table = boto3.resource("dynamodb", region_name="us-east-1").Table("djblog-noticias")
+        client = boto3.client("dynamodb", region_name="us-east-1")
+        mock_get_config.return_value.get_dynamodb_client.return_value = client
+        bodies = []
+        client.meta.events.register_first("before-call.*.*",
+                                          lambda params, **kwargs: bodies.append(json.loads(params["body"])))
+        stubber = Stubber(client)
+        stubber.add_response("query", {"Items": [], "ScannedCount": 0})
+
+        with stubber:
+            stats = CleanupEngine(table, 1000).run(["tecnologia"])
+
+        assert stats["falhas"] == 0
+        assert bodies[0]["ExpressionAttributeValues"][":nicho"] == {"S": "tecnologia"}
+
+
+class TestLambdaHandler:
+    """Testes para o handler"""
+
+    @patch("lambda_limpeza.get_config")
+    @patch("lambda_limpeza.get_dynamodb_table")
+    def test_handler_reports_stats(self, mock_get_table, mock_get_config):
+        """Testa resposta com contagem, vazão e capacidade"""
+        client = Mock()
+        client.query.return_value = {"Items": _keys("1"), "ScannedCount": 1}
+        client.batch_write_item.return_value = {}
+        mock_get_table.return_value = _table()
+        config = Mock()
+        config.cleanup.retention_days = 7
+        config.cleanup.mode = "index"
+        config.cleanup.scan_segments = 4
+        config.get_dynamodb_client.return_value = client
+        config.content.nichos = ["tecnologia"]
+        config.get_retention_days.side_effect = lambda nicho: 30 if nicho == "tecnologia" else 7
+        mock_get_config.return_value = config
+
+        result = lambda_handler({}, None)
+
+        assert result["statusCode"] == 200
+        assert result["body"]["deleted_count"] == 2
+        assert "itens_por_segundo" in result["body"]["stats"]
+        cutoffs = {call.kwargs["ExpressionAttributeValues"][":nicho"]["S"]:
+                   int(call.kwargs["ExpressionAttributeValues"][":cutoff"]["N"])
+                   for call in client.query.call_args_list}
+        assert cutoffs["geral"] - cutoffs["tecnologia"] == 23 * 86400
@@ -0,0 +1,263 @@
+"""
+Testes para o lambda_publicar_wordpress
+"""
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from lambda_publicar_wordpress import WordPressPublisher, reset_title_index_cache
+from utils import RateLimiter
+
+
+TITULOS = [
+    "Governo anuncia pacote para escolas",
+    "Time vence final nos pênaltis",
+    "Bolsa fecha em alta recorde",
+    "Nova vacina aprovada pela Anvisa",
+    "Startup levanta rodada milionária",
+    "Chuvas atingem litoral paulista",
+    "Satélite brasileiro entra em órbita",
+    "Inflação desacelera em setembro",
+    "Museu reabre após reforma"
+]
+
+
+def _noticia(i, titulo=None):
+    return {
+        "id": f"n{i}",
+        "titulo": titulo or TITULOS[i],
+        "resumo": "Resumo",
+        "link": f"https://example.com/{i}",
+        "fonte": "Fonte",
+        "nicho": "tecnologia",
+        "status_publicacao": "pendente"
+    }
+
+
+def _response(status, post_id=None, headers=None):
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.text = ""
+    response.json.return_value = {"id": post_id, "link": f"https://blog/{post_id}"}
+    return response
+
+
+def _table():
+    table = Mock()
+    table.name = "djblog-noticias"
+    return table
+
+
+def _status_updates(table):
+    """Updates enviados por gravar_em_lote, na ordem das transações"""
+    return [action["Update"] for call in table.meta.client.transact_write_items.call_args_list
+            for action in call.kwargs["TransactItems"]]
+
+
+class TestAsyncPublisher:
+    """Testes para a publicação com concorrência limitada"""
+
+    def setup_method(self):
+        reset_title_index_cache()
+        self.config_patch = patch('lambda_publicar_wordpress.get_config')
+        mock_config = self.config_patch.start()
+        mock_config.return_value.wordpress.wp_url = "https://wp.example.com/wp-json/wp/v2"
+        mock_config.return_value.wordpress.publish_concurrency = 2
+        mock_config.return_value.wordpress.publish_max_retries = 2
+        mock_config.return_value.get_categoria_wp.return_value = 2
+        mock_config.return_value.news_api.read_model_size = 50
+        self.http = Mock()
+        self.publisher = WordPressPublisher(rate_limiter=RateLimiter(rate=0), http_client=self.http)
+
+    def teardown_method(self):
+        self.config_patch.stop()
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_results_in_order_and_batched_status(self, mock_publicadas):
+        """Testa os status gravados em lote por bloco de publicações, e as duplicadas no fim"""
+        noticias = [_noticia(1), _noticia(2), _noticia(3, titulo=_noticia(1)["titulo"])]
+
+        def post(url, json, **kwargs):
+            time.sleep(0.02 if json["title"] == TITULOS[1] else 0)
+            return _response(201, post_id=TITULOS.index(json["title"]))
+
+        self.http.post.side_effect = post
+        table = _table()
+
+        self.publisher.publish_async(noticias, table)
+
+        mock_publicadas.assert_called_once()
+        updates = _status_updates(table)
+        # n1 demora mais: os status seguem a ordem em que os posts terminam
+        assert [update["Key"]["id"] for update in updates] == ["n2", "n1", "n3"]
+        assert [update["ExpressionAttributeValues"].get(":pid") for update in updates] == [2, 1, None]
+        assert updates[0]["ExpressionAttributeValues"][":status"] == "publicada"
+        assert table.meta.client.transact_write_items.call_count == 2
+        assert "REMOVE status_publicacao" in updates[2]["UpdateExpression"]
+        assert all(update["ConditionExpression"] == "attribute_exists(id)" for update in updates)
+        assert self.publisher.published_count == 2
+        assert self.publisher.duplicate_count == 1
+        table.update_item.assert_not_called()
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_statuses_flushed_before_crash(self, _):
+        """Testa que os posts de um bloco concluído já estão gravados se a Lambda cair depois"""
+        class Timeout(BaseException):
+            pass
+
+        def post(url, json, **kwargs):
+            if json["title"] == TITULOS[4]:
+                time.sleep(0.05)
+                raise Timeout()
+            time.sleep(0.01 if json["title"] == TITULOS[3] else 0)
+            return _response(201, post_id=TITULOS.index(json["title"]))
+
+        self.http.post.side_effect = post
+        table = _table()
+
+        with pytest.raises(Timeout):
+            self.publisher.publish_async([_noticia(1), _noticia(2), _noticia(3), _noticia(4)], table)
+
+        updates = _status_updates(table)
+        assert sorted(update["Key"]["id"] for update in updates) == ["n1", "n2"]
+        assert all(update["ExpressionAttributeValues"][":status"] == "publicada" for update in updates)
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_updates_read_model_with_published(self, _):
+        """Testa que só as notícias publicadas vão para o modelo de leitura"""
+        store = Mock()
+        store.update.return_value = 2
+        self.publisher.read_model_store = store
+        self.http.post.side_effect = [_response(201, post_id=1), _response(500)]
+        table = _table()
+
+        self.publisher.publish_async([_noticia(1), _noticia(2)], table)
+
+        assert self.publisher.update_read_model(table) == 2
+        publicadas = store.update.call_args.args[1]
+        assert [n["id"] for n in publicadas] == ["n1"]
+        assert publicadas[0]["publicado_em"] > 0
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_concurrency_is_bounded(self, _):
+        """Testa que no máximo publish_concurrency posts ficam em andamento"""
+        lock = threading.Lock()
+        state = {"active": 0, "max": 0}
+
+        def post(*args, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return _response(201, post_id=1)
+
+        self.http.post.side_effect = post
+
+        self.publisher.publish_async([_noticia(i) for i in range(8)], _table())
+
+        assert state["max"] == 2
+        assert self.publisher.published_count == 8
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_backoff_on_429(self, _):
+        """Testa nova tentativa após 429 respeitando Retry-After"""
+        self.http.post.side_effect = [
+            _response(429, headers={"Retry-After": "0"}),
+            _response(201, post_id=10)
+        ]
+        table = _table()
+
+        self.publisher.publish_async([_noticia(1)], table)
+
+        assert self.http.post.call_count == 2
+        assert self.publisher.published_count == 1
+        assert self.publisher.throttle_count == 1
+
+    @patch('lambda_publicar_wordpress.BACKOFF_BASE', 0.001)
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_gives_up_after_max_retries(self, _):
+        """Testa que 503 persistente vira erro sem gravar status"""
+        self.http.post.return_value = _response(503)
+        table = _table()
+
+        self.publisher.publish_async([_noticia(1)], table)
+
+        assert self.http.post.call_count == 3
+        assert self.publisher.error_count == 1
+        table.meta.client.transact_write_items.assert_not_called()
+
+    @patch('lambda_publicar_wordpress.marcar_publicada')
+    @patch('lambda_publicar_wordpress.gravar_em_lote', return_value=False)
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_falls_back_to_single_updates(self, _, mock_lote, mock_marcar):
+        """Testa que uma falha no lote não deixa notícia publicada como pendente"""
+        self.http.post.return_value = _response(201, post_id=5)
+
+        self.publisher.publish_async([_noticia(1)], _table())
+
+        mock_marcar.assert_called_once()
+        assert mock_marcar.call_args.args[1:4] == ("n1", 5, "https://blog/5")
+
+
+class TestTitleIndexCache:
+    """Testes para o índice de títulos mantido entre invocações"""
+
+    def setup_method(self):
+        reset_title_index_cache()
+        self.publisher = WordPressPublisher(rate_limiter=RateLimiter(rate=0), http_client=Mock())
+
+    def teardown_method(self):
+        reset_title_index_cache()
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas')
+    def test_incremental_reload_on_warm_invocation(self, mock_publicadas):
+        """Testa que a segunda invocação só lê as publicações recentes"""
+        agora = int(time.time())
+        mock_publicadas.return_value = [{"id": "p1", "titulo": TITULOS[0], "publicado_em": agora - 100}]
+        table = Mock()
+
+        assert self.publisher.is_duplicate_content({"id": "x", "titulo": TITULOS[0] + "!"}, table) is True
+        primeira = mock_publicadas.call_args.kwargs["desde"]
+
+        mock_publicadas.return_value = [{"id": "p2", "titulo": TITULOS[1], "publicado_em": agora}]
+        outro = WordPressPublisher(rate_limiter=RateLimiter(rate=0), http_client=Mock())
+        assert outro.is_duplicate_content({"id": "y", "titulo": TITULOS[0]}, table) is True
+        assert outro.is_duplicate_content({"id": "z", "titulo": TITULOS[1]}, table) is True
+
+        segunda = mock_publicadas.call_args_list[1].kwargs["desde"]
+        assert segunda == agora - 100 - 3600
+        assert segunda > primeira
+
+    @patch('lambda_publicar_wordpress.buscar_publicadas')
+    def test_ignores_own_id(self, mock_publicadas):
+        """Testa que a notícia não é duplicada dela mesma"""
+        mock_publicadas.return_value = [{"id": "n1", "titulo": TITULOS[0], "publicado_em": int(time.time())}]
+
+        assert self.publisher.is_duplicate_content({"id": "n1", "titulo": TITULOS[0]}, Mock()) is False
+
+    @patch('lambda_publicar_wordpress.marcar_duplicada')
+    @patch('lambda_publicar_wordpress.marcar_publicada')
+    @patch('lambda_publicar_wordpress.get_dynamodb_table')
+    @patch('lambda_publicar_wordpress.buscar_pendentes_publicacao')
+    @patch('lambda_publicar_wordpress.get_config')
+    @patch('lambda_publicar_wordpress.buscar_publicadas', return_value=[])
+    def test_sequential_mode_loads_index_once(self, mock_publicadas, mock_config, mock_pendentes, _, mock_marcar,
+                                              mock_duplicada):
+        """Testa que o modo sequencial lê o índice uma vez e compara as notícias da própria execução"""
+        mock_config.return_value.wordpress.publish_mode = "sequential"
+        mock_config.return_value.wordpress.wp_url = "https://wp.example.com/wp-json/wp/v2"
+        mock_config.return_value.news_api.read_model_size = 0
+        mock_pendentes.return_value = [_noticia(1), _noticia(2), _noticia(3, titulo=TITULOS[1])]
+        self.publisher.http.post.return_value = _response(201, post_id=7)
+
+        self.publisher.publish_all_pending()
+
+        mock_publicadas.assert_called_once()
+        assert mock_marcar.call_count == 2
+        mock_duplicada.assert_called_once()
+        assert mock_duplicada.call_args.args[1] == "n3"
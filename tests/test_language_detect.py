@@ -0,0 +1,75 @@
+"""
+Testes para o módulo language_detect
+"""
+import pytest
+from unittest.mock import Mock
+
+from language_detect import MAX_AMOSTRAS, NgramLanguageDetector, SourceLanguageProfiler
+
+FRASES = {
+    "pt": "O governo anunciou hoje um novo programa de vacinação contra a gripe para idosos e crianças.",
+    "en": "The central bank raised interest rates on Tuesday to fight persistent inflation.",
+    "es": "El gobierno anunció hoy un nuevo programa de vacunación contra la gripe para mayores y niños.",
+    "fr": "Le gouvernement a annoncé aujourd'hui un nouveau programme de vaccination contre la grippe.",
+    "de": "Die Regierung hat heute ein neues Impfprogramm gegen die Grippe für Ältere angekündigt.",
+    "it": "Il governo ha annunciato oggi un nuovo programma di vaccinazione contro l'influenza."
+}
+
+
+@pytest.fixture(scope="module")
+def ngram():
+    return NgramLanguageDetector()
+
+
+class TestNgramLanguageDetector:
+    """Testes do detector de n-gramas"""
+
+    @pytest.mark.parametrize("idioma", sorted(FRASES))
+    def test_detects_profile_languages(self, ngram, idioma):
+        lang, probability = ngram.detect_with_confidence(FRASES[idioma])
+
+        assert lang == idioma
+        assert probability > 0.95
+
+    def test_text_without_letters(self, ngram):
+        assert ngram.detect_with_confidence("123 456 !!!") == (None, 0.0)
+        with pytest.raises(ValueError):
+            ngram.detect("123")
+
+
+class TestSourceLanguageProfiler:
+    """Testes do perfil de idioma por fonte"""
+
+    def test_learns_dominant_and_skips_full_detector(self, ngram):
+        """Testa que, com o perfil aprendido, só os textos fora do padrão vão ao detector completo"""
+        detector = Mock(side_effect=ngram.detect)
+        profiler = SourceLanguageProfiler(detector, ngram, min_samples=3)
+
+        for _ in range(3):
+            assert profiler.detect("feed", FRASES["pt"]) == "pt"
+        assert profiler.dominant("feed") == "pt"
+
+        assert profiler.detect("feed", FRASES["pt"]) == "pt"
+        assert detector.call_count == 3
+
+        assert profiler.detect("feed", FRASES["en"]) == "en"
+        assert detector.call_count == 4
+        assert profiler.stats() == {"perfil": 1, "deteccoes": 4, "fora_do_padrao": 1, "fontes": 1}
+        assert profiler.counts("feed") == {"pt": 4, "en": 1}
+
+    def test_load_restores_profile(self, ngram):
+        detector = Mock()
+        profiler = SourceLanguageProfiler(detector, ngram)
+
+        profiler.load("feed", {"es": 9, "en": 1})
+
+        assert profiler.detect("feed", FRASES["es"]) == "es"
+        detector.assert_not_called()
+
+    def test_counts_are_halved_above_cap(self, ngram):
+        profiler = SourceLanguageProfiler(ngram.detect, ngram)
+        profiler.load("feed", {"pt": MAX_AMOSTRAS, "en": 1})
+
+        profiler.detect("feed", FRASES["pt"])
+
+        assert profiler.counts("feed") == {"pt": (MAX_AMOSTRAS + 1) // 2}
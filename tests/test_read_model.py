@@ -0,0 +1,165 @@
+"""
+Testes para o módulo read_model
+"""
+import json
+import time
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+
+from dynamodb_schema import atributos_projetados
+from read_model import ReadModelStore, READ_MODEL_ALL, merge_noticias
+
+
+def _noticia(i, nicho="saude"):
+    return {"id": f"n{i}", "titulo": f"Título {i}", "nicho": nicho, "publicado_em": Decimal(i),
+            "descricao_completa": "texto longo que não vai para a API"}
+
+
+def _conflict():
+    error = Exception("conflito")
+    error.response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+    return error
+
+
+class _Table:
+    """Tabela em memória com o PutItem condicional por versão"""
+
+    def __init__(self):
+        self.items = {}
+        self.put_item = Mock(side_effect=self._put)
+
+    def get_item(self, Key):
+        item = self.items.get(Key["nicho"])
+        return {"Item": item} if item else {}
+
+    def _put(self, Item, ConditionExpression, ExpressionAttributeValues):
+        atual = self.items.get(Item["nicho"])
+        if atual is not None and atual["versao"] != ExpressionAttributeValues[":anterior"]:
+            raise _conflict()
+        self.items[Item["nicho"]] = Item
+
+
+class TestMerge:
+    """Testes para o merge de documentos"""
+
+    def test_orders_truncates_and_compacts(self):
+        """Testa ordem por publicado_em, limite de tamanho e campos da API"""
+        atuais = [{"id": "n1", "publicado_em": 1}, {"id": "n3", "publicado_em": 3}]
+
+        noticias = merge_noticias(atuais, [_noticia(2), _noticia(4)], size=3)
+
+        assert [n["id"] for n in noticias] == ["n4", "n3", "n2"]
+        assert noticias[0]["publicado_em"] == 4 and isinstance(noticias[0]["publicado_em"], int)
+        assert "descricao_completa" not in noticias[0]
+
+    def test_drops_expired_and_keeps_expiry(self):
+        """Testa que notícias vencidas saem do documento e a expiração é guardada"""
+        agora = int(time.time())
+        atuais = [{"id": "n1", "publicado_em": 1, "ttl": agora - 10}, {"id": "n3", "publicado_em": 3}]
+
+        noticias = merge_noticias(atuais, [{**_noticia(2), "ttl": Decimal(agora + 86400)}], size=5)
+
+        assert [n["id"] for n in noticias] == ["n3", "n2"]
+        assert noticias[1]["ttl"] == agora + 86400
+
+
+class TestReadModelStore:
+    """Testes para a persistência versionada"""
+
+    def test_update_touches_only_affected_niches(self):
+        """Testa merge nos nichos afetados e no documento de todos os nichos"""
+        table = _Table()
+        store = ReadModelStore(table, size=2)
+        store.save("saude", [{"id": "n1", "nicho": "saude", "publicado_em": 1}], False, 0)
+        store.save(READ_MODEL_ALL, [], False, 0)
+        store.save("esportes", [], False, 0)
+        data_table = Mock()
+
+        assert store.update(data_table, [_noticia(2), _noticia(3)]) == 2
+
+        saude = store.load("saude")
+        assert [n["id"] for n in saude["noticias"]] == ["n3", "n2"]
+        assert saude["mais"] is True
+        assert saude["versao"] == 2
+        assert store.load(READ_MODEL_ALL)["versao"] == 2
+        assert store.load("esportes")["versao"] == 1
+        data_table.query.assert_not_called()
+
+    def test_rebuilds_missing_document_from_index(self):
+        """Testa que um nicho sem documento é montado com uma Query, incluindo as novas"""
+        table = _Table()
+        data_table = Mock()
+        data_table.query.return_value = {"Items": [_noticia(1)], "LastEvaluatedKey": {"id": "n1"}}
+        store = ReadModelStore(table, size=10)
+
+        assert store.apply(data_table, "saude", [_noticia(2)]) is True
+
+        documento = store.load("saude")
+        assert [n["id"] for n in documento["noticias"]] == ["n2", "n1"]
+        assert documento["mais"] is True
+        assert documento["versao"] == 1
+        assert json.loads(table.items["saude"]["documento"])["noticias"][0]["titulo"] == "Título 2"
+
+    def test_expired_news_leave_document(self):
+        """Testa a expiração: merge sem Query quando não há mais, remontagem quando há"""
+        agora = int(time.time())
+        table = _Table()
+        store = ReadModelStore(table, size=10)
+        vencida = {"id": "n1", "nicho": "saude", "publicado_em": 1, "ttl": agora - 60}
+        store.save("saude", [vencida], False, 0)
+        store.save("esportes", [{**vencida, "nicho": "esportes"}], True, 0)
+        data_table = Mock()
+        data_table.query.return_value = {"Items": [{**_noticia(5), "ttl": Decimal(agora + 60)}]}
+
+        assert store.apply(data_table, "saude", [_noticia(2)]) is True
+        assert [n["id"] for n in store.load("saude")["noticias"]] == ["n2"]
+        data_table.query.assert_not_called()
+
+        assert store.apply(data_table, "esportes", [_noticia(3, nicho="esportes")]) is True
+        documento = store.load("esportes")
+        assert [n["id"] for n in documento["noticias"]] == ["n5", "n3"]
+        assert documento["mais"] is False
+
+    @pytest.mark.parametrize("nicho", ["saude", READ_MODEL_ALL])
+    def test_rebuild_reads_only_projected_fields(self, nicho):
+        """Testa que a remontagem só pede atributos projetados no índice, incluindo o ttl"""
+        data_table = Mock()
+        data_table.query.return_value = {"Items": []}
+
+        assert ReadModelStore(_Table(), size=10).rebuild(data_table, nicho) is True
+
+        kwargs = data_table.query.call_args.kwargs
+        campos = set(kwargs["ExpressionAttributeNames"].values())
+        assert "ttl" in campos
+        assert campos <= atributos_projetados(kwargs["IndexName"])
+
+    def test_retries_after_version_conflict(self):
+        """Testa que quem perde a corrida relê e mantém as notícias do outro"""
+        table = _Table()
+        store = ReadModelStore(table, size=10)
+        store.save("saude", [], False, 0)
+        original_put = table.put_item.side_effect
+
+        def concurrent_put(**kwargs):
+            # Outro publicador grava a versão 2 antes desta gravação
+            table.put_item.side_effect = original_put
+            ReadModelStore(table).save("saude", [{"id": "outro", "publicado_em": 9}], False, 1)
+            raise _conflict()
+
+        table.put_item.side_effect = concurrent_put
+
+        assert store.apply(Mock(), "saude", [_noticia(1)]) is True
+
+        documento = store.load("saude")
+        assert [n["id"] for n in documento["noticias"]] == ["outro", "n1"]
+        assert documento["versao"] == 3
+        assert store.conflicts == 1
+
+    def test_load_error_returns_none(self):
+        """Testa que erro de leitura retorna None"""
+        table = Mock()
+        table.get_item.side_effect = Exception("erro")
+
+        assert ReadModelStore(table).load("saude") is None
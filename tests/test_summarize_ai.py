@@ -1,4 +1,19 @@
-from summarize_ai import resumir_texto
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+from summarize_ai import (
+    SummaryPipeline,
+    TokenBudget,
+    MemorySummaryCache,
+    TieredSummaryCache,
+    get_openai_client,
+    reset_summary_pipeline,
+    resumir_com_ia,
+    resumir_texto,
+    traduzir_com_ia
+)
 
 
 def test_resumir_texto_curto():
@@ -12,3 +27,141 @@ def test_resumir_texto_longo():
     resumo = resumir_texto(texto)
     assert len(resumo) <= 203  # 200 + '...'
     assert resumo.endswith("...")
+
+
+class _StubOpenAI(BaseHTTPRequestHandler):
+    """Servidor local compatível com /v1/chat/completions"""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+    malformed = False
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _StubOpenAI.requests.append(payload)
+        textos = json.loads(payload["messages"][1]["content"])["textos"]
+        content = "não é json" if _StubOpenAI.malformed else json.dumps(
+            {"resultados": [{"id": t["id"], "texto": "R: " + t["texto"][:10]} for t in textos]}
+        )
+        body = json.dumps({
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": payload["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": 40, "completion_tokens": 10, "total_tokens": 50}
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSummaryPipeline:
+    """Testes do pipeline contra um servidor OpenAI local"""
+
+    def setup_method(self):
+        _StubOpenAI.requests = []
+        _StubOpenAI.malformed = False
+        reset_summary_pipeline()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAI)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.client = get_openai_client("sk-test", f"http://127.0.0.1:{self.server.server_port}/v1")
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+        reset_summary_pipeline()
+
+    def test_batches_and_structured_output(self):
+        """Testa vários artigos por chamada e o mapeamento das respostas"""
+        pipeline = SummaryPipeline(self.client, batch_size=2, concurrency=2)
+        textos = {f"n{i}": f"Artigo número {i} " * 5 for i in range(5)}
+
+        resumos = pipeline.summarize(textos)
+
+        assert resumos == {key: "R: " + texto[:10] for key, texto in textos.items()}
+        assert len(_StubOpenAI.requests) == 3
+        assert _StubOpenAI.requests[0]["response_format"] == {"type": "json_object"}
+        assert pipeline.stats()["tokens"] == 150
+
+    def test_cache_and_duplicates_skip_api(self):
+        """Testa que textos repetidos e já resumidos não voltam à API"""
+        pipeline = SummaryPipeline(self.client, batch_size=10)
+
+        pipeline.summarize({"a": "mesmo texto", "b": "mesmo texto", "c": "outro texto"})
+        segunda = pipeline.summarize({"d": "outro texto"})
+
+        assert len(_StubOpenAI.requests) == 1
+        assert len(json.loads(_StubOpenAI.requests[0]["messages"][1]["content"])["textos"]) == 2
+        assert segunda == {"d": "R: outro text"}
+        assert pipeline.stats()["cache_hits"] == 1
+
+    def test_malformed_response_is_left_out(self):
+        """Testa que resposta fora do formato não entra no resultado nem no cache"""
+        _StubOpenAI.malformed = True
+        pipeline = SummaryPipeline(self.client)
+
+        assert pipeline.summarize({"a": "texto"}) == {}
+        assert pipeline.stats()["falhas"] == 1
+        assert len(pipeline.cache) == 0
+
+    def test_persistent_cache_shared_between_containers(self):
+        """Testa que um resultado gravado por um container evita a chamada em outro"""
+        store = MemorySummaryCache()
+        primeiro = SummaryPipeline(self.client, cache=TieredSummaryCache(MemorySummaryCache(), store))
+        segundo = SummaryPipeline(self.client, cache=TieredSummaryCache(MemorySummaryCache(), store))
+
+        primeiro.summarize({"a": "texto"})
+        resultado = segundo.summarize({"b": "texto"})
+
+        assert resultado == {"b": "R: texto"}
+        assert len(_StubOpenAI.requests) == 1
+        assert segundo.stats()["cache"]["hits_dynamodb"] == 1
+
+    def test_translate_prompt(self):
+        """Testa que a tradução leva o idioma no prompt e tem cache próprio"""
+        pipeline = SummaryPipeline(self.client)
+
+        pipeline.summarize({"a": "texto"})
+        pipeline.translate({"a": "texto"}, "inglês")
+
+        assert len(_StubOpenAI.requests) == 2
+        assert "inglês" in _StubOpenAI.requests[1]["messages"][0]["content"]
+
+
+class TestTokenBudget:
+    """Testes do orçamento de tokens por minuto"""
+
+    def test_waits_when_budget_is_spent_and_settles(self):
+        """Testa espera proporcional ao déficit e devolução do que sobrou"""
+        now = [0.0]
+        sleeps = []
+        budget = TokenBudget(600, clock=lambda: now[0], sleep=sleeps.append)
+
+        assert budget.acquire(600) == 0.0
+        assert budget.acquire(100) == 10.0
+        # Sem o acerto, o déficit seria 160 tokens (16 s)
+        budget.settle(estimated=100, actual=40)
+        assert budget.acquire(60) == 10.0
+        assert sleeps == [10.0, 10.0]
+
+    def test_disabled(self):
+        """Testa orçamento desligado"""
+        budget = TokenBudget(0)
+        assert budget.acquire(10 ** 9) == 0.0
+
+
+def test_resumir_com_ia_fallback():
+    """Testa que falha da API devolve o texto truncado"""
+    client = Mock()
+    client.chat.completions.create.side_effect = Exception("erro")
+
+    with patch("summarize_ai.get_summary_pipeline", return_value=SummaryPipeline(client)):
+        assert resumir_com_ia("x" * 300, "sk-test") == "x" * 200 + "..."
+        assert traduzir_com_ia("texto", "sk-test", "inglês") == "texto"
@@ -0,0 +1,126 @@
+"""
+Testes para o módulo summary_cache
+"""
+import time
+from unittest.mock import Mock, MagicMock
+
+from summary_cache import (
+    DynamoDBSummaryCache,
+    MemorySummaryCache,
+    TieredSummaryCache,
+    cache_key,
+    content_hash
+)
+
+
+class _Table:
+    """Tabela em memória com BatchGetItem e batch_writer"""
+
+    name = "djblog-summary-cache"
+
+    def __init__(self):
+        self.items = {}
+        self.meta = Mock()
+        self.meta.client.batch_get_item.side_effect = self._batch_get
+        self.writer = Mock()
+        self.writer.put_item.side_effect = lambda Item: self.items.__setitem__(Item["chave"], Item)
+
+    def _batch_get(self, RequestItems):
+        keys = [key["chave"] for key in RequestItems[self.name]["Keys"]]
+        return {"Responses": {self.name: [self.items[key] for key in keys if key in self.items]}}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        context = MagicMock()
+        context.__enter__.return_value = self.writer
+        return context
+
+
+def test_cache_key_separates_op_model_and_language():
+    """Testa que a chave muda com a operação, o modelo e o idioma, e não com o id"""
+    key = cache_key("traducao", "gpt-4o-mini", "texto", "inglês")
+
+    assert key == f"traducao#gpt-4o-mini#inglês#{content_hash('texto')}"
+    assert key != cache_key("traducao", "gpt-4o-mini", "texto", "espanhol")
+    assert key != cache_key("resumo", "gpt-4o-mini", "texto")
+    assert cache_key("resumo", "m", "texto") == cache_key("resumo", "m", "texto", None)
+
+
+class TestMemorySummaryCache:
+    """Testes do LRU em memória"""
+
+    def test_expires_after_ttl_and_evicts_lru(self):
+        now = [0.0]
+        cache = MemorySummaryCache(max_entries=2, ttl=10, clock=lambda: now[0])
+
+        cache.set_many({"a": "A", "b": "B"})
+        cache.get("a")
+        cache.set("c", "C")
+
+        assert cache.get_many(["a", "b", "c"]) == {"a": "A", "c": "C"}
+        now[0] = 11
+        assert cache.get("a") is None
+        assert cache.stats() == {"hits": 3, "misses": 2, "tamanho": 1}
+
+
+class TestDynamoDBSummaryCache:
+    """Testes da camada persistente"""
+
+    def test_roundtrip_with_ttl_and_metadata(self):
+        table = _Table()
+        cache = DynamoDBSummaryCache(table, ttl=3600)
+        key = cache_key("resumo", "gpt-3.5-turbo", "texto")
+
+        cache.set_many({key: "Resumo"})
+        item = table.items[key]
+
+        assert (item["op"], item["modelo"], item["idioma"]) == ("resumo", "gpt-3.5-turbo", "-")
+        assert item["hash_conteudo"] == content_hash("texto")
+        assert item["ttl"] - item["criado_em"] == 3600
+        assert cache.get_many([key, "resumo#m#-#outro"]) == {key: "Resumo"}
+        assert cache.stats() == {"hits": 1, "misses": 1, "erros": 0}
+
+    def test_ignores_expired_items_not_yet_deleted(self):
+        table = _Table()
+        table.items["k"] = {"chave": "k", "texto": "velho", "ttl": int(time.time()) - 1}
+
+        assert DynamoDBSummaryCache(table).get_many(["k"]) == {}
+
+    def test_chunks_of_100_and_errors_count_as_miss(self):
+        table = _Table()
+        cache = DynamoDBSummaryCache(table)
+        table.meta.client.batch_get_item.side_effect = [{"Responses": {}}, Exception("throttled")]
+
+        assert cache.get_many([f"k{i}" for i in range(150)]) == {}
+        sizes = [len(call.kwargs["RequestItems"][table.name]["Keys"])
+                 for call in table.meta.client.batch_get_item.call_args_list]
+        assert sizes == [100, 50]
+        assert cache.stats()["erros"] == 1
+
+
+class TestTieredSummaryCache:
+    """Testes do cache em camadas"""
+
+    def test_store_hits_are_promoted_to_memory(self):
+        table = _Table()
+        store = DynamoDBSummaryCache(table)
+        a, b = cache_key("resumo", "m", "a"), cache_key("resumo", "m", "b")
+        store.set_many({a: "A"})
+        cache = TieredSummaryCache(MemorySummaryCache(), store)
+
+        assert cache.get_many([a, b]) == {a: "A"}
+        assert cache.get_many([a]) == {a: "A"}
+
+        assert table.meta.client.batch_get_item.call_count == 1
+        stats = cache.stats()
+        assert (stats["hits_memoria"], stats["hits_dynamodb"], stats["misses"]) == (1, 1, 1)
+        assert stats["taxa_acerto"] == 0.667
+
+    def test_set_writes_both_tiers(self):
+        table = _Table()
+        cache = TieredSummaryCache(MemorySummaryCache(), DynamoDBSummaryCache(table))
+        key = cache_key("resumo", "m", "a")
+
+        cache.set(key, "A")
+
+        assert len(cache) == 1
+        assert table.items[key]["texto"] == "A"
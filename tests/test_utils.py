@@ -3,7 +3,9 @@ Testes para o módulo utils
 """
 import pytest
 import os
+import threading
 import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch, MagicMock
 from datetime import UTC
 
@@ -17,7 +19,10 @@ from utils import (
     sanitize_text,
     generate_content_hash,
     rate_limit_delay,
-    retry_on_failure
+    retry_on_failure,
+    RateLimiter,
+    HttpClient,
+    TTLCache
 )
 
 
@@ -32,6 +37,32 @@ class TestLogging:
         assert logger.name == "utils"
 
 
+class TestDatadog:
+    """Testes para o wrapper opcional do Datadog"""
+
+    def test_wrap_datadog_without_key(self, monkeypatch):
+        """Testa que sem chave o handler não muda e o datadog_lambda não é importado"""
+        from utils import wrap_datadog, DATADOG_KEY_VARS
+        for name in DATADOG_KEY_VARS:
+            monkeypatch.delenv(name, raising=False)
+
+        def handler(event, context):
+            return "ok"
+
+        with patch.dict("sys.modules", {"datadog_lambda.wrapper": None}):
+            assert wrap_datadog(handler) is handler
+
+    def test_wrap_datadog_with_key(self, monkeypatch):
+        """Testa que com chave configurada o wrapper é aplicado"""
+        from utils import wrap_datadog
+        monkeypatch.setenv("DD_API_KEY", "chave")
+        wrapper_module = Mock()
+        wrapper_module.datadog_lambda_wrapper.side_effect = lambda f: ("wrapped", f)
+
+        with patch.dict("sys.modules", {"datadog_lambda": Mock(), "datadog_lambda.wrapper": wrapper_module}):
+            assert wrap_datadog(len) == ("wrapped", len)
+
+
 class TestValidacao:
     """Testes para validação de variáveis"""
 
@@ -51,7 +82,7 @@ class TestValidacao:
 class TestURLValidation:
     """Testes para validação de URLs"""
 
-    @patch('utils.requests.head')
+    @patch('utils.HttpClient.head')
     def test_validar_url_sucesso(self, mock_head):
         """Testa validação de URL válida"""
         mock_head.return_value.status_code = 200
@@ -59,7 +90,7 @@ class TestURLValidation:
         assert validar_url("https://example.com") is True
         mock_head.assert_called_once()
 
-    @patch('utils.requests.head')
+    @patch('utils.HttpClient.head')
     def test_validar_url_erro_404(self, mock_head):
         """Testa validação de URL com erro 404"""
         mock_head.return_value.status_code = 404
@@ -111,6 +142,18 @@ class TestPlagioDetection:
             result = checar_plagio_local("Título único", "Resumo único", table)
             assert result is True
 
+    def test_checar_plagio_local_com_indice(self):
+        """Testa detecção de plágio usando um índice já carregado, sem scan"""
+        from dedup_index import NearDuplicateIndex
+
+        table = MagicMock()
+        index = NearDuplicateIndex()
+        index.add("n1", "Título único da notícia", "Resumo único da notícia", 1641081600)
+
+        assert checar_plagio_local("Título único da notícia", "Outro texto", table, index=index) is True
+        assert checar_plagio_local("Assunto diferente", "Outro texto", table, index=index) is False
+        table.scan.assert_not_called()
+
 
 class TestDuplicateDetection:
     """Testes para detecção de duplicatas"""
@@ -166,6 +209,115 @@ class TestTextProcessing:
         result = sanitize_text(text, max_length=100)
         assert len(result) == 100
 
+    def test_sanitize_text_html(self):
+        """Testa remoção de tags e decodificação de entidades"""
+        text = "<p>Apple&#8217;s new <b>iPhone</b>&nbsp;&amp; more&#8230;</p>"
+        assert sanitize_text(text) == "Apple’s new iPhone & more…"
+
+    def test_sanitize_text_tags_de_frase(self):
+        """Testa que tags de frase não separam palavras nem a pontuação"""
+        assert sanitize_text("Hello <b>world</b>!") == "Hello world!"
+        assert sanitize_text("<a href=\"/x\">Leia</a>, <em>agora</em>.") == "Leia, agora."
+        assert sanitize_text("pa<span class=\"x\">la</span>vra<br>nova") == "palavra nova"
+
+    def test_sanitize_text_script_e_comentario(self):
+        """Testa remoção de <script>, <style> e comentários com o conteúdo"""
+        text = "Antes<script>var x = '<b>';</script> <style>p {}</style>meio<!-- nota -->depois"
+        assert sanitize_text(text) == "Antes meio depois"
+
+    def test_sanitize_text_preserva_texto_literal(self):
+        """Testa que "<" solto e entidades escapadas viram texto, não tags"""
+        assert sanitize_text("se a < b e c > d") == "se a < b e c > d"
+        assert sanitize_text("&lt;b&gt;negrito&lt;/b&gt;") == "<b>negrito</b>"
+        assert sanitize_text("AT&T & co") == "AT&T & co"
+
+    def test_sanitize_text_controle(self):
+        """Testa que caracteres de controle e entidades de espaço viram espaço"""
+        assert sanitize_text("um&#8195;dois&emsp;&amp;três") == "um dois &três"
+        assert sanitize_text("linha\x00um\x1b\tdois ") == "linha um dois"
+
+    def test_sanitize_text_limite_com_html(self):
+        """Testa o limite contado sobre o texto já limpo"""
+        text = "<p>" + "palavra " * 1000 + "</p>"
+        result = sanitize_text(text, max_length=50)
+        assert result == ("palavra " * 7)[:50]
+
+
+def _sanitize_text_anterior(text, max_length=1000):
+    """sanitize_text antes da normalização de HTML (referência dos hashes já gravados)"""
+    if not text:
+        return ""
+    import re
+    return re.sub(r'\s+', ' ', text.strip())[:max_length]
+
+
+def _marcar(rng, palavras):
+    """
+    Mesmas palavras com tags de bloco, entidades de espaço e espaços variados
+    entre elas, e tags de frase (que não separam palavras) dentro delas
+    """
+    separadores = [" ", "  ", "\n", "\t ", "&nbsp;", " <br/> ", "<p>", "</b> ", "<!-- x -->",
+                   " <span class=\"a\">", "</li><li>", "&#160;", "\r\n"]
+    partes = [rng.choice(["", "<p>", " ", "\n"])]
+    for i, palavra in enumerate(palavras):
+        if i:
+            partes.append(rng.choice(separadores[1:]) if rng.random() < 0.5 else " ")
+        if rng.random() < 0.3:
+            corte = rng.randint(0, len(palavra))
+            tag = rng.choice(["b", "em", "a href=\"/x\"", "span"])
+            palavra = f"{palavra[:corte]}<{tag}>{palavra[corte:]}</{tag.split()[0]}>"
+        partes.append(palavra.replace("’", rng.choice(["’", "&#8217;", "&rsquo;", "&#x2019;"])))
+    partes.append(rng.choice(["", "</p>", " ", "\n"]))
+    return "".join(partes)
+
+
+class TestSanitizeTextPropriedades:
+    """Propriedades do sanitize_text em entradas aleatórias (semente fixa)"""
+
+    ALFABETO = "abcdefghijklmnopqrstuvwxyzçãéõúABCXYZ0123456789.,;:!?-’\"'()/#%$@"
+
+    def _palavras(self, rng):
+        return ["".join(rng.choice(self.ALFABETO) for _ in range(rng.randint(1, 10)))
+                for _ in range(rng.randint(1, 40))]
+
+    def test_texto_limpo_mantem_hash(self):
+        """Texto sem HTML gera o mesmo texto (e hash) da versão anterior"""
+        import random
+        rng = random.Random(42)
+        for _ in range(500):
+            texto = "".join(rng.choice(self.ALFABETO + " \t\n\r  ") for _ in range(rng.randint(0, 300)))
+            max_length = rng.choice([20, 100, 200, 1000])
+            esperado = _sanitize_text_anterior(texto, max_length)
+            assert sanitize_text(texto, max_length) == esperado
+            assert (generate_content_hash(sanitize_text(texto, 100), sanitize_text(texto, 1000))
+                    == generate_content_hash(_sanitize_text_anterior(texto, 100), _sanitize_text_anterior(texto, 1000)))
+
+    def test_marcacao_nao_muda_hash(self):
+        """O mesmo texto com tags, entidades e espaços diferentes gera o mesmo hash"""
+        import random
+        rng = random.Random(7)
+        for _ in range(300):
+            palavras = self._palavras(rng)
+            limpo = " ".join(palavras)
+            for max_length in (50, 1000):
+                esperado = limpo[:max_length]
+                for _ in range(3):
+                    assert sanitize_text(_marcar(rng, palavras), max_length) == esperado
+            assert generate_content_hash(sanitize_text(_marcar(rng, palavras)), "") == generate_content_hash(limpo, "")
+
+    def test_idempotente_e_limitado(self):
+        """Sanitizar de novo não muda o texto, e o tamanho respeita max_length"""
+        import random
+        rng = random.Random(3)
+        for _ in range(300):
+            texto = _marcar(rng, self._palavras(rng))
+            resultado = sanitize_text(texto)
+            assert resultado == resultado.strip()
+            assert sanitize_text(resultado) == resultado
+            # Como antes, o corte em max_length pode terminar num espaço
+            max_length = rng.randint(1, 300)
+            assert sanitize_text(texto, max_length) == resultado[:max_length]
+
     def test_generate_content_hash(self):
         """Testa geração de hash de conteúdo"""
         title = "Título teste"
@@ -191,6 +343,264 @@ class TestRateLimiting:
         assert end_time - start_time >= 0.1
 
 
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    falhas = 0
+
+    def do_GET(self):
+        headers = {}
+        if self.path in ("/instavel", "/limitado") and _Handler.falhas > 0:
+            _Handler.falhas -= 1
+            status = 503 if self.path == "/instavel" else 429
+            if self.path == "/limitado":
+                headers["Retry-After"] = "3600"
+        else:
+            status = 200
+        body = b"ok"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpClient:
+    """Testes para o cliente HTTP compartilhado"""
+
+    def setup_method(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.host = f"127.0.0.1:{self.server.server_port}"
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_reuses_connection(self):
+        """Testa que requisições seguidas ao mesmo host usam uma conexão"""
+        client = HttpClient()
+
+        for _ in range(3):
+            assert client.get(f"{self.base}/feed").status_code == 200
+
+        stats = client.host_stats()[self.host]
+        assert stats["requisicoes"] == 3
+        assert stats["conexoes_abertas"] == 1
+        assert stats["conexoes_reutilizadas"] == 2
+
+    def test_retries_get_on_503(self):
+        """Testa retry automático de GET em respostas 503"""
+        _Handler.falhas = 1
+        client = HttpClient(retries=2)
+
+        assert client.get(f"{self.base}/instavel").status_code == 200
+        assert _Handler.falhas == 0
+
+    def test_retry_after_is_capped(self):
+        """Testa que um Retry-After longo espera só max_retry_after antes do retry"""
+        _Handler.falhas = 1
+        client = HttpClient(retries=2, max_retry_after=0.05)
+
+        with patch("urllib3.util.retry.time.sleep") as mock_sleep:
+            assert client.get(f"{self.base}/limitado").status_code == 200
+
+        mock_sleep.assert_called_once_with(0.05)
+        assert _Handler.falhas == 0
+
+    def test_default_timeout_and_error_count(self):
+        """Testa timeout padrão e contagem de erros por host"""
+        client = HttpClient(connect_timeout=1, read_timeout=2)
+        with patch.object(client.session, "request", side_effect=ConnectionError("falhou")) as mock_request:
+            with pytest.raises(ConnectionError):
+                client.get("https://example.com/rss")
+
+        assert mock_request.call_args.kwargs["timeout"] == (1, 2)
+        assert client.host_stats()["example.com"]["erros"] == 1
+
+
+class TestRateLimiter:
+    """Testes para o token bucket por host"""
+
+    def _limiter(self, **kwargs):
+        self.now = 0.0
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        return RateLimiter(clock=lambda: self.now, sleep=sleep, **kwargs)
+
+    def test_burst_then_rate(self):
+        """Testa que o burst passa direto e as demais esperam 1/rate"""
+        limiter = self._limiter(rate=2.0, burst=2)
+
+        waits = [limiter.acquire("https://a.com/feed") for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 0.5]
+        assert limiter.total_wait == 1.0
+
+    def test_hosts_are_independent(self):
+        """Testa que cada host tem o seu balde"""
+        limiter = self._limiter(rate=1.0, burst=1)
+
+        assert limiter.acquire("https://a.com/1") == 0.0
+        assert limiter.acquire("https://b.com/1") == 0.0
+        assert limiter.acquire("https://a.com/2") == 1.0
+
+    def test_refill_over_time(self):
+        """Testa reposição das fichas com o tempo"""
+        limiter = self._limiter(rate=1.0, burst=1)
+        limiter.acquire("https://a.com")
+        self.now += 5
+
+        assert limiter.acquire("https://a.com") == 0.0
+
+    def test_per_host_rate_and_unlimited(self):
+        """Testa taxa específica por host e limite desligado"""
+        limiter = self._limiter(rate=0, burst=1, per_host={"wp.example.com": 0.5})
+
+        assert [limiter.acquire("https://x.com") for _ in range(3)] == [0.0, 0.0, 0.0]
+        limiter.acquire("https://wp.example.com/wp-json/wp/v2")
+        assert limiter.acquire("https://wp.example.com/wp-json/wp/v2") == 2.0
+
+
+class _InlineExecutor:
+    """Executa as recargas na hora, para testes determinísticos"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        fn(*args)
+
+
+class TestTTLCache:
+    """Testes para o cache LRU com TTL, stale-if-error e stale-while-revalidate"""
+
+    def _cache(self, **kwargs):
+        self.now = 0.0
+        self.executor = _InlineExecutor()
+        return TTLCache(clock=lambda: self.now, executor=self.executor, **kwargs)
+
+    def test_hit_then_miss_after_expiry(self):
+        """Testa entrada fresca servida do cache e recarregada depois do TTL"""
+        cache = self._cache(ttl=10)
+        loader = Mock(side_effect=["v1", "v2"])
+
+        assert cache.get("k", loader) == ("v1", "MISS")
+        self.now = 9
+        assert cache.get("k", loader) == ("v1", "HIT")
+        self.now = 10
+        assert cache.get("k", loader) == ("v2", "MISS")
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    def test_per_key_ttl(self):
+        """Testa TTL específico de uma chave"""
+        cache = self._cache(ttl=10)
+        cache.get("curta", lambda: 1, ttl=1)
+        cache.get("longa", lambda: 2)
+        self.now = 5
+
+        assert cache.get("curta", lambda: 3)[1] == "MISS"
+        assert cache.get("longa", lambda: 4) == (2, "HIT")
+
+    def test_stale_entry_refreshed_inline(self):
+        """Testa que a entrada velha é recarregada antes de responder, sem thread"""
+        cache = self._cache(ttl=10, stale_ttl=20)
+        cache.get("k", lambda: "v1")
+        self.now = 15
+
+        assert cache.get("k", lambda: "v2") == ("v2", "MISS")
+        assert cache.get("k", lambda: "v3") == ("v2", "HIT")
+        assert self.executor.submitted == 0
+        assert cache.stats()["refreshes"] == 1 and cache.stats()["misses"] == 1
+
+    def test_failed_inline_refresh_serves_stale_value(self):
+        """Testa que erro na recarga serve a entrada velha até o fim da janela"""
+        cache = self._cache(ttl=10, stale_ttl=20)
+        cache.get("k", lambda: "v1")
+
+        def falha():
+            raise RuntimeError("erro")
+
+        self.now = 15
+        assert cache.get("k", falha) == ("v1", "STALE")
+        self.now = 30
+        with pytest.raises(RuntimeError):
+            cache.get("k", falha)
+        assert cache.stats()["refresh_errors"] == 1 and cache.stats()["stale_hits"] == 1
+
+    def test_stale_while_revalidate(self):
+        """Testa que a entrada velha é servida e recarregada uma vez"""
+        cache = self._cache(ttl=10, stale_ttl=20, background_refresh=True)
+        cache.get("k", lambda: "v1")
+        self.now = 15
+
+        assert cache.get("k", lambda: "v2") == ("v1", "STALE")
+        assert cache.get("k", lambda: "v3") == ("v2", "HIT")
+        self.now = 100
+        assert cache.get("k", lambda: "v4") == ("v4", "MISS")
+        assert self.executor.submitted == 1
+        assert cache.stats()["refreshes"] == 1
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """Testa que erro na recarga mantém a entrada velha"""
+        cache = self._cache(ttl=10, stale_ttl=20, background_refresh=True)
+        cache.get("k", lambda: "v1")
+        self.now = 15
+
+        def falha():
+            raise RuntimeError("erro")
+
+        assert cache.get("k", falha) == ("v1", "STALE")
+        assert cache.get("k", falha) == ("v1", "STALE")
+        assert cache.stats()["refresh_errors"] == 2
+
+    def test_lru_eviction(self):
+        """Testa que a entrada menos usada sai primeiro"""
+        cache = self._cache(max_entries=2, ttl=10)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+
+        assert cache.get("a", lambda: 0)[1] == "HIT"
+        assert cache.get("b", lambda: 0)[1] == "MISS"
+        assert cache.stats()["evictions"] == 2
+
+    def test_loader_error_propagates_on_miss(self):
+        """Testa que erros no MISS não ficam no cache"""
+        cache = self._cache(ttl=10)
+
+        with pytest.raises(RuntimeError):
+            cache.get("k", Mock(side_effect=RuntimeError("erro")))
+        assert len(cache) == 0
+
+    def test_background_refresh_thread(self):
+        """Testa a recarga real em segundo plano"""
+        self.now = 0.0
+        cache = TTLCache(ttl=1, stale_ttl=10, clock=lambda: self.now, background_refresh=True)
+        cache.get("k", lambda: "v1")
+        self.now = 2
+        done = threading.Event()
+
+        def loader():
+            done.set()
+            return "v2"
+
+        assert cache.get("k", loader) == ("v1", "STALE")
+        assert done.wait(2)
+        cache._background().submit(lambda: None).result(timeout=2)
+        assert cache.get("k", loader) == ("v2", "HIT")
+
+
 class TestRetryDecorator:
     """Testes para decorator de retry"""
 
@@ -3,34 +3,81 @@ Utilitários para o projeto de agregação de notícias
 """
 import logging
 import os
+import threading
 import time
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
 from difflib import SequenceMatcher
-import requests
 from urllib.parse import urlparse
 import hashlib
+import html
+from functools import lru_cache
+import re
 from datetime import datetime, timedelta, UTC
 
 from config import get_config
 
+if TYPE_CHECKING:
+    # requests é importado só por quem faz HTTP (HttpClient); a limpeza e a
+    # API não pagam a importação na partida a frio
+    import requests
+
 # Configuração centralizada de logging
+_logging_configured = False
 
 
 def setup_logging(level: str = "INFO") -> logging.Logger:
-    """Configura logging centralizado com formato estruturado"""
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format= (
-            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-        ),
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    """
+    Configura logging centralizado com formato estruturado
+
+    Todos os módulos chamam esta função ao serem importados; a configuração
+    é aplicada uma única vez por processo.
+    """
+    global _logging_configured
+    if not _logging_configured:
+        logging.basicConfig(
+            level=getattr(logging, level.upper()),
+            format= (
+                '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+            ),
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        _logging_configured = True
     return logging.getLogger(__name__)
 
 
 logger = setup_logging()
 
 
+# Variáveis com a chave do Datadog; sem nenhuma delas o wrapper não tem para onde enviar
+DATADOG_KEY_VARS = ("DD_API_KEY", "DD_API_KEY_SECRET_ARN", "DD_API_KEY_SSM_NAME", "DD_KMS_API_KEY")
+
+
+def wrap_datadog(handler):
+    """
+    Aplica o wrapper do Datadog ao handler da Lambda
+
+    O datadog_lambda (e o ddtrace que ele carrega) só é importado se alguma
+    chave do Datadog estiver configurada, para não pesar na partida a frio
+    das funções sem monitoramento.
+
+    Args:
+        handler: Handler da Lambda
+
+    Returns:
+        Handler com o wrapper, ou o próprio handler se o Datadog não estiver
+        configurado ou instalado
+    """
+    if not any(os.environ.get(name) for name in DATADOG_KEY_VARS):
+        return handler
+
+    try:
+        from datadog_lambda.wrapper import datadog_lambda_wrapper
+    except ImportError:
+        return handler
+    return datadog_lambda_wrapper(handler)
+
+
 def validar_variaveis_obrigatorias(nomes: List[str]) -> None:
     """Valida se variáveis de ambiente obrigatórias estão definidas"""
     faltando = []
@@ -61,7 +108,8 @@ def validar_url(url: str) -> bool:
         if not parsed.scheme or not parsed.netloc:
             return False
 
-        response = requests.head(url, timeout=10, allow_redirects=True)
+        get_rate_limiter().acquire(url)
+        response = get_http_client().head(url, allow_redirects=True)
         return response.status_code < 400
 
     except Exception as e:
@@ -69,47 +117,68 @@ def validar_url(url: str) -> bool:
         return False
 
 
-def checar_plagio_local(title: str, resumo: str, table, threshold: float = 0.8) -> bool:
+def buscar_noticias_recentes(table, nicho: str = None, dias: int = 7) -> List[Dict[str, Any]]:
+    """
+    Busca todas as notícias inseridas nos últimos dias pelo índice nicho-data-index
+
+    Args:
+        table: Tabela do DynamoDB
+        nicho: Restringe a busca a um nicho (opcional; sem ele, consulta todos
+            os nichos configurados)
+        dias: Tamanho da janela em dias
+
+    Returns:
+        Lista de itens com id, titulo, resumo e data_insercao
+    """
+    try:
+        from data_access import buscar_por_nicho
+
+        cutoff_date = datetime.now(UTC) - timedelta(days=dias)
+        cutoff_timestamp = int(cutoff_date.timestamp())
+        nichos = [nicho] if nicho else get_config().content.nichos + ["geral"]
+
+        items = []
+        for n in nichos:
+            items.extend(buscar_por_nicho(
+                table, n, desde=cutoff_timestamp,
+                projection='id, titulo, resumo, data_insercao'
+            ))
+        return items
+
+    except Exception as e:
+        logger.error(f"Erro ao buscar notícias recentes: {e}")
+        return []
+
+
+def checar_plagio_local(title: str, resumo: str, table, threshold: float = 0.8, index=None) -> bool:
     """
     Verifica se uma notícia é plágio comparando com notícias existentes no DynamoDB
 
+    A busca usa o índice MinHash/LSH de dedup_index: só as notícias candidatas
+    são comparadas com SequenceMatcher.
+
     Args:
         title: Título da notícia
         resumo: Resumo da notícia
         table: Tabela do DynamoDB
         threshold: Limiar de similaridade (0-1)
+        index: NearDuplicateIndex já carregado (opcional). Sem ele, o índice é
+            montado a partir das notícias dos últimos 7 dias
 
     Returns:
         True se for considerado plágio
     """
     try:
-        from boto3.dynamodb.conditions import Attr
-
-        # Normaliza o texto para comparação
-        title_normalized = title.lower().strip()
-        resumo_normalized = resumo.lower().strip()
+        from dedup_index import NearDuplicateIndex
 
-        # Busca notícias recentes (últimos 7 dias)
-        cutoff_date = datetime.now(UTC) - timedelta(days=7)
-        cutoff_timestamp = int(cutoff_date.timestamp())
+        if index is None:
+            index = NearDuplicateIndex.from_items(buscar_noticias_recentes(table))
 
-        response = table.scan(
-            FilterExpression=Attr('data_insercao').gte(cutoff_timestamp),
-            ProjectionExpression='titulo, resumo',
-            Limit=100  # Limita para performance
-        )
-
-        for item in response.get('Items', []):
-            titulo_existente = item.get("titulo", "").lower().strip()
-            resumo_existente = item.get("resumo", "").lower().strip()
-
-            # Calcula similaridade
-            sim_titulo = SequenceMatcher(None, titulo_existente, title_normalized).ratio()
-            sim_resumo = SequenceMatcher(None, resumo_existente, resumo_normalized).ratio()
-
-            if sim_titulo > threshold or sim_resumo > threshold:
-                logger.info(f"Plágio detectado - Título: {sim_titulo:.2f}, Resumo: {sim_resumo:.2f}")
-                return True
+        match = index.find_duplicate(title, resumo, threshold)
+        if match is not None:
+            _, sim_titulo, sim_resumo = match
+            logger.info(f"Plágio detectado - Título: {sim_titulo:.2f}, Resumo: {sim_resumo:.2f}")
+            return True
 
         return False
 
@@ -172,18 +241,52 @@ def get_dynamodb_table(table_name: str = None):
     Returns:
         Objeto tabela do DynamoDB
     """
-    config = get_config()
-    table_name = table_name or config.database.dynamodb_table_name
-
-    dynamodb = config.get_dynamodb_resource()
-    table = dynamodb.Table(table_name)
-
-    return table
+    return get_config().get_dynamodb_table(table_name)
+
+
+# Marcação que vira um espaço: espaços, caracteres de controle, tags (com o
+# conteúdo de <script>/<style>), comentários HTML e entidades de espaço. Um
+# espaço simples entre palavras não casa (fica no texto, sem laço Python)
+_BLANK_PATTERN = (
+    r"(?! [^\s<&\x00-\x08\x0e-\x1f\x7f])"
+    r"(?:[\s\x00-\x08\x0e-\x1f\x7f]"
+    r"|<(?:(?:script|style)\b[^>]*>.*?</(?:script|style)\s*|!--.*?--|/?[a-z][^<>]*)>"
+    r"|&(?:nbsp|ensp|emsp|thinsp|#0*(?:9|10|13|32|160)|#x0*(?:9|a|d|20|a0));)+"
+)
+_MARKUP_RE = re.compile(
+    rf"(?P<blank>{_BLANK_PATTERN})|(?P<entity>&(?:#[0-9]{{1,7}}|#x[0-9a-f]{{1,6}}|[a-z][a-z0-9]{{1,31}});)",
+    re.IGNORECASE | re.DOTALL
+)
+# Tags de frase (inline) não separam palavras: uma sequência só delas some,
+# para que "<b>mundo</b>!" vire "mundo!" e não "mundo !"
+_INLINE_TAGS = ("a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "del", "dfn", "em", "font", "i",
+                "ins", "kbd", "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time",
+                "u", "var", "wbr")
+_INLINE_RUN_RE = re.compile(rf"(?:</?(?:{'|'.join(_INLINE_TAGS)})\b[^<>]*>)+", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+_NEEDS_MARKUP_PASS_RE = re.compile(r"[<&\x00-\x08\x0e-\x1f\x7f]")
+
+
+@lru_cache(maxsize=1024)
+def _decode_entity(entity: str) -> str:
+    """Entidade HTML decodificada ("" se ela for só espaço, ex.: &#8195;)"""
+    decoded = html.unescape(entity)
+    return "" if decoded.isspace() else decoded
 
 
 def sanitize_text(text: str, max_length: int = 1000) -> str:
     """
-    Sanitiza texto removendo caracteres especiais e limitando tamanho
+    Normaliza o texto: remove tags HTML, decodifica entidades, junta os
+    espaços e limita o tamanho
+
+    Tags de bloco (<p>, <br>, <li>...) viram espaço; tags de frase (<b>,
+    <a>, <span>...) somem, então "<b>mundo</b>!" vira "mundo!".
+
+    Tudo acontece numa única varredura com um regex pré-compilado, que para
+    assim que o resultado passa de max_length (o resto de um artigo longo
+    nem é lido). Texto sem "<", "&" ou caracteres de controle sai igual ao
+    da versão anterior (só espaços normalizados), então o hash das notícias
+    já gravadas não muda.
 
     Args:
         text: Texto para sanitizar
@@ -195,12 +298,39 @@ def sanitize_text(text: str, max_length: int = 1000) -> str:
     if not text:
         return ""
 
-    # Remove caracteres especiais e normaliza espaços
-    import re
-    text = re.sub(r'\s+', ' ', text.strip())
-    text = text[:max_length]
+    if not _NEEDS_MARKUP_PASS_RE.search(text):
+        return _SPACE_RE.sub(" ", text.strip())[:max_length]
+
+    text = text.strip()
+    parts: List[str] = []
+    size = 0
+    # Marcação desde o último literal; vira espaço só entre dois literais
+    pending = ""
+    position = 0
+    for match in _MARKUP_RE.finditer(text):
+        markup = match.group()
+        decoded = _decode_entity(markup) if match.lastgroup == "entity" else ""
+        literal = text[position:match.start()] + decoded
+        position = match.end()
+        if literal:
+            parts.append(" " + literal if pending and size and _separates_words(pending) else literal)
+            size += len(parts[-1])
+            pending = ""
+        if not decoded:
+            pending += markup
+        if size > max_length:
+            break
+    else:
+        literal = text[position:]
+        if literal:
+            parts.append(" " + literal if pending and size and _separates_words(pending) else literal)
+
+    return "".join(parts)[:max_length]
 
-    return text
+
+def _separates_words(markup: str) -> bool:
+    """Marcação que vira espaço: tudo menos uma sequência só de tags de frase"""
+    return not (markup[0] == "<" and _INLINE_RUN_RE.fullmatch(markup))
 
 
 def generate_content_hash(title: str, resumo: str) -> str:
@@ -228,6 +358,434 @@ def rate_limit_delay(seconds: float = 1.0) -> None:
     time.sleep(seconds)
 
 
+class RateLimiter:
+    """
+    Limitador de requisições por host no modelo token bucket
+
+    Cada host tem um balde com capacidade `burst` que recebe `rate` fichas por
+    segundo. Cada requisição consome uma ficha; sem fichas, a chamada espera
+    só o tempo necessário até a próxima. Seguro para uso entre threads: a
+    ficha é reservada sob lock e a espera acontece fora dele.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 2, per_host: Dict[str, float] = None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate: Requisições por segundo por host (<= 0 desliga o limite)
+            burst: Requisições permitidas em sequência sem espera
+            per_host: Taxas específicas por host
+            clock: Relógio monotônico (injetável nos testes)
+            sleep: Função de espera (injetável nos testes)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.per_host = {host.lower(): value for host, value in (per_host or {}).items()}
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+        self.waits: Dict[str, float] = {}
+
+    def set_rate(self, host: str, rate: float) -> None:
+        """Define a taxa de um host"""
+        with self._lock:
+            self.per_host[host.lower()] = rate
+
+    def acquire(self, url: str) -> float:
+        """
+        Aguarda uma ficha do host da URL
+
+        Args:
+            url: URL (ou host) da requisição
+
+        Returns:
+            Tempo esperado em segundos
+        """
+        host = (urlparse(url).netloc or url).lower()
+        rate = self.per_host.get(host, self.rate)
+        if rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * rate)
+            # A ficha é reservada mesmo sem saldo; o saldo negativo é a fila
+            tokens -= 1
+            self._buckets[host] = [tokens, now]
+            wait = -tokens / rate if tokens < 0 else 0.0
+            if wait:
+                self.total_wait += wait
+                self.waits[host] = self.waits.get(host, 0.0) + wait
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class TTLCache:
+    """
+    Cache LRU em memória com TTL por chave e stale-if-error
+
+    Pensado para containers "quentes" da Lambda: o conteúdo vive entre
+    invocações do mesmo container. Uma entrada é:
+
+    - fresca até `ttl` segundos após a gravação: servida direto (HIT)
+    - velha por mais `stale_ttl` segundos: recarregada antes de responder
+      (MISS); se a recarga falhar, a entrada velha é servida (STALE)
+    - expirada depois disso: recarregada antes de responder (MISS), e um
+      erro na carga propaga
+
+    Com background_refresh=True a entrada velha é servida na hora (STALE) e
+    recarregada numa thread, uma recarga por chave de cada vez
+    (stale-while-revalidate). Só serve para processos que continuam rodando
+    entre requisições: a Lambda congela a thread assim que o handler
+    retorna, e a recarga só andaria numa invocação seguinte, talvez sobre
+    uma conexão já morta. Passado `max_entries`, sai a menos usada.
+    """
+
+    HIT = "HIT"
+    STALE = "STALE"
+    MISS = "MISS"
+
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0, stale_ttl: float = 0.0,
+                 clock=time.monotonic, executor=None, background_refresh: bool = False):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            ttl: Tempo padrão, em segundos, em que uma entrada é fresca
+            stale_ttl: Tempo extra em que a entrada velha ainda é servida
+            clock: Relógio monotônico (injetável nos testes)
+            executor: Executor das recargas em segundo plano (padrão: uma thread)
+            background_refresh: Recarrega as entradas velhas em segundo plano
+                (não usar na Lambda)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.background_refresh = background_refresh
+        self._clock = clock
+        self._executor = executor
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Tuple[Any, str]:
+        """
+        Retorna o valor da chave, carregando-o se necessário
+
+        Args:
+            key: Chave da entrada
+            loader: Função sem argumentos que produz o valor (exceções propagam no MISS)
+            ttl: TTL desta chave (opcional; padrão self.ttl)
+
+        Returns:
+            (valor, "HIT" | "STALE" | "MISS")
+        """
+        refresh = inline = False
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self._clock()
+            if entry is not None and now < entry[2]:
+                self._entries.move_to_end(key)
+                if now < entry[1]:
+                    self.hits += 1
+                    return entry[0], self.HIT
+                if not self.background_refresh:
+                    inline = True
+                else:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        refresh = True
+                    value = entry[0]
+            else:
+                self.misses += 1
+                entry = None
+
+        if inline:
+            return self._refresh_inline(key, loader, ttl, entry[0])
+        if entry is None:
+            value = loader()
+            self.set(key, value, ttl)
+            return value, self.MISS
+
+        if refresh:
+            self._background().submit(self._refresh, key, loader, ttl)
+        return value, self.STALE
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Grava uma entrada, descartando as menos usadas acima do limite"""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (value, now + ttl, now + ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Descarta todas as entradas"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de uso do cache"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+            "size": len(self._entries)
+        }
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> None:
+        try:
+            self.set(key, loader(), ttl)
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            with self._lock:
+                self.refresh_errors += 1
+            logger.warning(f"Erro ao recarregar entrada do cache {key!r}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_inline(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float],
+                        stale: Any) -> Tuple[Any, str]:
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self.stale_hits += 1
+                self.refresh_errors += 1
+            logger.warning(f"Erro ao recarregar entrada do cache {key!r}, servindo a velha: {e}")
+            return stale, self.STALE
+        self.set(key, value, ttl)
+        with self._lock:
+            self.refreshes += 1
+        return value, self.MISS
+
+    def _background(self):
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                # Uma única thread: reaproveita o recurso DynamoDB dela entre recargas
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-refresh")
+            return self._executor
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado, reaproveitado entre invocações da Lambda
+
+    Usa uma requests.Session com pool de conexões por host e keep-alive,
+    gzip, timeouts padrão (conexão, leitura) e retry com backoff para
+    GET/HEAD em falhas de conexão e respostas 429/5xx. POST não é repetido
+    automaticamente por não ser idempotente. O Retry-After das respostas é
+    respeitado até max_retry_after segundos: um host que pede uma hora de
+    espera não prende o worker até o timeout da Lambda.
+
+    Mantém por host o número de requisições, erros e latência, e lê do
+    pool do urllib3 quantas conexões foram abertas, para medir o reuso.
+    """
+
+    USER_AGENT = "DJBlog/1.0"
+
+    def __init__(self, pool_maxsize: int = 16, connect_timeout: float = 3.05,
+                 read_timeout: float = 10.0, retries: int = 2, max_retry_after: float = 5.0):
+        """
+        Args:
+            pool_maxsize: Conexões mantidas por host
+            connect_timeout: Timeout de conexão em segundos
+            read_timeout: Timeout de leitura em segundos
+            retries: Tentativas extras para GET/HEAD
+            max_retry_after: Espera máxima, em segundos, pedida por um Retry-After
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        class CappedRetry(Retry):
+            """Retry do urllib3 com teto para o Retry-After"""
+
+            def get_retry_after(self, response):
+                retry_after = super().get_retry_after(response)
+                return None if retry_after is None else min(retry_after, max_retry_after)
+
+        self.timeout = (connect_timeout, read_timeout)
+        retry = CappedRetry(
+            total=retries,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize,
+                                   max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers.update({
+            "User-Agent": self.USER_AGENT,
+            "Accept-Encoding": "gzip, deflate"
+        })
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def request(self, method: str, url: str, **kwargs) -> "requests.Response":
+        """
+        Executa uma requisição pela sessão compartilhada
+
+        Args:
+            method: Método HTTP
+            url: URL da requisição
+            **kwargs: Parâmetros do requests (timeout padrão se omitido)
+
+        Returns:
+            Resposta HTTP
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlparse(url).netloc.lower()
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        except Exception:
+            self._record(host, error=True)
+            raise
+        finally:
+            self._record(host, latency=time.perf_counter() - start)
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("POST", url, **kwargs)
+
+    def _record(self, host: str, latency: float = None, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(host, {"requisicoes": 0, "erros": 0, "latencia_total": 0.0})
+            if error:
+                stats["erros"] += 1
+            if latency is not None:
+                stats["requisicoes"] += 1
+                stats["latencia_total"] += latency
+
+    def host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna os contadores por host desde a criação do cliente
+
+        Returns:
+            Por host: requisições, erros, latência média (ms), conexões
+            abertas e requisições que reaproveitaram uma conexão
+        """
+        connections: Dict[str, int] = {}
+        pool_requests: Dict[str, int] = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.host}:{pool.port}" if pool.port not in (80, 443, None) else pool.host
+            connections[host] = connections.get(host, 0) + pool.num_connections
+            pool_requests[host] = pool_requests.get(host, 0) + pool.num_requests
+
+        with self._lock:
+            result = {}
+            for host, stats in self._stats.items():
+                opened = connections.get(host, 0)
+                result[host] = {
+                    "requisicoes": stats["requisicoes"],
+                    "erros": stats["erros"],
+                    "latencia_media_ms": round(stats["latencia_total"] / stats["requisicoes"] * 1000, 1)
+                    if stats["requisicoes"] else 0.0,
+                    "conexoes_abertas": opened,
+                    "conexoes_reutilizadas": max(pool_requests.get(host, 0) - opened, 0)
+                }
+            return result
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Retorna o cliente HTTP compartilhado pelo processo
+
+    Criado uma vez por container, mantém as conexões abertas entre
+    invocações "quentes" da Lambda.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            try:
+                http_config = get_config().http
+                _http_client = HttpClient(
+                    pool_maxsize=int(http_config.pool_maxsize),
+                    connect_timeout=float(http_config.connect_timeout),
+                    read_timeout=float(http_config.read_timeout),
+                    retries=int(http_config.retries),
+                    max_retry_after=float(http_config.max_retry_after)
+                )
+            except Exception as e:
+                logger.warning(f"Configuração HTTP inválida, usando padrão: {e}")
+                _http_client = HttpClient()
+        return _http_client
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Retorna o limitador de requisições compartilhado pelo processo
+
+    As taxas vêm de config.rate_limit; o host do WordPress usa
+    wordpress_rps, salvo se tiver taxa própria em RATE_LIMIT_PER_HOST.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            try:
+                config = get_config()
+                per_host = dict(config.rate_limit.per_host or {})
+                wp_host = urlparse(config.wordpress.wp_url or "").netloc.lower()
+                if wp_host:
+                    per_host.setdefault(wp_host, config.rate_limit.wordpress_rps)
+                _rate_limiter = RateLimiter(
+                    rate=float(config.rate_limit.default_rps),
+                    burst=int(config.rate_limit.burst),
+                    per_host=per_host
+                )
+            except Exception as e:
+                logger.warning(f"Configuração de rate limit inválida, usando padrão: {e}")
+                _rate_limiter = RateLimiter()
+        return _rate_limiter
+
+
 def retry_on_failure(func=None, *, max_retries: int = 3, delay: float = 1.0):
     """
     Decorator para retry em caso de falha
@@ -268,16 +826,14 @@ def buscar_noticias_coletadas():
 def inserir_noticia_resumida(item):
     """Insere notícia resumida"""
     config = get_config()
-    dynamodb = config.get_dynamodb_resource()
-    table = dynamodb.Table(f"{config.database.dynamodb_table_name}-resumidas")
+    table = config.get_dynamodb_table(f"{config.database.dynamodb_table_name}-resumidas")
     table.put_item(Item=item)
 
 
 def buscar_noticias_resumidas():
     """Busca todas as notícias resumidas"""
     config = get_config()
-    dynamodb = config.get_dynamodb_resource()
-    table = dynamodb.Table(f"{config.database.dynamodb_table_name}-resumidas")
+    table = config.get_dynamodb_table(f"{config.database.dynamodb_table_name}-resumidas")
     response = table.scan()
     return response.get('Items', [])
 